@@ -3,35 +3,65 @@ chains/ - Blockchain interaction layer.
 
 Modules:
 - providers: RPC provider management with failover
-- block: Block number management and pinning
+- rate_limit: Per-endpoint token buckets and rate-limit backoff
+- block: Block number management, pinning and newHeads streaming
+- multicall: Multicall3 aggregate3 batching for eth_call
 """
 
 from chains.providers import (
     RPCProvider,
     RPCResponse,
+    RPCBatchItem,
     RPCStats,
     ProviderRegistry,
     get_provider,
     register_provider,
+    register_chain_provider,
     close_all_providers,
 )
+from chains.rate_limit import (
+    RateLimitConfig,
+    TokenBucket,
+    EndpointLimiter,
+)
 from chains.block import (
     BlockState,
     BlockPinner,
+    BlockStream,
     fetch_block_number,
 )
+from chains.multicall import (
+    Call3,
+    Call3Result,
+    Multicall3,
+    MulticallResult,
+    get_multicall3_address,
+)
 
 __all__ = [
     # Providers
     "RPCProvider",
     "RPCResponse", 
+    "RPCBatchItem",
     "RPCStats",
     "ProviderRegistry",
     "get_provider",
     "register_provider",
+    "register_chain_provider",
     "close_all_providers",
+    # Rate limits
+    "RateLimitConfig",
+    "TokenBucket",
+    "EndpointLimiter",
     # Block
     "BlockState",
     "BlockPinner",
+    "BlockStream",
     "fetch_block_number",
+    # Multicall
+    "Call3",
+    "Call3Result",
+    "Multicall3",
+    "MulticallResult",
+    "get_multicall3_address",
 ]
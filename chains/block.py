@@ -5,14 +5,20 @@ Provides:
 - Block fetching with latency tracking
 - Block pinning for quote consistency
 - Staleness detection
+- Push-style block stream (WS newHeads with HTTP polling fallback)
 """
 
+import asyncio
+import json
 from dataclasses import dataclass
+from typing import AsyncIterator
+
+import websockets
 
 from core.time import now_ms, BlockPin
 from core.logging import get_logger
 from core.exceptions import InfraError, ErrorCode
-from chains.providers import RPCProvider
+from chains.providers import RPCProvider, resolve_urls
 
 logger = get_logger(__name__)
 
@@ -24,6 +30,8 @@ class BlockState:
     block_number: int
     timestamp_ms: int
     latency_ms: int
+    block_hash: str | None = None  # Set by newHeads (used for reorg detection)
+    parent_hash: str | None = None
     
     def to_pin(self) -> BlockPin:
         """Convert to BlockPin for freshness tracking."""
@@ -76,6 +84,21 @@ async def fetch_block_number(provider: RPCProvider) -> BlockState:
         )
 
 
+def is_reorg(current: BlockState, new: BlockState) -> bool:
+    """
+    True if new replaces current's block: same height with another hash, or
+    the next height with a different parent. Needs hashes (newHeads); polled
+    blocks carry none and never count.
+    """
+    if not (current.block_hash and new.block_hash):
+        return False
+    if new.block_number == current.block_number:
+        return new.block_hash != current.block_hash
+    if new.block_number == current.block_number + 1 and new.parent_hash:
+        return new.parent_hash != current.block_hash
+    return False
+
+
 class BlockPinner:
     """
     Manages block pinning for a chain.
@@ -129,6 +152,36 @@ class BlockPinner:
         
         return self._current_state
     
+    def update(self, state: BlockState) -> bool:
+        """
+        Pin a block pushed from a BlockStream.
+        
+        Older blocks are ignored; the same height with a new hash (reorg)
+        replaces the pin. On a reorg the provider's pinned-block cache is
+        cleared, since its entries are keyed by block number.
+        
+        Returns:
+            True if the pin changed
+        """
+        current = self._current_state
+        if current is not None:
+            if state.block_number < current.block_number:
+                return False
+            if state.block_number == current.block_number and state.block_hash == current.block_hash:
+                return False
+            if is_reorg(current, state):
+                self.provider.clear_cache()
+                logger.warning(
+                    f"Reorg at block {current.block_number}, RPC cache cleared "
+                    f"(chain={self.provider.chain_id})"
+                )
+        
+        self._current_state = state
+        logger.debug(
+            f"Block pin updated: {state.block_number} (chain={self.provider.chain_id})"
+        )
+        return True
+    
     async def ensure_fresh(self) -> BlockState:
         """
         Ensure block pin is fresh, refreshing if needed.
@@ -161,3 +214,214 @@ class BlockPinner:
             "is_stale": self.is_stale(),
             "fetch_latency_ms": self._current_state.latency_ms,
         }
+
+
+# =============================================================================
+# BLOCK STREAM
+# =============================================================================
+
+def parse_new_head(chain_id: int, header: dict) -> BlockState:
+    """Build BlockState from a newHeads header (hex-encoded fields)."""
+    return BlockState(
+        chain_id=chain_id,
+        block_number=int(header["number"], 16),
+        timestamp_ms=now_ms(),
+        latency_ms=0,  # Pushed, no request round trip
+        block_hash=header.get("hash"),
+        parent_hash=header.get("parentHash"),
+    )
+
+
+class BlockStream:
+    """
+    Push-style block source for one chain.
+    
+    Subscribes to newHeads over WebSocket and keeps a BlockPinner updated.
+    When no WS endpoint is usable it polls eth_blockNumber over HTTP, and
+    keeps retrying WS with exponential backoff.
+    
+    Consumers iterate new blocks; a slow consumer only ever sees the latest
+    block (intermediate blocks are coalesced, never queued).
+    
+    Usage:
+        stream = BlockStream(provider, chain_config["ws_urls"], pinner)
+        await stream.start()
+        async for state in stream.blocks():
+            ...
+        await stream.stop()
+    """
+    
+    def __init__(
+        self,
+        provider: RPCProvider,
+        ws_urls: list[str] | None = None,
+        pinner: BlockPinner | None = None,
+        poll_interval_ms: int = 1000,
+        stall_timeout_ms: int = 30_000,
+        reconnect_base_ms: int = 500,
+        reconnect_max_ms: int = 30_000,
+    ):
+        self.provider = provider
+        self.ws_urls = resolve_urls(ws_urls or [])
+        self.pinner = pinner or BlockPinner(provider)
+        self.poll_interval_ms = poll_interval_ms
+        self.stall_timeout_ms = stall_timeout_ms
+        self.reconnect_base_ms = reconnect_base_ms
+        self.reconnect_max_ms = reconnect_max_ms
+        
+        self._latest: BlockState | None = None
+        self._changed = asyncio.Condition()
+        self._task: asyncio.Task | None = None
+        self._stopped = False
+        
+        # Stats
+        self.source: str = "none"  # "ws" | "http" | "none"
+        self.blocks_received = 0
+        self.ws_connects = 0
+        self.ws_failures = 0
+        self.last_error: str | None = None
+    
+    @property
+    def latest(self) -> BlockState | None:
+        """Most recent block seen by the stream."""
+        return self._latest
+    
+    async def start(self) -> None:
+        """Start the background subscription task."""
+        if self._task is None:
+            self._stopped = False
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the stream and wake any waiting consumers."""
+        self._stopped = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        async with self._changed:
+            self._changed.notify_all()
+    
+    async def blocks(self) -> AsyncIterator[BlockState]:
+        """
+        Iterate new blocks as they arrive.
+        
+        Yields the latest block each time it changes; blocks that arrive
+        while the consumer is busy are coalesced into the newest one.
+        """
+        last_yielded: BlockState | None = None
+        while not self._stopped:
+            async with self._changed:
+                await self._changed.wait_for(
+                    lambda: self._stopped or (
+                        self._latest is not None and self._latest is not last_yielded
+                    )
+                )
+                if self._stopped:
+                    return
+                last_yielded = self._latest
+            yield last_yielded
+    
+    async def _publish(self, state: BlockState) -> None:
+        """Record a block and notify consumers if the pin moved."""
+        if not self.pinner.update(state):
+            return
+        self.blocks_received += 1
+        async with self._changed:
+            self._latest = state
+            self._changed.notify_all()
+    
+    async def _run(self) -> None:
+        """Prefer WS; fall back to HTTP polling between reconnect attempts."""
+        failures = 0
+        while not self._stopped:
+            for url in self.ws_urls:
+                connects_before = self.ws_connects
+                try:
+                    await self._consume_ws(url)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.ws_failures += 1
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    logger.warning(
+                        f"newHeads stream failed: {self.last_error}",
+                        extra={"context": {"chain_id": self.provider.chain_id}},
+                    )
+                # A subscription that was up resets the backoff
+                if self.ws_connects > connects_before:
+                    failures = 0
+            
+            if self._stopped:
+                return
+            
+            # All WS endpoints down (or none configured): poll over HTTP
+            failures += 1
+            backoff_ms = min(
+                self.reconnect_max_ms,
+                self.reconnect_base_ms * 2 ** min(failures - 1, 16),
+            )
+            if not self.ws_urls:
+                backoff_ms = self.reconnect_max_ms
+            await self._poll_http(backoff_ms)
+    
+    async def _consume_ws(self, url: str) -> None:
+        """Subscribe to newHeads on one endpoint until it closes or stalls."""
+        timeout_s = self.stall_timeout_ms / 1000
+        async with websockets.connect(url, open_timeout=timeout_s) as ws:
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_subscribe",
+                "params": ["newHeads"],
+            }))
+            reply = json.loads(await asyncio.wait_for(ws.recv(), timeout_s))
+            if "error" in reply:
+                raise InfraError(
+                    code=ErrorCode.INFRA_RPC_ERROR,
+                    message=f"eth_subscribe rejected: {reply['error']}",
+                    details={"chain_id": self.provider.chain_id},
+                )
+            subscription_id = reply.get("result")
+            
+            self.ws_connects += 1
+            self.source = "ws"
+            logger.info(
+                "newHeads subscribed",
+                extra={"context": {"chain_id": self.provider.chain_id}},
+            )
+            
+            while not self._stopped:
+                # A silent socket is treated as dead (raises TimeoutError)
+                message = json.loads(await asyncio.wait_for(ws.recv(), timeout_s))
+                params = message.get("params") or {}
+                if params.get("subscription") != subscription_id:
+                    continue
+                await self._publish(parse_new_head(self.provider.chain_id, params["result"]))
+    
+    async def _poll_http(self, duration_ms: int) -> None:
+        """Poll eth_blockNumber for duration_ms."""
+        self.source = "http"
+        deadline = now_ms() + duration_ms
+        while not self._stopped and now_ms() < deadline:
+            try:
+                await self._publish(await fetch_block_number(self.provider))
+            except InfraError as e:
+                self.last_error = e.message
+                logger.debug(f"Block poll failed: {e.message}")
+            await asyncio.sleep(self.poll_interval_ms / 1000)
+    
+    def get_stats(self) -> dict:
+        """Get block stream statistics."""
+        return {
+            "chain_id": self.provider.chain_id,
+            "source": self.source,
+            "block_number": self._latest.block_number if self._latest else None,
+            "blocks_received": self.blocks_received,
+            "ws_connects": self.ws_connects,
+            "ws_failures": self.ws_failures,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,272 @@
+"""
+chains/multicall.py - Multicall3 aggregation for eth_call.
+
+Packs many read-only calls into one Multicall3.aggregate3 eth_call:
+- allowFailure per sub-call (one revert does not sink the batch)
+- All sub-calls execute against the same block by construction
+- Large call lists are chunked and sent as one JSON-RPC batch
+"""
+
+from dataclasses import dataclass
+
+from core.logging import get_logger
+from core.exceptions import InfraError, ErrorCode
+from chains.providers import RPCBatchItem, RPCProvider
+
+logger = get_logger(__name__)
+
+
+# =============================================================================
+# ADDRESSES
+# =============================================================================
+
+# Canonical Multicall3 deployment (same address on most EVM chains)
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+# Chains where Multicall3 lives elsewhere (different CREATE2 rules)
+MULTICALL3_OVERRIDES: dict[int, str] = {
+    324: "0xF9cda624FBC7e059355ce98a31693d299FACd963",  # zkSync Era
+}
+
+# Sub-calls per aggregate3 eth_call. Quoter calls burn ~100-300k gas each
+# and nodes cap eth_call gas, so keep each aggregate well under the cap.
+DEFAULT_MULTICALL_CHUNK_SIZE = 100
+
+
+def get_multicall3_address(chain_id: int) -> str:
+    """Get Multicall3 address for a chain."""
+    return MULTICALL3_OVERRIDES.get(chain_id, MULTICALL3_ADDRESS)
+
+
+# =============================================================================
+# ABI ENCODING
+# =============================================================================
+
+# keccak256("aggregate3((address,bool,bytes)[])")[:4]
+SELECTOR_AGGREGATE3 = "0x82ad56cb"
+
+
+@dataclass
+class Call3:
+    """One sub-call for aggregate3."""
+    target: str
+    call_data: str  # 0x-prefixed hex
+    allow_failure: bool = True
+
+
+@dataclass
+class Call3Result:
+    """Result of one aggregate3 sub-call."""
+    success: bool
+    return_data: str  # 0x-prefixed hex (revert data when success=False)
+    error: InfraError | None = None  # The leg's whole chunk failed (success=False)
+
+
+def _word(value: int) -> str:
+    """Encode an unsigned int as one 32-byte word."""
+    return hex(value)[2:].zfill(64)
+
+
+def encode_aggregate3(calls: list[Call3]) -> str:
+    """
+    Encode aggregate3((address target, bool allowFailure, bytes callData)[]).
+
+    Layout (all offsets in bytes):
+        selector
+        offset to array (0x20)
+        array length N
+        N tuple offsets (relative to the first offset word)
+        N tuples: target, allowFailure, offset to callData (0x60), len, data
+    """
+    encoded_tuples: list[str] = []
+    for call in calls:
+        data = call.call_data[2:] if call.call_data.startswith("0x") else call.call_data
+        data_len = len(data) // 2
+        padded = data.ljust(((len(data) + 63) // 64) * 64, "0")
+        encoded_tuples.append(
+            call.target[2:].lower().zfill(64)
+            + _word(1 if call.allow_failure else 0)
+            + _word(0x60)
+            + _word(data_len)
+            + padded
+        )
+
+    head: list[str] = []
+    offset = 32 * len(calls)
+    for encoded in encoded_tuples:
+        head.append(_word(offset))
+        offset += len(encoded) // 2
+
+    return (
+        SELECTOR_AGGREGATE3
+        + _word(0x20)
+        + _word(len(calls))
+        + "".join(head)
+        + "".join(encoded_tuples)
+    )
+
+
+def decode_aggregate3_response(hex_result: str) -> list[Call3Result]:
+    """
+    Decode aggregate3 return value (bool success, bytes returnData)[].
+
+    Raises:
+        ValueError: If the payload is malformed
+    """
+    if not hex_result or hex_result == "0x":
+        raise ValueError("Empty aggregate3 response")
+
+    data = hex_result[2:] if hex_result.startswith("0x") else hex_result
+
+    def word(byte_offset: int) -> int:
+        start = byte_offset * 2
+        chunk = data[start:start + 64]
+        if len(chunk) != 64:
+            raise ValueError(f"aggregate3 response truncated at byte {byte_offset}")
+        return int(chunk, 16)
+
+    array_start = word(0)
+    count = word(array_start)
+    items_start = array_start + 32
+
+    results: list[Call3Result] = []
+    for i in range(count):
+        tuple_start = items_start + word(items_start + 32 * i)
+        success = word(tuple_start) != 0
+        bytes_start = tuple_start + word(tuple_start + 32)
+        length = word(bytes_start)
+        begin = (bytes_start + 32) * 2
+        payload = data[begin:begin + length * 2]
+        if len(payload) != length * 2:
+            raise ValueError(f"aggregate3 returnData {i} truncated")
+        results.append(Call3Result(success=success, return_data="0x" + payload))
+
+    return results
+
+
+# =============================================================================
+# AGGREGATOR
+# =============================================================================
+
+@dataclass
+class MulticallResult:
+    """Results of an aggregate run, in call order."""
+    results: list[Call3Result]
+    latency_ms: int  # Slowest chunk
+    eth_calls: int  # aggregate3 eth_calls made
+
+
+class Multicall3:
+    """
+    Multicall3 aggregator.
+
+    Usage:
+        multicall = Multicall3(provider)
+        out = await multicall.aggregate3(calls, block_number=block)
+        for call, result in zip(calls, out.results): ...
+    """
+
+    def __init__(
+        self,
+        provider: RPCProvider,
+        address: str | None = None,
+        chunk_size: int = DEFAULT_MULTICALL_CHUNK_SIZE,
+    ):
+        self.provider = provider
+        self.address = address or get_multicall3_address(provider.chain_id)
+        self.chunk_size = max(1, chunk_size)
+
+    async def aggregate3(
+        self,
+        calls: list[Call3],
+        block_number: int | None = None,
+    ) -> MulticallResult:
+        """
+        Execute calls via aggregate3 at one block.
+
+        Calls are chunked by chunk_size; all chunks go out in a single
+        JSON-RPC batch pinned to the same block tag.
+
+        Args:
+            calls: Sub-calls to aggregate
+            block_number: Block number to query at (None = latest)
+
+        A chunk whose aggregate3 call fails or cannot be decoded fails
+        only its own legs: each gets Call3Result(success=False) with the
+        chunk's InfraError, and the other chunks' results are kept.
+
+        Returns:
+            MulticallResult with one Call3Result per call
+
+        Raises:
+            InfraError: If the batch itself fails (every endpoint)
+        """
+        if not calls:
+            return MulticallResult(results=[], latency_ms=0, eth_calls=0)
+
+        block_tag = hex(block_number) if block_number else "latest"
+        chunks = [
+            calls[i:i + self.chunk_size]
+            for i in range(0, len(calls), self.chunk_size)
+        ]
+
+        items = await self.provider.eth_call_batch(
+            [(self.address, encode_aggregate3(chunk)) for chunk in chunks],
+            block=block_tag,
+        )
+
+        results: list[Call3Result] = []
+        failed_chunks = 0
+        for chunk, item in zip(chunks, items):
+            try:
+                results.extend(self._decode_chunk(chunk, item, block_tag))
+            except InfraError as e:
+                failed_chunks += 1
+                logger.warning(f"{e.message} ({len(chunk)} calls)", extra={"context": e.details})
+                results.extend(Call3Result(success=False, return_data="0x", error=e) for _ in chunk)
+
+        latency_ms = max(item.latency_ms for item in items)
+        logger.debug(
+            f"aggregate3: {len(calls)} calls in {len(chunks)} chunks, {latency_ms}ms",
+            extra={"context": {
+                "block_tag": block_tag,
+                "failed": sum(not r.success for r in results),
+                "failed_chunks": failed_chunks,
+            }},
+        )
+
+        return MulticallResult(results=results, latency_ms=latency_ms, eth_calls=len(chunks))
+
+    def _decode_chunk(self, chunk: list[Call3], item: RPCBatchItem, block_tag: str) -> list[Call3Result]:
+        """
+        One chunk's sub-call results.
+
+        Raises:
+            InfraError: If the chunk's aggregate3 call failed or cannot be decoded
+        """
+        if not item.ok:
+            raise InfraError(
+                code=ErrorCode.INFRA_RPC_ERROR,
+                message=f"aggregate3 failed: {item.error.get('message', item.error)}",
+                details={
+                    "multicall": self.address,
+                    "block_tag": block_tag,
+                    "calls": len(chunk),
+                    "endpoint": item.endpoint_used,
+                },
+            )
+        try:
+            decoded = decode_aggregate3_response(item.result)
+        except ValueError as e:
+            raise InfraError(
+                code=ErrorCode.INFRA_BAD_ABI,
+                message=f"aggregate3 decode failed: {e}",
+                details={"multicall": self.address, "block_tag": block_tag},
+            )
+        if len(decoded) != len(chunk):
+            raise InfraError(
+                code=ErrorCode.INFRA_BAD_ABI,
+                message=f"aggregate3 returned {len(decoded)} results for {len(chunk)} calls",
+                details={"multicall": self.address, "block_tag": block_tag},
+            )
+        return decoded
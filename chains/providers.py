@@ -3,28 +3,52 @@ chains/providers.py - RPC provider management with failover.
 
 Provides reliable RPC access with:
 - Multiple endpoint failover
+- JSON-RPC batching (split at max_batch_size)
 - Request timeout handling
 - Connection pooling
-- Latency tracking
+- Latency tracking (rolling p50/p95/p99 per endpoint)
+- Latency-aware endpoint order and hedged requests
+- Per-endpoint rate limits (token buckets, see chains/rate_limit.py)
+- Result cache for calls pinned to a block number, and coalescing of
+  identical in-flight calls
 """
 
 import asyncio
+import json
 import os
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Awaitable, Callable, TypeVar
 
 import httpx
 from dotenv import load_dotenv
 
 from core.logging import get_logger
 from core.exceptions import InfraError, ErrorCode
+from core.constants import DEFAULT_RPC_BATCH_SIZE, DEFAULT_RPC_CACHE_SIZE
+from chains.rate_limit import (
+    EndpointLimiter,
+    RateLimitConfig,
+    is_rate_limit_error,
+    parse_retry_after,
+)
 
 logger = get_logger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+T = TypeVar("T")
+
+# Latency tracking
+LATENCY_WINDOW = 200  # Samples kept per endpoint
+MIN_LATENCY_SAMPLES = 10  # Below this an endpoint is "unmeasured": no ranking, no hedging
+
+# Methods whose result is fixed once the block (last param) is a number
+CACHEABLE_METHODS = frozenset({"eth_call", "eth_getBalance", "eth_getCode", "eth_getStorageAt"})
+CACHE_ENDPOINT = "cache"  # endpoint_used of a cached result
+
 
 @dataclass
 class RPCStats:
@@ -33,11 +57,36 @@ class RPCStats:
     total_requests: int = 0
     successful_requests: int = 0
     failed_requests: int = 0
+    rate_limited: int = 0  # 429s; not counted in total_requests (no quarantine)
     total_latency_ms: int = 0
     last_error: str | None = None
     last_success_ts: int | None = None
     quarantined: bool = False
     quarantine_until_ts: int | None = None
+    latencies_ms: deque[int] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    
+    def record_latency(self, latency_ms: int) -> None:
+        """Add a sample to the rolling window."""
+        self.latencies_ms.append(latency_ms)
+    
+    def latency_percentile(self, pct: int) -> int | None:
+        """Rolling latency percentile (nearest rank), None until MIN_LATENCY_SAMPLES."""
+        if len(self.latencies_ms) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
+    
+    @property
+    def p50_latency_ms(self) -> int | None:
+        return self.latency_percentile(50)
+    
+    @property
+    def p95_latency_ms(self) -> int | None:
+        return self.latency_percentile(95)
+    
+    @property
+    def p99_latency_ms(self) -> int | None:
+        return self.latency_percentile(99)
     
     @property
     def avg_latency_ms(self) -> int:
@@ -58,6 +107,42 @@ MIN_SUCCESS_RATE_FOR_ACTIVE = 0.1  # Below this = quarantine
 QUARANTINE_DURATION_MS = 60_000  # 1 minute quarantine
 
 
+def resolve_urls(urls: list[str]) -> list[str]:
+    """
+    Resolve environment variables in RPC/WS URLs.
+    
+    Alchemy URLs are dropped when ALCHEMY_API_KEY is not set.
+    """
+    api_key = os.getenv("ALCHEMY_API_KEY", "")
+    resolved = []
+    for url in urls:
+        resolved_url = url.replace("${ALCHEMY_API_KEY}", api_key)
+        # Only include if API key present or not needed
+        if api_key or "alchemy" not in resolved_url.lower():
+            resolved.append(resolved_url)
+    return resolved
+
+
+class _AbandonedCall(InfraError):
+    """A coalesced batch call whose owning call_batch was cancelled."""
+
+
+def _is_revert_error(error: object) -> bool:
+    """True for a JSON-RPC error object reporting an eth_call revert."""
+    if not isinstance(error, dict):
+        return False
+    return error.get("code") == 3 or "revert" in str(error.get("message", "")).lower()
+
+
+def _all_failed_code(errors: list[BaseException]) -> ErrorCode:
+    """INFRA_RATE_LIMIT when every endpoint only rate limited us, else INFRA_RPC_ERROR."""
+    if errors and all(
+        isinstance(e, InfraError) and e.code == ErrorCode.INFRA_RATE_LIMIT for e in errors
+    ):
+        return ErrorCode.INFRA_RATE_LIMIT
+    return ErrorCode.INFRA_RPC_ERROR
+
+
 @dataclass
 class RPCResponse:
     """Response from an RPC call."""
@@ -65,14 +150,28 @@ class RPCResponse:
     latency_ms: int
     endpoint_used: str
     block_number: int | None = None  # For calls that return block context
+    error: dict | None = None  # JSON-RPC error object if the call reverted (result is None)
+
+
+@dataclass
+class RPCBatchItem:
+    """Result of one call within a JSON-RPC batch."""
+    result: Any
+    error: dict | None  # JSON-RPC error object if this call failed (e.g. revert)
+    latency_ms: int
+    endpoint_used: str
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
 
 
 class RPCProvider:
     """
     RPC provider with failover support.
     
-    Tries multiple endpoints in order until one succeeds.
-    Tracks statistics per endpoint for monitoring.
+    Tries endpoints fastest-first until one succeeds, hedging slow calls
+    onto the next endpoint. Tracks statistics per endpoint for monitoring.
     """
     
     def __init__(
@@ -80,12 +179,32 @@ class RPCProvider:
         chain_id: int,
         rpc_urls: list[str],
         timeout_seconds: int = 10,
+        max_batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+        hedge: bool = True,
+        max_hedges: int = 1,
+        rate_limit: RateLimitConfig | None = None,
+        cache_size: int = DEFAULT_RPC_CACHE_SIZE,
     ):
         self.chain_id = chain_id
         self.timeout_seconds = timeout_seconds
+        self.max_batch_size = max(1, max_batch_size)
         self._client: httpx.AsyncClient | None = None
         self._request_id = 0
         
+        # Hedged requests: duplicate to the next endpoint after its p95
+        self.hedge = hedge
+        self.max_hedges = max(0, max_hedges)
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        
+        # Pinned-block results (LRU) and identical calls in flight
+        self.cache_size = max(0, cache_size)
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._calls_in_flight: dict[str, asyncio.Task] = {}
+        self._batch_calls_in_flight: dict[str, asyncio.Future] = {}
+        self.cache_hits = 0
+        self.coalesced_requests = 0
+        
         # Resolve API keys in URLs
         self.rpc_urls = self._resolve_urls(rpc_urls)
         
@@ -93,17 +212,15 @@ class RPCProvider:
         self.stats: dict[str, RPCStats] = {
             url: RPCStats(url=url) for url in self.rpc_urls
         }
+        
+        # Request budget per endpoint (None: unlimited)
+        self.limiters: dict[str, EndpointLimiter] = {
+            url: EndpointLimiter(rate_limit) for url in self.rpc_urls
+        } if rate_limit else {}
     
     def _resolve_urls(self, urls: list[str]) -> list[str]:
         """Resolve environment variables in URLs."""
-        api_key = os.getenv("ALCHEMY_API_KEY", "")
-        resolved = []
-        for url in urls:
-            resolved_url = url.replace("${ALCHEMY_API_KEY}", api_key)
-            # Only include if API key present or not needed
-            if api_key or "alchemy" not in resolved_url.lower():
-                resolved.append(resolved_url)
-        return resolved
+        return resolve_urls(urls)
     
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
@@ -125,13 +242,111 @@ class RPCProvider:
         self._request_id += 1
         return self._request_id
     
+    # =========================================================================
+    # RESULT CACHE
+    # =========================================================================
+    
+    @staticmethod
+    def _cache_key(method: str, params: list | None) -> str:
+        return json.dumps([method, params or []], sort_keys=True, separators=(",", ":"))
+    
+    @staticmethod
+    def _is_cacheable(method: str, params: list | None) -> bool:
+        """Pinned to a block number (not latest/pending), so the result cannot change."""
+        if method not in CACHEABLE_METHODS or not params:
+            return False
+        block = params[-1]
+        return isinstance(block, str) and block.startswith("0x")
+    
+    def _cache_get(self, key: str) -> tuple[bool, Any]:
+        if key not in self._cache:
+            return False, None
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        return True, self._cache[key]
+    
+    def _cache_put(self, key: str, result: Any) -> None:
+        if not self.cache_size:
+            return
+        self._cache[key] = result
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop cached results (BlockPinner calls this on a reorg)."""
+        self._cache.clear()
+    
+    def get_cache_stats(self) -> dict:
+        return {
+            "size": len(self._cache),
+            "hits": self.cache_hits,
+            "coalesced": self.coalesced_requests,
+        }
+    
+    # =========================================================================
+    # CALLS
+    # =========================================================================
+    
     async def call(
         self,
         method: str,
         params: list | None = None,
     ) -> RPCResponse:
         """
-        Make an RPC call with failover.
+        Make an RPC call, served from cache or shared with an identical call.
+        
+        Calls pinned to a block number are answered from the LRU cache once
+        seen. An identical call already in flight is awaited instead of
+        sent again.
+        
+        Args:
+            method: RPC method name
+            params: Method parameters
+            
+        Returns:
+            RPCResponse with result and metadata (endpoint_used "cache" on a hit);
+            a reverted eth_call is the node's answer: result None, error set
+            
+        Raises:
+            InfraError: If all endpoints fail
+        """
+        key = self._cache_key(method, params)
+        cacheable = self._is_cacheable(method, params)
+        if cacheable:
+            hit, result = self._cache_get(key)
+            if hit:
+                return RPCResponse(result=result, latency_ms=0, endpoint_used=CACHE_ENDPOINT)
+        
+        task = self._calls_in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._call_uncached(method, params))
+            self._calls_in_flight[key] = task
+            task.add_done_callback(lambda t: self._call_done(key, t, cacheable))
+        else:
+            self.coalesced_requests += 1
+        
+        # A cancelled caller must not cancel the call for the others
+        return await asyncio.shield(task)
+    
+    def _call_done(self, key: str, task: asyncio.Task, cacheable: bool) -> None:
+        self._calls_in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if cacheable and task.result().error is None:
+            self._cache_put(key, task.result().result)
+    
+    async def _call_uncached(
+        self,
+        method: str,
+        params: list | None = None,
+    ) -> RPCResponse:
+        """
+        Make an RPC call with failover and hedging.
+        
+        Endpoints are tried fastest-first (see _iter_endpoints). If the
+        current endpoint has not answered within its p95 latency, the same
+        call is also sent to the next endpoint; the first answer wins.
         
         Args:
             method: RPC method name
@@ -151,10 +366,228 @@ class RPCProvider:
             )
         
         client = await self._get_client()
-        last_error: Exception | None = None
+        urls = list(self._iter_endpoints())
+        errors: list[BaseException] = []
+        
+        async def attempt(url: str) -> RPCResponse:
+            payload = {
+                "jsonrpc": "2.0",
+                "method": method,
+                "params": params or [],
+                "id": self._next_request_id(),
+            }
+            try:
+                result, latency_ms = await self._post(client, url, payload)
+            except Exception as e:
+                errors.append(e)
+                raise
+            
+            if "error" in result:
+                if _is_revert_error(result["error"]):
+                    # The endpoint answered: a revert is the same everywhere
+                    self._record_success(url, latency_ms)
+                    return RPCResponse(
+                        result=None,
+                        latency_ms=latency_ms,
+                        endpoint_used=url,
+                        error=result["error"],
+                    )
+                error_msg = result["error"].get("message", str(result["error"]))
+                self._record_failure(url, error_msg)
+                logger.debug(f"RPC error from {url}: {error_msg}")
+                error = InfraError(
+                    code=ErrorCode.INFRA_RPC_ERROR,
+                    message=f"RPC error: {error_msg}",
+                    details={"url": url, "method": method},
+                )
+                errors.append(error)
+                raise error
+            
+            self._record_success(url, latency_ms)
+            return RPCResponse(
+                result=result.get("result"),
+                latency_ms=latency_ms,
+                endpoint_used=url,
+            )
+        
+        try:
+            return await self._run_hedged(urls, attempt)
+        except Exception as last_error:
+            # All endpoints failed
+            raise InfraError(
+                code=_all_failed_code(errors),
+                message=f"All RPC endpoints failed for chain {self.chain_id}",
+                details={
+                    "chain_id": self.chain_id,
+                    "endpoints_tried": len(self.rpc_urls),
+                    "last_error": str(last_error),
+                },
+            )
+    
+    async def _post(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        payload: dict | list,
+    ) -> tuple[Any, int]:
+        """
+        POST one JSON-RPC payload; transport failures are recorded and raised.
+        
+        Waits for the endpoint's rate limit first. A rate-limit response
+        (HTTP 429 or a rate-limit JSON-RPC error) raises INFRA_RATE_LIMIT
+        and backs the endpoint off without counting as a failure.
+        
+        A hedged attempt cancelled by a faster endpoint is not counted as a
+        request; its elapsed time is kept as a latency sample (a lower bound)
+        so a slow endpoint still loses rank.
+        
+        Returns:
+            (decoded JSON body, latency_ms)
+        """
+        stats = self.stats[url]
+        limiter = self.limiters.get(url)
+        if limiter:
+            calls = payload if isinstance(payload, list) else [payload]
+            await limiter.acquire([c["method"] for c in calls])
+        
+        stats.total_requests += 1
+        start_ms = int(time.time() * 1000)
+        
+        try:
+            resp = await client.post(url, json=payload)
+            latency_ms = int(time.time() * 1000) - start_ms
+            result = None if resp.status_code == 429 else resp.json()
+        except asyncio.CancelledError:
+            stats.total_requests -= 1
+            stats.record_latency(int(time.time() * 1000) - start_ms)
+            raise
+        except httpx.TimeoutException:
+            latency_ms = int(time.time() * 1000) - start_ms
+            self._record_failure(url, f"Timeout after {latency_ms}ms")
+            logger.debug(f"RPC timeout for {url}: {latency_ms}ms")
+            raise
+        except Exception as e:
+            self._record_failure(url, str(e))
+            logger.debug(f"RPC failed for {url}: {e}")
+            raise
+        
+        if result is None or (isinstance(result, dict) and is_rate_limit_error(result.get("error"))):
+            error = "HTTP 429" if result is None else result["error"].get("message", "rate limited")
+            stats.total_requests -= 1  # Unanswered, not failed
+            self._record_rate_limited(url, error, parse_retry_after(resp.headers.get("Retry-After")))
+            raise InfraError(
+                code=ErrorCode.INFRA_RATE_LIMIT,
+                message=f"RPC rate limited: {error}",
+                details={"url": url},
+            )
+        return result, latency_ms
+    
+    def _record_success(self, url: str, latency_ms: int) -> None:
+        stats = self.stats[url]
+        stats.successful_requests += 1
+        stats.total_latency_ms += latency_ms
+        stats.last_success_ts = int(time.time() * 1000)
+        stats.record_latency(latency_ms)
+        if url in self.limiters:
+            self.limiters[url].on_success()
+    
+    def _record_failure(self, url: str, error: str) -> None:
+        stats = self.stats[url]
+        stats.failed_requests += 1
+        stats.last_error = error
+        self._check_quarantine(stats)
+    
+    def _record_rate_limited(self, url: str, error: str, retry_after_s: float | None = None) -> None:
+        """Back off the endpoint; a 429 says nothing about its health (no quarantine)."""
+        stats = self.stats[url]
+        stats.rate_limited += 1
+        stats.last_error = error
+        if url in self.limiters:
+            self.limiters[url].on_rate_limited(retry_after_s)
+        logger.debug(f"RPC rate limited by {url}: {error}")
+    
+    async def _run_hedged(
+        self,
+        urls: list[str],
+        attempt: Callable[[str], Awaitable[T]],
+    ) -> T:
+        """
+        Run attempt(url) over urls with failover and hedging.
+        
+        urls is consumed from the front as endpoints are started, so a
+        caller can continue with the remaining ones. While one attempt is
+        in flight and the endpoint has a p95, a second attempt starts on
+        the next endpoint after that p95 (at most max_hedges extra). A
+        failure starts the next endpoint immediately. The first success
+        wins; other attempts are cancelled.
+        
+        Raises:
+            The last attempt's exception if every endpoint failed
+        """
+        in_flight: dict[asyncio.Task, str] = {}
+        hedged_urls: set[str] = set()
+        last_error: BaseException | None = None
+        
+        def start_next() -> str:
+            url = urls.pop(0)
+            in_flight[asyncio.ensure_future(attempt(url))] = url
+            return url
+        
+        try:
+            while in_flight or urls:
+                if not in_flight:
+                    start_next()
+                    continue
+                
+                # Hedge deadline: p95 of the newest attempt's endpoint
+                delay_s = None
+                if self.hedge and urls and len(hedged_urls) < self.max_hedges:
+                    p95 = self.stats[list(in_flight.values())[-1]].p95_latency_ms
+                    if p95 is not None:
+                        delay_s = p95 / 1000
+                
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=delay_s, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    self.hedged_requests += 1
+                    hedged_urls.add(start_next())
+                    logger.debug(f"Hedged slow RPC to {list(hedged_urls)[-1]}")
+                    continue
+                
+                for task in done:
+                    url = in_flight.pop(task)
+                    if task.exception() is None:
+                        if url in hedged_urls:
+                            self.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+        
+        raise last_error if last_error else InfraError(
+            code=ErrorCode.INFRA_RPC_ERROR,
+            message="No RPC endpoint available",
+            details={"chain_id": self.chain_id},
+        )
+    
+    def _iter_endpoints(self):
+        """
+        Yield endpoints fastest-first, skipping quarantined ones.
+        
+        Measured endpoints are ranked by p50 latency weighted by success
+        rate (a 50% endpoint counts as twice as slow); endpoints without
+        MIN_LATENCY_SAMPLES follow in config order. Endpoints backing off
+        after a rate limit go last. With no measurements this is plain
+        config-order failover.
+        """
         current_ts = int(time.time() * 1000)
         
-        for url in self.rpc_urls:
+        available = []
+        for index, url in enumerate(self.rpc_urls):
             stats = self.stats[url]
             
             # Check quarantine status
@@ -169,71 +602,218 @@ class RPCProvider:
                     stats.quarantine_until_ts = None
                     logger.info(f"Endpoint released from quarantine: {url}")
             
-            stats.total_requests += 1
+            limiter = self.limiters.get(url)
+            blocked = limiter is not None and limiter.blocked
+            p50 = stats.p50_latency_ms
+            if p50 is None:
+                available.append((blocked, 1, 0.0, index, url))
+            else:
+                rate = stats.success_rate if stats.total_requests else 1.0
+                available.append((blocked, 0, p50 / max(rate, 0.05), index, url))
+        
+        for *_, url in sorted(available):
+            yield url
+    
+    async def call_batch(
+        self,
+        calls: list[tuple[str, list | None]],
+    ) -> list[RPCBatchItem]:
+        """
+        Make many RPC calls as JSON-RPC batch requests with failover.
+        
+        Calls are split into batches of at most max_batch_size and sent
+        concurrently. Responses are matched back by id, so the returned list
+        is in the same order as calls. A per-call JSON-RPC error (e.g. an
+        eth_call revert) is returned on its item and does not count against
+        the endpoint; a failed POST does, and its batch moves to the next
+        endpoint.
+        
+        Calls pinned to a block number are answered from the cache when
+        possible. Duplicates within the batch, and calls identical to one
+        in flight from another call_batch, are sent once and shared.
+        
+        Args:
+            calls: (method, params) pairs
             
-            payload = {
-                "jsonrpc": "2.0",
-                "method": method,
-                "params": params or [],
-                "id": self._next_request_id(),
-            }
+        Returns:
+            One RPCBatchItem per call, in call order
             
-            start_ms = int(time.time() * 1000)
+        Raises:
+            InfraError: If all endpoints fail for any batch
+        """
+        if not calls:
+            return []
+        
+        if not self.rpc_urls:
+            raise InfraError(
+                code=ErrorCode.INFRA_RPC_ERROR,
+                message="No RPC endpoints configured",
+                details={"chain_id": self.chain_id},
+            )
+        
+        items: list[RPCBatchItem | None] = [None] * len(calls)
+        waiting: list[tuple[int, asyncio.Future]] = []
+        owned: dict[str, asyncio.Future] = {}  # In flight on our batches
+        to_send: list[tuple[str, list | None]] = []
+        
+        for i, (method, params) in enumerate(calls):
+            key = self._cache_key(method, params)
+            if self._is_cacheable(method, params):
+                hit, result = self._cache_get(key)
+                if hit:
+                    items[i] = RPCBatchItem(result, None, 0, CACHE_ENDPOINT)
+                    continue
             
+            future = self._batch_calls_in_flight.get(key)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._batch_calls_in_flight[key] = owned[key] = future
+                to_send.append((method, params))
+            else:
+                self.coalesced_requests += 1
+            waiting.append((i, future))
+        
+        try:
+            chunks = [
+                to_send[i:i + self.max_batch_size]
+                for i in range(0, len(to_send), self.max_batch_size)
+            ]
+            chunk_items = await asyncio.gather(*(self._send_batch(c) for c in chunks))
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                # Our cancellation is not the other waiters': they resend
+                e = _AbandonedCall(
+                    code=ErrorCode.INFRA_RPC_ERROR,
+                    message="Coalesced RPC call abandoned by a cancelled batch",
+                    details={"chain_id": self.chain_id},
+                )
+            for key, future in owned.items():
+                self._batch_calls_in_flight.pop(key, None)
+                future.set_exception(e)
+                future.exception()  # Retrieved: only other waiters re-raise it
+            raise
+        
+        sent_items = [item for items in chunk_items for item in items]
+        for (method, params), item in zip(to_send, sent_items):
+            key = self._cache_key(method, params)
+            self._batch_calls_in_flight.pop(key, None)
+            if item.ok and self._is_cacheable(method, params):
+                self._cache_put(key, item.result)
+            owned[key].set_result(item)
+        
+        abandoned: list[int] = []
+        for i, future in waiting:
             try:
-                resp = await client.post(url, json=payload)
-                latency_ms = int(time.time() * 1000) - start_ms
-                
-                result = resp.json()
-                
-                if "error" in result:
-                    error_msg = result["error"].get("message", str(result["error"]))
-                    stats.failed_requests += 1
-                    stats.last_error = error_msg
-                    self._check_quarantine(stats)
-                    last_error = InfraError(
-                        code=ErrorCode.INFRA_RPC_ERROR,
-                        message=f"RPC error: {error_msg}",
-                        details={"url": url, "method": method},
-                    )
-                    logger.debug(f"RPC error from {url}: {error_msg}")
+                items[i] = await asyncio.shield(future)
+            except _AbandonedCall:
+                abandoned.append(i)
+        if abandoned:
+            resent = await self.call_batch([calls[i] for i in abandoned])
+            for i, item in zip(abandoned, resent):
+                items[i] = item
+        return items
+    
+    async def _send_batch(
+        self,
+        calls: list[tuple[str, list | None]],
+    ) -> list[RPCBatchItem]:
+        """
+        Send one batch, failing over per endpoint until every id is answered.
+        
+        Each round is hedged like call(); ids a winning endpoint did not
+        answer are resent to the remaining endpoints.
+        """
+        client = await self._get_client()
+        last_error: BaseException | None = None
+        errors: list[BaseException] = []
+        
+        request_ids = [self._next_request_id() for _ in calls]
+        index_by_id = {request_id: i for i, request_id in enumerate(request_ids)}
+        items: list[RPCBatchItem | None] = [None] * len(calls)
+        urls = list(self._iter_endpoints())
+        
+        async def attempt(url: str, payload: list[dict]) -> tuple[list, int, str]:
+            try:
+                result, latency_ms = await self._post(client, url, payload)
+            except Exception as e:
+                errors.append(e)
+                raise
+            
+            if not isinstance(result, list):
+                # Whole batch rejected (batching unsupported, too large, ...)
+                error = result.get("error", result) if isinstance(result, dict) else result
+                error_msg = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                self._record_failure(url, error_msg)
+                logger.debug(f"RPC batch error from {url}: {error_msg}")
+                raise InfraError(
+                    code=ErrorCode.INFRA_RPC_ERROR,
+                    message=f"RPC batch error: {error_msg}",
+                    details={"url": url, "batch_size": len(payload)},
+                )
+            
+            self._record_success(url, latency_ms)
+            return result, latency_ms, url
+        
+        while urls:
+            # Only resend calls the previous endpoint did not answer
+            payload = [
+                {
+                    "jsonrpc": "2.0",
+                    "method": calls[i][0],
+                    "params": calls[i][1] or [],
+                    "id": request_ids[i],
+                }
+                for i, item in enumerate(items)
+                if item is None
+            ]
+            
+            try:
+                result, latency_ms, url = await self._run_hedged(
+                    urls, lambda url: attempt(url, payload)
+                )
+            except Exception as e:
+                last_error = e
+                break
+            
+            rate_limited = False
+            for entry in result:
+                index = index_by_id.get(entry.get("id"))
+                if index is None or items[index] is not None:
                     continue
-                
-                # Success
-                stats.successful_requests += 1
-                stats.total_latency_ms += latency_ms
-                stats.last_success_ts = int(time.time() * 1000)
-                
-                return RPCResponse(
-                    result=result.get("result"),
+                if is_rate_limit_error(entry.get("error")):
+                    # Not an answer: resend to the next endpoint
+                    rate_limited = True
+                    continue
+                items[index] = RPCBatchItem(
+                    result=entry.get("result"),
+                    error=entry.get("error"),
                     latency_ms=latency_ms,
                     endpoint_used=url,
                 )
-                
-            except httpx.TimeoutException as e:
-                latency_ms = int(time.time() * 1000) - start_ms
-                stats.failed_requests += 1
-                stats.last_error = f"Timeout after {latency_ms}ms"
-                self._check_quarantine(stats)
-                last_error = e
-                logger.debug(f"RPC timeout for {url}: {latency_ms}ms")
-                continue
-                
-            except Exception as e:
-                stats.failed_requests += 1
-                stats.last_error = str(e)
-                self._check_quarantine(stats)
-                last_error = e
-                logger.debug(f"RPC failed for {url}: {e}")
-                continue
+            
+            if rate_limited:
+                self._record_rate_limited(url, "rate limited calls in batch")
+            
+            if all(item is not None for item in items):
+                return items
+            
+            last_error = InfraError(
+                code=ErrorCode.INFRA_RATE_LIMIT if rate_limited else ErrorCode.INFRA_RPC_ERROR,
+                message="RPC batch calls rate limited" if rate_limited else "RPC batch response missing ids",
+                details={"url": url, "missing": sum(item is None for item in items)},
+            )
+            errors.append(last_error)
+            logger.debug(f"RPC batch from {url} missing ids, retrying remainder")
         
         # All endpoints failed
         raise InfraError(
-            code=ErrorCode.INFRA_RPC_ERROR,
-            message=f"All RPC endpoints failed for chain {self.chain_id}",
+            code=_all_failed_code(errors),
+            message=f"All RPC endpoints failed for batch on chain {self.chain_id}",
             details={
                 "chain_id": self.chain_id,
                 "endpoints_tried": len(self.rpc_urls),
+                "batch_size": len(calls),
+                "unanswered": sum(item is None for item in items),
                 "last_error": str(last_error),
             },
         )
@@ -290,6 +870,52 @@ class RPCProvider:
             [{"to": to, "data": data}, block],
         )
     
+    async def eth_call_batch(
+        self,
+        calls: list[tuple[str, str]],
+        block: str = "latest",
+    ) -> list[RPCBatchItem]:
+        """
+        Make many eth_calls at one block via JSON-RPC batching.
+        
+        Args:
+            calls: (to, data) pairs
+            block: Block number or "latest"
+            
+        Returns:
+            One RPCBatchItem per call, in call order
+        """
+        return await self.call_batch([
+            ("eth_call", [{"to": to, "data": data}, block])
+            for to, data in calls
+        ])
+    
+    async def get_logs(
+        self,
+        addresses: list[str],
+        topics: list,
+        from_block: int,
+        to_block: int,
+    ) -> RPCResponse:
+        """
+        Fetch logs for a block range (eth_getLogs).
+        
+        Args:
+            addresses: Contract addresses to filter on
+            topics: Topic filter (e.g. [[topic_a, topic_b]] for "a OR b")
+            from_block: First block (inclusive)
+            to_block: Last block (inclusive)
+            
+        Returns:
+            RPCResponse with the list of log objects
+        """
+        return await self.call("eth_getLogs", [{
+            "address": addresses,
+            "topics": topics,
+            "fromBlock": hex(from_block),
+            "toBlock": hex(to_block),
+        }])
+    
     async def get_gas_price(self) -> tuple[int, int]:
         """
         Get current gas price in wei.
@@ -308,6 +934,10 @@ class RPCProvider:
                 "total_requests": s.total_requests,
                 "success_rate": round(s.success_rate, 3),
                 "avg_latency_ms": s.avg_latency_ms,
+                "p50_latency_ms": s.p50_latency_ms,
+                "p95_latency_ms": s.p95_latency_ms,
+                "p99_latency_ms": s.p99_latency_ms,
+                "rate_limited": s.rate_limited,
                 "last_error": s.last_error,
                 "quarantined": s.quarantined,
             }
@@ -330,6 +960,8 @@ class ProviderRegistry:
         chain_id: int,
         rpc_urls: list[str],
         timeout_seconds: int = 10,
+        max_batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+        rate_limit: RateLimitConfig | None = None,
     ) -> RPCProvider:
         """
         Register a provider for a chain.
@@ -341,7 +973,9 @@ class ProviderRegistry:
             # Return existing provider to preserve stats
             return self._providers[chain_id]
         
-        provider = RPCProvider(chain_id, rpc_urls, timeout_seconds)
+        provider = RPCProvider(
+            chain_id, rpc_urls, timeout_seconds, max_batch_size, rate_limit=rate_limit
+        )
         self._providers[chain_id] = provider
         return provider
     
@@ -374,9 +1008,20 @@ def register_provider(
     chain_id: int,
     rpc_urls: list[str],
     timeout_seconds: int = 10,
+    max_batch_size: int = DEFAULT_RPC_BATCH_SIZE,
+    rate_limit: RateLimitConfig | None = None,
 ) -> RPCProvider:
     """Register provider in global registry."""
-    return _registry.register(chain_id, rpc_urls, timeout_seconds)
+    return _registry.register(chain_id, rpc_urls, timeout_seconds, max_batch_size, rate_limit)
+
+
+def register_chain_provider(chain_config: dict) -> RPCProvider:
+    """Register the provider for a chains.yaml entry (rpc_urls, rate_limit)."""
+    return register_provider(
+        chain_config.get("chain_id"),
+        chain_config.get("rpc_urls", []),
+        rate_limit=RateLimitConfig.from_config(chain_config.get("rate_limit")),
+    )
 
 
 async def close_all_providers() -> None:
@@ -0,0 +1,213 @@
+"""
+chains/rate_limit.py - Per-endpoint request budgets for RPC providers.
+
+Each endpoint gets a token bucket (a second one when a compute-unit budget
+is configured). A request waits until its cost is available, so concurrent
+quoting is paced instead of tripping HTTP 429.
+
+Costs:
+- requests_per_second: every JSON-RPC call costs 1 (a batch costs its size)
+- compute_units_per_second: every call costs its method weight
+  (DEFAULT_METHOD_COMPUTE_UNITS, overridable per chain)
+
+Adaptive backoff (AIMD): a rate-limit response halves the bucket rate and
+pauses the endpoint for Retry-After (or one refill interval); every
+success then adds back RATE_RECOVERY_FRACTION of the configured rate.
+
+Config (config/chains.yaml, per chain, applied to each endpoint):
+
+    rate_limit:
+      requests_per_second: 25
+      compute_units_per_second: 330
+      burst_seconds: 1
+      method_weights:
+        eth_getLogs: 75
+
+A chain without a rate_limit section gets DEFAULT_REQUESTS_PER_SECOND per
+endpoint; `enabled: false` turns the budget off (e.g. a local node).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from core.constants import DEFAULT_REQUESTS_PER_SECOND
+
+# Compute units per method (Alchemy's published weights); unknown methods
+# cost DEFAULT_COMPUTE_UNITS
+DEFAULT_METHOD_COMPUTE_UNITS: dict[str, int] = {
+    "eth_chainId": 0,
+    "eth_blockNumber": 10,
+    "eth_gasPrice": 20,
+    "eth_call": 26,
+    "eth_getLogs": 75,
+}
+DEFAULT_COMPUTE_UNITS = 26
+
+# Adaptive backoff
+MIN_RATE_FRACTION = 0.1  # Never throttle below 10% of the configured rate
+RATE_RECOVERY_FRACTION = 0.02  # Rate regained per success, of the configured rate
+MAX_RETRY_AFTER_SECONDS = 30  # Cap on a server-sent Retry-After
+
+# JSON-RPC error codes providers use for "slow down" (-32005 is left out:
+# Infura also uses it for oversized eth_getLogs results)
+RATE_LIMIT_ERROR_CODES = frozenset({429})
+RATE_LIMIT_MESSAGES = ("rate limit", "too many requests", "compute units per second", "throughput limit")
+
+
+@dataclass
+class RateLimitConfig:
+    """Per-endpoint request budget."""
+    requests_per_second: float | None = DEFAULT_REQUESTS_PER_SECOND
+    compute_units_per_second: float | None = None
+    burst_seconds: float = 1.0
+    method_weights: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, section: dict | None) -> "RateLimitConfig | None":
+        """
+        Build from a chains.yaml rate_limit section.
+
+        A missing section gives the default budget; None is returned
+        (unlimited) only for `enabled: false`.
+        """
+        section = section or {}
+        if not section.get("enabled", True):
+            return None
+        return cls(
+            requests_per_second=section.get("requests_per_second", DEFAULT_REQUESTS_PER_SECOND),
+            compute_units_per_second=section.get("compute_units_per_second"),
+            burst_seconds=section.get("burst_seconds", 1.0),
+            method_weights=dict(section.get("method_weights") or {}),
+        )
+
+    def compute_units(self, method: str) -> int:
+        """Compute-unit weight of one call."""
+        if method in self.method_weights:
+            return self.method_weights[method]
+        return DEFAULT_METHOD_COMPUTE_UNITS.get(method, DEFAULT_COMPUTE_UNITS)
+
+
+class TokenBucket:
+    """
+    Async token bucket with AIMD rate adaptation.
+
+    Waiters are served in arrival order (the lock is held while sleeping).
+    A cost above capacity is clamped, so one large batch cannot block forever.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.max_rate = rate
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.tokens = self.capacity
+        self.blocked_until = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, cost: float = 1) -> float:
+        """
+        Wait until cost tokens are available and take them.
+
+        Returns:
+            Seconds spent waiting
+        """
+        cost = min(cost, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= cost:
+                        self.tokens -= cost
+                        return waited
+                    wait = (cost - self.tokens) / self.rate
+                await asyncio.sleep(wait)
+                waited += wait
+
+    def on_success(self) -> None:
+        """Additive recovery toward the configured rate."""
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVERY_FRACTION)
+
+    def on_rate_limited(self, retry_after_s: float | None = None) -> None:
+        """Multiplicative decrease; pause for retry_after_s or one refill interval."""
+        now = time.monotonic()
+        self._refill(now)
+        self.rate = max(self.max_rate * MIN_RATE_FRACTION, self.rate / 2)
+        self.tokens = 0.0
+        pause = retry_after_s if retry_after_s is not None else self.capacity / self.rate
+        self.blocked_until = max(self.blocked_until, now + min(pause, MAX_RETRY_AFTER_SECONDS))
+
+
+class EndpointLimiter:
+    """Request and compute-unit buckets for one endpoint."""
+
+    def __init__(self, config: RateLimitConfig):
+        self.config = config
+        self.buckets: list[tuple[str, TokenBucket]] = []
+        if config.requests_per_second:
+            rps = config.requests_per_second
+            self.buckets.append(("requests", TokenBucket(rps, rps * config.burst_seconds)))
+        if config.compute_units_per_second:
+            cups = config.compute_units_per_second
+            self.buckets.append(("compute_units", TokenBucket(cups, cups * config.burst_seconds)))
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+
+    def cost(self, methods: list[str]) -> dict[str, int]:
+        """Cost of a request (one call or a batch) per bucket kind."""
+        return {
+            "requests": len(methods),
+            "compute_units": sum(self.config.compute_units(m) for m in methods),
+        }
+
+    async def acquire(self, methods: list[str]) -> float:
+        """Wait for budget for these calls; returns seconds waited."""
+        cost = self.cost(methods)
+        waited = 0.0
+        for kind, bucket in self.buckets:
+            waited += await bucket.acquire(cost[kind])
+        self.wait_seconds += waited
+        return waited
+
+    @property
+    def blocked(self) -> bool:
+        """True while a rate-limit pause is in effect."""
+        now = time.monotonic()
+        return any(bucket.blocked_until > now for _, bucket in self.buckets)
+
+    def on_success(self) -> None:
+        for _, bucket in self.buckets:
+            bucket.on_success()
+
+    def on_rate_limited(self, retry_after_s: float | None = None) -> None:
+        self.rate_limited += 1
+        for _, bucket in self.buckets:
+            bucket.on_rate_limited(retry_after_s)
+
+
+def is_rate_limit_error(error: object) -> bool:
+    """True for a JSON-RPC error object that means "slow down"."""
+    if not isinstance(error, dict):
+        return False
+    if error.get("code") in RATE_LIMIT_ERROR_CODES:
+        return True
+    message = str(error.get("message", "")).lower()
+    return any(marker in message for marker in RATE_LIMIT_MESSAGES)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After header in seconds (HTTP-date form is ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
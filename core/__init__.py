@@ -7,6 +7,8 @@ This package contains:
 - exceptions.py: Typed exceptions with error codes
 - math.py: Safe mathematical utilities (no float)
 - time.py: Freshness rules and block pinning
+- timing.py: Per-stage pipeline timers
+- snapshot.py: Compact binary scan snapshots (JSON export)
 - logging.py: Structured JSON logging
 """
 
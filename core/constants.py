@@ -121,6 +121,12 @@ DEFAULT_MIN_CONFIDENCE = Decimal("0.5")
 # Gas
 DEFAULT_GAS_BUFFER_PERCENT = 20  # Add 20% to estimated gas
 
+# Trade sizing
+DEFAULT_QUOTE_SIZES_USD = (50, 100, 200, 400)  # Quote ladder, USD
+DEFAULT_SIZE_SEARCH_MAX_PROBES = 12  # Golden-section probes per candidate
+DEFAULT_SIZE_SEARCH_TOLERANCE_BPS = 200  # Stop when the bracket is < 2% of size
+DEFAULT_LADDER_REPRICE_BPS = 500  # Rebuild a token's quote ladder after a 5% USD move
+
 
 # =============================================================================
 # INFRASTRUCTURE DEFAULTS
@@ -129,6 +135,20 @@ DEFAULT_GAS_BUFFER_PERCENT = 20  # Add 20% to estimated gas
 DEFAULT_RPC_TIMEOUT_SECONDS = 10
 DEFAULT_MAX_RETRIES = 3
 DEFAULT_RETRY_DELAY_SECONDS = 1
+DEFAULT_RPC_BATCH_SIZE = 50  # Max calls per JSON-RPC batch POST
+DEFAULT_RPC_CACHE_SIZE = 4096  # Pinned-block eth_call results kept (LRU)
 
 # Rate limiting
 DEFAULT_REQUESTS_PER_SECOND = 10
+
+# Scanning
+DEFAULT_MAX_CONCURRENT_QUOTES = 10  # In-flight quote calls per chain
+
+# Pool state cache
+DEFAULT_LOG_BLOCK_RANGE = 500  # Max blocks per eth_getLogs request
+DEFAULT_REORG_DEPTH = 64  # Blocks of undo journal kept for rollback
+DEFAULT_BITMAP_WORD_RADIUS = 2  # Tick bitmap words cached either side of the price
+
+# Pool index (existence / liquidity probes)
+DEFAULT_POOL_INDEX_TTL_SECONDS = 6 * 3600  # Re-probe cached candidates after 6h
+DEFAULT_POOL_DEAD_AFTER_FAILURES = 20  # Cycles in a row a pool's quotes all revert -> DEAD
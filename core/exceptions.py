@@ -37,6 +37,7 @@ class ErrorCode(str, Enum):
     POOL_DEAD = "POOL_DEAD"
     POOL_SUSPICIOUS = "POOL_SUSPICIOUS"
     POOL_UNSUPPORTED_FEE = "POOL_UNSUPPORTED_FEE"
+    POOL_STATE_INCOMPLETE = "POOL_STATE_INCOMPLETE"  # Cached state doesn't cover the swap
     
     # Slippage / Impact
     SLIPPAGE_TOO_HIGH = "SLIPPAGE_TOO_HIGH"
@@ -7,17 +7,63 @@ All logs include:
 - module
 - message
 - context (chain_id, block_number, latency_ms, etc.)
+
+Pipeline (setup_logging):
+    caller -> SamplingFilter -> QueueHandler -> queue -> writer thread
+           -> JSONFormatter -> stdout / file
+
+Callers only resolve the message and enqueue the record; JSON serialization
+and I/O happen on a background thread, so logging never blocks the event
+loop. If the queue is full, records are dropped (and counted), not waited on.
+
+SamplingFilter thins hot-path loggers (per-quote, per-RPC, per-trade
+messages): keep 1 in N DEBUG/INFO records, cap records per second below
+ERROR. ERROR and CRITICAL always pass.
 """
 
+import atexit
 import json
 import logging
+import logging.handlers
+import queue
 import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
 
+try:
+    import orjson  # Optional (pip install arby[fast]): ~5x faster than json
+except ImportError:
+    orjson = None
+
 # Global context that gets added to all log entries
 _global_context: dict[str, Any] = {}
 
+# Records buffered between callers and the writer thread
+DEFAULT_LOG_QUEUE_SIZE = 10_000
+
+# Loggers that log per quote / RPC call / paper trade
+HOT_PATH_LOGGERS = ("dex.adapters", "chains.providers", "strategy.paper_trading")
+DEFAULT_LOG_SAMPLE_EVERY = 100
+DEFAULT_HOT_PATH_MAX_PER_SECOND = 50.0
+
+# Reused encoder: json.dumps(default=...) builds a new one per call
+_JSON_ENCODER = json.JSONEncoder(default=str)
+
+# Active queue listener (writer thread), if any
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _dumps(entry: dict) -> str:
+    """Serialize a log entry (orjson when installed, else stdlib json)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # e.g. wei amounts beyond 64 bits
+    return _JSON_ENCODER.encode(entry)
+
 
 class JSONFormatter(logging.Formatter):
     """
@@ -39,7 +85,8 @@ class JSONFormatter(logging.Formatter):
     
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            # Record creation time, not write time (writes are deferred)
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -58,11 +105,111 @@ class JSONFormatter(logging.Formatter):
         # Add exception info if present
         if record.exc_info:
             context["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            context["exception"] = record.exc_text  # Pre-formatted by the queue handler
         
         if context:
             log_entry["context"] = context
         
-        return json.dumps(log_entry, default=str)
+        return _dumps(log_entry)
+
+
+@dataclass
+class LogSampling:
+    """Sampling rule for one logger (and its children)."""
+    every: int = 1  # Keep 1 in N DEBUG/INFO records
+    max_per_second: float | None = None  # Cap on records below ERROR
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Per-logger sampling and rate limiting.
+    
+    Rules match by logger-name prefix ("dex.adapters" covers
+    "dex.adapters.uniswap_v3"); the longest prefix wins. ERROR and above
+    always pass. Dropped records are counted per logger in `dropped`.
+    """
+    
+    def __init__(self, rules: dict[str, LogSampling]):
+        super().__init__()
+        self.rules = rules
+        self.dropped: dict[str, int] = {}
+        self._rule_by_name: dict[str, LogSampling | None] = {}
+        self._seen: dict[str, int] = {}
+        self._windows: dict[str, tuple[float, int]] = {}  # name -> (window start, count)
+    
+    def _rule(self, name: str) -> LogSampling | None:
+        if name not in self._rule_by_name:
+            matches = [
+                prefix for prefix in self.rules
+                if name == prefix or name.startswith(prefix + ".")
+            ]
+            self._rule_by_name[name] = self.rules[max(matches, key=len)] if matches else None
+        return self._rule_by_name[name]
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        rule = self._rule(record.name)
+        if rule is None:
+            return True
+        
+        name = record.name
+        if rule.every > 1 and record.levelno < logging.WARNING:
+            seen = self._seen.get(name, 0)
+            self._seen[name] = seen + 1
+            if seen % rule.every:
+                return self._drop(name)
+        
+        if rule.max_per_second is not None:
+            now = time.monotonic()
+            window_start, count = self._windows.get(name, (now, 0))
+            if now - window_start >= 1.0:
+                window_start, count = now, 0
+            if count >= rule.max_per_second:
+                return self._drop(name)
+            self._windows[name] = (window_start, count + 1)
+        
+        return True
+    
+    def _drop(self, name: str) -> bool:
+        self.dropped[name] = self.dropped.get(name, 0) + 1
+        return False
+
+
+def hot_path_sampling(
+    every: int = DEFAULT_LOG_SAMPLE_EVERY,
+    max_per_second: float | None = DEFAULT_HOT_PATH_MAX_PER_SECOND,
+) -> dict[str, LogSampling]:
+    """Sampling rules for HOT_PATH_LOGGERS."""
+    return {name: LogSampling(every=every, max_per_second=max_per_second) for name in HOT_PATH_LOGGERS}
+
+
+class LogQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves formatting to the writer thread.
+    
+    Only the message and traceback are resolved on the caller's thread;
+    a full queue drops the record (counted in `dropped`) instead of blocking.
+    """
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
 
 
 class ContextAdapter(logging.LoggerAdapter):
@@ -121,6 +268,9 @@ def setup_logging(
     level: str = "INFO",
     json_output: bool = True,
     log_file: str | None = None,
+    use_queue: bool = True,
+    sampling: dict[str, LogSampling] | None = None,
+    queue_size: int = DEFAULT_LOG_QUEUE_SIZE,
 ) -> None:
     """
     Setup logging configuration.
@@ -129,11 +279,15 @@ def setup_logging(
         level: Log level (DEBUG, INFO, WARNING, ERROR)
         json_output: Use JSON formatting (recommended for production)
         log_file: Optional file path for logging
+        use_queue: Format and write on a background thread
+        sampling: Per-logger sampling rules (e.g. hot_path_sampling())
+        queue_size: Records buffered before new ones are dropped
     """
     root_logger = logging.getLogger()
     root_logger.setLevel(getattr(logging, level.upper()))
     
-    # Clear existing handlers
+    # Clear existing handlers (flushing a previous writer thread)
+    shutdown_logging()
     root_logger.handlers.clear()
     
     # Create formatter
@@ -148,13 +302,26 @@ def setup_logging(
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers: list[logging.Handler] = [console_handler]
     
     # File handler (optional)
     if log_file:
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if use_queue:
+        global _listener
+        log_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        queue_handler = LogQueueHandler(log_queue)
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        handlers = [queue_handler]
+    
+    for handler in handlers:
+        if sampling:
+            handler.addFilter(SamplingFilter(sampling))
+        root_logger.addHandler(handler)
     
     # Suppress noisy loggers
     logging.getLogger("urllib3").setLevel(logging.WARNING)
@@ -162,6 +329,15 @@ def setup_logging(
     logging.getLogger("asyncio").setLevel(logging.WARNING)
 
 
+@atexit.register
+def shutdown_logging() -> None:
+    """Stop the writer thread after it drains the queue (no-op without one)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 # =============================================================================
 # CONVENIENCE FUNCTIONS
 # =============================================================================
@@ -6,6 +6,8 @@ All monetary values use int (wei) or Decimal.
 """
 
 from decimal import Decimal, ROUND_DOWN, ROUND_UP, InvalidOperation
+from fractions import Fraction
+from functools import total_ordering
 from typing import overload
 
 from core.constants import BPS_DENOMINATOR, WEI_PER_ETH, WEI_PER_GWEI
@@ -236,6 +238,139 @@ def normalize_price(
     return normalized_out / normalized_in
 
 
+# =============================================================================
+# EXACT PRICES
+# =============================================================================
+
+# 10**n for token decimals, so hot paths don't re-exponentiate per call
+_POW10 = tuple(10**n for n in range(40))
+
+
+def pow10(n: int) -> int:
+    """10**n, table lookup for the usual token decimals."""
+    return _POW10[n] if 0 <= n < len(_POW10) else 10**n
+
+
+def _div_trunc(numerator: int, denominator: int) -> int:
+    """Integer division truncated toward zero (like int(Decimal)); denominator > 0."""
+    if numerator >= 0:
+        return numerator // denominator
+    return -(-numerator // denominator)
+
+
+@total_ordering
+class Price:
+    """
+    Exact price as an integer rational num/den (den > 0).
+    
+    Same value as normalize_price() but with no Decimal context and no
+    rounding: comparisons and bps differences cross-multiply ints.
+    Unlike fractions.Fraction it is not reduced by gcd on construction,
+    which keeps creation and comparison cheap for wei-sized operands.
+    
+    Zero means "no price" (amount_in == 0 or amount_out == 0).
+    """
+    
+    __slots__ = ("num", "den")
+    
+    def __init__(self, num: int, den: int = 1):
+        if isinstance(num, float) or isinstance(den, float):
+            raise ValidationError(
+                "Float values are not allowed. Use int, str, or Decimal.",
+                {"num": num, "den": den},
+            )
+        if den <= 0:
+            raise ValidationError(f"Price denominator must be positive: {den}")
+        self.num = num
+        self.den = den
+    
+    @classmethod
+    def from_amounts(
+        cls,
+        amount_in: int,
+        amount_out: int,
+        decimals_in: int,
+        decimals_out: int,
+    ) -> "Price":
+        """amount_out per amount_in, normalized by token decimals."""
+        if amount_in == 0:
+            return cls(0)
+        return cls(amount_out * pow10(decimals_in), amount_in * pow10(decimals_out))
+    
+    @classmethod
+    def from_decimal(cls, value: "Decimal | int | str | Price") -> "Price":
+        """Exact conversion from a Decimal / int / numeric string."""
+        if isinstance(value, Price):
+            return value
+        num, den = safe_decimal(value).as_integer_ratio()
+        return cls(num, den)
+    
+    def __bool__(self) -> bool:
+        return self.num != 0
+    
+    @staticmethod
+    def _coerce(other: object) -> "Price | None":
+        if isinstance(other, Price):
+            return other
+        if isinstance(other, bool):
+            return None
+        if isinstance(other, int):
+            return Price(other)
+        if isinstance(other, Decimal):
+            return Price.from_decimal(other)
+        return None
+    
+    def __eq__(self, other: object) -> bool:
+        other = Price._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self.num * other.den == other.num * self.den
+    
+    def __lt__(self, other: "Price | Decimal | int") -> bool:
+        other = Price._coerce(other)
+        if other is None:
+            return NotImplemented
+        return self.num * other.den < other.num * self.den
+    
+    def __hash__(self) -> int:
+        # Equal prices hash equal regardless of representation (and match int/Decimal)
+        return hash(Fraction(self.num, self.den))
+    
+    def bps_diff(self, reference: "Price") -> int:
+        """
+        (self - reference) / reference * 10000, truncated toward zero.
+        
+        Returns 0 if reference is zero.
+        """
+        if reference.num == 0:
+            return 0
+        cross = self.num * reference.den - reference.num * self.den
+        return _div_trunc(cross * 10000, reference.num * self.den)
+    
+    def deviation_bps(self, reference: "Price") -> int:
+        """|self - reference| / reference * 10000 (floor)."""
+        return abs(self.bps_diff(reference))
+    
+    def spread_bps(self, other: "Price") -> int:
+        """|self - other| / min(self, other) * 10000 (floor); 0 if either is zero."""
+        if self.num == 0 or other.num == 0:
+            return 0
+        low, high = (self, other) if self < other else (other, self)
+        return high.bps_diff(low)
+    
+    def to_decimal(self) -> Decimal:
+        """Decimal value (rounded to the Decimal context) for reports."""
+        if self.num == 0:
+            return Decimal("0")
+        return Decimal(self.num) / Decimal(self.den)
+    
+    def __str__(self) -> str:
+        return str(self.to_decimal())
+    
+    def __repr__(self) -> str:
+        return f"Price({self.num}, {self.den})"
+
+
 # =============================================================================
 # ROUNDING HELPERS
 # =============================================================================
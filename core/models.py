@@ -6,6 +6,7 @@ All monetary values are in wei (int) or Decimal. NO FLOATS.
 
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import cached_property
 from decimal import Decimal
 from typing import Any
 
@@ -18,6 +19,7 @@ from core.constants import (
     TradeStatus,
 )
 from core.exceptions import ErrorCode
+from core.math import Price
 
 
 @dataclass(frozen=True)
@@ -118,20 +120,26 @@ class Quote:
         from core.time import is_quote_fresh
         return is_quote_fresh(self.timestamp_ms)
     
+    @cached_property
+    def price(self) -> Price:
+        """
+        Exact price (amount_out / amount_in), normalized by decimals.
+        Computed once per quote; gates and spreads compare these.
+        """
+        return Price.from_amounts(
+            self.amount_in,
+            self.amount_out,
+            self.token_in.decimals,
+            self.token_out.decimals,
+        )
+    
     @property
     def effective_price(self) -> Decimal:
         """
         Price as Decimal (amount_out / amount_in), normalized by decimals.
         Used for comparison only, not for PnL calculation.
         """
-        if self.amount_in == 0:
-            return Decimal("0")
-        
-        # Use explicit token decimals
-        normalized_in = Decimal(self.amount_in) / Decimal(10**self.token_in.decimals)
-        normalized_out = Decimal(self.amount_out) / Decimal(10**self.token_out.decimals)
-        
-        return normalized_out / normalized_in
+        return self.price.to_decimal()
 
 
 @dataclass
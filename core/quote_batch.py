@@ -0,0 +1,385 @@
+"""
+core/quote_batch.py - Columnar storage for one cycle's quotes.
+
+A scan cycle quotes thousands of pool x size combinations. Keeping each one
+as a Quote dataclass (plus a stringly-typed copy for the snapshot) costs a
+__dict__ per quote and a lot of short-lived garbage. QuoteBatch stores the
+cycle's quotes in parallel lists instead:
+
+- Pool and Token instances are interned once per batch; rows hold indices
+- QuoteRow is a two-slot view (batch, index) that reads like a Quote, so
+  gates and the spread engine accept it unchanged
+- to_snapshot() hands the column lists to the JSON writer as-is (no
+  per-quote dicts); from_snapshot() / records() rebuild rows or the legacy
+  per-quote dicts when a reader needs them
+
+All amounts stay int (wei). NO FLOATS.
+"""
+
+import sys
+from decimal import Decimal
+from typing import Any, Iterator
+
+from core.constants import DexType, TradeDirection
+from core.math import Price
+from core.models import Pool, Quote, Token
+
+QUOTE_BATCH_FORMAT = "columnar-v1"
+
+# Per-row columns written to the snapshot, in order
+SNAPSHOT_COLUMNS = (
+    "dex",
+    "quoter",
+    "pool",
+    "direction",
+    "token_in",
+    "token_out",
+    "amount_in",
+    "amount_out",
+    "block_number",
+    "timestamp_ms",
+    "gas_estimate",
+    "ticks_crossed",
+    "sqrt_price_x96_after",
+    "latency_ms",
+)
+
+
+class QuoteRow:
+    """
+    Read-only Quote view over one batch row.
+
+    Exposes the Quote attributes gates and the spread engine use; call
+    to_quote() for a standalone Quote.
+    """
+
+    __slots__ = ("batch", "index")
+
+    def __init__(self, batch: "QuoteBatch", index: int):
+        self.batch = batch
+        self.index = index
+
+    @property
+    def pool(self) -> Pool:
+        return self.batch.pools[self.batch.pool[self.index]]
+
+    @property
+    def direction(self) -> TradeDirection:
+        return self.batch.direction[self.index]
+
+    @property
+    def token_in(self) -> Token:
+        return self.batch.tokens[self.batch.token_in[self.index]]
+
+    @property
+    def token_out(self) -> Token:
+        return self.batch.tokens[self.batch.token_out[self.index]]
+
+    @property
+    def amount_in(self) -> int:
+        return self.batch.amount_in[self.index]
+
+    @property
+    def amount_out(self) -> int:
+        return self.batch.amount_out[self.index]
+
+    @property
+    def block_number(self) -> int:
+        return self.batch.block_number[self.index]
+
+    @property
+    def timestamp_ms(self) -> int:
+        return self.batch.timestamp_ms[self.index]
+
+    @property
+    def gas_estimate(self) -> int:
+        return self.batch.gas_estimate[self.index]
+
+    @property
+    def ticks_crossed(self) -> int | None:
+        return self.batch.ticks_crossed[self.index]
+
+    @property
+    def sqrt_price_x96_after(self) -> int | None:
+        return self.batch.sqrt_price_x96_after[self.index]
+
+    @property
+    def latency_ms(self) -> int:
+        return self.batch.latency_ms[self.index]
+
+    @property
+    def dex(self) -> str | None:
+        return self.batch.dex[self.index]
+
+    @property
+    def price(self) -> Price:
+        return self.batch.price(self.index)
+
+    @property
+    def effective_price(self) -> Decimal:
+        return self.price.to_decimal()
+
+    @property
+    def is_fresh(self) -> bool:
+        from core.time import is_quote_fresh
+        return is_quote_fresh(self.timestamp_ms)
+
+    def to_quote(self) -> Quote:
+        """Materialize a standalone Quote."""
+        return self.batch.to_quote(self.index)
+
+    def __repr__(self) -> str:
+        return f"QuoteRow({self.index}, dex={self.dex}, amount_in={self.amount_in}, amount_out={self.amount_out})"
+
+
+class QuoteBatch:
+    """
+    Parallel-list store for the quotes of one cycle.
+
+    Usage:
+        batch = QuoteBatch()
+        row = batch.append(quote, dex="uniswap_v3", quoter=quoter_address)
+        gate_price_sanity(row, anchor)        # rows read like Quotes
+        summary["quotes"] = batch.to_snapshot()
+    """
+
+    __slots__ = (
+        "tokens", "pools", "_token_index", "_pool_index",
+        "dex", "quoter", "pool", "direction", "token_in", "token_out",
+        "amount_in", "amount_out", "block_number", "timestamp_ms",
+        "gas_estimate", "ticks_crossed", "sqrt_price_x96_after", "latency_ms",
+        "anchor_price", "_prices",
+    )
+
+    def __init__(self) -> None:
+        # Interned instances (rows store indices)
+        self.tokens: list[Token] = []
+        self.pools: list[Pool] = []
+        self._token_index: dict[Token, int] = {}
+        self._pool_index: dict[Pool, int] = {}
+
+        # Row columns
+        self.dex: list[str | None] = []
+        self.quoter: list[str | None] = []
+        self.pool: list[int] = []
+        self.direction: list[TradeDirection] = []
+        self.token_in: list[int] = []
+        self.token_out: list[int] = []
+        self.amount_in: list[int] = []
+        self.amount_out: list[int] = []
+        self.block_number: list[int] = []
+        self.timestamp_ms: list[int] = []
+        self.gas_estimate: list[int] = []
+        self.ticks_crossed: list[int | None] = []
+        self.sqrt_price_x96_after: list[int | None] = []
+        self.latency_ms: list[int] = []
+        self.anchor_price: list[Price | None] = []
+        self._prices: list[Price | None] = []  # Filled on first access
+
+    def __len__(self) -> int:
+        return len(self.amount_in)
+
+    def __getitem__(self, index: int) -> QuoteRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return QuoteRow(self, index)
+
+    def __iter__(self) -> Iterator[QuoteRow]:
+        return (QuoteRow(self, i) for i in range(len(self)))
+
+    def intern_token(self, token: Token) -> int:
+        """Index of token, adding it on first sight."""
+        index = self._token_index.get(token)
+        if index is None:
+            index = self._token_index[token] = len(self.tokens)
+            self.tokens.append(token)
+        return index
+
+    def intern_pool(self, pool: Pool) -> int:
+        """Index of pool (and its tokens), adding it on first sight."""
+        index = self._pool_index.get(pool)
+        if index is None:
+            self.intern_token(pool.token0)
+            self.intern_token(pool.token1)
+            index = self._pool_index[pool] = len(self.pools)
+            self.pools.append(pool)
+        return index
+
+    def append(
+        self,
+        quote: Quote | QuoteRow,
+        dex: str | None = None,
+        quoter: str | None = None,
+        anchor_price: Price | None = None,
+    ) -> QuoteRow:
+        """
+        Copy a quote into the batch.
+
+        Args:
+            quote: Quote (or row of another batch)
+            dex: DEX key the quote was fetched for
+            quoter: Quoter contract used
+            anchor_price: Anchor the quote was sanity-checked against
+
+        Returns:
+            Row view; the original Quote can be dropped
+        """
+        self.dex.append(sys.intern(dex) if dex else None)
+        self.quoter.append(sys.intern(quoter) if quoter else None)
+        self.pool.append(self.intern_pool(quote.pool))
+        self.direction.append(quote.direction)
+        self.token_in.append(self.intern_token(quote.token_in))
+        self.token_out.append(self.intern_token(quote.token_out))
+        self.amount_in.append(quote.amount_in)
+        self.amount_out.append(quote.amount_out)
+        self.block_number.append(quote.block_number)
+        self.timestamp_ms.append(quote.timestamp_ms)
+        self.gas_estimate.append(quote.gas_estimate)
+        self.ticks_crossed.append(quote.ticks_crossed)
+        self.sqrt_price_x96_after.append(quote.sqrt_price_x96_after)
+        self.latency_ms.append(quote.latency_ms)
+        self.anchor_price.append(anchor_price)
+        # Reuse a price the gates already computed
+        if isinstance(quote, QuoteRow):
+            self._prices.append(quote.batch._prices[quote.index])
+        else:
+            self._prices.append(quote.__dict__.get("price"))
+        return QuoteRow(self, len(self.amount_in) - 1)
+
+    def price(self, index: int) -> Price:
+        """Exact price of a row (cached)."""
+        price = self._prices[index]
+        if price is None:
+            price = self._prices[index] = Price.from_amounts(
+                self.amount_in[index],
+                self.amount_out[index],
+                self.tokens[self.token_in[index]].decimals,
+                self.tokens[self.token_out[index]].decimals,
+            )
+        return price
+
+    def to_quote(self, index: int) -> Quote:
+        """Materialize row index as a Quote."""
+        return Quote(
+            pool=self.pools[self.pool[index]],
+            direction=self.direction[index],
+            token_in=self.tokens[self.token_in[index]],
+            token_out=self.tokens[self.token_out[index]],
+            amount_in=self.amount_in[index],
+            amount_out=self.amount_out[index],
+            block_number=self.block_number[index],
+            timestamp_ms=self.timestamp_ms[index],
+            gas_estimate=self.gas_estimate[index],
+            ticks_crossed=self.ticks_crossed[index],
+            sqrt_price_x96_after=self.sqrt_price_x96_after[index],
+            latency_ms=self.latency_ms[index],
+        )
+
+    # =========================================================================
+    # SNAPSHOT
+    # =========================================================================
+
+    def to_snapshot(self) -> dict[str, Any]:
+        """
+        JSON-ready columnar form.
+
+        Row columns are the batch's own lists (not copied); amounts are
+        JSON integers, exact at any size. Only the small interned tables
+        and the anchor column are converted.
+        """
+        columns: dict[str, Any] = {name: getattr(self, name) for name in SNAPSHOT_COLUMNS}
+        columns["anchor_price"] = [str(p) if p else None for p in self.anchor_price]
+        return {
+            "format": QUOTE_BATCH_FORMAT,
+            "count": len(self),
+            "tokens": [
+                {
+                    "chain_id": t.chain_id,
+                    "address": t.address,
+                    "symbol": t.symbol,
+                    "name": t.name,
+                    "decimals": t.decimals,
+                }
+                for t in self.tokens
+            ],
+            "pools": [
+                {
+                    "chain_id": p.chain_id,
+                    "dex_id": p.dex_id,
+                    "dex_type": p.dex_type.value,
+                    "pool_address": p.pool_address,
+                    "token0": self._token_index[p.token0],
+                    "token1": self._token_index[p.token1],
+                    "fee": p.fee,
+                }
+                for p in self.pools
+            ],
+            "columns": columns,
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict[str, Any]) -> "QuoteBatch":
+        """Rebuild a batch written by to_snapshot()."""
+        batch = cls()
+        for t in data["tokens"]:
+            batch.intern_token(Token(
+                chain_id=t["chain_id"],
+                address=t["address"],
+                symbol=t["symbol"],
+                name=t["name"],
+                decimals=t["decimals"],
+            ))
+        for p in data["pools"]:
+            batch.intern_pool(Pool(
+                chain_id=p["chain_id"],
+                dex_id=p["dex_id"],
+                dex_type=DexType(p["dex_type"]),
+                pool_address=p["pool_address"],
+                token0=batch.tokens[p["token0"]],
+                token1=batch.tokens[p["token1"]],
+                fee=p["fee"],
+            ))
+
+        columns = data["columns"]
+        for name in SNAPSHOT_COLUMNS:
+            setattr(batch, name, list(columns[name]))
+        # Adapters also emit pool-relative "0to1" / "1to0" strings
+        directions = {d.value: d for d in TradeDirection}
+        batch.direction = [directions.get(d, d) for d in batch.direction]
+        batch.anchor_price = [
+            Price.from_decimal(p) if p is not None else None
+            for p in columns["anchor_price"]
+        ]
+        batch._prices = [None] * len(batch.amount_in)
+        return batch
+
+    def records(self) -> list[dict[str, Any]]:
+        """Per-quote dicts in the legacy snapshot layout (for readers that need rows)."""
+        out = []
+        for i in range(len(self)):
+            pool = self.pools[self.pool[i]]
+            token_in = self.tokens[self.token_in[i]]
+            token_out = self.tokens[self.token_out[i]]
+            anchor = self.anchor_price[i]
+            sqrt_price = self.sqrt_price_x96_after[i]
+            out.append({
+                "dex": self.dex[i],
+                "pair": f"{token_in.symbol}/{token_out.symbol}",
+                "pool_address": pool.pool_address or "computed",
+                "token_in": token_in.address,
+                "token_out": token_out.address,
+                "fee": pool.fee,
+                "quoter": self.quoter[i],
+                "amount_in": str(self.amount_in[i]),
+                "amount_out": str(self.amount_out[i]),
+                "implied_price": str(self.price(i)),
+                "anchor_price": str(anchor) if anchor else None,
+                "block_number": self.block_number[i],
+                "gas_estimate": self.gas_estimate[i],
+                "ticks_crossed": self.ticks_crossed[i],
+                "sqrt_price_x96_after": str(sqrt_price) if sqrt_price else None,
+                "latency_ms": self.latency_ms[i],
+            })
+        return out
@@ -0,0 +1,515 @@
+"""
+core/snapshot.py - Compact binary scan snapshots.
+
+A JSON snapshot (indent=2) spends most of its bytes and write time on
+repeated dict keys, whitespace and integers spelled out as strings. This
+format stores the same JSON-shaped data:
+
+- File: SNAPSHOT_MAGIC, then length-prefixed records (u8 kind, u8 flags,
+  u32 length, payload). One META record (timestamp, mode, session_summary)
+  and one CYCLE record per cycle summary; payloads are zlib-compressed
+  (level 1) unless written with compress_level=0
+- Record payload: a string table (every key and string value once), then
+  one tagged value tree referencing it
+- Columns: a list of ints packs into a fixed-width array (b/h/i/q, or
+  fixed-width bytes for wei amounts past 64 bits); lists of str, float and
+  bool pack likewise; a list of dicts with identical keys (spreads, paper
+  trades) is stored as a table of such columns
+- Strings that are canonical integers ("1000000000000000000") are stored
+  as integers and read back as the same strings
+
+Decoding returns exactly what json.load of the JSON snapshot would
+(tuples as lists, non-str keys and other objects as JSON would render
+them). SnapshotReader memory-maps the file and decodes one cycle at a
+time, so readers never hold the whole session.
+
+Stdlib only. NO FLOATS are introduced: floats are only stored where the
+summary already had them.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Iterator
+
+SNAPSHOT_MAGIC = b"ARBYSNP1"
+SNAPSHOT_SUFFIX = ".arbysnap"
+
+# Record kinds
+KIND_META = 1
+KIND_CYCLE = 2
+
+_RECORD_HEADER = struct.Struct("<BBI")  # kind, flags, payload length
+FLAG_ZLIB = 1
+
+# zlib level 1: ~5x smaller payloads for ~1% of encode time
+DEFAULT_COMPRESS_LEVEL = 1
+
+# Lists shorter than this are stored item by item
+COLUMN_MIN_ROWS = 4
+
+# Value tags
+T_NONE = 0
+T_FALSE = 1
+T_TRUE = 2
+T_INT = 3
+T_FLOAT = 4
+T_STR = 5
+T_LIST = 6
+T_DICT = 7
+T_INT_STR = 8
+T_INT_COL = 9
+T_BIGINT_COL = 10
+T_STR_COL = 11
+T_INT_STR_COL = 12
+T_FLOAT_COL = 13
+T_BOOL_COL = 14
+T_TABLE = 15
+
+_FLOAT = struct.Struct("<d")
+_SWAP = sys.byteorder == "big"  # Columns are written little-endian
+
+# Narrowest array typecode per signed range
+_INT_TYPECODES = (("b", 1 << 7), ("h", 1 << 15), ("i", 1 << 31), ("q", 1 << 63))
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(z: int) -> int:
+    return z >> 1 if not z & 1 else -((z + 1) >> 1)
+
+
+def _key(key: Any) -> str:
+    """Dict key as json.dumps would write it."""
+    if isinstance(key, str):
+        return str.__str__(key)
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    return str(key)
+
+
+def _is_int_str(values: list[str]) -> list[int] | None:
+    """Ints for a column of canonical integer strings, else None."""
+    first = values[0]
+    if not (first[:1].isdigit() or (first[:1] == "-" and first[1:2].isdigit())):
+        return None
+    try:
+        ints = list(map(int, values))
+    except ValueError:
+        return None
+    return ints if list(map(str, ints)) == values else None
+
+
+# =============================================================================
+# ENCODER
+# =============================================================================
+
+class _Encoder:
+    """Encodes one record: string table + tagged value tree."""
+
+    def __init__(self):
+        self.out = bytearray()
+        self.strings: dict[str, int] = {}
+
+    def _uvarint(self, n: int) -> None:
+        out = self.out
+        while n >= 0x80:
+            out.append((n & 0x7F) | 0x80)
+            n >>= 7
+        out.append(n)
+
+    def _ref(self, s: str) -> int:
+        index = self.strings.get(s)
+        if index is None:
+            index = self.strings[s] = len(self.strings)
+        return index
+
+    def value(self, v: Any) -> None:
+        t = type(v)
+        out = self.out
+        if v is None:
+            out.append(T_NONE)
+        elif t is bool:
+            out.append(T_TRUE if v else T_FALSE)
+        elif t is str:
+            self._str(v)
+        elif t is int:
+            out.append(T_INT)
+            self._uvarint(_zigzag(v))
+        elif t is float:
+            out.append(T_FLOAT)
+            out += _FLOAT.pack(v)
+        elif t is dict:
+            out.append(T_DICT)
+            self._uvarint(len(v))
+            for key, item in v.items():
+                self._uvarint(self._ref(key if type(key) is str else _key(key)))
+                self.value(item)
+        elif t is list or t is tuple:
+            self._list(v if t is list else list(v))
+        elif isinstance(v, str):
+            self._str(str.__str__(v))
+        elif isinstance(v, int):
+            self.value(int(v))
+        elif isinstance(v, float):
+            self.value(float(v))
+        elif isinstance(v, dict):
+            self.value(dict(v))
+        elif isinstance(v, (list, tuple)):
+            self._list(list(v))
+        else:
+            self._str(str(v))  # json.dump(default=str)
+
+    def _str(self, s: str) -> None:
+        if s[:1].isdigit() or s[:1] == "-":
+            try:
+                n = int(s)
+            except ValueError:
+                pass
+            else:
+                if str(n) == s:
+                    self.out.append(T_INT_STR)
+                    self._uvarint(_zigzag(n))
+                    return
+        self.out.append(T_STR)
+        self._uvarint(self._ref(s))
+
+    def _list(self, items: list) -> None:
+        if len(items) >= COLUMN_MIN_ROWS:
+            first = type(items[0])
+            if len(set(map(type, items))) == 1:
+                if first is int:
+                    self.out.append(T_INT_COL)
+                    return self._ints(items)
+                if first is str:
+                    ints = _is_int_str(items)
+                    if ints is not None:
+                        self.out.append(T_INT_STR_COL)
+                        return self._ints(ints)
+                    self.out.append(T_STR_COL)
+                    return self._array("I", [self._ref(s) for s in items])
+                if first is float:
+                    self.out.append(T_FLOAT_COL)
+                    return self._array("d", items)
+                if first is bool:
+                    self.out.append(T_BOOL_COL)
+                    self._uvarint(len(items))
+                    self.out += bytes(items)
+                    return None
+                if first is dict:
+                    keys = list(items[0])
+                    if all(type(k) is str for k in keys) and all(list(d) == keys for d in items):
+                        return self._table(keys, items)
+        self.out.append(T_LIST)
+        self._uvarint(len(items))
+        for item in items:
+            self.value(item)
+        return None
+
+    def _ints(self, ints: list[int]) -> None:
+        low, high = min(ints), max(ints)
+        for typecode, bound in _INT_TYPECODES:
+            if -bound <= low and high < bound:
+                self.out.append(ord(typecode))
+                return self._array(typecode, ints)
+        # Past 64 bits (wei amounts, sqrtPriceX96): fixed-width signed bytes
+        self.out.append(T_BIGINT_COL)
+        width = max(low.bit_length(), high.bit_length()) // 8 + 1
+        self._uvarint(len(ints))
+        self._uvarint(width)
+        self.out += b"".join(n.to_bytes(width, "little", signed=True) for n in ints)
+        return None
+
+    def _array(self, typecode: str, values: list) -> None:
+        packed = array(typecode, values)
+        if _SWAP:
+            packed.byteswap()
+        self._uvarint(len(values))
+        self.out += packed.tobytes()
+
+    def _table(self, keys: list[str], rows: list[dict]) -> None:
+        self.out.append(T_TABLE)
+        self._uvarint(len(rows))
+        self._uvarint(len(keys))
+        for key in keys:
+            self._uvarint(self._ref(key))
+        for key in keys:
+            self._list([row[key] for row in rows])
+
+    def finish(self) -> bytes:
+        body = self.out
+        self.out = bytearray()
+        self._uvarint(len(self.strings))
+        for s in self.strings:
+            raw = s.encode("utf-8")
+            self._uvarint(len(raw))
+            self.out += raw
+        return bytes(self.out + body)
+
+
+def encode_record(value: Any) -> bytes:
+    """Encode one JSON-shaped value as a record payload."""
+    encoder = _Encoder()
+    encoder.value(value)
+    return encoder.finish()
+
+
+# =============================================================================
+# DECODER
+# =============================================================================
+
+class _Decoder:
+    """Decodes one record payload."""
+
+    def __init__(self, buf: bytes):
+        self.buf = buf
+        self.pos = 0
+        count = self._uvarint()
+        strings = []
+        for _ in range(count):
+            size = self._uvarint()
+            strings.append(buf[self.pos:self.pos + size].decode("utf-8"))
+            self.pos += size
+        self.strings = strings
+
+    def _uvarint(self) -> int:
+        buf = self.buf
+        pos = self.pos
+        byte = buf[pos]
+        pos += 1
+        result = byte & 0x7F
+        shift = 7
+        while byte & 0x80:
+            byte = buf[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            shift += 7
+        self.pos = pos
+        return result
+
+    def value(self) -> Any:
+        tag = self.buf[self.pos]
+        self.pos += 1
+        if tag == T_STR:
+            return self.strings[self._uvarint()]
+        if tag == T_INT:
+            return _unzigzag(self._uvarint())
+        if tag == T_DICT:
+            strings = self.strings
+            result = {}
+            for _ in range(self._uvarint()):
+                key = strings[self._uvarint()]
+                result[key] = self.value()
+            return result
+        if tag == T_NONE:
+            return None
+        if tag == T_TRUE:
+            return True
+        if tag == T_FALSE:
+            return False
+        if tag == T_INT_STR:
+            return str(_unzigzag(self._uvarint()))
+        if tag == T_FLOAT:
+            (result,) = _FLOAT.unpack_from(self.buf, self.pos)
+            self.pos += 8
+            return result
+        if tag == T_LIST:
+            return [self.value() for _ in range(self._uvarint())]
+        if tag == T_INT_COL:
+            return self._ints()
+        if tag == T_INT_STR_COL:
+            return list(map(str, self._ints()))
+        if tag == T_STR_COL:
+            strings = self.strings
+            return [strings[i] for i in self._array("I")]
+        if tag == T_FLOAT_COL:
+            return self._array("d")
+        if tag == T_BOOL_COL:
+            count = self._uvarint()
+            raw = self.buf[self.pos:self.pos + count]
+            self.pos += count
+            return [b == 1 for b in raw]
+        if tag == T_TABLE:
+            rows = self._uvarint()
+            keys = [self.strings[self._uvarint()] for _ in range(self._uvarint())]
+            columns = [self.value() for _ in keys]
+            return [dict(zip(keys, values)) for values in zip(*columns)] if keys else [{} for _ in range(rows)]
+        raise ValueError(f"Unknown snapshot value tag {tag} at offset {self.pos - 1}")
+
+    def _ints(self) -> list[int]:
+        tag = self.buf[self.pos]
+        self.pos += 1
+        if tag == T_BIGINT_COL:
+            count = self._uvarint()
+            width = self._uvarint()
+            start = self.pos
+            self.pos += count * width
+            buf = self.buf
+            return [
+                int.from_bytes(buf[i:i + width], "little", signed=True)
+                for i in range(start, start + count * width, width)
+            ]
+        return self._array(chr(tag))
+
+    def _array(self, typecode: str) -> list:
+        count = self._uvarint()
+        packed = array(typecode)
+        size = count * packed.itemsize
+        packed.frombytes(self.buf[self.pos:self.pos + size])
+        self.pos += size
+        if _SWAP:
+            packed.byteswap()
+        return packed.tolist()
+
+
+def decode_record(payload: bytes) -> Any:
+    """Decode a payload written by encode_record()."""
+    return _Decoder(payload).value()
+
+
+# =============================================================================
+# FILES
+# =============================================================================
+
+class SnapshotWriter:
+    """
+    Streams a binary snapshot: write_meta() once, write_cycle() per cycle.
+
+    Usage:
+        with SnapshotWriter(path) as writer:
+            writer.write_meta({"timestamp": ..., "mode": "REGISTRY"})
+            for summary in cycle_summaries:
+                writer.write_cycle(summary)
+    """
+
+    def __init__(self, path: Path, compress_level: int = DEFAULT_COMPRESS_LEVEL):
+        self.path = Path(path)
+        self.compress_level = compress_level
+        self._file = open(self.path, "wb")
+        self._file.write(SNAPSHOT_MAGIC)
+
+    def _write(self, kind: int, value: Any) -> None:
+        payload = encode_record(value)
+        flags = 0
+        if self.compress_level:
+            payload = zlib.compress(payload, self.compress_level)
+            flags |= FLAG_ZLIB
+        self._file.write(_RECORD_HEADER.pack(kind, flags, len(payload)))
+        self._file.write(payload)
+
+    def write_meta(self, meta: dict) -> None:
+        self._write(KIND_META, meta)
+
+    def write_cycle(self, summary: dict) -> None:
+        self._write(KIND_CYCLE, summary)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "SnapshotWriter":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class SnapshotReader:
+    """
+    Memory-mapped binary snapshot; cycles decode lazily, one at a time.
+
+    Opening only walks the record headers. `meta` holds the snapshot-level
+    fields; iterating (or cycle(i)) decodes a single cycle summary.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f"Not a snapshot file: {self.path}")
+        if self._map[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"Not a snapshot file: {self.path}")
+
+        self._cycles: list[tuple[int, int, int]] = []  # (flags, start, end)
+        self.meta: dict = {}
+        pos = len(SNAPSHOT_MAGIC)
+        end = len(self._map)
+        while pos + _RECORD_HEADER.size <= end:
+            kind, flags, length = _RECORD_HEADER.unpack_from(self._map, pos)
+            start = pos + _RECORD_HEADER.size
+            if start + length > end:
+                break  # Truncated tail (writer interrupted): keep complete records
+            if kind == KIND_CYCLE:
+                self._cycles.append((flags, start, start + length))
+            elif kind == KIND_META:
+                self.meta.update(self._decode(flags, start, start + length))
+            pos = start + length
+
+    def _decode(self, flags: int, start: int, end: int) -> Any:
+        payload = self._map[start:end]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return decode_record(payload)
+
+    def __len__(self) -> int:
+        return len(self._cycles)
+
+    def cycle(self, index: int) -> dict:
+        return self._decode(*self._cycles[index])
+
+    def __iter__(self) -> Iterator[dict]:
+        for flags, start, end in self._cycles:
+            yield self._decode(flags, start, end)
+
+    def to_dict(self) -> dict:
+        """The whole snapshot, shaped like the JSON form."""
+        return {**self.meta, "cycle_summaries": list(self)}
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def write_snapshot(path: Path, snapshot: dict, compress_level: int = DEFAULT_COMPRESS_LEVEL) -> None:
+    """Write a snapshot dict ({..., "cycle_summaries": [...]}) in binary form."""
+    meta = {k: v for k, v in snapshot.items() if k != "cycle_summaries"}
+    with SnapshotWriter(path, compress_level) as writer:
+        writer.write_meta(meta)
+        for summary in snapshot.get("cycle_summaries", []):
+            writer.write_cycle(summary)
+
+
+def load_snapshot(path: Path) -> dict:
+    """Load a snapshot written in either form (JSON by suffix, else binary)."""
+    path = Path(path)
+    if path.suffix == ".json":
+        with open(path) as f:
+            return json.load(f)
+    with SnapshotReader(path) as reader:
+        return reader.to_dict()
+
+
+def export_json(path: Path, output: Path, indent: int | None = 2) -> Path:
+    """Export a binary snapshot as the legacy JSON snapshot."""
+    with SnapshotReader(path) as reader, open(output, "w") as f:
+        json.dump(reader.to_dict(), f, indent=indent)
+    return Path(output)
@@ -5,8 +5,11 @@ Ensures quotes are fresh and block-consistent.
 """
 
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Iterator
 
 from core.constants import DEFAULT_MAX_BLOCK_AGE, DEFAULT_MAX_QUOTE_AGE_MS
 
@@ -36,16 +39,41 @@ class BlockPin:
         return self.age_ms > DEFAULT_MAX_QUOTE_AGE_MS
 
 
+# Recorded time returned by now_ms/now_utc inside frozen_clock (replay)
+_frozen_now_ms: ContextVar[int | None] = ContextVar("frozen_now_ms", default=None)
+
+
 def now_ms() -> int:
     """Current time in milliseconds (Unix timestamp)."""
+    frozen = _frozen_now_ms.get()
+    if frozen is not None:
+        return frozen
     return int(time.time() * 1000)
 
 
 def now_utc() -> datetime:
     """Current UTC datetime."""
+    frozen = _frozen_now_ms.get()
+    if frozen is not None:
+        return datetime.fromtimestamp(frozen / 1000, timezone.utc)
     return datetime.now(timezone.utc)
 
 
+@contextmanager
+def frozen_clock(timestamp_ms: int) -> Iterator[None]:
+    """
+    Freeze now_ms/now_utc at timestamp_ms.
+    
+    Replay runs recorded cycles under the time they were gated at, so
+    freshness checks and trade timestamps match the live run.
+    """
+    token = _frozen_now_ms.set(timestamp_ms)
+    try:
+        yield
+    finally:
+        _frozen_now_ms.reset(token)
+
+
 def is_quote_fresh(
     quote_timestamp_ms: int,
     max_age_ms: int = DEFAULT_MAX_QUOTE_AGE_MS,
@@ -0,0 +1,129 @@
+"""
+core/timing.py - Stage timers for the scan pipeline.
+
+StageTimer measures where one cycle spends its time; StageHistogram rolls
+the per-cycle durations up across cycles (count, total, p50/p95/max).
+
+Durations come from time.perf_counter (monotonic), never wall clock.
+Stages are flat: a stage entered several times in a cycle (e.g. gates,
+once per quote) accumulates. Time outside every stage is reported as
+"other", so RPC waits and local math can be told apart.
+
+Usage:
+    timer = StageTimer()
+    with timer.stage("quoting"):
+        quotes = await fetch(...)
+    summary["stage_timings_ms"] = timer.to_dict()
+"""
+
+import time
+from collections import deque
+
+# Per-stage samples kept by StageHistogram for percentiles
+DEFAULT_STAGE_WINDOW = 1024
+
+# Keys StageTimer.to_dict adds besides the stages themselves
+TOTAL_STAGE = "total"
+OTHER_STAGE = "other"
+
+
+class _Span:
+    """Context manager for one timed stage (cheaper than @contextmanager)."""
+
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer: "StageTimer", name: str):
+        self.timer = timer
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.timer.add(self.name, time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """Accumulated per-stage durations of one cycle."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.seconds: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def stage(self, name: str) -> _Span:
+        """Time a block: `with timer.stage("gates"): ...`"""
+        return _Span(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add a measured duration to a stage."""
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    @property
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the timer was created."""
+        return (time.perf_counter() - self.started) * 1000
+
+    def to_dict(self) -> dict[str, float]:
+        """
+        Milliseconds per stage (rounded to µs), in first-entered order.
+
+        Adds "total" (timer lifetime) and "other" (total minus all stages).
+        """
+        total_ms = self.elapsed_ms
+        timings = {name: round(s * 1000, 3) for name, s in self.seconds.items()}
+        timings[OTHER_STAGE] = round(max(0.0, total_ms - sum(self.seconds.values()) * 1000), 3)
+        timings[TOTAL_STAGE] = round(total_ms, 3)
+        return timings
+
+
+class StageHistogram:
+    """Per-stage distribution of cycle timings (bounded window per stage)."""
+
+    def __init__(self, window: int = DEFAULT_STAGE_WINDOW):
+        self.window = window
+        self.samples: dict[str, deque[float]] = {}
+        self.totals_ms: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def record(self, timings_ms: dict[str, float]) -> None:
+        """Add one cycle's stage_timings_ms."""
+        for name, ms in timings_ms.items():
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(ms)
+            self.totals_ms[name] = self.totals_ms.get(name, 0.0) + ms
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def percentile(self, name: str, pct: int) -> float | None:
+        """Nearest-rank percentile over the window (same rule as RPCStats)."""
+        samples = self.samples.get(name)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, len(ordered) * pct // 100)]
+
+    def to_dict(self) -> dict[str, dict]:
+        """
+        {stage: {count, total_ms, share_pct, p50_ms, p95_ms, max_ms}}.
+
+        Stages are ordered by total time, slowest first; share_pct is the
+        stage's share of "total" (omitted when no total was recorded).
+        """
+        grand_total = self.totals_ms.get(TOTAL_STAGE, 0.0)
+        result = {}
+        for name in sorted(self.totals_ms, key=self.totals_ms.get, reverse=True):
+            total_ms = self.totals_ms[name]
+            result[name] = {
+                "count": self.counts[name],
+                "total_ms": round(total_ms, 3),
+                "share_pct": round(total_ms / grand_total * 100, 1) if grand_total else None,
+                "p50_ms": self.percentile(name, 50),
+                "p95_ms": self.percentile(name, 95),
+                "max_ms": max(self.samples[name]),
+            }
+        return result
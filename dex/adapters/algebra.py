@@ -14,10 +14,13 @@ from dataclasses import dataclass
 import time
 
 from core.logging import get_logger
-from core.exceptions import ErrorCode, QuoteError
+from core.exceptions import ErrorCode, InfraError, QuoteError
 from core.models import Token, Pool, Quote
 from core.time import now_ms
 from chains.providers import RPCProvider
+from chains.multicall import Call3, Call3Result
+from dex.local_quoter import LocalV3Quoter
+from dex.pool_state import PoolStateStore
 
 logger = get_logger(__name__)
 
@@ -120,10 +123,14 @@ class AlgebraAdapter:
         provider: RPCProvider,
         quoter_address: str,
         dex_id: str = "camelot_v3",
+        state_store: PoolStateStore | None = None,
     ):
         self.provider = provider
         self.quoter_address = quoter_address
         self.dex_id = dex_id
+        # Cached pool state: quote locally when it covers the pinned block
+        self.state_store = state_store
+        self._local_quoter = LocalV3Quoter()
     
     async def get_quote_raw(
         self,
@@ -181,7 +188,9 @@ class AlgebraAdapter:
                 latency_ms=latency_ms,
             )
             
-        except QuoteError:
+        except (QuoteError, InfraError):
+            # Provider errors (outage, INFRA_RATE_LIMIT) are not the pool's;
+            # a revert comes back as result None (checked above)
             raise
         except Exception as e:
             # Capture full error context for debugging
@@ -222,11 +231,9 @@ class AlgebraAdapter:
         Returns:
             Quote model with all fields populated
         """
-        # Determine direction
-        if token_in.address.lower() == pool.token0.address.lower():
-            direction = "0to1"
-        else:
-            direction = "1to0"
+        local_quote = self.get_local_quote(pool, token_in, token_out, amount_in, block_number)
+        if local_quote is not None:
+            return local_quote
         
         # Get raw quote
         result = await self.get_quote_raw(
@@ -236,6 +243,101 @@ class AlgebraAdapter:
             block_number=block_number,
         )
         
+        return self._build_quote(pool, token_in, token_out, amount_in, result, block_number)
+    
+    def get_local_quote(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        block_number: int | None,
+    ) -> Quote | None:
+        """
+        Quote from the pool-state store, or None to fall back to the quoter.
+        
+        Only POOL_STATE_INCOMPLETE falls back; a local POOL_NO_LIQUIDITY is
+        the real answer for that size and is raised.
+        """
+        if self.state_store is None or not block_number or not pool.pool_address:
+            return None
+        try:
+            state = self.state_store.state_at(pool.pool_address, block_number)
+            return self._local_quoter.get_quote(
+                pool, state, token_in, token_out, amount_in, block_number
+            )
+        except QuoteError as e:
+            if e.code != ErrorCode.POOL_STATE_INCOMPLETE:
+                raise
+            logger.debug(f"Local quote unavailable for {pool.pool_address}: {e.message}")
+            return None
+    
+    def build_quote_call(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+    ) -> Call3:
+        """Build the Algebra quoter sub-call for Multicall3 aggregation."""
+        return Call3(
+            target=self.quoter_address,
+            call_data=encode_quote_exact_input_single(
+                token_in=token_in.address,
+                token_out=token_out.address,
+                amount_in=amount_in,
+            ),
+        )
+    
+    def decode_quote_call(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        call_result: Call3Result,
+        block_number: int | None,
+        latency_ms: int,
+    ) -> Quote:
+        """
+        Build a Quote from an aggregate3 sub-call result.
+        
+        Raises:
+            QuoteError: QUOTE_REVERT if this leg reverted or returned bad data
+        """
+        if not call_result.success:
+            raise QuoteError(
+                code=ErrorCode.QUOTE_REVERT,
+                message="Algebra quote sub-call reverted",
+                details={
+                    "token_in": token_in.address,
+                    "token_out": token_out.address,
+                    "amount_in": amount_in,
+                    "quoter": self.quoter_address,
+                    "revert_data": call_result.return_data[:202],
+                },
+            )
+        
+        amount_out, fee = decode_quote_response(call_result.return_data)
+        result = AlgebraQuoteResult(amount_out=amount_out, fee=fee, latency_ms=latency_ms)
+        return self._build_quote(pool, token_in, token_out, amount_in, result, block_number)
+    
+    def _build_quote(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        result: AlgebraQuoteResult,
+        block_number: int | None,
+    ) -> Quote:
+        """Build Quote model from a decoded Algebra quoter result."""
+        # Determine direction
+        if token_in.address.lower() == pool.token0.address.lower():
+            direction = "0to1"
+        else:
+            direction = "1to0"
+        
         # Algebra doesn't report gas estimate in quote, use estimate
         # Typical Algebra swap: 150k-250k gas
         gas_estimate = 200_000
@@ -3,9 +3,10 @@ dex/adapters/uniswap_v3.py - Uniswap V3 quoting adapter.
 
 Implements quoting via QuoterV2 contract.
 Supports:
-- Single-hop quotes (quoteExactInputSingle)
+- Single-hop quotes (quoteExactInputSingle, quoteExactOutputSingle)
 - Fee tier selection
 - Slippage/price impact from sqrtPriceX96
+- Multicall3 sub-calls (build_quote_call / decode_quote_call)
 """
 
 from dataclasses import dataclass
@@ -14,8 +15,11 @@ from decimal import Decimal
 from core.logging import get_logger
 from core.models import Token, Pool, Quote
 from core.time import now_ms
-from core.exceptions import QuoteError, ErrorCode
+from core.exceptions import InfraError, QuoteError, ErrorCode
 from chains.providers import RPCProvider
+from chains.multicall import Call3, Call3Result
+from dex.local_quoter import LocalV3Quoter
+from dex.pool_state import PoolStateStore
 
 logger = get_logger(__name__)
 
@@ -28,6 +32,10 @@ logger = get_logger(__name__)
 # keccak256("quoteExactInputSingle((address,address,uint256,uint24,uint160))")[:4]
 SELECTOR_QUOTE_EXACT_INPUT_SINGLE = "0xc6a5026a"
 
+# Function selector: quoteExactOutputSingle((address,address,uint256,uint24,uint160))
+# keccak256("quoteExactOutputSingle((address,address,uint256,uint24,uint160))")[:4]
+SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE = "0xbd21704a"
+
 
 def encode_quote_exact_input_single(
     token_in: str,
@@ -68,12 +76,43 @@ def encode_quote_exact_input_single(
     )
 
 
+def encode_quote_exact_output_single(
+    token_in: str,
+    token_out: str,
+    amount_out: int,
+    fee: int,
+    sqrt_price_limit_x96: int = 0,
+) -> str:
+    """
+    Encode quoteExactOutputSingle call data for QuoterV2.
+    
+    struct QuoteExactOutputSingleParams {
+        address tokenIn;
+        address tokenOut;
+        uint256 amount;   // exact amount of tokenOut wanted
+        uint24 fee;
+        uint160 sqrtPriceLimitX96;
+    }
+    
+    Same static-tuple layout as quoteExactInputSingle.
+    """
+    return (
+        f"{SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE}"
+        f"{token_in[2:].lower().zfill(64)}"
+        f"{token_out[2:].lower().zfill(64)}"
+        f"{hex(amount_out)[2:].zfill(64)}"
+        f"{hex(fee)[2:].zfill(64)}"
+        f"{hex(sqrt_price_limit_x96)[2:].zfill(64)}"
+    )
+
+
 def decode_quote_response(hex_result: str) -> tuple[int, int, int, int]:
     """
-    Decode quoteExactInputSingle response.
+    Decode quoteExactInputSingle / quoteExactOutputSingle response.
     
     Returns:
-        (amountOut, sqrtPriceX96After, initializedTicksCrossed, gasEstimate)
+        (amount, sqrtPriceX96After, initializedTicksCrossed, gasEstimate)
+        where amount is amountOut for exact input, amountIn for exact output
     """
     if not hex_result or hex_result == "0x":
         raise QuoteError(
@@ -129,10 +168,14 @@ class UniswapV3Adapter:
         provider: RPCProvider,
         quoter_address: str,
         dex_id: str = "uniswap_v3",
+        state_store: PoolStateStore | None = None,
     ):
         self.provider = provider
         self.quoter_address = quoter_address
         self.dex_id = dex_id
+        # Cached pool state: quote locally when it covers the pinned block
+        self.state_store = state_store
+        self._local_quoter = LocalV3Quoter()
     
     async def get_quote_raw(
         self,
@@ -182,7 +225,9 @@ class UniswapV3Adapter:
                 latency_ms=response.latency_ms,
             )
             
-        except QuoteError:
+        except (QuoteError, InfraError):
+            # Provider errors (outage, INFRA_RATE_LIMIT) are not the pool's;
+            # a revert comes back as result None and fails decoding above
             raise
         except Exception as e:
             raise QuoteError(
@@ -219,11 +264,9 @@ class UniswapV3Adapter:
         Returns:
             Quote model with all fields populated
         """
-        # Determine direction
-        if token_in.address.lower() == pool.token0.address.lower():
-            direction = "0to1"
-        else:
-            direction = "1to0"
+        local_quote = self.get_local_quote(pool, token_in, token_out, amount_in, block_number)
+        if local_quote is not None:
+            return local_quote
         
         # Get raw quote with pinned block
         result = await self.get_quote_raw(
@@ -234,6 +277,213 @@ class UniswapV3Adapter:
             block_number=block_number,
         )
         
+        return self._build_quote(pool, token_in, token_out, amount_in, result, block_number)
+    
+    def get_local_quote(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        block_number: int | None,
+    ) -> Quote | None:
+        """
+        Quote from the pool-state store, or None to fall back to the quoter.
+        
+        Only POOL_STATE_INCOMPLETE falls back; a local POOL_NO_LIQUIDITY is
+        the real answer for that size and is raised.
+        """
+        if self.state_store is None or not block_number or not pool.pool_address:
+            return None
+        try:
+            state = self.state_store.state_at(pool.pool_address, block_number)
+            return self._local_quoter.get_quote(
+                pool, state, token_in, token_out, amount_in, block_number
+            )
+        except QuoteError as e:
+            if e.code != ErrorCode.POOL_STATE_INCOMPLETE:
+                raise
+            logger.debug(f"Local quote unavailable for {pool.pool_address}: {e.message}")
+            return None
+    
+    def build_quote_call(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+    ) -> Call3:
+        """Build the QuoterV2 sub-call for Multicall3 aggregation."""
+        return Call3(
+            target=self.quoter_address,
+            call_data=encode_quote_exact_input_single(
+                token_in=token_in.address,
+                token_out=token_out.address,
+                amount_in=amount_in,
+                fee=pool.fee,
+            ),
+        )
+    
+    def decode_quote_call(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        call_result: Call3Result,
+        block_number: int | None,
+        latency_ms: int,
+    ) -> Quote:
+        """
+        Build a Quote from an aggregate3 sub-call result.
+        
+        Raises:
+            QuoteError: QUOTE_REVERT if this leg reverted or returned bad data
+        """
+        if not call_result.success:
+            raise QuoteError(
+                code=ErrorCode.QUOTE_REVERT,
+                message="Quote sub-call reverted",
+                details={
+                    "token_in": token_in.address,
+                    "token_out": token_out.address,
+                    "amount_in": amount_in,
+                    "fee": pool.fee,
+                    "quoter": self.quoter_address,
+                    "revert_data": call_result.return_data[:202],
+                },
+            )
+        
+        amount_out, sqrt_price, ticks, gas = decode_quote_response(call_result.return_data)
+        result = UniswapV3QuoteResult(
+            amount_out=amount_out,
+            sqrt_price_x96_after=sqrt_price,
+            ticks_crossed=ticks,
+            gas_estimate=gas,
+            latency_ms=latency_ms,
+        )
+        return self._build_quote(pool, token_in, token_out, amount_in, result, block_number)
+    
+    # =========================================================================
+    # EXACT OUTPUT
+    # =========================================================================
+    
+    async def get_quote_exact_output(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_out: int,
+        block_number: int | None = None,
+    ) -> Quote:
+        """
+        Quote the input needed to receive exactly amount_out.
+        
+        Returns:
+            Quote with amount_in = required input, amount_out = requested output
+        """
+        call = self.build_quote_exact_output_call(pool, token_in, token_out, amount_out)
+        block_tag = hex(block_number) if block_number else "latest"
+        try:
+            response = await self.provider.eth_call(
+                to=call.target,
+                data=call.call_data,
+                block=block_tag,
+            )
+        except InfraError:
+            raise  # Outage / INFRA_RATE_LIMIT, not the pool
+        except Exception as e:
+            raise QuoteError(
+                code=ErrorCode.QUOTE_REVERT,
+                message=f"Exact-output quote call failed: {e}",
+                details={
+                    "token_in": token_in.address,
+                    "token_out": token_out.address,
+                    "amount_out": amount_out,
+                    "fee": pool.fee,
+                    "quoter": self.quoter_address,
+                },
+            )
+        return self.decode_quote_exact_output_call(
+            pool, token_in, token_out, amount_out,
+            Call3Result(success=response.error is None, return_data=response.result or "0x"),
+            block_number, response.latency_ms,
+        )
+    
+    def build_quote_exact_output_call(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_out: int,
+    ) -> Call3:
+        """Build the QuoterV2 quoteExactOutputSingle sub-call."""
+        return Call3(
+            target=self.quoter_address,
+            call_data=encode_quote_exact_output_single(
+                token_in=token_in.address,
+                token_out=token_out.address,
+                amount_out=amount_out,
+                fee=pool.fee,
+            ),
+        )
+    
+    def decode_quote_exact_output_call(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_out: int,
+        call_result: Call3Result,
+        block_number: int | None,
+        latency_ms: int,
+    ) -> Quote:
+        """
+        Build a Quote from a quoteExactOutputSingle result.
+        
+        Raises:
+            QuoteError: QUOTE_REVERT if the call reverted or returned bad data
+        """
+        if not call_result.success:
+            raise QuoteError(
+                code=ErrorCode.QUOTE_REVERT,
+                message="Exact-output quote sub-call reverted",
+                details={
+                    "token_in": token_in.address,
+                    "token_out": token_out.address,
+                    "amount_out": amount_out,
+                    "fee": pool.fee,
+                    "quoter": self.quoter_address,
+                    "revert_data": call_result.return_data[:202],
+                },
+            )
+        
+        amount_in, sqrt_price, ticks, gas = decode_quote_response(call_result.return_data)
+        result = UniswapV3QuoteResult(
+            amount_out=amount_out,
+            sqrt_price_x96_after=sqrt_price,
+            ticks_crossed=ticks,
+            gas_estimate=gas,
+            latency_ms=latency_ms,
+        )
+        return self._build_quote(pool, token_in, token_out, amount_in, result, block_number)
+    
+    def _build_quote(
+        self,
+        pool: Pool,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        result: UniswapV3QuoteResult,
+        block_number: int | None,
+    ) -> Quote:
+        """Build Quote model from a decoded QuoterV2 result."""
+        # Determine direction
+        if token_in.address.lower() == pool.token0.address.lower():
+            direction = "0to1"
+        else:
+            direction = "1to0"
+        
         # Build Quote model with all V3-specific fields
         quote = Quote(
             pool=pool,
@@ -0,0 +1,265 @@
+"""
+dex/local_quoter.py - In-process Uniswap V3 quoting from cached pool state.
+
+Replays Pool.swap with exact integer math (dex/v3_math.py) over a cached
+slot0 / liquidity / tick bitmap / ticks snapshot. Returns the same Quote
+model as UniswapV3Adapter.get_quote, so gates and spreads are unchanged.
+
+Differences from QuoterV2:
+- gas_estimate is modelled (base + per initialized tick), not measured
+- A swap that exhausts liquidity raises POOL_NO_LIQUIDITY instead of
+  silently quoting a partial fill
+- A swap that walks into an uncached bitmap word raises
+  POOL_STATE_INCOMPLETE so the caller can fall back to an RPC quote
+"""
+
+from dataclasses import dataclass, field
+
+from core.logging import get_logger
+from core.models import Token, Pool, Quote
+from core.time import now_ms
+from core.exceptions import QuoteError, ErrorCode
+from dex import v3_math
+
+logger = get_logger(__name__)
+
+
+# Modelled swap gas (QuoterV2 measures it on-chain)
+LOCAL_QUOTE_BASE_GAS = 90_000
+LOCAL_QUOTE_GAS_PER_TICK = 25_000
+
+
+@dataclass(slots=True)
+class TickInfo:
+    """Liquidity data of one initialized tick."""
+    liquidity_gross: int
+    liquidity_net: int
+
+
+@dataclass
+class PoolState:
+    """
+    Cached V3 pool state at a block.
+
+    tick_bitmap holds only fetched words; a missing key means "not cached"
+    (a fetched empty word is stored as 0).
+    """
+    pool_address: str
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    fee: int  # Pips (hundredths of a bip)
+    tick_spacing: int
+    tick_bitmap: dict[int, int] = field(default_factory=dict)
+    ticks: dict[int, TickInfo] = field(default_factory=dict)
+    block_number: int = 0
+    fee_one_for_zero: int | None = None  # Directional-fee pools (Camelot); None = fee
+
+    def copy(self) -> "PoolState":
+        """Independent copy (ticks are copied, not shared)."""
+        return PoolState(
+            pool_address=self.pool_address,
+            sqrt_price_x96=self.sqrt_price_x96,
+            tick=self.tick,
+            liquidity=self.liquidity,
+            fee=self.fee,
+            tick_spacing=self.tick_spacing,
+            tick_bitmap=dict(self.tick_bitmap),
+            ticks={t: TickInfo(i.liquidity_gross, i.liquidity_net) for t, i in self.ticks.items()},
+            block_number=self.block_number,
+            fee_one_for_zero=self.fee_one_for_zero,
+        )
+
+
+@dataclass
+class SwapResult:
+    """Result of a simulated swap."""
+    amount_in: int  # Including fee
+    amount_out: int
+    sqrt_price_x96_after: int
+    tick_after: int
+    liquidity_after: int
+    ticks_crossed: int  # As QuoterV2 reports it
+    fully_filled: bool
+
+
+def simulate_swap(
+    state: PoolState,
+    zero_for_one: bool,
+    amount_specified: int,
+    sqrt_price_limit_x96: int = 0,
+) -> SwapResult:
+    """
+    Simulate Pool.swap without mutating state.
+
+    Args:
+        state: Pool state to swap against
+        zero_for_one: token0 -> token1
+        amount_specified: > 0 exact input, < 0 exact output
+        sqrt_price_limit_x96: 0 = no limit (QuoterV2 default)
+
+    Raises:
+        QuoteError: POOL_STATE_INCOMPLETE if the path leaves the cached bitmap
+    """
+    if sqrt_price_limit_x96 == 0:
+        sqrt_price_limit_x96 = (
+            v3_math.MIN_SQRT_RATIO + 1 if zero_for_one else v3_math.MAX_SQRT_RATIO - 1
+        )
+
+    exact_input = amount_specified > 0
+    fee = state.fee if zero_for_one or state.fee_one_for_zero is None else state.fee_one_for_zero
+    remaining = amount_specified
+    calculated = 0
+    sqrt_price = state.sqrt_price_x96
+    tick = state.tick
+    liquidity = state.liquidity
+
+    while remaining != 0 and sqrt_price != sqrt_price_limit_x96:
+        sqrt_price_start = sqrt_price
+
+        try:
+            tick_next, initialized, _ = v3_math.next_initialized_tick_within_one_word(
+                state.tick_bitmap, tick, state.tick_spacing, zero_for_one
+            )
+        except KeyError as e:
+            raise QuoteError(
+                code=ErrorCode.POOL_STATE_INCOMPLETE,
+                message=f"Tick bitmap word {e.args[0]} not cached",
+                details={"pool": state.pool_address, "word_pos": e.args[0], "tick": tick},
+            )
+
+        tick_next = max(v3_math.MIN_TICK, min(v3_math.MAX_TICK, tick_next))
+        sqrt_price_next = v3_math.get_sqrt_ratio_at_tick(tick_next)
+
+        if zero_for_one:
+            target = max(sqrt_price_next, sqrt_price_limit_x96)
+        else:
+            target = min(sqrt_price_next, sqrt_price_limit_x96)
+
+        sqrt_price, step_in, step_out, step_fee = v3_math.compute_swap_step(
+            sqrt_price, target, liquidity, remaining, fee
+        )
+
+        if exact_input:
+            remaining -= step_in + step_fee
+            calculated -= step_out
+        else:
+            remaining += step_out
+            calculated += step_in + step_fee
+
+        if sqrt_price == sqrt_price_next:
+            if initialized:
+                info = state.ticks.get(tick_next)
+                if info is None:
+                    raise QuoteError(
+                        code=ErrorCode.POOL_STATE_INCOMPLETE,
+                        message=f"Tick {tick_next} initialized but not cached",
+                        details={"pool": state.pool_address, "tick": tick_next},
+                    )
+                liquidity_net = -info.liquidity_net if zero_for_one else info.liquidity_net
+                liquidity += liquidity_net
+            tick = tick_next - 1 if zero_for_one else tick_next
+        elif sqrt_price != sqrt_price_start:
+            tick = v3_math.get_tick_at_sqrt_ratio(sqrt_price)
+
+    if exact_input:
+        amount_in, amount_out = amount_specified - remaining, -calculated
+    else:
+        amount_in, amount_out = calculated, -amount_specified + remaining
+
+    return SwapResult(
+        amount_in=amount_in,
+        amount_out=amount_out,
+        sqrt_price_x96_after=sqrt_price,
+        tick_after=tick,
+        liquidity_after=liquidity,
+        ticks_crossed=v3_math.count_initialized_ticks_crossed(
+            state.tick_bitmap, state.tick_spacing, state.tick, tick
+        ),
+        fully_filled=remaining == 0,
+    )
+
+
+class LocalV3Quoter:
+    """
+    QuoterV2-equivalent quoting from cached PoolState.
+
+    Usage:
+        quoter = LocalV3Quoter()
+        quote = quoter.get_quote(pool, state, token_in, token_out, amount_in)
+    """
+
+    def get_quote(
+        self,
+        pool: Pool,
+        state: PoolState,
+        token_in: Token,
+        token_out: Token,
+        amount_in: int,
+        block_number: int | None = None,
+    ) -> Quote:
+        """
+        Quote an exact-input swap against cached state.
+
+        Args:
+            pool: Pool being quoted
+            state: Cached pool state (at block_number)
+            token_in: Input token
+            token_out: Output token
+            amount_in: Input amount in wei
+            block_number: Block the state is pinned at (default: state.block_number)
+
+        Returns:
+            Quote model with the same fields as UniswapV3Adapter.get_quote
+
+        Raises:
+            QuoteError: POOL_NO_LIQUIDITY / POOL_STATE_INCOMPLETE
+        """
+        start_ms = now_ms()
+        zero_for_one = token_in.address.lower() == pool.token0.address.lower()
+
+        result = simulate_swap(state, zero_for_one, amount_in)
+
+        if not result.fully_filled:
+            raise QuoteError(
+                code=ErrorCode.POOL_NO_LIQUIDITY,
+                message="Swap exhausts pool liquidity",
+                details={
+                    "pool": state.pool_address,
+                    "amount_in": amount_in,
+                    "amount_in_filled": result.amount_in,
+                },
+            )
+
+        return Quote(
+            pool=pool,
+            direction="0to1" if zero_for_one else "1to0",
+            amount_in=amount_in,
+            amount_out=result.amount_out,
+            token_in=token_in,
+            token_out=token_out,
+            timestamp_ms=now_ms(),
+            block_number=block_number if block_number is not None else state.block_number,
+            gas_estimate=LOCAL_QUOTE_BASE_GAS + LOCAL_QUOTE_GAS_PER_TICK * result.ticks_crossed,
+            ticks_crossed=result.ticks_crossed,
+            sqrt_price_x96_after=result.sqrt_price_x96_after,
+            latency_ms=now_ms() - start_ms,
+        )
+
+    def get_quotes_multi_size(
+        self,
+        pool: Pool,
+        state: PoolState,
+        token_in: Token,
+        token_out: Token,
+        amounts_in: list[int],
+        block_number: int | None = None,
+    ) -> list[Quote]:
+        """Quote several sizes; sizes that cannot be filled are skipped."""
+        quotes = []
+        for amount_in in amounts_in:
+            try:
+                quotes.append(self.get_quote(pool, state, token_in, token_out, amount_in, block_number))
+            except QuoteError as e:
+                logger.debug(f"Local quote failed for amount {amount_in}: {e.message}")
+        return quotes
@@ -0,0 +1,97 @@
+"""
+dex/pool_address.py - Deterministic (CREATE2) pool addresses.
+
+V3 factories deploy pools with CREATE2, so a pool's address follows from
+the deployer, the sorted token pair (+ fee) and the pool init-code hash:
+
+    address = keccak256(0xff ++ deployer ++ salt ++ init_code_hash)[12:]
+
+- Uniswap V3 style: salt = keccak256(abi.encode(token0, token1, fee));
+  deployer = factory (PancakeSwap V3: its separate PoolDeployer)
+- Algebra: salt = keccak256(abi.encode(token0, token1)); deployer = poolDeployer
+
+zkSync Era uses a different CREATE2 preimage; DEXes there have no init-code
+hash configured and are resolved via factory lookup instead.
+"""
+
+from eth_utils import keccak, to_checksum_address
+
+from core.constants import DexType
+
+
+def sort_tokens(token_a: str, token_b: str) -> tuple[str, str]:
+    """Order two token addresses as the pool does (token0 < token1)."""
+    if token_a.lower() < token_b.lower():
+        return token_a, token_b
+    return token_b, token_a
+
+
+def _address_bytes(address: str) -> bytes:
+    return bytes.fromhex(address.lower().replace("0x", "").zfill(40))
+
+
+def create2_address(deployer: str, salt: bytes, init_code_hash: str) -> str:
+    """Compute a CREATE2 address (checksummed)."""
+    preimage = (
+        b"\xff"
+        + _address_bytes(deployer)
+        + salt
+        + bytes.fromhex(init_code_hash.lower().replace("0x", ""))
+    )
+    return to_checksum_address(keccak(preimage)[12:])
+
+
+def compute_v3_pool_address(
+    deployer: str,
+    token_a: str,
+    token_b: str,
+    fee: int,
+    init_code_hash: str,
+) -> str:
+    """Uniswap V3 style pool address (PoolAddress.computeAddress)."""
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = keccak(
+        _address_bytes(token0).rjust(32, b"\0")
+        + _address_bytes(token1).rjust(32, b"\0")
+        + fee.to_bytes(32, "big")
+    )
+    return create2_address(deployer, salt, init_code_hash)
+
+
+def compute_algebra_pool_address(
+    pool_deployer: str,
+    token_a: str,
+    token_b: str,
+    init_code_hash: str,
+) -> str:
+    """Algebra pool address (one pool per pair, no fee in the salt)."""
+    token0, token1 = sort_tokens(token_a, token_b)
+    salt = keccak(
+        _address_bytes(token0).rjust(32, b"\0")
+        + _address_bytes(token1).rjust(32, b"\0")
+    )
+    return create2_address(pool_deployer, salt, init_code_hash)
+
+
+def compute_pool_address(
+    dex_config: dict,
+    token_a: str,
+    token_b: str,
+    fee: int,
+) -> str | None:
+    """
+    Pool address from a config/dexes.yaml entry.
+
+    Uses pool_init_code_hash with pool_deployer (or factory).
+
+    Returns:
+        Checksummed address, or None if the DEX has no init-code hash configured
+    """
+    init_code_hash = dex_config.get("pool_init_code_hash")
+    deployer = dex_config.get("pool_deployer") or dex_config.get("factory")
+    if not init_code_hash or not deployer:
+        return None
+
+    if dex_config.get("adapter_type") == DexType.ALGEBRA.value:
+        return compute_algebra_pool_address(deployer, token_a, token_b, init_code_hash)
+    return compute_v3_pool_address(deployer, token_a, token_b, fee, init_code_hash)
@@ -0,0 +1,737 @@
+"""
+dex/pool_state.py - Incremental V3/Algebra pool-state cache.
+
+Bootstraps slot0/globalState, liquidity, tick bitmap words and ticks once per
+pool (batched eth_calls), then keeps the state current by replaying Swap,
+Mint, Burn and Fee logs block by block. Logs come from eth_getLogs ranges
+(sync / advance) or from any other source such as a WS `logs` subscription
+(apply_logs).
+
+Reorgs:
+- Every applied block records an undo entry (values before the block)
+- rollback(n) unwinds entries above n; entries older than reorg_depth
+  blocks are pruned, so the oldest reachable block is checkpoint_block
+- A rollback past the checkpoint clears the store (re-bootstrap required)
+
+state_at(pool, block) is the view adapters quote from: the live state at
+the synced block, or a copy unwound to an older block inside the journal.
+"""
+
+from dataclasses import dataclass, field
+
+from core.constants import (
+    DexType,
+    DEFAULT_LOG_BLOCK_RANGE,
+    DEFAULT_REORG_DEPTH,
+    DEFAULT_BITMAP_WORD_RADIUS,
+)
+from core.logging import get_logger
+from core.models import Pool
+from core.exceptions import QuoteError, ErrorCode
+from chains.providers import RPCProvider
+from chains.block import BlockState
+from dex import v3_math
+from dex.local_quoter import PoolState, TickInfo
+
+logger = get_logger(__name__)
+
+
+# =============================================================================
+# ABI ENCODING (pool getters and events)
+# =============================================================================
+
+SELECTOR_SLOT0 = "0x3850c7bd"  # slot0() - Uniswap V3
+SELECTOR_GLOBAL_STATE = "0xe76c01e4"  # globalState() - Algebra
+SELECTOR_LIQUIDITY = "0x1a686502"  # liquidity()
+SELECTOR_FEE = "0xddca3f43"  # fee() - Uniswap V3
+SELECTOR_TICK_SPACING = "0xd0c93a7c"  # tickSpacing()
+SELECTOR_TICK_BITMAP = "0x5339c296"  # tickBitmap(int16) - Uniswap V3
+SELECTOR_TICK_TABLE = "0xc677e3e0"  # tickTable(int16) - Algebra
+SELECTOR_TICKS = "0xf30dba93"  # ticks(int24) - both
+
+# Uniswap V3 and Algebra share the Swap/Mint/Burn signatures
+TOPIC_SWAP = "0xc42079f94a6350d7e6235f29174924f928cc2ac818eb64fed8004e115fbcca67"
+TOPIC_MINT = "0x7a53080ba414158be7ec69b987b5fb7d07dee101fe85488f0853ae16239d0bde"
+TOPIC_BURN = "0x0c396cd989a39f4459b5fa1aed6a9a8dcdbc45908acfd67e028cd568da98982c"
+TOPIC_FEE = "0x598b9f043c813aa6be3426ca60d1c65d17256312890be5118dab55b0775ebe2a"  # Fee(uint16)
+TOPIC_FEE_DIRECTIONAL = "0x8a89de70856bccec096661388f305b9a75f5f65cb0d8a0e1e803c39dabedb57f"  # Fee(uint16,uint16)
+
+POOL_EVENT_TOPICS = [TOPIC_SWAP, TOPIC_MINT, TOPIC_BURN, TOPIC_FEE, TOPIC_FEE_DIRECTIONAL]
+
+# Algebra V1 pools without tickSpacing() use a constant spacing
+ALGEBRA_DEFAULT_TICK_SPACING = 60
+
+
+def encode_int_arg(selector: str, value: int) -> str:
+    """Encode a single signed int argument (two's complement, 32 bytes)."""
+    return f"{selector}{value % (1 << 256):064x}"
+
+
+def decode_words(hex_data: str) -> list[int]:
+    """Split ABI return data into 32-byte words."""
+    data = hex_data[2:] if hex_data.startswith("0x") else hex_data
+    return [int(data[i:i + 64], 16) for i in range(0, len(data) - 63, 64)]
+
+
+def to_signed(word: int) -> int:
+    """Interpret a 32-byte word as a signed int256 (covers sign-extended int24/int128)."""
+    return word - (1 << 256) if word >= 1 << 255 else word
+
+
+@dataclass
+class PoolEvent:
+    """A decoded pool log."""
+    pool_address: str  # Lowercase
+    block_number: int
+    log_index: int
+    kind: str  # "swap" | "mint" | "burn" | "fee"
+    block_hash: str | None = None
+    removed: bool = False
+    # swap
+    sqrt_price_x96: int = 0
+    liquidity: int = 0
+    tick: int = 0
+    # mint / burn
+    tick_lower: int = 0
+    tick_upper: int = 0
+    amount: int = 0
+    # fee
+    fee: int = 0
+    fee_one_for_zero: int | None = None
+
+
+def parse_pool_log(log: dict) -> PoolEvent | None:
+    """
+    Decode a Swap/Mint/Burn/Fee log object (eth_getLogs or WS format).
+
+    Returns:
+        PoolEvent, or None for unrelated topics
+    """
+    topics = [t.lower() for t in log.get("topics", [])]
+    if not topics:
+        return None
+
+    words = decode_words(log.get("data", "0x"))
+    event = PoolEvent(
+        pool_address=log["address"].lower(),
+        block_number=int(log["blockNumber"], 16),
+        log_index=int(log.get("logIndex", "0x0"), 16),
+        kind="",
+        block_hash=log.get("blockHash"),
+        removed=bool(log.get("removed", False)),
+    )
+
+    if topics[0] == TOPIC_SWAP:
+        # data: amount0, amount1, sqrtPriceX96, liquidity, tick
+        event.kind = "swap"
+        event.sqrt_price_x96 = words[2]
+        event.liquidity = words[3]
+        event.tick = to_signed(words[4])
+    elif topics[0] == TOPIC_MINT:
+        # topics: owner, tickLower, tickUpper; data: sender, amount, amount0, amount1
+        event.kind = "mint"
+        event.tick_lower = to_signed(int(topics[2], 16))
+        event.tick_upper = to_signed(int(topics[3], 16))
+        event.amount = words[1]
+    elif topics[0] == TOPIC_BURN:
+        # topics: owner, tickLower, tickUpper; data: amount, amount0, amount1
+        event.kind = "burn"
+        event.tick_lower = to_signed(int(topics[2], 16))
+        event.tick_upper = to_signed(int(topics[3], 16))
+        event.amount = words[0]
+    elif topics[0] == TOPIC_FEE:
+        event.kind = "fee"
+        event.fee = words[0]
+    elif topics[0] == TOPIC_FEE_DIRECTIONAL:
+        event.kind = "fee"
+        event.fee, event.fee_one_for_zero = words[0], words[1]
+    else:
+        return None
+
+    return event
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+@dataclass
+class _PoolUndo:
+    """Values of one pool before a block was applied (first touch wins)."""
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    fee: int
+    fee_one_for_zero: int | None
+    ticks: dict[int, TickInfo | None] = field(default_factory=dict)  # None = absent
+    words: dict[int, int | None] = field(default_factory=dict)  # None = not cached
+
+
+class PoolStateStore:
+    """
+    Per-chain cache of V3/Algebra pool state, keyed by pool address.
+
+    Usage:
+        store = PoolStateStore(provider)
+        await store.bootstrap(pools, block_number)
+        await store.advance(block_state)  # each new head
+        state = store.state_at(pool.pool_address, block_number)
+    """
+
+    def __init__(
+        self,
+        provider: RPCProvider,
+        reorg_depth: int = DEFAULT_REORG_DEPTH,
+        log_block_range: int = DEFAULT_LOG_BLOCK_RANGE,
+        word_radius: int = DEFAULT_BITMAP_WORD_RADIUS,
+    ):
+        self.provider = provider
+        self.chain_id = provider.chain_id
+        self.reorg_depth = max(1, reorg_depth)
+        self.log_block_range = max(1, log_block_range)
+        self.word_radius = max(0, word_radius)
+
+        self.synced_block: int | None = None
+        self._base_block: int | None = None  # First bootstrap block
+        self._states: dict[str, PoolState] = {}
+        self._dex_types: dict[str, DexType] = {}
+        self._bootstrap_block: dict[str, int] = {}
+        self._journal: dict[int, dict[str, _PoolUndo]] = {}
+        self._block_hashes: dict[int, str] = {}
+
+        # Stats
+        self.logs_applied = 0
+        self.reorgs = 0
+
+    @property
+    def pools(self) -> list[str]:
+        """Cached pool addresses (lowercase)."""
+        return list(self._states)
+
+    @property
+    def checkpoint_block(self) -> int | None:
+        """Oldest block the store can roll back to."""
+        if self.synced_block is None:
+            return None
+        return max(self._base_block or 0, self.synced_block - self.reorg_depth)
+
+    # -------------------------------------------------------------------------
+    # Bootstrap
+    # -------------------------------------------------------------------------
+
+    async def bootstrap(
+        self,
+        pools: list[Pool],
+        block_number: int | None = None,
+    ) -> list[str]:
+        """
+        Fetch full state for pools not yet cached.
+
+        The first bootstrap sets synced_block; later ones always load at the
+        current synced_block so every pool in the store is at the same height.
+
+        Args:
+            pools: V3 / Algebra pools with real addresses
+            block_number: Bootstrap block (ignored once synced)
+
+        Returns:
+            Addresses that were bootstrapped (failures are logged and skipped)
+        """
+        if self.synced_block is not None:
+            block_number = self.synced_block
+        if block_number is None:
+            raise ValueError("block_number is required for the first bootstrap")
+
+        pending = {
+            p.pool_address.lower(): p.dex_type
+            for p in pools
+            if p.pool_address and p.pool_address.lower() not in self._states
+        }
+        if not pending:
+            return []
+        block_tag = hex(block_number)
+        self._dex_types.update(pending)
+
+        # Round 1: price/tick/fee, liquidity, tick spacing
+        calls: list[tuple[str, str]] = []
+        for address, dex_type in pending.items():
+            if dex_type == DexType.ALGEBRA:
+                calls += [(address, SELECTOR_GLOBAL_STATE), (address, SELECTOR_LIQUIDITY),
+                          (address, SELECTOR_TICK_SPACING)]
+            else:
+                calls += [(address, SELECTOR_SLOT0), (address, SELECTOR_LIQUIDITY),
+                          (address, SELECTOR_TICK_SPACING), (address, SELECTOR_FEE)]
+        items = await self.provider.eth_call_batch(calls, block=block_tag)
+
+        states: dict[str, PoolState] = {}
+        pos = 0
+        for address, dex_type in pending.items():
+            width = 3 if dex_type == DexType.ALGEBRA else 4
+            group = items[pos:pos + width]
+            pos += width
+            try:
+                states[address] = self._decode_core(address, dex_type, group, block_number)
+            except (ValueError, IndexError, TypeError) as e:
+                self._dex_types.pop(address, None)
+                logger.warning(f"Pool state bootstrap failed for {address}: {e}")
+
+        # Rounds 2-3: bitmap words around the price, then their ticks
+        await self._load_words(
+            states, {a: self._words_around(s) for a, s in states.items()}, block_tag
+        )
+
+        for address, state in states.items():
+            self._states[address] = state
+            self._bootstrap_block[address] = block_number
+
+        if self.synced_block is None:
+            self.synced_block = block_number
+            self._base_block = block_number
+
+        logger.info(
+            f"Bootstrapped {len(states)}/{len(pending)} pools at block {block_number}",
+            extra={"context": {"chain_id": self.chain_id, "block": block_number}},
+        )
+        return list(states)
+
+    def _decode_core(self, address: str, dex_type: DexType, items: list, block_number: int) -> PoolState:
+        """Build PoolState (no ticks yet) from the round-1 batch items."""
+        head, liquidity_item, spacing_item = items[0], items[1], items[2]
+        if not head.ok or not liquidity_item.ok:
+            raise ValueError(f"getter reverted: {head.error or liquidity_item.error}")
+
+        head_words = decode_words(head.result)
+        liquidity = decode_words(liquidity_item.result)[0]
+        fee_one_for_zero = None
+
+        if dex_type == DexType.ALGEBRA:
+            # globalState: price, tick, fee, ... (Camelot: price, tick, feeZto, feeOtz, ...)
+            fee = head_words[2]
+            if len(head_words) >= 8:
+                fee_one_for_zero = head_words[3]
+            tick_spacing = (
+                decode_words(spacing_item.result)[0] if spacing_item.ok
+                else ALGEBRA_DEFAULT_TICK_SPACING
+            )
+        else:
+            if not spacing_item.ok or not items[3].ok:
+                raise ValueError("tickSpacing()/fee() reverted")
+            tick_spacing = decode_words(spacing_item.result)[0]
+            fee = decode_words(items[3].result)[0]
+
+        return PoolState(
+            pool_address=address,
+            sqrt_price_x96=head_words[0],
+            tick=to_signed(head_words[1]),
+            liquidity=liquidity,
+            fee=fee,
+            tick_spacing=to_signed(tick_spacing),
+            block_number=block_number,
+            fee_one_for_zero=fee_one_for_zero,
+        )
+
+    def _words_around(self, state: PoolState) -> list[int]:
+        """Bitmap word positions within word_radius of the current tick."""
+        word, _ = v3_math.tick_position(v3_math.compress_tick(state.tick, state.tick_spacing))
+        return list(range(
+            max(word - self.word_radius, -(1 << 15)),
+            min(word + self.word_radius, (1 << 15) - 1) + 1,
+        ))
+
+    async def _load_words(
+        self,
+        states: dict[str, PoolState],
+        words_by_pool: dict[str, list[int]],
+        block_tag: str,
+        undo_by_pool: dict[str, _PoolUndo] | None = None,
+    ) -> None:
+        """Fetch bitmap words and the ticks they mark initialized into states."""
+        word_calls: list[tuple[str, int]] = [
+            (address, word)
+            for address, words in words_by_pool.items()
+            for word in words
+            if word not in states[address].tick_bitmap
+        ]
+        if not word_calls:
+            return
+
+        items = await self.provider.eth_call_batch([
+            (address, encode_int_arg(
+                SELECTOR_TICK_TABLE if self._dex_type(address) == DexType.ALGEBRA
+                else SELECTOR_TICK_BITMAP, word,
+            ))
+            for address, word in word_calls
+        ], block=block_tag)
+
+        loaded: list[tuple[str, int, int]] = []
+        for (address, word), item in zip(word_calls, items):
+            if not item.ok:
+                logger.debug(f"Bitmap word {word} of {address} failed: {item.error}")
+                continue
+            loaded.append((address, word, decode_words(item.result)[0]))
+
+        tick_calls: list[tuple[str, int]] = []
+        for address, word, bits in loaded:
+            spacing = states[address].tick_spacing
+            for bit in range(256):
+                if bits >> bit & 1:
+                    tick_calls.append((address, ((word << 8) + bit) * spacing))
+
+        tick_items = await self.provider.eth_call_batch(
+            [(address, encode_int_arg(SELECTOR_TICKS, tick)) for address, tick in tick_calls],
+            block=block_tag,
+        ) if tick_calls else []
+
+        ticks: dict[tuple[str, int], TickInfo] = {}
+        failed_words: set[tuple[str, int]] = set()
+        for (address, tick), item in zip(tick_calls, tick_items):
+            word, _ = v3_math.tick_position(v3_math.compress_tick(tick, states[address].tick_spacing))
+            if not item.ok:
+                failed_words.add((address, word))
+                continue
+            # ticks(): liquidityGross/Total, liquidityNet/Delta, ...
+            words = decode_words(item.result)
+            ticks[(address, tick)] = TickInfo(words[0], to_signed(words[1]))
+
+        # A word is cached only if all of its ticks are
+        for address, word, bits in loaded:
+            if (address, word) in failed_words:
+                continue
+            state = states[address]
+            undo = undo_by_pool.get(address) if undo_by_pool else None
+            if undo is not None:
+                undo.words.setdefault(word, None)
+            state.tick_bitmap[word] = bits
+            for bit in range(256):
+                if bits >> bit & 1:
+                    tick = ((word << 8) + bit) * state.tick_spacing
+                    if undo is not None:
+                        undo.ticks.setdefault(tick, state.ticks.get(tick))
+                    state.ticks[tick] = ticks[(address, tick)]
+
+    def _dex_type(self, address: str) -> DexType:
+        return self._dex_types.get(address, DexType.UNISWAP_V3)
+
+    # -------------------------------------------------------------------------
+    # Incremental updates
+    # -------------------------------------------------------------------------
+
+    async def advance(self, head: BlockState) -> None:
+        """
+        Bring the store up to a new head, rolling back first on a reorg.
+
+        A reorg is detected when the head is at or below synced_block with
+        a different hash, or when its parent hash differs from the one seen.
+        """
+        if self.synced_block is None:
+            return
+
+        n = head.block_number
+        reorged = False
+        if n <= self.synced_block:
+            known = self._block_hashes.get(n)
+            reorged = head.block_hash is not None and known is not None and known != head.block_hash
+            if not reorged:
+                return
+        elif head.parent_hash is not None:
+            known_parent = self._block_hashes.get(n - 1)
+            reorged = known_parent is not None and known_parent != head.parent_hash
+
+        if reorged:
+            fork_block = await self._find_fork_block(min(n, self.synced_block + 1) - 1)
+            logger.warning(
+                f"Reorg at head {n}: rolling back to {fork_block}",
+                extra={"context": {"chain_id": self.chain_id, "synced": self.synced_block}},
+            )
+            if not self.rollback(fork_block):
+                return
+
+        if head.block_hash:
+            self._block_hashes[n] = head.block_hash
+        await self.sync(n)
+
+    async def _find_fork_block(self, upto: int) -> int:
+        """Highest known block <= upto whose hash is still canonical."""
+        candidates = sorted(
+            (b for b in self._block_hashes if b <= upto), reverse=True
+        )
+        if not candidates:
+            return upto
+
+        items = await self.provider.call_batch([
+            ("eth_getBlockByNumber", [hex(b), False]) for b in candidates
+        ])
+        for block, item in zip(candidates, items):
+            if item.ok and item.result and item.result.get("hash") == self._block_hashes[block]:
+                return block
+        return (self.checkpoint_block or upto) - 1
+
+    async def sync(self, to_block: int) -> None:
+        """Apply logs for (synced_block, to_block] via eth_getLogs ranges."""
+        if self.synced_block is None or to_block <= self.synced_block:
+            return
+
+        addresses = self.pools
+        start = self.synced_block + 1
+        while start <= to_block:
+            end = min(start + self.log_block_range - 1, to_block)
+            logs = []
+            if addresses:
+                response = await self.provider.get_logs(
+                    addresses, [POOL_EVENT_TOPICS], start, end
+                )
+                logs = response.result or []
+            self.apply_logs(logs, end)
+            start = end + 1
+
+        await self._extend_coverage()
+
+    def apply_logs(self, logs: list[dict], to_block: int) -> None:
+        """
+        Apply raw logs and mark the store synced through to_block.
+
+        Logs may come from eth_getLogs or a WS subscription; the caller
+        buffers a block's logs before applying it. Logs flagged removed
+        roll the store back to the block before them first.
+        """
+        if self.synced_block is None:
+            return
+
+        events = [e for e in (parse_pool_log(log) for log in logs) if e is not None]
+        removed = [e.block_number for e in events if e.removed]
+        if removed and not self.rollback(min(removed) - 1):
+            return
+
+        events = sorted(
+            (e for e in events if not e.removed and e.block_number > self.synced_block),
+            key=lambda e: (e.block_number, e.log_index),
+        )
+        for event in events:
+            if event.pool_address not in self._states:
+                continue
+            block_undo = self._journal.setdefault(event.block_number, {})
+            self._apply_event(event, block_undo)
+            if event.block_hash:
+                self._block_hashes[event.block_number] = event.block_hash
+            self.logs_applied += 1
+
+        self.synced_block = max(self.synced_block, to_block)
+        for state in self._states.values():
+            state.block_number = self.synced_block
+        self._prune()
+
+    def _apply_event(self, event: PoolEvent, block_undo: dict[str, _PoolUndo]) -> None:
+        """Apply one event, journaling first-touch values for the block."""
+        state = self._states[event.pool_address]
+        undo = block_undo.get(event.pool_address)
+        if undo is None:
+            undo = _PoolUndo(
+                sqrt_price_x96=state.sqrt_price_x96,
+                tick=state.tick,
+                liquidity=state.liquidity,
+                fee=state.fee,
+                fee_one_for_zero=state.fee_one_for_zero,
+            )
+            block_undo[event.pool_address] = undo
+
+        if event.kind == "swap":
+            state.sqrt_price_x96 = event.sqrt_price_x96
+            state.liquidity = event.liquidity
+            state.tick = event.tick
+        elif event.kind in ("mint", "burn"):
+            delta = event.amount if event.kind == "mint" else -event.amount
+            if delta == 0:
+                return  # Burn(0) pokes fees only
+            self._update_tick(state, undo, event.tick_lower, delta, delta)
+            self._update_tick(state, undo, event.tick_upper, delta, -delta)
+            if event.tick_lower <= state.tick < event.tick_upper:
+                state.liquidity += delta
+        elif event.kind == "fee":
+            state.fee = event.fee
+            state.fee_one_for_zero = event.fee_one_for_zero
+
+    def _update_tick(
+        self,
+        state: PoolState,
+        undo: _PoolUndo,
+        tick: int,
+        delta_gross: int,
+        delta_net: int,
+    ) -> None:
+        """Mirror Tick.update + TickBitmap.flipTick for a cached word."""
+        word, bit = v3_math.tick_position(v3_math.compress_tick(tick, state.tick_spacing))
+        if word not in state.tick_bitmap:
+            return  # Not cached: the simulator refuses to walk into it anyway
+
+        undo.ticks.setdefault(tick, state.ticks.get(tick))
+        undo.words.setdefault(word, state.tick_bitmap[word])
+
+        # TickInfo objects are replaced, never mutated, so undo entries stay valid
+        info = state.ticks.get(tick)
+        gross_before = info.liquidity_gross if info else 0
+        gross_after = gross_before + delta_gross
+        if gross_after == 0:
+            state.ticks.pop(tick, None)
+        else:
+            net_before = info.liquidity_net if info else 0
+            state.ticks[tick] = TickInfo(gross_after, net_before + delta_net)
+
+        if (gross_before == 0) != (gross_after == 0):
+            state.tick_bitmap[word] ^= 1 << bit
+
+    async def _extend_coverage(self) -> None:
+        """Load bitmap words the price has moved next to (journaled at synced_block)."""
+        missing = {
+            address: [w for w in self._words_around(state) if w not in state.tick_bitmap]
+            for address, state in self._states.items()
+        }
+        missing = {a: words for a, words in missing.items() if words}
+        if not missing:
+            return
+
+        block_undo = self._journal.setdefault(self.synced_block, {})
+        undo_by_pool = {}
+        for address in missing:
+            state = self._states[address]
+            undo_by_pool[address] = block_undo.setdefault(address, _PoolUndo(
+                sqrt_price_x96=state.sqrt_price_x96,
+                tick=state.tick,
+                liquidity=state.liquidity,
+                fee=state.fee,
+                fee_one_for_zero=state.fee_one_for_zero,
+            ))
+        await self._load_words(self._states, missing, hex(self.synced_block), undo_by_pool)
+
+    # -------------------------------------------------------------------------
+    # Reorgs and views
+    # -------------------------------------------------------------------------
+
+    def rollback(self, block_number: int) -> bool:
+        """
+        Unwind the store to the state after block_number.
+
+        Returns:
+            False if block_number is older than the checkpoint; the store is
+            then cleared and must be bootstrapped again
+        """
+        if self.synced_block is None or block_number >= self.synced_block:
+            return True
+
+        self.reorgs += 1
+        if block_number < self.checkpoint_block:
+            logger.warning(
+                f"Rollback to {block_number} is past checkpoint {self.checkpoint_block}; clearing pool state",
+                extra={"context": {"chain_id": self.chain_id}},
+            )
+            self._reset()
+            return False
+
+        for block in sorted(self._journal, reverse=True):
+            if block <= block_number:
+                break
+            for address, undo in self._journal.pop(block).items():
+                if address in self._states:
+                    self._restore(self._states[address], undo)
+
+        for address in [a for a, b in self._bootstrap_block.items() if b > block_number]:
+            self._drop(address)
+        for block in [b for b in self._block_hashes if b > block_number]:
+            del self._block_hashes[block]
+
+        self.synced_block = block_number
+        for state in self._states.values():
+            state.block_number = block_number
+        return True
+
+    def state_at(self, pool_address: str, block_number: int) -> PoolState:
+        """
+        Pool state as of block_number (read-only).
+
+        Returns the live object at synced_block, or an unwound copy for an
+        older block within the journal.
+
+        Raises:
+            QuoteError: POOL_STATE_INCOMPLETE if the pool is not cached or
+                the block is outside [checkpoint_block, synced_block]
+        """
+        address = pool_address.lower()
+        state = self._states.get(address)
+        if state is None:
+            raise QuoteError(
+                code=ErrorCode.POOL_STATE_INCOMPLETE,
+                message="Pool state not cached",
+                details={"pool": address, "chain_id": self.chain_id},
+            )
+
+        oldest = max(self.checkpoint_block, self._bootstrap_block[address])
+        if not oldest <= block_number <= self.synced_block:
+            raise QuoteError(
+                code=ErrorCode.POOL_STATE_INCOMPLETE,
+                message=f"Pool state covers blocks {oldest}..{self.synced_block}, pinned {block_number}",
+                details={"pool": address, "block_number": block_number, "synced_block": self.synced_block},
+            )
+
+        if block_number == self.synced_block:
+            return state
+
+        view = state.copy()
+        for block in sorted(self._journal, reverse=True):
+            if block <= block_number:
+                break
+            undo = self._journal[block].get(address)
+            if undo is not None:
+                self._restore(view, undo)
+        view.block_number = block_number
+        return view
+
+    @staticmethod
+    def _restore(state: PoolState, undo: _PoolUndo) -> None:
+        state.sqrt_price_x96 = undo.sqrt_price_x96
+        state.tick = undo.tick
+        state.liquidity = undo.liquidity
+        state.fee = undo.fee
+        state.fee_one_for_zero = undo.fee_one_for_zero
+        for tick, info in undo.ticks.items():
+            if info is None:
+                state.ticks.pop(tick, None)
+            else:
+                state.ticks[tick] = info
+        for word, bits in undo.words.items():
+            if bits is None:
+                state.tick_bitmap.pop(word, None)
+            else:
+                state.tick_bitmap[word] = bits
+
+    def _prune(self) -> None:
+        """Drop journal entries and hashes older than the checkpoint."""
+        checkpoint = self.checkpoint_block
+        for block in [b for b in self._journal if b <= checkpoint]:
+            del self._journal[block]
+        for block in [b for b in self._block_hashes if b < checkpoint]:
+            del self._block_hashes[block]
+
+    def _drop(self, address: str) -> None:
+        self._states.pop(address, None)
+        self._dex_types.pop(address, None)
+        self._bootstrap_block.pop(address, None)
+
+    def _reset(self) -> None:
+        self._states.clear()
+        self._dex_types.clear()
+        self._bootstrap_block.clear()
+        self._journal.clear()
+        self._block_hashes.clear()
+        self.synced_block = None
+        self._base_block = None
+
+    def get_stats(self) -> dict:
+        """Get store statistics."""
+        return {
+            "chain_id": self.chain_id,
+            "pools": len(self._states),
+            "synced_block": self.synced_block,
+            "checkpoint_block": self.checkpoint_block,
+            "journal_blocks": len(self._journal),
+            "logs_applied": self.logs_applied,
+            "reorgs": self.reorgs,
+        }
@@ -0,0 +1,418 @@
+"""
+dex/v3_math.py - Exact Uniswap V3 integer math.
+
+Bit-exact ports of the v3-core libraries used by Pool.swap:
+- TickMath (tick <-> sqrtPriceX96)
+- FullMath / UnsafeMath (mulDiv with rounding)
+- SqrtPriceMath (amount deltas, next sqrt price)
+- SwapMath.computeSwapStep
+- TickBitmap.nextInitializedTickWithinOneWord
+- PoolTicksCounter.countInitializedTicksCrossed (QuoterV2's ticks_crossed)
+
+CRITICAL: Integers only. Solidity overflow branches that change rounding
+are reproduced so results match the on-chain quoter to the wei.
+"""
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+Q96 = 1 << 96
+MAX_UINT256 = (1 << 256) - 1
+MAX_UINT160 = (1 << 160) - 1
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+
+FEE_DENOMINATOR = 1_000_000  # Fees in hundredths of a bip (pips)
+
+
+# =============================================================================
+# FULL MATH
+# =============================================================================
+
+def mul_div(a: int, b: int, denominator: int) -> int:
+    """floor(a * b / denominator), reverting (ValueError) like FullMath on overflow."""
+    if denominator == 0:
+        raise ValueError("mul_div: division by zero")
+    result = a * b // denominator
+    if result > MAX_UINT256:
+        raise ValueError("mul_div: result overflows uint256")
+    return result
+
+
+def mul_div_rounding_up(a: int, b: int, denominator: int) -> int:
+    """ceil(a * b / denominator)."""
+    if denominator == 0:
+        raise ValueError("mul_div_rounding_up: division by zero")
+    result = -(-(a * b) // denominator)
+    if result > MAX_UINT256:
+        raise ValueError("mul_div_rounding_up: result overflows uint256")
+    return result
+
+
+def div_rounding_up(x: int, y: int) -> int:
+    """ceil(x / y) for unsigned x, y > 0 (UnsafeMath.divRoundingUp)."""
+    return -(-x // y)
+
+
+# =============================================================================
+# TICK MATH
+# =============================================================================
+
+_TICK_RATIO_FACTORS = (
+    (0x2, 0xfff97272373d413259a46990580e213a),
+    (0x4, 0xfff2e50f5f656932ef12357cf3c7fdcc),
+    (0x8, 0xffe5caca7e10e4e61c3624eaa0941cd0),
+    (0x10, 0xffcb9843d60f6159c9db58835c926644),
+    (0x20, 0xff973b41fa98c081472e6896dfb254c0),
+    (0x40, 0xff2ea16466c96a3843ec78b326b52861),
+    (0x80, 0xfe5dee046a99a2a811c461f1969c3053),
+    (0x100, 0xfcbe86c7900a88aedcffc83b479aa3a4),
+    (0x200, 0xf987a7253ac413176f2b074cf7815e54),
+    (0x400, 0xf3392b0822b70005940c7a398e4b70f3),
+    (0x800, 0xe7159475a2c29b7443b29c7fa6e889d9),
+    (0x1000, 0xd097f3bdfd2022b8845ad8f792aa5825),
+    (0x2000, 0xa9f746462d870fdf8a65dc1f90e061e5),
+    (0x4000, 0x70d869a156d2a1b890bb3df62baf32f7),
+    (0x8000, 0x31be135f97d08fd981231505542fcfa6),
+    (0x10000, 0x9aa508b5b7a84e1c677de54f3e99bc9),
+    (0x20000, 0x5d6af8dedb81196699c329225ee604),
+    (0x40000, 0x2216e584f5fa1ea926041bedfe98),
+    (0x80000, 0x48a170391f7dc42444e8fa2),
+)
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """sqrt(1.0001^tick) * 2^96 as a Q64.96, rounded up (TickMath.getSqrtRatioAtTick)."""
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError(f"tick out of range: {tick}")
+
+    ratio = (
+        0xfffcb933bd6fad37aa2d162d1a594001
+        if abs_tick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    for bit, factor in _TICK_RATIO_FACTORS:
+        if abs_tick & bit:
+            ratio = (ratio * factor) >> 128
+
+    if tick > 0:
+        ratio = MAX_UINT256 // ratio
+
+    # Q128.128 -> Q64.96, rounding up
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """
+    Greatest tick whose sqrt ratio is <= sqrt_price_x96 (TickMath.getTickAtSqrtRatio).
+
+    Solved by binary search over get_sqrt_ratio_at_tick, which is exact by
+    definition of the on-chain result.
+    """
+    if not (MIN_SQRT_RATIO <= sqrt_price_x96 < MAX_SQRT_RATIO):
+        raise ValueError(f"sqrt price out of range: {sqrt_price_x96}")
+
+    low, high = MIN_TICK, MAX_TICK
+    while low < high:
+        mid = (low + high + 1) >> 1
+        if get_sqrt_ratio_at_tick(mid) <= sqrt_price_x96:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+# =============================================================================
+# SQRT PRICE MATH
+# =============================================================================
+
+def get_next_sqrt_price_from_amount0_rounding_up(
+    sqrt_price_x96: int, liquidity: int, amount: int, add: bool,
+) -> int:
+    """Next sqrt price after adding/removing amount of token0, rounded up."""
+    if amount == 0:
+        return sqrt_price_x96
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price_x96
+
+    if add:
+        # On-chain precise path only when product and sum fit in uint256
+        if product <= MAX_UINT256:
+            denominator = numerator1 + product
+            if denominator <= MAX_UINT256:
+                return mul_div_rounding_up(numerator1, sqrt_price_x96, denominator)
+        return div_rounding_up(numerator1, numerator1 // sqrt_price_x96 + amount)
+
+    if product > MAX_UINT256 or numerator1 <= product:
+        raise ValueError("insufficient token0 liquidity for output")
+    result = mul_div_rounding_up(numerator1, sqrt_price_x96, numerator1 - product)
+    if result > MAX_UINT160:
+        raise ValueError("sqrt price overflows uint160")
+    return result
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(
+    sqrt_price_x96: int, liquidity: int, amount: int, add: bool,
+) -> int:
+    """Next sqrt price after adding/removing amount of token1, rounded down."""
+    if add:
+        quotient = (amount << 96) // liquidity
+        result = sqrt_price_x96 + quotient
+        if result > MAX_UINT160:
+            raise ValueError("sqrt price overflows uint160")
+        return result
+
+    quotient = div_rounding_up(amount << 96, liquidity)
+    if sqrt_price_x96 <= quotient:
+        raise ValueError("insufficient token1 liquidity for output")
+    return sqrt_price_x96 - quotient
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int, liquidity: int, amount_in: int, zero_for_one: bool,
+) -> int:
+    """Next sqrt price given an input amount."""
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("price and liquidity must be positive")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96, liquidity, amount_in, True)
+    return get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96, liquidity, amount_in, True)
+
+
+def get_next_sqrt_price_from_output(
+    sqrt_price_x96: int, liquidity: int, amount_out: int, zero_for_one: bool,
+) -> int:
+    """Next sqrt price given an output amount."""
+    if sqrt_price_x96 <= 0 or liquidity <= 0:
+        raise ValueError("price and liquidity must be positive")
+    if zero_for_one:
+        return get_next_sqrt_price_from_amount1_rounding_down(sqrt_price_x96, liquidity, amount_out, False)
+    return get_next_sqrt_price_from_amount0_rounding_up(sqrt_price_x96, liquidity, amount_out, False)
+
+
+def get_amount0_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token0 amount between two sqrt prices for a liquidity."""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if sqrt_a <= 0:
+        raise ValueError("sqrt price must be positive")
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_b - sqrt_a
+    if round_up:
+        return div_rounding_up(mul_div_rounding_up(numerator1, numerator2, sqrt_b), sqrt_a)
+    return mul_div(numerator1, numerator2, sqrt_b) // sqrt_a
+
+
+def get_amount1_delta(sqrt_a: int, sqrt_b: int, liquidity: int, round_up: bool) -> int:
+    """Token1 amount between two sqrt prices for a liquidity."""
+    if sqrt_a > sqrt_b:
+        sqrt_a, sqrt_b = sqrt_b, sqrt_a
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_b - sqrt_a, Q96)
+    return mul_div(liquidity, sqrt_b - sqrt_a, Q96)
+
+
+# =============================================================================
+# SWAP MATH
+# =============================================================================
+
+def compute_swap_step(
+    sqrt_price_current_x96: int,
+    sqrt_price_target_x96: int,
+    liquidity: int,
+    amount_remaining: int,
+    fee_pips: int,
+) -> tuple[int, int, int, int]:
+    """
+    One swap step within a single tick range (SwapMath.computeSwapStep).
+
+    amount_remaining > 0 is exact input, < 0 exact output.
+
+    Returns:
+        (sqrt_price_next_x96, amount_in, amount_out, fee_amount)
+    """
+    zero_for_one = sqrt_price_current_x96 >= sqrt_price_target_x96
+    exact_in = amount_remaining >= 0
+
+    amount_in = 0
+    amount_out = 0
+
+    if exact_in:
+        amount_remaining_less_fee = mul_div(amount_remaining, FEE_DENOMINATOR - fee_pips, FEE_DENOMINATOR)
+        amount_in = (
+            get_amount0_delta(sqrt_price_target_x96, sqrt_price_current_x96, liquidity, True)
+            if zero_for_one
+            else get_amount1_delta(sqrt_price_current_x96, sqrt_price_target_x96, liquidity, True)
+        )
+        if amount_remaining_less_fee >= amount_in:
+            sqrt_price_next = sqrt_price_target_x96
+        else:
+            sqrt_price_next = get_next_sqrt_price_from_input(
+                sqrt_price_current_x96, liquidity, amount_remaining_less_fee, zero_for_one
+            )
+    else:
+        amount_out = (
+            get_amount1_delta(sqrt_price_target_x96, sqrt_price_current_x96, liquidity, False)
+            if zero_for_one
+            else get_amount0_delta(sqrt_price_current_x96, sqrt_price_target_x96, liquidity, False)
+        )
+        if -amount_remaining >= amount_out:
+            sqrt_price_next = sqrt_price_target_x96
+        else:
+            sqrt_price_next = get_next_sqrt_price_from_output(
+                sqrt_price_current_x96, liquidity, -amount_remaining, zero_for_one
+            )
+
+    reached_target = sqrt_price_target_x96 == sqrt_price_next
+
+    if zero_for_one:
+        if not (reached_target and exact_in):
+            amount_in = get_amount0_delta(sqrt_price_next, sqrt_price_current_x96, liquidity, True)
+        if not (reached_target and not exact_in):
+            amount_out = get_amount1_delta(sqrt_price_next, sqrt_price_current_x96, liquidity, False)
+    else:
+        if not (reached_target and exact_in):
+            amount_in = get_amount1_delta(sqrt_price_current_x96, sqrt_price_next, liquidity, True)
+        if not (reached_target and not exact_in):
+            amount_out = get_amount0_delta(sqrt_price_current_x96, sqrt_price_next, liquidity, False)
+
+    # Cap output at the requested amount
+    if not exact_in and amount_out > -amount_remaining:
+        amount_out = -amount_remaining
+
+    if exact_in and sqrt_price_next != sqrt_price_target_x96:
+        # Didn't reach the target: the remainder is all fee
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, FEE_DENOMINATOR - fee_pips)
+
+    return sqrt_price_next, amount_in, amount_out, fee_amount
+
+
+# =============================================================================
+# TICK BITMAP
+# =============================================================================
+
+def tick_position(compressed: int) -> tuple[int, int]:
+    """(word_pos, bit_pos) of a compressed tick (TickBitmap.position)."""
+    return compressed >> 8, compressed % 256
+
+
+def compress_tick(tick: int, tick_spacing: int) -> int:
+    """Tick / spacing rounded toward negative infinity."""
+    return tick // tick_spacing
+
+
+def most_significant_bit(x: int) -> int:
+    return x.bit_length() - 1
+
+
+def least_significant_bit(x: int) -> int:
+    return (x & -x).bit_length() - 1
+
+
+def next_initialized_tick_within_one_word(
+    tick_bitmap: dict[int, int],
+    tick: int,
+    tick_spacing: int,
+    lte: bool,
+) -> tuple[int, bool, int]:
+    """
+    Next initialized tick in the same bitmap word (or the word boundary).
+
+    Args:
+        tick_bitmap: word_pos -> 256-bit word
+        lte: Search to the left (zeroForOne)
+
+    Returns:
+        (next_tick, initialized, word_pos) - word_pos is the word read,
+        so callers can tell whether it was actually cached
+
+    Raises:
+        KeyError: If the needed word is not in tick_bitmap
+    """
+    compressed = compress_tick(tick, tick_spacing)
+
+    if lte:
+        word_pos, bit_pos = tick_position(compressed)
+        mask = (1 << bit_pos) - 1 + (1 << bit_pos)
+        masked = tick_bitmap[word_pos] & mask
+        initialized = masked != 0
+        if initialized:
+            next_tick = (compressed - (bit_pos - most_significant_bit(masked))) * tick_spacing
+        else:
+            next_tick = (compressed - bit_pos) * tick_spacing
+    else:
+        word_pos, bit_pos = tick_position(compressed + 1)
+        mask = MAX_UINT256 ^ ((1 << bit_pos) - 1)
+        masked = tick_bitmap[word_pos] & mask
+        initialized = masked != 0
+        if initialized:
+            next_tick = (compressed + 1 + (least_significant_bit(masked) - bit_pos)) * tick_spacing
+        else:
+            next_tick = (compressed + 1 + (255 - bit_pos)) * tick_spacing
+
+    return next_tick, initialized, word_pos
+
+
+def count_initialized_ticks_crossed(
+    tick_bitmap: dict[int, int],
+    tick_spacing: int,
+    tick_before: int,
+    tick_after: int,
+) -> int:
+    """
+    Initialized ticks crossed between two ticks, as QuoterV2 reports it
+    (PoolTicksCounter.countInitializedTicksCrossed).
+
+    Note Solidity's tick / spacing truncates toward zero here, unlike
+    TickBitmap, and missing words count as empty.
+    """
+    def position(t: int) -> tuple[int, int]:
+        compressed = t // tick_spacing if t >= 0 else -((-t) // tick_spacing)
+        return compressed >> 8, compressed % 256
+
+    word_pos, bit_pos = position(tick_before)
+    word_pos_after, bit_pos_after = position(tick_after)
+
+    tick_after_initialized = (
+        bool(tick_bitmap.get(word_pos_after, 0) & (1 << bit_pos_after))
+        and _sol_mod(tick_after, tick_spacing) == 0
+        and tick_before > tick_after
+    )
+    tick_before_initialized = (
+        bool(tick_bitmap.get(word_pos, 0) & (1 << bit_pos))
+        and _sol_mod(tick_before, tick_spacing) == 0
+        and tick_before < tick_after
+    )
+
+    if word_pos < word_pos_after or (word_pos == word_pos_after and bit_pos <= bit_pos_after):
+        word_lower, bit_lower, word_higher, bit_higher = word_pos, bit_pos, word_pos_after, bit_pos_after
+    else:
+        word_lower, bit_lower, word_higher, bit_higher = word_pos_after, bit_pos_after, word_pos, bit_pos
+
+    crossed = 0
+    mask = (MAX_UINT256 << bit_lower) & MAX_UINT256
+    while word_lower <= word_higher:
+        if word_lower == word_higher:
+            mask &= MAX_UINT256 >> (255 - bit_higher)
+        crossed += bin(tick_bitmap.get(word_lower, 0) & mask).count("1")
+        word_lower += 1
+        mask = MAX_UINT256
+
+    if tick_after_initialized:
+        crossed -= 1
+    if tick_before_initialized:
+        crossed -= 1
+    return crossed
+
+
+def _sol_mod(a: int, b: int) -> int:
+    """Solidity signed modulo (sign follows the dividend)."""
+    r = abs(a) % abs(b)
+    return -r if a < 0 else r
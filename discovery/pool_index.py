@@ -0,0 +1,317 @@
+"""
+discovery/pool_index.py - On-chain existence and liquidity index for pool candidates.
+
+The registry emits one candidate per pair x DEX x fee tier; many of those
+pools were never deployed or hold no liquidity, and quoting them only
+produces QUOTE_REVERT rejects. PoolIndex resolves each candidate once:
+
+1. Address: CREATE2 (dex/pool_address.py) or factory getPool/poolByPair
+2. Existence: batched eth_getCode
+3. Liquidity probe: batched liquidity()
+
+Results are cached to disk (JSON) with a TTL so restarts don't re-probe.
+Infra failures never prune: a candidate is dropped only on a definite
+"no code" / "zero liquidity" answer.
+"""
+
+import json
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from core.constants import DexType, PoolStatus, DEFAULT_POOL_INDEX_TTL_SECONDS
+from core.logging import get_logger
+from core.time import now_ms
+from chains.providers import RPCProvider
+from dex.pool_address import compute_pool_address, sort_tokens
+from discovery.registry import PoolCandidate, PoolRegistry
+from discovery.registry_store import RegistryStore
+
+logger = get_logger(__name__)
+
+
+# keccak256("getPool(address,address,uint24)")[:4]
+SELECTOR_GET_POOL = "0x1698ee82"
+# keccak256("poolByPair(address,address)")[:4] - Algebra factory
+SELECTOR_POOL_BY_PAIR = "0xd9a641e1"
+# keccak256("liquidity()")[:4]
+SELECTOR_LIQUIDITY = "0x1a686502"
+
+ZERO_ADDRESS = "0x" + "0" * 40
+
+
+def _address_arg(address: str) -> str:
+    return address.lower().replace("0x", "").zfill(64)
+
+
+@dataclass
+class PoolIndexEntry:
+    """Probe result for one candidate."""
+    pool_address: str  # "" if the factory has no pool
+    exists: bool
+    liquidity: int
+    checked_at_ms: int
+
+    @property
+    def alive(self) -> bool:
+        return self.exists and self.liquidity > 0
+
+    def to_dict(self) -> dict:
+        return {
+            "pool_address": self.pool_address,
+            "exists": self.exists,
+            "liquidity": str(self.liquidity),  # uint128 - keep exact in JSON
+            "checked_at_ms": self.checked_at_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PoolIndexEntry":
+        return cls(
+            pool_address=data["pool_address"],
+            exists=data["exists"],
+            liquidity=int(data["liquidity"]),
+            checked_at_ms=data["checked_at_ms"],
+        )
+
+
+class PoolIndex:
+    """
+    Per-chain cache of pool addresses, existence and liquidity.
+
+    Usage:
+        index = PoolIndex(provider, cache_path=Path("data/pool_index/arbitrum_one.json"))
+        alive = await index.prune(candidates, dex_configs)
+    """
+
+    def __init__(
+        self,
+        provider: RPCProvider,
+        cache_path: Path | None = None,
+        ttl_seconds: int = DEFAULT_POOL_INDEX_TTL_SECONDS,
+    ):
+        self.provider = provider
+        self.cache_path = cache_path
+        self.ttl_ms = ttl_seconds * 1000
+        self._entries: dict[str, PoolIndexEntry] = {}
+
+        # Stats
+        self.probed = 0
+        self.cache_hits = 0
+
+        self._load()
+
+    @staticmethod
+    def candidate_key(candidate: PoolCandidate) -> str:
+        """Stable key: chain, DEX, sorted tokens, fee."""
+        pool = candidate.pool
+        token0, token1 = sort_tokens(pool.token0.address, pool.token1.address)
+        return f"{pool.chain_id}:{candidate.dex_key}:{token0}:{token1}:{pool.fee}".lower()
+
+    def get(self, candidate: PoolCandidate) -> PoolIndexEntry | None:
+        """Cached entry if still fresh."""
+        entry = self._entries.get(self.candidate_key(candidate))
+        if entry is None or now_ms() - entry.checked_at_ms > self.ttl_ms:
+            return None
+        return entry
+
+    async def refresh(
+        self,
+        candidates: list[PoolCandidate],
+        dex_configs: dict,
+    ) -> None:
+        """
+        Probe candidates that have no fresh cache entry.
+
+        Args:
+            candidates: Candidates of one chain (this provider)
+            dex_configs: config/dexes.yaml section for that chain
+        """
+        stale: list[PoolCandidate] = []
+        for candidate in candidates:
+            if self.get(candidate) is not None:
+                self.cache_hits += 1
+            else:
+                stale.append(candidate)
+        if not stale:
+            return
+
+        addresses = await self._resolve_addresses(stale, dex_configs)
+
+        # Existence: eth_getCode for every resolved address
+        with_address = [(c, a) for c, a in zip(stale, addresses) if a]
+        code_items = await self.provider.call_batch([
+            ("eth_getCode", [address, "latest"]) for _, address in with_address
+        ]) if with_address else []
+
+        deployed: list[tuple[PoolCandidate, str]] = []
+        checked_at = now_ms()
+        for (candidate, address), item in zip(with_address, code_items):
+            if not item.ok:
+                continue  # Unknown - probe again next time
+            if item.result in (None, "0x", "0x0"):
+                self._entries[self.candidate_key(candidate)] = PoolIndexEntry(address, False, 0, checked_at)
+            else:
+                deployed.append((candidate, address))
+
+        # Factory said "no pool": definite
+        for candidate, address in zip(stale, addresses):
+            if address == "":
+                self._entries[self.candidate_key(candidate)] = PoolIndexEntry("", False, 0, checked_at)
+
+        # Liquidity probe for deployed pools
+        liquidity_items = await self.provider.eth_call_batch(
+            [(address, SELECTOR_LIQUIDITY) for _, address in deployed]
+        ) if deployed else []
+        for (candidate, address), item in zip(deployed, liquidity_items):
+            if not item.ok or not item.result or item.result == "0x":
+                continue
+            self._entries[self.candidate_key(candidate)] = PoolIndexEntry(
+                address, True, int(item.result[2:66], 16), checked_at
+            )
+
+        self.probed += len(stale)
+        self._save()
+
+    async def _resolve_addresses(
+        self,
+        candidates: list[PoolCandidate],
+        dex_configs: dict,
+    ) -> list[str | None]:
+        """
+        Pool address per candidate.
+
+        Returns:
+            Address, "" if the factory has no pool, None if unresolved
+        """
+        addresses: list[str | None] = []
+        lookups: list[tuple[int, str, str]] = []  # (index, factory, call data)
+
+        for i, candidate in enumerate(candidates):
+            pool = candidate.pool
+            dex_config = dex_configs.get(candidate.dex_key, {})
+            address = pool.pool_address or compute_pool_address(
+                dex_config, pool.token0.address, pool.token1.address, pool.fee
+            )
+            addresses.append(address)
+            if address:
+                continue
+
+            factory = dex_config.get("factory")
+            if not factory:
+                continue
+            token0, token1 = sort_tokens(pool.token0.address, pool.token1.address)
+            if pool.dex_type == DexType.ALGEBRA:
+                data = f"{SELECTOR_POOL_BY_PAIR}{_address_arg(token0)}{_address_arg(token1)}"
+            else:
+                data = f"{SELECTOR_GET_POOL}{_address_arg(token0)}{_address_arg(token1)}{pool.fee:064x}"
+            lookups.append((i, factory, data))
+
+        if lookups:
+            items = await self.provider.eth_call_batch([(f, d) for _, f, d in lookups])
+            for (i, _, _), item in zip(lookups, items):
+                if item.ok and item.result and len(item.result) >= 66:
+                    address = "0x" + item.result[-40:]
+                    addresses[i] = "" if address == ZERO_ADDRESS else address
+
+        return addresses
+
+    async def prune(
+        self,
+        candidates: list[PoolCandidate],
+        dex_configs: dict,
+    ) -> list[PoolCandidate]:
+        """
+        Refresh, then keep live candidates (with pool_address filled in).
+
+        Candidates whose probe failed are kept unchanged.
+        """
+        await self.refresh(candidates, dex_configs)
+
+        kept = []
+        for candidate in candidates:
+            entry = self.get(candidate)
+            if entry is None:
+                kept.append(candidate)
+                continue
+            if not entry.alive:
+                continue
+            if candidate.pool.pool_address != entry.pool_address:
+                candidate.pool = replace(candidate.pool, pool_address=entry.pool_address)
+            kept.append(candidate)
+        return kept
+
+    def _load(self) -> None:
+        """Load cached entries."""
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+            self._entries = {
+                key: PoolIndexEntry.from_dict(value)
+                for key, value in data.get("entries", {}).items()
+            }
+            logger.info(f"Loaded pool index: {len(self._entries)} entries from {self.cache_path}")
+        except Exception as e:
+            logger.warning(f"Failed to load pool index: {e}")
+
+    def _save(self) -> None:
+        """Persist entries."""
+        if not self.cache_path:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, "w") as f:
+            json.dump({
+                "chain_id": self.provider.chain_id,
+                "entries": {key: entry.to_dict() for key, entry in self._entries.items()},
+            }, f, indent=2)
+
+    def get_stats(self) -> dict:
+        """Get index statistics."""
+        return {
+            "entries": len(self._entries),
+            "alive": sum(1 for e in self._entries.values() if e.alive),
+            "probed": self.probed,
+            "cache_hits": self.cache_hits,
+        }
+
+
+async def prune_registry_chain(
+    registry: PoolRegistry,
+    chain_key: str,
+    dex_configs: dict,
+    index: PoolIndex,
+    store: RegistryStore | None = None,
+) -> dict:
+    """
+    Drop a chain's registry candidates that have no pool or no liquidity.
+
+    With a store, resolved addresses are persisted and probed pools are
+    marked ACTIVE / DEAD in registry.sqlite.
+
+    Returns:
+        Summary with before/after counts and index stats
+    """
+    candidates = registry.get_candidates_for_chain(chain_key)
+    kept = await index.prune(candidates, dex_configs)
+    registry.set_candidates_for_chain(chain_key, kept)
+
+    if store is not None:
+        kept_ids = {id(c) for c in kept}
+        await store.upsert_pools(kept)
+        await store.set_pool_statuses(
+            [(c.pool, PoolStatus.DEAD) for c in candidates if id(c) not in kept_ids]
+            + [(c.pool, PoolStatus.ACTIVE) for c in kept if index.get(c) is not None]
+        )
+
+    summary = {
+        "chain": chain_key,
+        "candidates": len(candidates),
+        "kept": len(kept),
+        "pruned": len(candidates) - len(kept),
+        **index.get_stats(),
+    }
+    logger.info(
+        f"Pool index pruned {summary['pruned']}/{len(candidates)} candidates for {chain_key}",
+        extra={"context": summary},
+    )
+    return summary
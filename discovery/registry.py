@@ -6,8 +6,10 @@ Replaces hardcoded smoke harness with config-driven pool discovery.
 Pipeline:
 1. Parse intent.txt → list of (chain, base, quote) pairs
 2. Resolve token addresses via core_tokens.yaml
-3. Generate pool candidates per DEX/fee tier
-4. Store in registry for scanner consumption
+3. Generate pool candidates per DEX/fee tier (CREATE2 addresses where the
+   DEX config has pool_init_code_hash)
+4. Prune candidates with no pool / no liquidity (discovery/pool_index.py)
+5. Store in registry for scanner consumption
 """
 
 import json
@@ -21,6 +23,7 @@ import yaml
 from core.logging import get_logger
 from core.models import Token, Pool
 from core.constants import DexType, PoolStatus
+from dex.pool_address import compute_pool_address
 
 logger = get_logger(__name__)
 
@@ -188,6 +191,22 @@ class PoolRegistry:
         # Cache
         self._resolved_pairs: list[ResolvedPair] = []
         self._pool_candidates: list[PoolCandidate] = []
+        self._candidates_by_chain: dict[int, list[PoolCandidate]] = {}
+    
+    @property
+    def resolved_pairs(self) -> list[ResolvedPair]:
+        return list(self._resolved_pairs)
+    
+    @property
+    def candidates(self) -> list[PoolCandidate]:
+        return list(self._pool_candidates)
+    
+    def _reindex(self) -> None:
+        """Sort candidates by priority and rebuild the per-chain index."""
+        self._pool_candidates.sort(key=lambda c: c.priority)
+        self._candidates_by_chain = {}
+        for candidate in self._pool_candidates:
+            self._candidates_by_chain.setdefault(candidate.pool.chain_id, []).append(candidate)
     
     def load_intent(self, intent_path: Path) -> int:
         """Load and resolve intent pairs."""
@@ -213,35 +232,45 @@ class PoolRegistry:
         logger.info(f"Resolved {len(self._resolved_pairs)} pairs from intent")
         return len(self._resolved_pairs)
     
-    def generate_pool_candidates(self, chain_key: str | None = None) -> list[PoolCandidate]:
+    def quotable_dexes(self, chain_key: str) -> dict[str, dict]:
+        """DEX configs of a chain that get pool candidates."""
+        return {
+            dex_key: dex_config
+            for dex_key, dex_config in self.dexes_config.get(chain_key, {}).items()
+            if dex_config.get("enabled", False)
+            and dex_config.get("verified_for_quoting", False)
+            # Only V3-style DEXes for now
+            and dex_config.get("adapter_type", "") == "uniswap_v3"
+        }
+    
+    def get_pairs_for_chain(self, chain_key: str) -> list[str]:
+        """Resolved intent pairs of a chain as "BASE/QUOTE"."""
+        return [
+            f"{p.base.symbol}/{p.quote.symbol}" for p in self._resolved_pairs if p.chain_key == chain_key
+        ]
+    
+    def generate_pool_candidates(
+        self,
+        chain_key: str | None = None,
+        pairs: list[ResolvedPair] | None = None,
+    ) -> list[PoolCandidate]:
         """
         Generate pool candidates from resolved pairs.
         
         For each pair + DEX + fee tier, create a pool candidate.
+        
+        Args:
+            chain_key: Only this chain
+            pairs: Only these pairs (default: every resolved pair)
         """
         self._pool_candidates = []
         
-        for resolved in self._resolved_pairs:
+        for resolved in self._resolved_pairs if pairs is None else pairs:
             # Filter by chain if specified
             if chain_key and resolved.chain_key != chain_key:
                 continue
             
-            # Get DEX configs for this chain
-            chain_dexes = self.dexes_config.get(resolved.chain_key, {})
-            
-            for dex_key, dex_config in chain_dexes.items():
-                if not dex_config.get("enabled", False):
-                    continue
-                
-                if not dex_config.get("verified_for_quoting", False):
-                    continue
-                
-                adapter_type = dex_config.get("adapter_type", "")
-                
-                # Only V3-style DEXes for now
-                if adapter_type != "uniswap_v3":
-                    continue
-                
+            for dex_key, dex_config in self.quotable_dexes(resolved.chain_key).items():
                 fee_tiers = dex_config.get("fee_tiers", [500, 3000])
                 priority = dex_config.get("priority", 10)
                 
@@ -256,7 +285,11 @@ class PoolRegistry:
                         chain_id=resolved.chain_id,
                         dex_id=dex_key,
                         dex_type=DexType.UNISWAP_V3,
-                        pool_address="",  # Will be computed or discovered
+                        # CREATE2 when the init-code hash is configured, else
+                        # resolved via factory lookup in PoolIndex
+                        pool_address=compute_pool_address(
+                            dex_config, token0.address, token1.address, fee
+                        ) or "",
                         token0=token0,
                         token1=token1,
                         fee=fee,
@@ -274,7 +307,7 @@ class PoolRegistry:
                     self._pool_candidates.append(candidate)
         
         # Sort by priority
-        self._pool_candidates.sort(key=lambda c: c.priority)
+        self._reindex()
         
         logger.info(
             f"Generated {len(self._pool_candidates)} pool candidates",
@@ -285,7 +318,21 @@ class PoolRegistry:
     
     def get_candidates_for_chain(self, chain_key: str) -> list[PoolCandidate]:
         """Get pool candidates for a specific chain."""
-        return [c for c in self._pool_candidates if c.pool.chain_id == self.chains_config.get(chain_key, {}).get("chain_id")]
+        chain_id = self.chains_config.get(chain_key, {}).get("chain_id")
+        return list(self._candidates_by_chain.get(chain_id, []))
+    
+    def add_candidates(self, candidates: list[PoolCandidate]) -> None:
+        """Add candidates (e.g. loaded from registry.sqlite)."""
+        self._pool_candidates.extend(candidates)
+        self._reindex()
+    
+    def set_candidates_for_chain(self, chain_key: str, candidates: list[PoolCandidate]) -> None:
+        """Replace a chain's candidates (e.g. after pruning dead pools)."""
+        chain_id = self.chains_config.get(chain_key, {}).get("chain_id")
+        self._pool_candidates = [
+            c for c in self._pool_candidates if c.pool.chain_id != chain_id
+        ] + candidates
+        self._reindex()
     
     def get_summary(self) -> dict:
         """Get registry summary."""
@@ -344,11 +391,14 @@ class PoolRegistry:
 def load_registry(
     intent_path: Path,
     config_dir: Path = Path("config"),
+    generate: bool = True,
 ) -> PoolRegistry:
     """
     Load and initialize pool registry.
     
-    Convenience function for scanner integration.
+    Convenience function for scanner integration. With generate=False only
+    the intent is resolved; candidates then come from registry.sqlite
+    (RegistryStore.load_registry_candidates).
     """
     with open(config_dir / "chains.yaml") as f:
         chains_config = yaml.safe_load(f)
@@ -361,6 +411,7 @@ def load_registry(
     
     registry = PoolRegistry(chains_config, dexes_config, tokens_config)
     registry.load_intent(intent_path)
-    registry.generate_pool_candidates()
+    if generate:
+        registry.generate_pool_candidates()
     
     return registry
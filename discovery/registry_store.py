@@ -0,0 +1,453 @@
+"""
+discovery/registry_store.py - Persistent registry (data/registry.sqlite).
+
+Tables (Roadmap A2):
+- tokens(chain_id, address, ...)            PK (chain_id, address)
+- intent_pairs(chain_id, sym_a, sym_b, ...)  PK (chain_id, sym_a, sym_b)
+- pools(id, chain_id, dex_id, token0, token1, fee, pool_address, pair, ...)
+  UNIQUE (chain_id, dex_id, token0, token1, fee)
+- pool_health(pool_id, quotes_ok, quotes_failed, consecutive_failed, last_error, ...)
+
+Indexes: pools(chain_id), pools(chain_id, pair), pools(dex_id, fee).
+
+Writes are upserts that only touch rows whose values changed, so
+re-saving the same registry on every start is cheap.
+
+The scanner starts from the store (load_registry_candidates): known intent
+pairs keep their stored pools, only new pairs are generated from config.
+Each cycle reads its candidates back with get_pool_candidates and reports
+quote outcomes with record_pool_outcomes; a pool whose quotes fail
+DEFAULT_POOL_DEAD_AFTER_FAILURES cycles in a row is marked DEAD and drops
+out of the next query.
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import aiosqlite
+
+from core.constants import DEFAULT_POOL_DEAD_AFTER_FAILURES, DexType, PoolStatus, TokenStatus
+from core.logging import get_logger
+from core.models import Token, Pool
+from discovery.registry import PoolCandidate, PoolRegistry, ResolvedPair
+
+logger = get_logger(__name__)
+
+
+DEFAULT_REGISTRY_PATH = Path("data/registry.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    chain_id INTEGER NOT NULL,
+    address TEXT NOT NULL,  -- lowercase (key)
+    address_checksum TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    name TEXT NOT NULL,
+    decimals INTEGER NOT NULL,
+    is_core INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_verified TEXT NOT NULL,
+    PRIMARY KEY (chain_id, address)
+);
+
+CREATE TABLE IF NOT EXISTS intent_pairs (
+    chain_id INTEGER NOT NULL,
+    chain_key TEXT NOT NULL,
+    sym_a TEXT NOT NULL,
+    sym_b TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'intent',
+    added_at TEXT NOT NULL,
+    PRIMARY KEY (chain_id, sym_a, sym_b)
+);
+
+CREATE TABLE IF NOT EXISTS pools (
+    id INTEGER PRIMARY KEY,
+    chain_id INTEGER NOT NULL,
+    dex_id TEXT NOT NULL,
+    dex_type TEXT NOT NULL,
+    token0 TEXT NOT NULL,
+    token1 TEXT NOT NULL,
+    fee INTEGER NOT NULL,
+    pool_address TEXT NOT NULL DEFAULT '',
+    pair TEXT NOT NULL,
+    base_address TEXT NOT NULL,
+    quote_address TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_verified TEXT NOT NULL,
+    UNIQUE (chain_id, dex_id, token0, token1, fee)
+);
+
+CREATE INDEX IF NOT EXISTS idx_pools_chain ON pools (chain_id);
+CREATE INDEX IF NOT EXISTS idx_pools_chain_pair ON pools (chain_id, pair);
+CREATE INDEX IF NOT EXISTS idx_pools_dex_fee ON pools (dex_id, fee);
+
+CREATE TABLE IF NOT EXISTS pool_health (
+    pool_id INTEGER PRIMARY KEY REFERENCES pools (id) ON DELETE CASCADE,
+    quotes_ok INTEGER NOT NULL DEFAULT 0,
+    quotes_failed INTEGER NOT NULL DEFAULT 0,
+    consecutive_failed INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    last_quote_at TEXT,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Columns added after the first release: (table, column, definition)
+MIGRATIONS = (
+    ("pool_health", "consecutive_failed", "INTEGER NOT NULL DEFAULT 0"),
+)
+
+# Pools in these states are never handed to the scanner
+INACTIVE_POOL_STATUSES = (PoolStatus.DEAD.value, PoolStatus.SUSPICIOUS.value)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _pool_key(pool: Pool) -> tuple[int, str, str, str, int]:
+    """Natural key of a pool row (token0/token1 lowercase)."""
+    return (pool.chain_id, pool.dex_id, pool.token0.address.lower(), pool.token1.address.lower(), pool.fee)
+
+
+class RegistryStore:
+    """
+    SQLite persistence for tokens, intent pairs, pools and pool health.
+
+    Usage:
+        async with RegistryStore(Path("data/registry.sqlite")) as store:
+            await store.save_registry(registry)
+            candidates = await store.get_pool_candidates(42161, pair="WETH/USDC")
+    """
+
+    def __init__(self, path: Path = DEFAULT_REGISTRY_PATH):
+        self.path = path
+        self._db: aiosqlite.Connection | None = None
+
+    async def open(self) -> None:
+        """Open the database and create missing tables/indexes."""
+        if self._db is not None:
+            return
+        if str(self.path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = await aiosqlite.connect(self.path)
+        self._db.row_factory = aiosqlite.Row
+        await self._db.execute("PRAGMA foreign_keys = ON")
+        await self._db.execute("PRAGMA journal_mode = WAL")
+        await self._db.executescript(SCHEMA)
+        for table, column, definition in MIGRATIONS:
+            async with self._db.execute(f"PRAGMA table_info({table})") as cursor:
+                columns = {row["name"] for row in await cursor.fetchall()}
+            if column not in columns:
+                await self._db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        await self._db.commit()
+
+    async def close(self) -> None:
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
+    async def __aenter__(self) -> "RegistryStore":
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    @property
+    def db(self) -> aiosqlite.Connection:
+        if self._db is None:
+            raise RuntimeError("RegistryStore is not open")
+        return self._db
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    async def upsert_tokens(self, tokens: list[Token]) -> int:
+        """Insert or update tokens. Returns rows changed."""
+        now = _now_iso()
+        before = self.db.total_changes
+        await self.db.executemany(
+            """
+            INSERT INTO tokens (chain_id, address, address_checksum, symbol, name, decimals, is_core, status,
+                                first_seen, last_verified)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (chain_id, address) DO UPDATE SET
+                symbol = excluded.symbol, name = excluded.name, decimals = excluded.decimals,
+                is_core = excluded.is_core, status = excluded.status, last_verified = excluded.last_verified
+            WHERE symbol IS NOT excluded.symbol OR decimals IS NOT excluded.decimals
+                OR is_core IS NOT excluded.is_core OR status IS NOT excluded.status
+            """,
+            [
+                (t.chain_id, t.address.lower(), t.address, t.symbol, t.name, t.decimals,
+                 int(t.is_core), t.status.value, now, now)
+                for t in tokens
+            ],
+        )
+        await self.db.commit()
+        return self.db.total_changes - before
+
+    async def upsert_intent_pairs(self, pairs: list[ResolvedPair]) -> int:
+        """Insert new intent pairs. Returns rows added."""
+        now = _now_iso()
+        before = self.db.total_changes
+        await self.db.executemany(
+            """
+            INSERT INTO intent_pairs (chain_id, chain_key, sym_a, sym_b, source, added_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (chain_id, sym_a, sym_b) DO NOTHING
+            """,
+            [(p.chain_id, p.chain_key, p.base.symbol, p.quote.symbol, "intent", now) for p in pairs],
+        )
+        await self.db.commit()
+        return self.db.total_changes - before
+
+    async def upsert_pools(self, candidates: list[PoolCandidate]) -> int:
+        """
+        Insert or update pool candidates. Returns rows changed.
+
+        A known pool_address is never overwritten with "", and status of an
+        existing row is left alone (it is owned by set_pool_status).
+        """
+        now = _now_iso()
+        before = self.db.total_changes
+        await self.db.executemany(
+            """
+            INSERT INTO pools (chain_id, dex_id, token0, token1, fee, dex_type, pool_address, pair,
+                               base_address, quote_address, priority, status, first_seen, last_verified)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (chain_id, dex_id, token0, token1, fee) DO UPDATE SET
+                pool_address = CASE WHEN excluded.pool_address != '' THEN excluded.pool_address ELSE pool_address END,
+                priority = excluded.priority, last_verified = excluded.last_verified
+            WHERE (excluded.pool_address != '' AND pool_address IS NOT excluded.pool_address)
+                OR priority IS NOT excluded.priority
+            """,
+            [
+                (*_pool_key(c.pool), c.pool.dex_type.value, c.pool.pool_address,
+                 f"{c.base.symbol}/{c.quote.symbol}", c.base.address.lower(), c.quote.address.lower(),
+                 c.priority, c.pool.status.value, now, now)
+                for c in candidates
+            ],
+        )
+        await self.db.commit()
+        return self.db.total_changes - before
+
+    async def set_pool_statuses(self, updates: list[tuple[Pool, PoolStatus]]) -> None:
+        """Set pool statuses (e.g. DEAD after a failed liquidity probe)."""
+        now = _now_iso()
+        await self.db.executemany(
+            """
+            UPDATE pools SET status = ?, last_verified = ?
+            WHERE chain_id = ? AND dex_id = ? AND token0 = ? AND token1 = ? AND fee = ?
+            """,
+            [(status.value, now, *_pool_key(pool)) for pool, status in updates],
+        )
+        await self.db.commit()
+
+    async def record_pool_health(self, pool: Pool, ok: bool, error_code: str | None = None) -> None:
+        """Count one quote outcome for a pool."""
+        await self.record_pool_outcomes([(pool, ok, error_code)])
+
+    async def record_pool_outcomes(
+        self,
+        outcomes: list[tuple[Pool, bool, str | None]],
+        dead_after: int = DEFAULT_POOL_DEAD_AFTER_FAILURES,
+    ) -> int:
+        """
+        Count quote outcomes (pool, ok, error_code) in one transaction.
+
+        A success resets the pool's failure streak; pools reaching dead_after
+        failures in a row are marked DEAD (hidden from get_pool_candidates).
+
+        Returns:
+            Pools newly marked DEAD
+        """
+        if not outcomes:
+            return 0
+        now = _now_iso()
+        await self.db.executemany(
+            """
+            INSERT INTO pool_health (pool_id, quotes_ok, quotes_failed, consecutive_failed, last_error,
+                                     last_quote_at, updated_at)
+            SELECT id, ?, ?, ?, ?, ?, ? FROM pools
+            WHERE chain_id = ? AND dex_id = ? AND token0 = ? AND token1 = ? AND fee = ?
+            ON CONFLICT (pool_id) DO UPDATE SET
+                quotes_ok = quotes_ok + excluded.quotes_ok,
+                quotes_failed = quotes_failed + excluded.quotes_failed,
+                consecutive_failed = CASE WHEN excluded.quotes_ok > 0 THEN 0
+                                          ELSE consecutive_failed + excluded.quotes_failed END,
+                last_error = COALESCE(excluded.last_error, last_error),
+                last_quote_at = excluded.last_quote_at,
+                updated_at = excluded.updated_at
+            """,
+            [
+                (int(ok), int(not ok), int(not ok), error_code, now, now, *_pool_key(pool))
+                for pool, ok, error_code in outcomes
+            ],
+        )
+        before = self.db.total_changes
+        await self.db.execute(
+            f"""
+            UPDATE pools SET status = ?, last_verified = ?
+            WHERE status NOT IN ({', '.join('?' * len(INACTIVE_POOL_STATUSES))})
+                AND id IN (SELECT pool_id FROM pool_health WHERE consecutive_failed >= ?)
+            """,
+            (PoolStatus.DEAD.value, now, *INACTIVE_POOL_STATUSES, dead_after),
+        )
+        marked_dead = self.db.total_changes - before
+        await self.db.commit()
+        if marked_dead:
+            logger.warning(
+                f"Marked {marked_dead} pools DEAD after {dead_after} failed quote cycles",
+                extra={"context": {"path": str(self.path)}},
+            )
+        return marked_dead
+
+    async def save_registry(self, registry: PoolRegistry) -> dict:
+        """Persist a registry's resolved pairs, tokens and candidates."""
+        pairs = registry.resolved_pairs
+        tokens = list({t: None for p in pairs for t in (p.base, p.quote)})
+        summary = {
+            "tokens_changed": await self.upsert_tokens(tokens),
+            "intent_pairs_added": await self.upsert_intent_pairs(pairs),
+            "pools_changed": await self.upsert_pools(registry.candidates),
+        }
+        logger.info(f"Registry saved to {self.path}", extra={"context": summary})
+        return summary
+
+    async def load_registry_candidates(self, registry: PoolRegistry) -> dict:
+        """
+        Fill registry with candidates from the store, then persist it.
+
+        Intent pairs already in the store keep their stored (non-dead)
+        pools; candidates are generated from config only for new pairs.
+        """
+        known = await self.get_intent_pairs()
+        stored: list[PoolCandidate] = []
+        new_pairs: list[ResolvedPair] = []
+        for pair in registry.resolved_pairs:
+            if (pair.chain_id, pair.base.symbol, pair.quote.symbol) not in known:
+                new_pairs.append(pair)
+                continue
+            quotable = registry.quotable_dexes(pair.chain_key)
+            stored.extend(
+                c for c in await self.get_pool_candidates(
+                    pair.chain_id, pair=f"{pair.base.symbol}/{pair.quote.symbol}"
+                )
+                if c.dex_key in quotable
+            )
+        generated = len(registry.generate_pool_candidates(pairs=new_pairs))
+        registry.add_candidates(stored)
+
+        summary = {
+            "known_pairs": len(registry.resolved_pairs) - len(new_pairs),
+            "new_pairs": len(new_pairs),
+            "stored_candidates": len(stored),
+            "generated_candidates": generated,
+            **await self.save_registry(registry),
+        }
+        logger.info(f"Registry candidates loaded from {self.path}", extra={"context": summary})
+        return summary
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    async def get_intent_pairs(self) -> set[tuple[int, str, str]]:
+        """Stored intent pairs as (chain_id, base symbol, quote symbol)."""
+        async with self.db.execute("SELECT chain_id, sym_a, sym_b FROM intent_pairs") as cursor:
+            return {tuple(row) for row in await cursor.fetchall()}
+
+    async def get_pool_candidates(
+        self,
+        chain_id: int,
+        pair: str | None = None,
+        dex_id: str | None = None,
+        fee: int | None = None,
+        include_inactive: bool = False,
+    ) -> list[PoolCandidate]:
+        """
+        Candidates for a chain via the pools indexes, priority order.
+
+        Args:
+            chain_id: Chain to load
+            pair: "BASE/QUOTE" filter (uses idx_pools_chain_pair)
+            dex_id, fee: Optional filters
+            include_inactive: Also return dead/suspicious pools
+        """
+        where = ["p.chain_id = ?"]
+        params: list = [chain_id]
+        if pair is not None:
+            where.append("p.pair = ?")
+            params.append(pair)
+        if dex_id is not None:
+            where.append("p.dex_id = ?")
+            params.append(dex_id)
+        if fee is not None:
+            where.append("p.fee = ?")
+            params.append(fee)
+        if not include_inactive:
+            where.append(f"p.status NOT IN ({', '.join('?' * len(INACTIVE_POOL_STATUSES))})")
+            params.extend(INACTIVE_POOL_STATUSES)
+
+        query = f"""
+            SELECT p.*, t0.symbol AS t0_symbol, t0.name AS t0_name, t0.decimals AS t0_decimals,
+                   t0.is_core AS t0_core, t0.address_checksum AS t0_address,
+                   t1.symbol AS t1_symbol, t1.name AS t1_name, t1.decimals AS t1_decimals,
+                   t1.is_core AS t1_core, t1.address_checksum AS t1_address
+            FROM pools p
+            JOIN tokens t0 ON t0.chain_id = p.chain_id AND t0.address = p.token0
+            JOIN tokens t1 ON t1.chain_id = p.chain_id AND t1.address = p.token1
+            WHERE {' AND '.join(where)}
+            ORDER BY p.priority, p.id
+        """
+        async with self.db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+        return [self._row_to_candidate(row) for row in rows]
+
+    async def get_pool_health(self, chain_id: int) -> list[dict]:
+        """Health rows for a chain's pools."""
+        async with self.db.execute(
+            """
+            SELECT p.dex_id, p.pair, p.fee, p.pool_address, p.status,
+                   h.quotes_ok, h.quotes_failed, h.consecutive_failed, h.last_error, h.last_quote_at
+            FROM pool_health h JOIN pools p ON p.id = h.pool_id
+            WHERE p.chain_id = ?
+            ORDER BY p.pair, p.dex_id, p.fee
+            """,
+            (chain_id,),
+        ) as cursor:
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def count_pools(self) -> int:
+        async with self.db.execute("SELECT COUNT(*) FROM pools") as cursor:
+            (count,) = await cursor.fetchone()
+        return count
+
+    @staticmethod
+    def _row_to_candidate(row: aiosqlite.Row) -> PoolCandidate:
+        chain_id = row["chain_id"]
+        token0 = Token(
+            chain_id=chain_id, address=row["t0_address"], symbol=row["t0_symbol"], name=row["t0_name"],
+            decimals=row["t0_decimals"], is_core=bool(row["t0_core"]), status=TokenStatus.VERIFIED,
+        )
+        token1 = Token(
+            chain_id=chain_id, address=row["t1_address"], symbol=row["t1_symbol"], name=row["t1_name"],
+            decimals=row["t1_decimals"], is_core=bool(row["t1_core"]), status=TokenStatus.VERIFIED,
+        )
+        base, quote = (token0, token1) if row["base_address"] == row["token0"] else (token1, token0)
+        pool = Pool(
+            chain_id=chain_id,
+            dex_id=row["dex_id"],
+            dex_type=DexType(row["dex_type"]),
+            pool_address=row["pool_address"],
+            token0=token0,
+            token1=token1,
+            fee=row["fee"],
+            status=PoolStatus(row["status"]),
+        )
+        return PoolCandidate(pool=pool, base=base, quote=quote, dex_key=row["dex_id"], priority=row["priority"])
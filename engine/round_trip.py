@@ -0,0 +1,202 @@
+"""
+engine/round_trip.py - Directional two-leg round-trip evaluation.
+
+Comparing two exact-input quotes in the same direction (base -> quote) and
+calling the cheaper DEX "buy" ignores that buying is the opposite swap,
+with its own price impact and fee on the other side of the pool
+(Roadmap 3.3: directional pricing). A round trip quotes each leg in the
+direction it would execute:
+
+    buy leg   quote -> base on DEX A, exact output of size base   (cost)
+    sell leg  base -> quote on DEX B, exact input of size base    (proceeds)
+
+Fixing the base size on both legs makes them independent, so every leg of
+every candidate goes out as one JSON-RPC batch of quoter eth_calls pinned
+to the same block - one round trip of latency, same state for both legs.
+
+    gross_bps = (proceeds - cost) * 10000 // cost
+    gas_cost  = gas_total * gas_price_wei * r_num // r_den
+    net_bps   = (proceeds - cost - gas_cost) * 10000 // cost
+
+r_num/r_den (RoundTripRequest.gas_rate) is quote-token wei per native wei
+(engine.sizing.GasPricer); without it net figures are None - gas cannot
+be valued, so callers must not gate on them.
+
+All amounts are int wei. NO FLOATS.
+"""
+
+from dataclasses import dataclass
+from typing import Protocol
+
+from core.constants import BPS_DENOMINATOR
+from core.logging import get_logger
+from core.math import Price
+from core.models import Pool, Quote, Token
+from chains.multicall import Call3, Call3Result
+from chains.providers import RPCProvider
+
+logger = get_logger(__name__)
+
+BPS = int(BPS_DENOMINATOR)
+
+
+class ExactOutputAdapter(Protocol):
+    """Adapter that can quote the buy leg (quoteExactOutputSingle)."""
+
+    def build_quote_exact_output_call(
+        self, pool: Pool, token_in: Token, token_out: Token, amount_out: int,
+    ) -> Call3: ...
+
+    def decode_quote_exact_output_call(
+        self, pool: Pool, token_in: Token, token_out: Token, amount_out: int,
+        call_result: Call3Result, block_number: int | None, latency_ms: int,
+    ) -> Quote: ...
+
+
+class ExactInputAdapter(Protocol):
+    """Adapter that can quote the sell leg (quoteExactInputSingle)."""
+
+    def build_quote_call(
+        self, pool: Pool, token_in: Token, token_out: Token, amount_in: int,
+    ) -> Call3: ...
+
+    def decode_quote_call(
+        self, pool: Pool, token_in: Token, token_out: Token, amount_in: int,
+        call_result: Call3Result, block_number: int | None, latency_ms: int,
+    ) -> Quote: ...
+
+
+@dataclass
+class RoundTripRequest:
+    """Buy base_amount of base on buy_pool, sell it on sell_pool."""
+    buy_dex: str
+    buy_adapter: ExactOutputAdapter
+    buy_pool: Pool
+    sell_dex: str
+    sell_adapter: ExactInputAdapter
+    sell_pool: Pool
+    base: Token
+    quote: Token
+    base_amount: int
+    gas_rate: Price | None = None  # Quote-token wei per native wei (None = unpriced)
+
+
+@dataclass
+class RoundTrip:
+    """Executable two-leg result, both legs at the same block."""
+    request: RoundTripRequest
+    buy_quote: Quote  # quote -> base: amount_in = cost, amount_out = base_amount
+    sell_quote: Quote  # base -> quote: amount_in = base_amount, amount_out = proceeds
+    block_number: int
+
+    @property
+    def cost(self) -> int:
+        """Quote-token wei paid on the buy leg."""
+        return self.buy_quote.amount_in
+
+    @property
+    def proceeds(self) -> int:
+        """Quote-token wei received on the sell leg."""
+        return self.sell_quote.amount_out
+
+    @property
+    def gross_pnl(self) -> int:
+        """Quote-token wei left after both legs, before gas."""
+        return self.proceeds - self.cost
+
+    @property
+    def gross_bps(self) -> int:
+        return self.gross_pnl * BPS // self.cost if self.cost else 0
+
+    @property
+    def gas_total(self) -> int:
+        return self.buy_quote.gas_estimate + self.sell_quote.gas_estimate
+
+    def gas_cost(self, gas_price_wei: int) -> int | None:
+        """Gas for both legs in quote-token wei (None without a gas rate)."""
+        rate = self.request.gas_rate
+        if rate is None:
+            return None
+        return self.gas_total * gas_price_wei * rate.num // rate.den
+
+    def net_pnl(self, gas_price_wei: int) -> int | None:
+        """Quote-token wei after gas (None without a gas rate)."""
+        gas_cost = self.gas_cost(gas_price_wei)
+        return None if gas_cost is None else self.gross_pnl - gas_cost
+
+    def net_pnl_bps(self, gas_price_wei: int) -> int | None:
+        """Net PnL in bps of cost (None without a gas rate)."""
+        net_pnl = self.net_pnl(gas_price_wei)
+        if net_pnl is None:
+            return None
+        return net_pnl * BPS // self.cost if self.cost else 0
+
+    def to_dict(self, gas_price_wei: int) -> dict:
+        """Report form; amounts as strings (exact)."""
+        gas_cost = self.gas_cost(gas_price_wei)
+        return {
+            "buy_dex": self.request.buy_dex,
+            "sell_dex": self.request.sell_dex,
+            "base_amount": str(self.request.base_amount),
+            "cost": str(self.cost),
+            "proceeds": str(self.proceeds),
+            "gross_pnl": str(self.gross_pnl),
+            "gross_bps": self.gross_bps,
+            "gas_total": self.gas_total,
+            "gas_cost": None if gas_cost is None else str(gas_cost),
+            "net_pnl_bps": self.net_pnl_bps(gas_price_wei),
+            "block_number": self.block_number,
+        }
+
+
+async def evaluate_round_trips(
+    provider: RPCProvider,
+    requests: list[RoundTripRequest],
+    block_number: int,
+) -> list[RoundTrip | BaseException]:
+    """
+    Quote both legs of every request in one batch at block_number.
+
+    Failures are captured per request (a reverted leg becomes that
+    request's QuoteError; a batch-level failure is returned for every
+    request), like fetch_quotes_multicall.
+
+    Returns:
+        One RoundTrip or exception per request, in request order
+    """
+    if not requests:
+        return []
+
+    calls: list[Call3] = []
+    for r in requests:
+        calls.append(r.buy_adapter.build_quote_exact_output_call(r.buy_pool, r.quote, r.base, r.base_amount))
+        calls.append(r.sell_adapter.build_quote_call(r.sell_pool, r.base, r.quote, r.base_amount))
+
+    try:
+        items = await provider.eth_call_batch(
+            [(call.target, call.call_data) for call in calls],
+            block=hex(block_number),
+        )
+    except Exception as e:
+        logger.warning(f"Round-trip batch failed: {e}")
+        return [e] * len(requests)
+
+    def as_call_result(item) -> Call3Result:
+        return Call3Result(success=item.ok, return_data=item.result if item.ok else "0x")
+
+    outcomes: list[RoundTrip | BaseException] = []
+    for i, r in enumerate(requests):
+        buy_item, sell_item = items[2 * i], items[2 * i + 1]
+        try:
+            buy_quote = r.buy_adapter.decode_quote_exact_output_call(
+                r.buy_pool, r.quote, r.base, r.base_amount,
+                as_call_result(buy_item), block_number, buy_item.latency_ms,
+            )
+            sell_quote = r.sell_adapter.decode_quote_call(
+                r.sell_pool, r.base, r.quote, r.base_amount,
+                as_call_result(sell_item), block_number, sell_item.latency_ms,
+            )
+            outcomes.append(RoundTrip(r, buy_quote, sell_quote, block_number))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
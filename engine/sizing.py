@@ -0,0 +1,355 @@
+"""
+engine/sizing.py - Trade size ladders and optimal-size search.
+
+Quote sizes come from strategy.yaml (quote.sizes_usd) and are converted to
+token_in wei per token, so a USDC-in pair is not probed with 10**18 wei.
+
+For a profitable round trip the best size maximizes
+
+    net(size) = proceeds(size) - cost(size) - gas
+
+Price impact makes proceeds concave and cost convex in size, so net is
+unimodal and golden-section search finds the peak with one new probe per
+step. optimize_sizes() runs the search for many candidates in lockstep:
+each step sends one probe per unfinished candidate as a single batch
+(one RPC round trip for all of them), or evaluates local V3 math.
+
+Probe functions return net PnL in quote-token wei, or None when the size
+cannot be filled (revert / liquidity exhausted), which ranks below any
+number. All sizes are int wei. NO FLOATS.
+"""
+
+import inspect
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from typing import Awaitable, Callable, Mapping, Sequence, TypeVar
+
+from core.constants import (
+    BPS_DENOMINATOR,
+    DEFAULT_SIZE_SEARCH_MAX_PROBES,
+    DEFAULT_SIZE_SEARCH_TOLERANCE_BPS,
+    WEI_PER_ETH,
+)
+from core.exceptions import QuoteError
+from core.math import Price, pow10
+from core.models import Pool, Quote, Token
+from core.quote_batch import QuoteRow
+from chains.providers import RPCProvider
+from dex.local_quoter import PoolState, simulate_swap
+from engine.round_trip import RoundTrip, RoundTripRequest, evaluate_round_trips
+
+T = TypeVar("T")
+
+BPS = int(BPS_DENOMINATOR)
+
+# Tokens valued at 1 USD for sizing (no reference price needed)
+USD_STABLE_SYMBOLS = frozenset({
+    "USDC", "USDC.E", "USDBC", "USDT", "DAI", "FRAX", "LUSD", "USDE",
+})
+
+# Golden ratio section, 1 - 1/phi, as an integer fraction
+_GOLDEN_NUM = 381_966
+_GOLDEN_DEN = 1_000_000
+
+ProbeBatch = Callable[[list[tuple[T, int]]], Awaitable[list[int | None]]]
+
+
+# =============================================================================
+# SIZE LADDER
+# =============================================================================
+
+def usd_price(token: Token, reference_price: Decimal | None = None) -> Decimal | None:
+    """USD price for sizing: 1 for stables, else the reference (None if unknown)."""
+    if token.symbol.upper() in USD_STABLE_SYMBOLS:
+        return Decimal(1)
+    return reference_price if reference_price and reference_price > 0 else None
+
+
+def size_ladder(sizes_usd: Sequence[Decimal], token: Token, price_usd: Decimal) -> list[int]:
+    """
+    Convert USD sizes to token wei, ascending and de-duplicated.
+
+    Args:
+        sizes_usd: Sizes in USD
+        token: Token the size is paid in
+        price_usd: USD per whole token
+    """
+    scale = Decimal(10) ** token.decimals
+    amounts = {int(Decimal(size) * scale / price_usd) for size in sizes_usd}
+    return sorted(a for a in amounts if a > 0)
+
+
+def ladder_needs_reprice(built_at_usd: Decimal, price_usd: Decimal, band_bps: int) -> bool:
+    """
+    True once price_usd has moved more than band_bps from the price a ladder
+    was built at. Inside the band the old wei sizes are reused, so quotes (and
+    spread ids keyed on amount_in) repeat from block to block.
+    """
+    return abs(price_usd - built_at_usd) * BPS > built_at_usd * band_bps
+
+
+# =============================================================================
+# GAS VALUATION
+# =============================================================================
+
+class GasPricer:
+    """
+    Values gas (native wei) in token wei at the scanner's USD reference prices.
+
+    rate(token) is token wei per native wei as an exact Price, so a gas cost
+    in token units is gas_wei * rate.num // rate.den. Gas must never be
+    charged against amount_in as if it were native wei: for a USDC-in pair
+    (6 decimals) that overstates it by ~10**12 * ETH price.
+
+    Usage:
+        pricer = GasPricer("ETH", {"WETH": Decimal(2500)})
+        pricer.rate(usdc)  # Price(2500 * 10**6, 10**18)
+    """
+
+    def __init__(self, native_symbol: str, prices_usd: Mapping[str, Decimal]):
+        """
+        Args:
+            native_symbol: Gas token of the chain (chains.yaml native_symbol)
+            prices_usd: Symbol -> USD per whole token, for this chain
+        """
+        self.native_symbol = native_symbol.upper()
+        self.wrapped_symbol = "W" + self.native_symbol
+        self.prices_usd = prices_usd
+        self.native_price_usd = prices_usd.get(self.wrapped_symbol) or prices_usd.get(native_symbol)
+
+    def rate(self, token: Token) -> Price | None:
+        """Token wei per native wei (None while either USD price is unknown)."""
+        if token.symbol.upper() in (self.native_symbol, self.wrapped_symbol):
+            return Price(pow10(token.decimals), WEI_PER_ETH)
+        native = self.native_price_usd
+        price = usd_price(token, self.prices_usd.get(token.symbol))
+        if not native or not price:
+            return None
+        native_num, native_den = native.as_integer_ratio()
+        price_num, price_den = price.as_integer_ratio()
+        return Price(
+            native_num * price_den * pow10(token.decimals),
+            native_den * price_num * WEI_PER_ETH,
+        )
+
+    def quote_rates(self, quote: Quote | QuoteRow) -> tuple[Price | None, Price | None]:
+        """
+        (token_in, token_out) rates for a quote.
+
+        A side without a USD price is valued through the quote itself, so
+        an unlisted token paired with WETH or a stable still gets a rate.
+        """
+        rate_in, rate_out = self.rate(quote.token_in), self.rate(quote.token_out)
+        amount_in, amount_out = quote.amount_in, quote.amount_out
+        if amount_in > 0 and amount_out > 0:
+            if rate_in is None and rate_out is not None:
+                rate_in = Price(rate_out.num * amount_in, rate_out.den * amount_out)
+            elif rate_out is None and rate_in is not None:
+                rate_out = Price(rate_in.num * amount_out, rate_in.den * amount_in)
+        return rate_in, rate_out
+
+
+# =============================================================================
+# GOLDEN-SECTION SEARCH
+# =============================================================================
+
+@dataclass
+class SizeSearchResult:
+    """Best probed size of one candidate."""
+    size: int
+    net_pnl: int | None  # None: no probed size could be filled
+    probes: int
+
+    @property
+    def profitable(self) -> bool:
+        return self.net_pnl is not None and self.net_pnl > 0
+
+
+@dataclass
+class _Bracket:
+    """Search state: [lo, hi] with interior points c < d and their values."""
+    lo: int
+    hi: int
+    c: int = 0
+    d: int = 0
+    fc: int | None = None
+    fd: int | None = None
+    probes: int = 0
+    best_size: int = 0
+    best_pnl: int | None = None
+    done: bool = False
+
+    def record(self, slot: str, size: int, value: int | None) -> None:
+        setattr(self, "fc" if slot == "c" else "fd", value)
+        self.probes += 1
+        if _gt(value, self.best_pnl):
+            self.best_size, self.best_pnl = size, value
+
+
+def _gt(a: int | None, b: int | None) -> bool:
+    """a > b with None ranked lowest."""
+    if a is None:
+        return False
+    return b is None or a > b
+
+
+async def optimize_sizes(
+    candidates: list[T],
+    bounds: list[tuple[int, int]],
+    probe_batch: ProbeBatch,
+    max_probes: int = DEFAULT_SIZE_SEARCH_MAX_PROBES,
+    tolerance_bps: int = DEFAULT_SIZE_SEARCH_TOLERANCE_BPS,
+) -> list[SizeSearchResult]:
+    """
+    Golden-section search for every candidate, one probe batch per step.
+
+    Args:
+        candidates: Opaque candidates passed back to probe_batch
+        bounds: (lo, hi) size bracket per candidate
+        probe_batch: Evaluates [(candidate, size)] -> [net PnL or None]
+        max_probes: Probe budget per candidate (at least 2)
+        tolerance_bps: Stop once hi - lo <= lo * tolerance_bps / 10000
+
+    Returns:
+        One SizeSearchResult per candidate, in order
+    """
+    brackets: list[_Bracket] = []
+    for lo, hi in bounds:
+        lo, hi = min(lo, hi), max(lo, hi)
+        offset = (hi - lo) * _GOLDEN_NUM // _GOLDEN_DEN
+        brackets.append(_Bracket(lo=lo, hi=hi, c=lo + offset, d=hi - offset, best_size=lo))
+
+    # First step probes both interior points
+    pending: list[tuple[int, str, int]] = [(i, "c", b.c) for i, b in enumerate(brackets)]
+    pending += [(i, "d", b.d) for i, b in enumerate(brackets)]
+
+    while pending:
+        values = await probe_batch([(candidates[i], size) for i, _, size in pending])
+        for (i, slot, size), value in zip(pending, values):
+            brackets[i].record(slot, size, value)
+
+        pending = []
+        for i, b in enumerate(brackets):
+            if b.done:
+                continue
+            if b.probes >= max_probes or (b.hi - b.lo) * BPS <= b.lo * tolerance_bps or b.d <= b.c:
+                b.done = True
+                continue
+            # Drop the side beyond the worse interior point; reuse the other
+            if _gt(b.fd, b.fc):
+                b.lo, b.c, b.fc = b.c, b.d, b.fd
+                b.d = b.lo + b.hi - b.c
+                pending.append((i, "d", b.d))
+            else:
+                b.hi, b.d, b.fd = b.d, b.c, b.fc
+                b.c = b.lo + b.hi - b.d
+                pending.append((i, "c", b.c))
+
+    return [SizeSearchResult(size=b.best_size, net_pnl=b.best_pnl, probes=b.probes) for b in brackets]
+
+
+async def golden_section_search(
+    probe: Callable[[int], int | None | Awaitable[int | None]],
+    lo: int,
+    hi: int,
+    max_probes: int = DEFAULT_SIZE_SEARCH_MAX_PROBES,
+    tolerance_bps: int = DEFAULT_SIZE_SEARCH_TOLERANCE_BPS,
+) -> SizeSearchResult:
+    """Single-candidate search; probe may be sync (local math) or async."""
+    async def probe_batch(items: list[tuple[None, int]]) -> list[int | None]:
+        values = []
+        for _, size in items:
+            value = probe(size)
+            values.append(await value if inspect.isawaitable(value) else value)
+        return values
+
+    (result,) = await optimize_sizes([None], [(lo, hi)], probe_batch, max_probes, tolerance_bps)
+    return result
+
+
+# =============================================================================
+# PROBES
+# =============================================================================
+
+def round_trip_probe(
+    provider: RPCProvider,
+    block_number: int,
+    gas_price_wei: int,
+) -> ProbeBatch[RoundTripRequest]:
+    """
+    Probe batch over quoter round trips: all legs of a step in one RPC batch.
+
+    Each (request, size) is re-quoted with base_amount = size. Gas is
+    valued at request.gas_rate; requests without one probe as None.
+    """
+    async def probe_batch(items: list[tuple[RoundTripRequest, int]]) -> list[int | None]:
+        outcomes = await evaluate_round_trips(
+            provider,
+            [replace(request, base_amount=size) for request, size in items],
+            block_number,
+        )
+        return [
+            outcome.net_pnl(gas_price_wei) if isinstance(outcome, RoundTrip) else None
+            for outcome in outcomes
+        ]
+    return probe_batch
+
+
+def local_first_probe(
+    remote: ProbeBatch[T],
+) -> ProbeBatch[tuple[T, Callable[[int], int | None] | None]]:
+    """
+    Probe batch over (candidate, local profit or None) pairs.
+
+    Candidates with a local profit function (local_round_trip_profit) are
+    evaluated in memory; only the rest go to remote, as one batch.
+    """
+    async def probe_batch(
+        items: list[tuple[tuple[T, Callable[[int], int | None] | None], int]],
+    ) -> list[int | None]:
+        values = [profit(size) if profit else None for (_, profit), size in items]
+        pending = [i for i, ((_, profit), _) in enumerate(items) if profit is None]
+        if pending:
+            remote_values = await remote([(items[i][0][0], items[i][1]) for i in pending])
+            for i, value in zip(pending, remote_values):
+                values[i] = value
+        return values
+    return probe_batch
+
+
+def local_round_trip_profit(
+    buy_pool: Pool,
+    buy_state: PoolState,
+    sell_pool: Pool,
+    sell_state: PoolState,
+    base: Token,
+    gas_cost_quote: int = 0,
+) -> Callable[[int], int | None]:
+    """
+    Net PnL of a round trip from cached pool state (no RPC).
+
+    Buys size base on buy_pool (exact output), sells it on sell_pool
+    (exact input). Both pools must hold base and the same quote token.
+
+    Args:
+        buy_pool, buy_state: Pool to buy base in, and its state
+        sell_pool, sell_state: Pool to sell base in, and its state
+        base: Traded base token
+        gas_cost_quote: Gas for both legs in quote-token wei
+    """
+    base_address = base.address.lower()
+    buy_base_is_token0 = buy_pool.token0.address.lower() == base_address
+    sell_base_is_token0 = sell_pool.token0.address.lower() == base_address
+
+    def profit(size: int) -> int | None:
+        try:
+            # quote -> base: zero_for_one when quote is token0
+            buy = simulate_swap(buy_state, not buy_base_is_token0, -size)
+            sell = simulate_swap(sell_state, sell_base_is_token0, size)
+        except QuoteError:
+            return None
+        if not buy.fully_filled or not sell.fully_filled:
+            return None
+        return sell.amount_out - buy.amount_in - gas_cost_quote
+
+    return profit
@@ -0,0 +1,215 @@
+"""
+engine/spread_engine.py - Batched cross-DEX spread computation.
+
+One cycle's quotes are grouped by "PAIR_FEE_AMOUNT" key, one quote per DEX.
+SpreadMatrix lays every quote out as flat integer columns (amount_in,
+price numerator/denominator, gas), taking each quote's exact rational
+price (core.math.Price, cached on the quote) once:
+
+    price = (amount_out * 10^in_decimals) / (amount_in * 10^out_decimals)
+
+Every DEX pair inside a group is then compared by integer
+cross-multiplication - no Decimal division, no per-pair re-pricing:
+
+    spread_bps = |n_a*d_b - n_b*d_a| * 10000 // (n_buy * d_sell)
+    gas_bps    = (gas_a + gas_b) * gas_price_wei * r_num * 10000 // (amount_in * r_den)
+    net_bps    = spread_bps - gas_bps
+
+r_num/r_den is the group's gas rate: token_in wei per native wei (see
+engine.sizing.GasPricer), so gas and amount_in are in the same unit.
+Groups whose rate is unknown are left out and listed in
+SpreadMatrix.unpriced. Without a gas_rate callable the rate is 1, which
+is only right for native-in (WETH) groups.
+
+Only rows that pass the filter become SpreadRow objects; callers build
+their report dicts from those. Quotes may be Quote objects or QuoteBatch
+rows (core.quote_batch.QuoteRow). The number of pairs grows quadratically
+with the DEX count, so the inner loop touches nothing but ints.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from core.constants import BPS_DENOMINATOR
+from core.math import Price
+from core.models import Quote
+from core.quote_batch import QuoteRow
+
+BPS = int(BPS_DENOMINATOR)
+
+# Gas rate of a quote's token_in: token_in wei per native wei (None = unknown)
+GasRate = Callable[[Quote | QuoteRow], Price | None]
+
+
+@dataclass(slots=True)
+class SpreadRow:
+    """One cross-DEX spread (buy on the cheaper DEX, sell on the dearer)."""
+    key: str
+    buy_dex: str
+    sell_dex: str
+    buy_quote: Quote | QuoteRow
+    sell_quote: Quote | QuoteRow
+    spread_bps: int
+    gas_total: int
+    gas_cost_wei: int  # Native wei
+    gas_cost_bps: int  # Of amount_in, after conversion to token_in wei
+    net_pnl_bps: int
+
+    @property
+    def profitable(self) -> bool:
+        return self.net_pnl_bps > 0
+
+
+class SpreadMatrix:
+    """
+    Column layout of a cycle's quotes, grouped for pairwise comparison.
+
+    Usage:
+        matrix = SpreadMatrix.from_groups(quotes_by_key, gas_rate)
+        rows = matrix.spreads(gas_price_wei, min_net_pnl_bps=1)
+    """
+
+    __slots__ = (
+        "keys", "dexes", "quotes", "offsets",
+        "amount_in", "price_num", "price_den", "gas",
+        "gas_rate_num", "gas_rate_den", "unpriced",
+    )
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.offsets: list[int] = [0]  # Group g spans [offsets[g], offsets[g + 1])
+        self.dexes: list[str] = []
+        self.quotes: list[Quote | QuoteRow] = []
+        self.amount_in: list[int] = []
+        self.price_num: list[int] = []
+        self.price_den: list[int] = []
+        self.gas: list[int] = []
+        self.gas_rate_num: list[int] = []  # Per group
+        self.gas_rate_den: list[int] = []
+        self.unpriced: list[str] = []  # Groups skipped: gas rate unknown
+
+    @classmethod
+    def from_groups(
+        cls,
+        quotes_by_key: dict[str, dict[str, Quote | QuoteRow]],
+        gas_rate: GasRate | None = None,
+    ) -> "SpreadMatrix":
+        """
+        Lay out quotes; groups with fewer than two DEXes are skipped.
+
+        Args:
+            quotes_by_key: Spread key -> dex -> quote
+            gas_rate: Token_in wei per native wei of a quote (first known
+                one in the group is used); None charges gas 1:1
+        """
+        matrix = cls()
+        for key, dex_quotes in quotes_by_key.items():
+            if len(dex_quotes) < 2:
+                continue
+            rate_num, rate_den = 1, 1
+            if gas_rate is not None:
+                rate = next(
+                    (r for r in map(gas_rate, dex_quotes.values()) if r is not None), None
+                )
+                if rate is None:
+                    matrix.unpriced.append(key)
+                    continue
+                rate_num, rate_den = rate.num, rate.den
+            matrix.gas_rate_num.append(rate_num)
+            matrix.gas_rate_den.append(rate_den)
+            for dex, quote in dex_quotes.items():
+                matrix.dexes.append(dex)
+                matrix.quotes.append(quote)
+                matrix.amount_in.append(quote.amount_in)
+                # Zero-priced quotes (amount_in or amount_out == 0) never pair
+                price = quote.price
+                matrix.price_num.append(price.num)
+                matrix.price_den.append(price.den)
+                matrix.gas.append(quote.gas_estimate)
+            matrix.keys.append(key)
+            matrix.offsets.append(len(matrix.quotes))
+        return matrix
+
+    @property
+    def pair_count(self) -> int:
+        """Number of DEX pairs compared per pass."""
+        return sum(
+            n * (n - 1) // 2
+            for n in (self.offsets[g + 1] - self.offsets[g] for g in range(len(self.keys)))
+        )
+
+    def spreads(
+        self,
+        gas_price_wei: int,
+        min_net_pnl_bps: int | None = None,
+    ) -> list[SpreadRow]:
+        """
+        Compare every DEX pair of every group.
+
+        Args:
+            gas_price_wei: Gas price for both legs
+            min_net_pnl_bps: Keep rows with net_pnl_bps >= this;
+                None keeps every row with a non-zero spread
+
+        Returns:
+            Surviving rows, in group order then DEX order
+        """
+        num, den, gas, amount_in = self.price_num, self.price_den, self.gas, self.amount_in
+        rows: list[SpreadRow] = []
+
+        for g, key in enumerate(self.keys):
+            start, end = self.offsets[g], self.offsets[g + 1]
+            rate_num, rate_den = self.gas_rate_num[g], self.gas_rate_den[g]
+            for a in range(start, end):
+                n_a, d_a = num[a], den[a]
+                if n_a == 0 or d_a == 0:
+                    continue
+                for b in range(a + 1, end):
+                    n_b, d_b = num[b], den[b]
+                    if n_b == 0 or d_b == 0:
+                        continue
+
+                    cross = n_a * d_b - n_b * d_a
+                    if cross == 0:
+                        continue
+                    # Lower price is the buy leg: p_a < p_b <=> cross < 0
+                    if cross < 0:
+                        buy, sell, cross = a, b, -cross
+                        spread_bps = cross * BPS // (n_a * d_b)
+                    else:
+                        buy, sell = b, a
+                        spread_bps = cross * BPS // (n_b * d_a)
+                    if spread_bps == 0:
+                        continue
+
+                    gas_total = gas[a] + gas[b]
+                    gas_cost_wei = gas_total * gas_price_wei
+                    size = amount_in[a]
+                    gas_cost_bps = gas_cost_wei * rate_num * BPS // (size * rate_den) if size else 0
+                    net_pnl_bps = spread_bps - gas_cost_bps
+                    if min_net_pnl_bps is not None and net_pnl_bps < min_net_pnl_bps:
+                        continue
+
+                    rows.append(SpreadRow(
+                        key=key,
+                        buy_dex=self.dexes[buy],
+                        sell_dex=self.dexes[sell],
+                        buy_quote=self.quotes[buy],
+                        sell_quote=self.quotes[sell],
+                        spread_bps=spread_bps,
+                        gas_total=gas_total,
+                        gas_cost_wei=gas_cost_wei,
+                        gas_cost_bps=gas_cost_bps,
+                        net_pnl_bps=net_pnl_bps,
+                    ))
+        return rows
+
+
+def compute_spreads(
+    quotes_by_key: dict[str, dict[str, Quote | QuoteRow]],
+    gas_price_wei: int,
+    min_net_pnl_bps: int | None = None,
+    gas_rate: GasRate | None = None,
+) -> list[SpreadRow]:
+    """Convenience wrapper: lay out quotes and compute spreads in one call."""
+    return SpreadMatrix.from_groups(quotes_by_key, gas_rate).spreads(gas_price_wei, min_net_pnl_bps)
@@ -8,8 +8,12 @@ Reports include:
 - Reject histogram summary
 - RPC health metrics
 - Coverage stats (pairs, DEXes, chains)
+
+TruthReportAggregator builds the report incrementally (one pass per cycle
+summary); generate_truth_report is the one-shot form over a snapshot.
 """
 
+import heapq
 import json
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
@@ -18,6 +22,7 @@ from pathlib import Path
 from typing import Any
 
 from core.logging import get_logger
+from core.timing import StageHistogram
 
 logger = get_logger(__name__)
 
@@ -234,6 +239,9 @@ class TruthReport:
     pnl_suppressed: bool = False
     pnl_suppressed_reason: str | None = None
     
+    # Where cycle time goes: StageHistogram.to_dict() over the cycles' stage_timings_ms
+    stage_breakdown: dict | None = None
+    
     def validate_invariants(self) -> list[str]:
         """
         Validate report invariants (Team Lead Крок 2 + КРОК 8).
@@ -399,6 +407,9 @@ class TruthReport:
         if self.top_blocked_reasons:
             result["top_blocked_reasons"] = self.top_blocked_reasons
         
+        if self.stage_breakdown:
+            result["stage_breakdown"] = self.stage_breakdown
+        
         return result
 
 
@@ -726,349 +737,487 @@ def calculate_confidence_simple(spread: dict) -> float:
     return score
 
 
-def generate_truth_report(
-    snapshot: dict,
-    paper_session_stats: dict | None = None,
-    top_n: int = 10,
-    notion_capital_numeraire: float = 0.0,  # AC-3: Pass from SMOKE config
-) -> TruthReport:
+# Ignore opportunities with < 5 bps (noise)
+MIN_NET_PNL_BPS = 5
+
+# Candidate heap size per top_n slot for a bounded aggregator
+CANDIDATES_PER_SLOT = 4
+
+
+@dataclass(slots=True)
+class _SpreadState:
+    """Latest version of one spread_id (last cycle wins)."""
+    first_seen: int  # Tie-break for equal scores: first appearance order
+    seq: int  # Version; heap entries with an older seq are stale
+    profitable: bool
+    executable: bool
+    blocked_reason: str | None
+
+
+class TruthReportAggregator:
     """
-    Generate truth report from scan snapshot.
-    
-    Args:
-        snapshot: Scan snapshot dict
-        paper_session_stats: Optional cumulative paper trading stats
-        top_n: Number of top opportunities to include
-        notion_capital_numeraire: Notional capital for PnL normalization (AC-3)
+    Incremental truth report: consumes each cycle summary once.
+    
+    Keeps running counters, per-reason histograms, the latest state of every
+    spread_id and a heap of top-opportunity candidates, so report() costs the
+    same on cycle 10 and cycle 100,000. report() returns the TruthReport that
+    generate_truth_report would build from the same cycles.
+    
+    Candidates are pre-scored at ingest (with the RPC success rate and block
+    age known then) and re-scored with the final values in report(). With
+    max_candidates=None every candidate is kept and ranking is exact; a bound
+    keeps the best max_candidates (default CANDIDATES_PER_SLOT × top_n), so a
+    spread can only be missed if it was outside that margin when ingested.
+    
+    Usage:
+        aggregator = TruthReportAggregator()
+        for summary in cycles:
+            aggregator.add_cycle(summary)
+        report = aggregator.report(paper_stats, notion_capital_numeraire=10_000)
     """
-    cycle_summaries = snapshot.get("cycle_summaries", [])
-    mode = snapshot.get("mode", "UNKNOWN")
-    
-    # Aggregate metrics across cycles
-    total_attempted = 0
-    total_fetched = 0
-    total_passed = 0
-    total_pools = 0
-    all_spreads = []
-    all_reject_reasons: dict[str, int] = {}
-    rpc_total_requests = 0
-    rpc_successful_requests = 0
-    rpc_latency_weighted = 0
-    rpc_endpoint_count = 0
-    chains_seen = set()
-    dexes_seen = set()
-    pairs_seen = set()
-    
-    for cycle in cycle_summaries:
-        total_attempted += cycle.get("quotes_attempted", 0)
-        total_fetched += cycle.get("quotes_fetched", 0)
-        total_passed += cycle.get("quotes_passed_gates", 0)
-        total_pools += cycle.get("pools_scanned", 0)
+    
+    def __init__(
+        self,
+        mode: str | None = None,
+        top_n: int = 10,
+        max_candidates: int | None = -1,
+    ):
+        self.mode = mode
+        self.top_n = top_n
+        self.max_candidates = top_n * CANDIDATES_PER_SLOT if max_candidates == -1 else max_candidates
+        self.cycles = 0
+        self.modes_seen: set[str] = set()
+        
+        # Quote and coverage counters
+        self.total_attempted = 0
+        self.total_fetched = 0
+        self.total_passed = 0
+        self.total_pools = 0
+        self.chains_seen: set = set()
+        self.dexes_seen: set = set()
+        self.pairs_seen: set = set()
+        self.reject_reasons: dict[str, int] = {}
+        self.stage_timings = StageHistogram()
         
-        chains_seen.add(cycle.get("chain"))
+        # RPC stats, weighted by total_requests
+        self.rpc_total_requests = 0
+        self.rpc_successful_requests = 0
+        self.rpc_latency_weighted = 0
+        self.block_age_ms = 0  # From the last cycle
+        
+        # Signals (every spread dict, plus counted unprofitable ones)
+        self.signals_total = 0
+        self.signals_profitable = 0
+        self.signals_executable = 0
+        
+        # Spread IDs (latest version of each)
+        self._spreads: dict[str, _SpreadState] = {}
+        self.spread_ids_profitable = 0
+        self.spread_ids_executable = 0
+        self.blocked_reasons: dict[str | None, int] = {}
+        
+        # Min-heap of (ingest score, -first_seen, seq, spread_id, spread):
+        # on equal scores the earlier spread ranks higher, as in the report
+        self._candidates: list[tuple[float, int, int, str, dict]] = []
+        self._seq = 0
+    
+    # =========================================================================
+    # INGEST
+    # =========================================================================
+    
+    def add_cycle(self, cycle: dict) -> None:
+        """Consume one cycle summary."""
+        self.cycles += 1
+        if cycle.get("mode"):
+            self.modes_seen.add(cycle["mode"])
+        
+        self.total_attempted += cycle.get("quotes_attempted", 0)
+        self.total_fetched += cycle.get("quotes_fetched", 0)
+        self.total_passed += cycle.get("quotes_passed_gates", 0)
+        self.total_pools += cycle.get("pools_scanned", 0)
+        
+        self.chains_seen.add(cycle.get("chain"))
         
         for dex in cycle.get("dexes_passed_gate", []):
-            dexes_seen.add(dex.get("dex_key"))
+            self.dexes_seen.add(dex.get("dex_key"))
         
         # Get pairs from cycle summary (not from quotes which may be empty)
         for pair in cycle.get("pairs_scanned", []):
             if pair:
-                pairs_seen.add(pair)
-        
-        # Spreads
-        all_spreads.extend(cycle.get("spreads", []))
+                self.pairs_seen.add(pair)
         
         # Reject reasons (support both old and new field names)
         reject_reasons = cycle.get("reject_reasons_histogram") or cycle.get("quote_reject_reasons", {})
         for reason, count in reject_reasons.items():
-            all_reject_reasons[reason] = all_reject_reasons.get(reason, 0) + count
+            self.reject_reasons[reason] = self.reject_reasons.get(reason, 0) + count
+        
+        # Stage timings (absent in snapshots written before they existed)
+        self.stage_timings.record(cycle.get("stage_timings_ms") or {})
         
         # RPC stats - weighted by total_requests
-        for url, stats in cycle.get("rpc_stats", {}).items():
+        for stats in cycle.get("rpc_stats", {}).values():
             requests = stats.get("total_requests", 0)
             if requests > 0:
-                success_rate = stats.get("success_rate", 0)
-                latency = stats.get("avg_latency_ms", 0)
-                
-                rpc_total_requests += requests
-                rpc_successful_requests += int(requests * success_rate)
-                rpc_latency_weighted += latency * requests
-                rpc_endpoint_count += 1
-    
-    # Calculate health metrics
-    fetch_rate = total_fetched / total_attempted if total_attempted > 0 else 0.0
-    gate_pass_rate = total_passed / total_fetched if total_fetched > 0 else 0.0
-    
-    # Weighted RPC stats
-    rpc_success_rate = rpc_successful_requests / rpc_total_requests if rpc_total_requests > 0 else 0.0
-    rpc_avg_latency = int(rpc_latency_weighted / rpc_total_requests) if rpc_total_requests > 0 else 0
-    # R5: Track failed requests explicitly
-    rpc_failed_requests = rpc_total_requests - rpc_successful_requests
-    
-    # Top reject reasons
-    sorted_rejects = sorted(all_reject_reasons.items(), key=lambda x: x[1], reverse=True)
-    top_rejects = sorted_rejects[:5]
-    
-    health = HealthMetrics(
-        rpc_success_rate=round(rpc_success_rate, 3),
-        rpc_avg_latency_ms=rpc_avg_latency,
-        rpc_total_requests=rpc_total_requests,
-        rpc_failed_requests=rpc_failed_requests,  # R5
-        quote_fetch_rate=round(fetch_rate, 3),
-        quote_gate_pass_rate=round(gate_pass_rate, 3),
-        chains_active=len(chains_seen),
-        dexes_active=len(dexes_seen),
-        pairs_covered=len(pairs_seen),
-        pools_scanned=total_pools,
-        top_reject_reasons=top_rejects,
-    )
-    
-    # Calculate spread stats - Team Lead Крок 1-2: Clear terminology
-    # all_spreads = all signals (spread × size variants)
-    # unique_spreads = unique spread_ids
+                self.rpc_total_requests += requests
+                self.rpc_successful_requests += int(requests * stats.get("success_rate", 0))
+                self.rpc_latency_weighted += stats.get("avg_latency_ms", 0) * requests
+        
+        self.block_age_ms = (cycle.get("block_pin") or {}).get("age_ms", 0) or 0
+        
+        # Spreads (after RPC stats and block age: they feed the ingest score)
+        rpc_success_rate = self.rpc_success_rate
+        for spread in cycle.get("spreads", []):
+            self._add_spread(spread, rpc_success_rate)
+        self.signals_total += cycle.get("spreads_unprofitable", 0)
     
-    # First, deduplicate spreads by spread_id (keep latest/last occurrence per id)
-    spreads_by_id: dict[str, dict] = {}
-    for spread in all_spreads:
+    def _add_spread(self, spread: dict, rpc_success_rate: float) -> None:
+        net_bps = spread.get("net_pnl_bps", 0)
+        executable = bool(spread.get("executable"))
+        
+        self.signals_total += 1
+        if net_bps > 0:
+            self.signals_profitable += 1
+        if executable:
+            self.signals_executable += 1
+        
         spread_id = spread.get("id", "")
-        if spread_id:
-            spreads_by_id[spread_id] = spread  # Last wins (most recent)
-    unique_spreads = list(spreads_by_id.values())
-    
-    # SIGNALS = all spreads (including duplicates/size variants)
-    signals_total = len(all_spreads)
-    signals_profitable = len([s for s in all_spreads if s.get("net_pnl_bps", 0) > 0])
-    signals_executable = len([s for s in all_spreads if s.get("executable")])
-    
-    # SPREAD_IDS = unique spreads only
-    spread_ids_total = len(unique_spreads)
-    spread_ids_profitable = len([s for s in unique_spreads if s.get("net_pnl_bps", 0) > 0])
-    spread_ids_executable = len([s for s in unique_spreads if s.get("executable")])
-    
-    # Blocked spreads (profitable but not executable)
-    profitable_spreads = [s for s in unique_spreads if s.get("net_pnl_bps", 0) > 0]
-    executable_spreads = [s for s in profitable_spreads if s.get("executable")]
-    blocked_spreads = [s for s in profitable_spreads if not s.get("executable")]
-    
-    # Blocked reasons breakdown (Team Lead Крок 3)
-    blocked_reasons_count: dict[str, int] = {}
-    for spread in blocked_spreads:
-        # Determine blocked reason
-        reason = spread.get("blocked_reason", BlockedReason.EXEC_DISABLED_NOT_VERIFIED)
-        blocked_reasons_count[reason] = blocked_reasons_count.get(reason, 0) + 1
-    
-    # Sort blocked reasons by count
-    top_blocked = sorted(blocked_reasons_count.items(), key=lambda x: x[1], reverse=True)
-    
-    # Get block age from last cycle
-    block_age_ms = 0
-    if cycle_summaries:
-        last_cycle = cycle_summaries[-1]
-        block_pin = last_cycle.get("block_pin", {})
-        block_age_ms = block_pin.get("age_ms", 0) or 0
-    
-    # Rank opportunities by confidence × net_pnl
-    ranked = []
-    for spread in unique_spreads:
-        confidence, breakdown = calculate_confidence(
-            spread,
-            rpc_success_rate=rpc_success_rate,
-            block_age_ms=block_age_ms,
+        if not spread_id:
+            return
+        
+        self._seq += 1
+        previous = self._spreads.get(spread_id)
+        if previous is not None:
+            self._count_spread(previous, -1)
+        state = _SpreadState(
+            first_seen=previous.first_seen if previous else len(self._spreads),
+            seq=self._seq,
+            profitable=net_bps > 0,
+            executable=executable,
+            blocked_reason=spread.get("blocked_reason", BlockedReason.EXEC_DISABLED_NOT_VERIFIED),
         )
-        net_bps = spread.get("net_pnl_bps", 0)
+        self._spreads[spread_id] = state
+        self._count_spread(state, 1)
+        
+        if net_bps >= MIN_NET_PNL_BPS:
+            # Score a copy: calculate_confidence annotates the dict it is given
+            confidence, _ = calculate_confidence(
+                dict(spread), rpc_success_rate=rpc_success_rate, block_age_ms=self.block_age_ms,
+            )
+            heapq.heappush(
+                self._candidates, (confidence * net_bps, -state.first_seen, self._seq, spread_id, spread)
+            )
+            if self.max_candidates is not None and len(self._candidates) > 2 * self.max_candidates:
+                self._compact()
+    
+    def _count_spread(self, state: _SpreadState, delta: int) -> None:
+        if state.profitable:
+            self.spread_ids_profitable += delta
+            if not state.executable:
+                reason = state.blocked_reason
+                self.blocked_reasons[reason] = self.blocked_reasons.get(reason, 0) + delta
+                if not self.blocked_reasons[reason]:
+                    del self.blocked_reasons[reason]
+        if state.executable:
+            self.spread_ids_executable += delta
+    
+    def _is_current(self, seq: int, spread_id: str) -> bool:
+        return self._spreads[spread_id].seq == seq
+    
+    def _compact(self) -> None:
+        """Drop stale entries and keep the best max_candidates."""
+        current = [c for c in self._candidates if self._is_current(c[2], c[3])]
+        self._candidates = heapq.nlargest(self.max_candidates, current)
+        heapq.heapify(self._candidates)
+    
+    # =========================================================================
+    # REPORT
+    # =========================================================================
+    
+    @property
+    def rpc_success_rate(self) -> float:
+        if self.rpc_total_requests == 0:
+            return 0.0
+        return self.rpc_successful_requests / self.rpc_total_requests
+    
+    @property
+    def spread_ids_total(self) -> int:
+        return len(self._spreads)
+    
+    def report(
+        self,
+        paper_session_stats: dict | None = None,
+        notion_capital_numeraire: float = 0.0,
+    ) -> TruthReport:
+        """Build the TruthReport for everything consumed so far."""
+        total_attempted = self.total_attempted
+        total_fetched = self.total_fetched
+        rpc_total_requests = self.rpc_total_requests
+        top_n = self.top_n
         
-        ranked.append({
-            "spread": spread,
-            "confidence": confidence,
-            "confidence_breakdown": breakdown,
-            "score": confidence * net_bps,  # Combined score
-        })
-    
-    # Sort by score descending
-    ranked.sort(key=lambda x: x["score"], reverse=True)
-    
-    # Filter out noise: minimum net_pnl_bps threshold
-    MIN_NET_PNL_BPS = 5  # Ignore opportunities with < 5 bps
-    ranked = [r for r in ranked if r["spread"].get("net_pnl_bps", 0) >= MIN_NET_PNL_BPS]
-    
-    # R6: Do NOT filter by executable if that represents execution policy
-    # Ranking should be by economic signals (net_pnl_bps, confidence)
-    # Then display economic_executable, paper_would_execute, execution_ready, blocked_reason
-    # 
-    # For top opportunities, include ALL economically viable spreads,
-    # not just execution-policy-approved ones
-    ranked_economic = [
-        r for r in ranked 
-        if r["spread"].get("net_pnl_bps", 0) > 0  # Economic criterion: positive PnL
-    ]
-    
-    # Build top opportunities (by economic ranking, not execution policy)
-    top_opportunities = []
-    for i, item in enumerate(ranked_economic[:top_n]):
-        spread = item["spread"]
-        buy_leg = spread.get("buy_leg", {})
-        sell_leg = spread.get("sell_leg", {})
+        if self.mode is not None:
+            mode = self.mode
+        elif len(self.modes_seen) == 1:
+            mode = next(iter(self.modes_seen))
+        else:
+            mode = "MIXED" if self.modes_seen else "UNKNOWN"
         
-        # Calculate expected USDC using implied_price from spread
-        amount_in = int(spread.get("amount_in", "0"))
-        net_bps = spread.get("net_pnl_bps", 0)
+        # Calculate health metrics
+        fetch_rate = total_fetched / total_attempted if total_attempted > 0 else 0.0
+        gate_pass_rate = self.total_passed / total_fetched if total_fetched > 0 else 0.0
         
-        # Get implied_price from buy leg (price in quote per base)
-        buy_price_str = buy_leg.get("price", "0")
-        try:
-            implied_price = float(buy_price_str) if buy_price_str else 0.0
-        except (ValueError, TypeError):
-            implied_price = 0.0
+        # Weighted RPC stats
+        rpc_success_rate = self.rpc_success_rate
+        rpc_avg_latency = int(self.rpc_latency_weighted / rpc_total_requests) if rpc_total_requests > 0 else 0
+        # R5: Track failed requests explicitly
+        rpc_failed_requests = rpc_total_requests - self.rpc_successful_requests
         
-        # Calculate notional value and expected PnL
-        amount_base = amount_in / 10**18  # Assuming 18 decimals for base token
-        notional_usdc = amount_base * implied_price
-        expected_usdc = notional_usdc * (net_bps / 10000) if net_bps > 0 else 0.0
+        # Top reject reasons
+        sorted_rejects = sorted(self.reject_reasons.items(), key=lambda x: x[1], reverse=True)
+        top_rejects = sorted_rejects[:5]
         
-        # Get pair from spread (or derive from legs)
-        pair = spread.get("pair", "")
-        if not pair:
-            token_in = spread.get("token_in_symbol", buy_leg.get("token_in_symbol", ""))
-            token_out = spread.get("token_out_symbol", buy_leg.get("token_out_symbol", ""))
-            pair = f"{token_in}/{token_out}" if token_in and token_out else "UNKNOWN"
+        health = HealthMetrics(
+            rpc_success_rate=round(rpc_success_rate, 3),
+            rpc_avg_latency_ms=rpc_avg_latency,
+            rpc_total_requests=rpc_total_requests,
+            rpc_failed_requests=rpc_failed_requests,  # R5
+            quote_fetch_rate=round(fetch_rate, 3),
+            quote_gate_pass_rate=round(gate_pass_rate, 3),
+            chains_active=len(self.chains_seen),
+            dexes_active=len(self.dexes_seen),
+            pairs_covered=len(self.pairs_seen),
+            pools_scanned=self.total_pools,
+            top_reject_reasons=top_rejects,
+        )
         
-        # Team Lead Крок 3: Determine execution status
-        is_executable = spread.get("executable", False)
-        is_verified = spread.get("verified_for_execution", False)
-        blocked_reason = spread.get("blocked_reason")
+        # Blocked reasons, sorted by count
+        blocked_reasons_count = dict(self.blocked_reasons)
+        top_blocked = sorted(blocked_reasons_count.items(), key=lambda x: x[1], reverse=True)
         
-        # executable_economic = passes all gates AND net_pnl > 0
-        executable_economic = is_executable and net_bps > 0
+        # Rank current candidates by confidence × net_pnl with final RPC/block values
+        ranked = []
+        for _, _, seq, spread_id, spread in self._candidates:
+            if not self._is_current(seq, spread_id):
+                continue
+            confidence, breakdown = calculate_confidence(
+                spread,
+                rpc_success_rate=rpc_success_rate,
+                block_age_ms=self.block_age_ms,
+            )
+            ranked.append({
+                "spread": spread,
+                "confidence": confidence,
+                "confidence_breakdown": breakdown,
+                "score": confidence * spread.get("net_pnl_bps", 0),  # Combined score
+                "first_seen": self._spreads[spread_id].first_seen,
+            })
         
-        # paper_would_execute = what paper trading would do
-        paper_would_execute = executable_economic  # In paper mode, ignore verification
+        # Sort by score descending (ties: first-seen order)
+        ranked.sort(key=lambda x: (-x["score"], x["first_seen"]))
         
-        # execution_ready = executable_economic AND verified AND not blocked
-        execution_ready = executable_economic and is_verified and not blocked_reason
+        # R6: Do NOT filter by executable if that represents execution policy
+        # Ranking should be by economic signals (net_pnl_bps, confidence)
+        # Then display economic_executable, paper_would_execute, execution_ready, blocked_reason
+        # 
+        # For top opportunities, include ALL economically viable spreads,
+        # not just execution-policy-approved ones
+        ranked_economic = [
+            r for r in ranked 
+            if r["spread"].get("net_pnl_bps", 0) > 0  # Economic criterion: positive PnL
+        ]
+        # Build top opportunities (by economic ranking, not execution policy)
+        top_opportunities = []
+        for i, item in enumerate(ranked_economic[:top_n]):
+            spread = item["spread"]
+            buy_leg = spread.get("buy_leg", {})
+            sell_leg = spread.get("sell_leg", {})
         
-        # If not execution_ready but executable_economic, explain why
-        if executable_economic and not execution_ready:
-            if not is_verified:
-                blocked_reason = BlockedReason.EXEC_DISABLED_NOT_VERIFIED
-            elif blocked_reason is None:
-                blocked_reason = BlockedReason.EXEC_DISABLED_CONFIG
+            # Calculate expected USDC using implied_price from spread
+            amount_in = int(spread.get("amount_in", "0"))
+            net_bps = spread.get("net_pnl_bps", 0)
         
-        top_opportunities.append(OpportunityRank(
-            rank=i + 1,
-            spread_id=spread.get("id", ""),
-            buy_dex=buy_leg.get("dex", spread.get("buy_dex", "")),
-            sell_dex=sell_leg.get("dex", spread.get("sell_dex", "")),
-            pair=pair,
-            fee=spread.get("fee", 0),
-            amount_in=spread.get("amount_in", "0"),
-            spread_bps=spread.get("spread_bps", 0),
-            gas_cost_bps=spread.get("gas_cost_bps", 0),
-            net_pnl_bps=net_bps,
-            expected_pnl_usdc=round(expected_usdc, 4),
-            # Team Lead Крок 3: Clear separation
-            executable_economic=executable_economic,
-            paper_would_execute=paper_would_execute,
-            execution_ready=execution_ready,
-            blocked_reason=blocked_reason,
-            confidence=round(item["confidence"], 3),
-            confidence_breakdown=item.get("confidence_breakdown"),
-        ))
-    
-    # Cumulative PnL from paper session
-    total_pnl_bps = 0
-    total_pnl_numeraire = 0.0
-    numeraire = "USDC"
-    
-    # Revalidation stats from paper session
-    revalidation_total = 0
-    revalidation_passed = 0
-    revalidation_gates_changed = 0
-    
-    # Team Lead Крок 3: Count execution_ready from opportunities
-    execution_ready_count = sum(
-        1 for opp in top_opportunities if opp.execution_ready
-    )
-    paper_executable_count = sum(
-        1 for opp in top_opportunities if opp.paper_would_execute
-    )
-    
-    if paper_session_stats:
-        total_pnl_bps = paper_session_stats.get("total_pnl_bps", 0)
-        # AC-5: Read from numeraire (source of truth), fallback to legacy
-        total_pnl_numeraire = paper_session_stats.get(
-            "total_pnl_numeraire", 
-            paper_session_stats.get("total_pnl_usdc", 0.0)  # Legacy fallback
+            # Get implied_price from buy leg (price in quote per base)
+            buy_price_str = buy_leg.get("price", "0")
+            try:
+                implied_price = float(buy_price_str) if buy_price_str else 0.0
+            except (ValueError, TypeError):
+                implied_price = 0.0
+        
+            # Calculate notional value and expected PnL
+            amount_base = amount_in / 10**18  # Assuming 18 decimals for base token
+            notional_usdc = amount_base * implied_price
+            expected_usdc = notional_usdc * (net_bps / 10000) if net_bps > 0 else 0.0
+        
+            # Get pair from spread (or derive from legs)
+            pair = spread.get("pair", "")
+            if not pair:
+                token_in = spread.get("token_in_symbol", buy_leg.get("token_in_symbol", ""))
+                token_out = spread.get("token_out_symbol", buy_leg.get("token_out_symbol", ""))
+                pair = f"{token_in}/{token_out}" if token_in and token_out else "UNKNOWN"
+        
+            # Team Lead Крок 3: Determine execution status
+            is_executable = spread.get("executable", False)
+            is_verified = spread.get("verified_for_execution", False)
+            blocked_reason = spread.get("blocked_reason")
+        
+            # executable_economic = passes all gates AND net_pnl > 0
+            executable_economic = is_executable and net_bps > 0
+        
+            # paper_would_execute = what paper trading would do
+            paper_would_execute = executable_economic  # In paper mode, ignore verification
+        
+            # execution_ready = executable_economic AND verified AND not blocked
+            execution_ready = executable_economic and is_verified and not blocked_reason
+        
+            # If not execution_ready but executable_economic, explain why
+            if executable_economic and not execution_ready:
+                if not is_verified:
+                    blocked_reason = BlockedReason.EXEC_DISABLED_NOT_VERIFIED
+                elif blocked_reason is None:
+                    blocked_reason = BlockedReason.EXEC_DISABLED_CONFIG
+        
+            top_opportunities.append(OpportunityRank(
+                rank=i + 1,
+                spread_id=spread.get("id", ""),
+                buy_dex=buy_leg.get("dex", spread.get("buy_dex", "")),
+                sell_dex=sell_leg.get("dex", spread.get("sell_dex", "")),
+                pair=pair,
+                fee=spread.get("fee", 0),
+                amount_in=spread.get("amount_in", "0"),
+                spread_bps=spread.get("spread_bps", 0),
+                gas_cost_bps=spread.get("gas_cost_bps", 0),
+                net_pnl_bps=net_bps,
+                expected_pnl_usdc=round(expected_usdc, 4),
+                # Team Lead Крок 3: Clear separation
+                executable_economic=executable_economic,
+                paper_would_execute=paper_would_execute,
+                execution_ready=execution_ready,
+                blocked_reason=blocked_reason,
+                confidence=round(item["confidence"], 3),
+                confidence_breakdown=item.get("confidence_breakdown"),
+            ))
+    
+        # Cumulative PnL from paper session
+        total_pnl_bps = 0
+        total_pnl_numeraire = 0.0
+        numeraire = "USDC"
+    
+        # Revalidation stats from paper session
+        revalidation_total = 0
+        revalidation_passed = 0
+        revalidation_gates_changed = 0
+    
+        # Team Lead Крок 3: Count execution_ready from opportunities
+        execution_ready_count = sum(
+            1 for opp in top_opportunities if opp.execution_ready
         )
-        numeraire = paper_session_stats.get("numeraire", "USDC")
-        revalidation_total = paper_session_stats.get("revalidation_total", 0)
-        revalidation_passed = paper_session_stats.get("revalidation_passed", 0)
-        revalidation_gates_changed = paper_session_stats.get("revalidation_gates_changed", 0)
-        # КРОК 4: Get would_execute count for PnL validation
-        would_execute_count = paper_session_stats.get("would_execute", 0)
-    
-    # Roadmap 3.2: No float money - use Decimal
-    from decimal import Decimal
-    normalized_return_pct = None  # str or None
-    would_execute_pnl_usdc = "0.000000"  # str
-    would_execute_pnl_bps = 0
-    
-    # Parse notion_capital as Decimal
-    notion_capital_decimal = Decimal(str(notion_capital_numeraire))
-    
-    if paper_session_stats and notion_capital_decimal > 0:
-        would_execute_count = paper_session_stats.get("would_execute", 0)
+        paper_executable_count = sum(
+            1 for opp in top_opportunities if opp.paper_would_execute
+        )
+    
+        if paper_session_stats:
+            total_pnl_bps = paper_session_stats.get("total_pnl_bps", 0)
+            # AC-5: Read from numeraire (source of truth), fallback to legacy
+            total_pnl_numeraire = paper_session_stats.get(
+                "total_pnl_numeraire", 
+                paper_session_stats.get("total_pnl_usdc", 0.0)  # Legacy fallback
+            )
+            numeraire = paper_session_stats.get("numeraire", "USDC")
+            revalidation_total = paper_session_stats.get("revalidation_total", 0)
+            revalidation_passed = paper_session_stats.get("revalidation_passed", 0)
+            revalidation_gates_changed = paper_session_stats.get("revalidation_gates_changed", 0)
+            # КРОК 4: Get would_execute count for PnL validation
+            would_execute_count = paper_session_stats.get("would_execute", 0)
+    
+        # Roadmap 3.2: No float money - use Decimal
+        from decimal import Decimal
+        normalized_return_pct = None  # str or None
+        would_execute_pnl_usdc = "0.000000"  # str
+        would_execute_pnl_bps = 0
+    
+        # Parse notion_capital as Decimal
+        notion_capital_decimal = Decimal(str(notion_capital_numeraire))
+    
+        if paper_session_stats and notion_capital_decimal > 0:
+            would_execute_count = paper_session_stats.get("would_execute", 0)
         
-        if would_execute_count > 0:
-            # Parse total_pnl as Decimal (it's already str from paper_session)
-            total_pnl_decimal = Decimal(total_pnl_numeraire)
-            would_execute_pnl_usdc = total_pnl_numeraire  # str
-            would_execute_pnl_bps = total_pnl_bps
+            if would_execute_count > 0:
+                # Parse total_pnl as Decimal (it's already str from paper_session)
+                total_pnl_decimal = Decimal(total_pnl_numeraire)
+                would_execute_pnl_usdc = total_pnl_numeraire  # str
+                would_execute_pnl_bps = total_pnl_bps
             
-            # Roadmap 3.2: normalized_return_pct as Decimal-string
-            normalized_pct_decimal = (total_pnl_decimal / notion_capital_decimal) * 100
-            normalized_return_pct = str(normalized_pct_decimal.quantize(Decimal("0.0001")))
+                # Roadmap 3.2: normalized_return_pct as Decimal-string
+                normalized_pct_decimal = (total_pnl_decimal / notion_capital_decimal) * 100
+                normalized_return_pct = str(normalized_pct_decimal.quantize(Decimal("0.0001")))
             
-            # Sanity check - flag if > 50%
-            if normalized_pct_decimal > Decimal("50"):
-                logger.warning(
-                    f"Unrealistic normalized_return_pct: {normalized_return_pct}%, "
-                    f"will be flagged by invariant"
-                )
+                # Sanity check - flag if > 50%
+                if normalized_pct_decimal > Decimal("50"):
+                    logger.warning(
+                        f"Unrealistic normalized_return_pct: {normalized_return_pct}%, "
+                        f"will be flagged by invariant"
+                    )
+    
+        # Roadmap 3.2: All PnL values as str
+        notion_capital_str = str(notion_capital_decimal.quantize(Decimal("0.000001")))
+    
+        return TruthReport(
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            mode=mode,
+            health=health,
+            top_opportunities=top_opportunities,
+            # Team Lead Крок 1: Clear terminology
+            spread_ids_total=self.spread_ids_total,
+            spread_ids_profitable=self.spread_ids_profitable,
+            spread_ids_executable=self.spread_ids_executable,
+            signals_total=self.signals_total,
+            signals_profitable=self.signals_profitable,
+            signals_executable=self.signals_executable,
+            # Blocked
+            blocked_spreads=sum(blocked_reasons_count.values()),
+            blocked_reasons=blocked_reasons_count if blocked_reasons_count else None,
+            top_blocked_reasons=top_blocked if top_blocked else None,
+            # Execution - Team Lead Крок 3: Count from opportunities
+            paper_executable_count=paper_executable_count,
+            execution_ready_count=execution_ready_count,
+            # Revalidation
+            revalidation_total=revalidation_total,
+            revalidation_passed=revalidation_passed,
+            revalidation_gates_changed=revalidation_gates_changed,
+            # Roadmap 3.2: PnL as Decimal-strings
+            total_pnl_bps=total_pnl_bps,
+            total_pnl_usdc=total_pnl_numeraire,  # str
+            would_execute_pnl_bps=would_execute_pnl_bps,
+            would_execute_pnl_usdc=would_execute_pnl_usdc,  # str
+            notion_capital_usdc=notion_capital_str,  # str
+            normalized_return_pct=normalized_return_pct,  # str or None
+            stage_breakdown=self.stage_timings.to_dict() or None,
+        )
+
+
+def generate_truth_report(
+    snapshot: dict,
+    paper_session_stats: dict | None = None,
+    top_n: int = 10,
+    notion_capital_numeraire: float = 0.0,  # AC-3: Pass from SMOKE config
+) -> TruthReport:
+    """
+    Generate truth report from scan snapshot.
     
-    # Roadmap 3.2: All PnL values as str
-    notion_capital_str = str(notion_capital_decimal.quantize(Decimal("0.000001")))
-    
-    return TruthReport(
-        timestamp=datetime.now(timezone.utc).isoformat(),
-        mode=mode,
-        health=health,
-        top_opportunities=top_opportunities,
-        # Team Lead Крок 1: Clear terminology
-        spread_ids_total=spread_ids_total,
-        spread_ids_profitable=spread_ids_profitable,
-        spread_ids_executable=spread_ids_executable,
-        signals_total=signals_total,
-        signals_profitable=signals_profitable,
-        signals_executable=signals_executable,
-        # Blocked
-        blocked_spreads=len(blocked_spreads),
-        blocked_reasons=blocked_reasons_count if blocked_reasons_count else None,
-        top_blocked_reasons=top_blocked if top_blocked else None,
-        # Execution - Team Lead Крок 3: Count from opportunities
-        paper_executable_count=paper_executable_count,
-        execution_ready_count=execution_ready_count,
-        # Revalidation
-        revalidation_total=revalidation_total,
-        revalidation_passed=revalidation_passed,
-        revalidation_gates_changed=revalidation_gates_changed,
-        # Roadmap 3.2: PnL as Decimal-strings
-        total_pnl_bps=total_pnl_bps,
-        total_pnl_usdc=total_pnl_numeraire,  # str
-        would_execute_pnl_bps=would_execute_pnl_bps,
-        would_execute_pnl_usdc=would_execute_pnl_usdc,  # str
-        notion_capital_usdc=notion_capital_str,  # str
-        normalized_return_pct=normalized_return_pct,  # str or None
+    One-shot TruthReportAggregator over the snapshot's cycle summaries
+    (unbounded candidates, so the ranking is exact).
+    
+    Args:
+        snapshot: Scan snapshot dict
+        paper_session_stats: Optional cumulative paper trading stats
+        top_n: Number of top opportunities to include
+        notion_capital_numeraire: Notional capital for PnL normalization (AC-3)
+    """
+    aggregator = TruthReportAggregator(
+        mode=snapshot.get("mode", "UNKNOWN"), top_n=top_n, max_candidates=None,
     )
+    for cycle in snapshot.get("cycle_summaries", []):
+        aggregator.add_cycle(cycle)
+    return aggregator.report(paper_session_stats, notion_capital_numeraire)
 
 
 def save_truth_report(report: TruthReport, output_dir: Path) -> Path:
@@ -1111,6 +1260,12 @@ def print_truth_report(report: TruthReport) -> None:
     print(f"Executable: {report.executable_spreads}")
     print(f"Blocked: {report.blocked_spreads}")
     
+    if report.stage_breakdown:
+        print("\n--- STAGE TIMINGS (ms) ---")
+        for stage, t in report.stage_breakdown.items():
+            share = f"{t['share_pct']}%" if t["share_pct"] is not None else "-"
+            print(f"  {stage}: total={t['total_ms']} ({share}) p50={t['p50_ms']} p95={t['p95_ms']} max={t['max_ms']}")
+    
     print("\n--- CUMULATIVE PNL ---")
     # Roadmap 3.2: total_pnl_usdc is now str
     print(f"Total: {report.total_pnl_bps} bps (${report.total_pnl_usdc})")
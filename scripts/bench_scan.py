@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+scripts/bench_scan.py - Scan pipeline throughput benchmark.
+
+Drives run_scan_cycle (REGISTRY mode, with a PaperSession) against the
+local fake JSON-RPC node in scripts/fake_rpc.py, so numbers do not depend
+on Alchemy, network weather or market state.
+
+For each universe size it builds a synthetic registry (tokens vs USDC and
+WETH, on three V3 DEXes x two fee tiers), runs N cycles on consecutive
+blocks, then writes one snapshot and reports:
+
+- quotes/sec (attempted quotes over cycle wall time)
+- cycle wall time p50/p99
+- p50/p99 per stage: cycle, snapshot, the scanner's own stage timings
+  (scan.<stage>, from stage_timings_ms) and server-side time per RPC method
+- HTTP requests and calls served
+- peak RSS (process-wide, so it only grows across sizes)
+
+Usage:
+    python scripts/bench_scan.py --pools 10,100,1000,5000 --cycles 5
+    python scripts/bench_scan.py --pools 1000 --latency-ms 20 --multicall --out after.json
+    python scripts/bench_scan.py --pools 1000 --compare before.json
+"""
+
+import asyncio
+import hashlib
+import json
+import resource
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path (scripts are not part of the package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.constants import DexType, PoolStatus, DEFAULT_MAX_CONCURRENT_QUOTES
+from core.logging import get_logger, setup_logging
+from core.models import Pool, Token
+from chains.providers import close_all_providers
+from discovery.registry import PoolCandidate, PoolRegistry
+from strategy.jobs.run_scan import ScanSession, run_scan_cycle
+from strategy.paper_trading import PaperSession
+from scripts.fake_rpc import FakeChain, FakeRPCServer, FakeToken
+
+logger = get_logger("arby.bench_scan")
+
+CHAIN_KEY = "bench"
+CHAIN_ID = 42161
+FEE_TIERS = [500, 3000]
+
+# Quoter addresses are arbitrary: the fake node prices any address
+BENCH_DEXES = {
+    "uniswap_v3": "0x61fFE014bA17989E743c5F6cB21bF9697530B21e",  # ANCHOR_DEX
+    "sushiswap_v3": "0x0524E833cCD057e4d7A296e3aaAb9f7675964Ce1",
+    "pancakeswap_v3": "0xB048Bbc1Ee6b733FFfCFb9e9CeF7375518e25997",
+}
+
+USDC = FakeToken("0xaf88d065e77c8cC2239327C5EDb3A432268e5831", "USDC", 6, Decimal(1))
+WETH = FakeToken("0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", "WETH", 18, Decimal(2500))
+
+
+# =============================================================================
+# UNIVERSE
+# =============================================================================
+
+def synthetic_token(index: int) -> FakeToken:
+    """Deterministic token: price spread over $0.1-$1000, some 8-decimal."""
+    symbol = f"TK{index:04d}"
+    address = "0x" + hashlib.sha256(symbol.encode()).hexdigest()[:40]
+    price = Decimal(10) ** (index % 5 - 1) * (Decimal(10) + index % 7) / Decimal(10)
+    return FakeToken(address, symbol, 8 if index % 5 == 4 else 18, price)
+
+
+def to_token(fake: FakeToken) -> Token:
+    return Token(
+        chain_id=CHAIN_ID, address=fake.address, symbol=fake.symbol,
+        name=fake.symbol, decimals=fake.decimals, is_core=True,
+    )
+
+
+def build_universe(pool_count: int) -> tuple[list[FakeToken], dict, list[PoolCandidate]]:
+    """
+    Tokens, DEX configs and exactly pool_count registry candidates.
+
+    Every synthetic token trades against USDC and WETH on every DEX and fee.
+    The first candidate is WETH/USDC on the anchor DEX: it prices WETH, which
+    the scanner needs to value gas in token_in units.
+    """
+    dex_configs = {
+        dex_key: {
+            "adapter_type": "uniswap_v3",
+            "quoter_v2": quoter,
+            "fee_tiers": FEE_TIERS,
+            "enabled": True,
+            "verified_for_quoting": True,
+            "verified_for_execution": True,
+        }
+        for dex_key, quoter in BENCH_DEXES.items()
+    }
+
+    tokens = [USDC, WETH]
+    weth, usdc = to_token(WETH), to_token(USDC)
+    candidates: list[PoolCandidate] = [PoolCandidate(
+        pool=Pool(
+            chain_id=CHAIN_ID, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+            pool_address="", token0=min(weth, usdc, key=lambda t: t.address.lower()),
+            token1=max(weth, usdc, key=lambda t: t.address.lower()), fee=FEE_TIERS[0],
+            status=PoolStatus.ACTIVE,
+        ),
+        base=weth, quote=usdc, dex_key="uniswap_v3",
+    )]
+    index = 0
+    while len(candidates) < pool_count:
+        fake = synthetic_token(index)
+        tokens.append(fake)
+        base = to_token(fake)
+        for quote_fake in (USDC, WETH):
+            quote = to_token(quote_fake)
+            token0, token1 = sorted((base, quote), key=lambda t: t.address.lower())
+            for dex_key in BENCH_DEXES:
+                for fee in FEE_TIERS:
+                    pool = Pool(
+                        chain_id=CHAIN_ID, dex_id=dex_key, dex_type=DexType.UNISWAP_V3,
+                        pool_address="", token0=token0, token1=token1, fee=fee,
+                        status=PoolStatus.ACTIVE,
+                    )
+                    candidates.append(PoolCandidate(pool=pool, base=base, quote=quote, dex_key=dex_key))
+        index += 1
+
+    return tokens, dex_configs, candidates[:pool_count]
+
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def percentile(values: list[float], pct: int) -> float | None:
+    """Nearest-rank percentile (same rule as RPCStats)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, len(ordered) * pct // 100)], 3)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+async def bench_universe(
+    pool_count: int,
+    cycles: int,
+    workdir: Path,
+    use_multicall: bool = False,
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES,
+    paper_trading: bool = True,
+    **server_options,
+) -> dict:
+    """Run cycles scan cycles over a pool_count universe; returns the report row."""
+    tokens, dex_configs, candidates = build_universe(pool_count)
+    chain = FakeChain(tokens, chain_id=CHAIN_ID)
+
+    async with FakeRPCServer(chain, **server_options) as server:
+        chain_config = {
+            "chain_id": CHAIN_ID, "rpc_urls": [server.url], "enabled": True,
+            "rate_limit": {"enabled": False},  # Local node: measure the scanner, not the budget
+        }
+        registry = PoolRegistry({CHAIN_KEY: chain_config}, {CHAIN_KEY: dex_configs}, {})
+        registry.set_candidates_for_chain(CHAIN_KEY, candidates)
+
+        run_dir = workdir / f"pools_{pool_count}"
+        snapshots_dir = run_dir / "snapshots"
+        snapshots_dir.mkdir(parents=True, exist_ok=True)
+        session = ScanSession(snapshots_dir, Path("bench"))
+        paper_session = PaperSession(run_dir / "trades", session_id="bench") if paper_trading else None
+
+        stages: dict[str, list[float]] = {"cycle": []}
+        summaries: list[dict] = []
+        try:
+            for _ in range(cycles):
+                chain.advance()
+                start = time.perf_counter()
+                summary = await run_scan_cycle(
+                    CHAIN_KEY, chain_config, dex_configs, {}, session, paper_session, registry,
+                    max_concurrent_quotes=max_concurrent_quotes,
+                    use_multicall=use_multicall,
+                )
+                stages["cycle"].append((time.perf_counter() - start) * 1000)
+                summaries.append(summary)
+                # In-cycle stages as the scanner measured them
+                for name, ms in summary.get("stage_timings_ms", {}).items():
+                    if name != "total":
+                        stages.setdefault(f"scan.{name}", []).append(ms)
+
+            start = time.perf_counter()
+            session.save_snapshot(summaries)
+            stages["snapshot"] = [(time.perf_counter() - start) * 1000]
+        finally:
+            await close_all_providers()
+
+        for method, samples in server.service_ms.items():
+            stages[f"rpc.{method}"] = samples
+
+        attempted = sum(s["quotes_attempted"] for s in summaries)
+        wall_s = sum(stages["cycle"]) / 1000
+        return {
+            "pools": pool_count,
+            "cycles": cycles,
+            "quotes_attempted": attempted,
+            "quotes_fetched": sum(s["quotes_fetched"] for s in summaries),
+            "quotes_per_sec": round(attempted / wall_s, 1) if wall_s else None,
+            "cycle_ms_p50": percentile(stages["cycle"], 50),
+            "cycle_ms_p99": percentile(stages["cycle"], 99),
+            "stages_ms": {
+                name: {"p50": percentile(samples, 50), "p99": percentile(samples, 99), "count": len(samples)}
+                for name, samples in stages.items()
+            },
+            "spreads": sum(len(s.get("spreads", [])) for s in summaries),
+            "paper_trades": paper_session.stats.get("total_trades", 0) if paper_session else 0,
+            "http_requests": server.http_requests,
+            "rpc_calls": dict(server.method_counts),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+
+async def run_benchmark(pool_counts: list[int], cycles: int, workdir: Path, **options) -> dict:
+    """Benchmark every universe size (ascending, so peak RSS stays meaningful)."""
+    results = []
+    for pool_count in sorted(pool_counts):
+        row = await bench_universe(pool_count, cycles, workdir, **options)
+        logger.info(f"{pool_count} pools: {row['quotes_per_sec']} quotes/s, p50 cycle {row['cycle_ms_p50']} ms")
+        results.append(row)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": sys.version.split()[0],
+        "options": {k: v for k, v in options.items() if not isinstance(v, Path)},
+        "results": results,
+    }
+
+
+def format_report(report: dict, baseline: dict | None = None) -> str:
+    """Plain-text table; with a baseline, quotes/s and p50 deltas per size."""
+    before = {row["pools"]: row for row in (baseline or {}).get("results", [])}
+    lines = [f"{'pools':>6} {'quotes/s':>10} {'cycle p50':>10} {'cycle p99':>10} {'rss MB':>8}  vs baseline"]
+    for row in report["results"]:
+        delta = ""
+        old = before.get(row["pools"])
+        if old and old.get("quotes_per_sec") and row["quotes_per_sec"]:
+            speedup = row["quotes_per_sec"] / old["quotes_per_sec"]
+            delta = f"x{speedup:.2f} quotes/s, p50 {old['cycle_ms_p50']} -> {row['cycle_ms_p50']} ms"
+        lines.append(
+            f"{row['pools']:>6} {row['quotes_per_sec']:>10} {row['cycle_ms_p50']:>10} "
+            f"{row['cycle_ms_p99']:>10} {row['peak_rss_mb']:>8}  {delta}"
+        )
+        slow = sorted(row["stages_ms"].items(), key=lambda kv: kv[1]["p50"] or 0, reverse=True)
+        lines.append("       " + ", ".join(f"{name} p50={s['p50']} p99={s['p99']}" for name, s in slow[:5]))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the scan pipeline against a local fake RPC")
+    parser.add_argument("--pools", default="10,100,1000", help="Comma-separated universe sizes")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Server latency per HTTP request")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Mean of extra exponential latency")
+    parser.add_argument("--revert-rate", type=float, default=0)
+    parser.add_argument("--http-error-rate", type=float, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0)
+    parser.add_argument("--multicall", action="store_true", help="Quote through Multicall3")
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT_QUOTES)
+    parser.add_argument("--no-paper", action="store_true", help="Skip the PaperSession")
+    parser.add_argument("--log-level", default="WARNING")
+    parser.add_argument("--out", help="Write the JSON report here")
+    parser.add_argument("--compare", help="Baseline JSON report to compare against")
+    args = parser.parse_args()
+
+    setup_logging(level=args.log_level, json_output=False)
+
+    with tempfile.TemporaryDirectory(prefix="arby_bench_") as tmp:
+        report = asyncio.run(run_benchmark(
+            [int(p) for p in args.pools.split(",")],
+            args.cycles,
+            Path(tmp),
+            use_multicall=args.multicall,
+            max_concurrent_quotes=args.max_concurrent,
+            paper_trading=not args.no_paper,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            revert_rate=args.revert_rate,
+            http_error_rate=args.http_error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+        ))
+
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print(format_report(report, baseline))
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+scripts/export_snapshot.py - Convert binary scan snapshots to JSON.
+
+Binary snapshots (scan_*.arbysnap, core/snapshot.py) load back to exactly
+the dict the JSON snapshot held; this writes that dict out as the legacy
+indented JSON next to the input (or to --out).
+
+With --truth-report, cycles are streamed from the memory-mapped file into
+a TruthReportAggregator instead, so long runs never load in full.
+
+Usage:
+    python scripts/export_snapshot.py data/snapshots/scan_20260101_120000.arbysnap
+    python scripts/export_snapshot.py data/snapshots/*.arbysnap --indent 0
+    python scripts/export_snapshot.py data/snapshots/scan_20260101_120000.arbysnap --truth-report
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path (scripts are not part of the package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.snapshot import SnapshotReader, export_json
+from monitoring.truth_report import TruthReportAggregator, print_truth_report
+
+
+def snapshot_truth_report(path: Path):
+    """Truth report of a binary snapshot, decoding one cycle at a time."""
+    with SnapshotReader(path) as reader:
+        aggregator = TruthReportAggregator(mode=reader.meta.get("mode"))
+        for summary in reader:
+            aggregator.add_cycle(summary)
+    return aggregator.report()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export binary scan snapshots as JSON")
+    parser.add_argument("snapshots", nargs="+", help="scan_*.arbysnap files")
+    parser.add_argument("--out", help="Output path (single input only; default: input with .json suffix)")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indent (0 = compact)")
+    parser.add_argument("--truth-report", action="store_true", help="Print a truth report instead of exporting")
+    args = parser.parse_args()
+
+    if args.out and len(args.snapshots) > 1:
+        parser.error("--out needs a single input snapshot")
+
+    for name in args.snapshots:
+        path = Path(name)
+        if args.truth_report:
+            print_truth_report(snapshot_truth_report(path))
+            continue
+        output = Path(args.out) if args.out else path.with_suffix(".json")
+        export_json(path, output, indent=args.indent or None)
+        print(f"{path} -> {output}")
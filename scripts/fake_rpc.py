@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+scripts/fake_rpc.py - Local JSON-RPC stand-in for benchmarks.
+
+A deterministic chain on 127.0.0.1 that answers what the scanner asks:
+
+- eth_chainId, eth_blockNumber, eth_gasPrice
+- eth_call to any QuoterV2 (quoteExactInputSingle / quoteExactOutputSingle)
+- eth_call to any Algebra quoter (quoteExactInputSingle)
+- eth_call to Multicall3 aggregate3 wrapping any of the above
+
+Every (quoter, token pair, fee) is a constant-product pool holding
+depth_usd per side at the tokens' USD prices, skewed by a deterministic
++-skew_bps per pool so cross-DEX spreads exist. Same inputs, same outputs,
+on every run and every machine.
+
+Latency and failures are injected per HTTP request (latency_ms + jitter,
+http_error_rate -> 503, rate_limit_rate -> 429) and per call
+(revert_rate -> "execution reverted"), from a seeded RNG.
+
+Usage:
+    async with FakeRPCServer(FakeChain(tokens)) as server:
+        chain_config = {"chain_id": ..., "rpc_urls": [server.url], "rate_limit": {"enabled": False}}
+"""
+
+import asyncio
+import hashlib
+import random
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from decimal import Decimal
+from math import isqrt
+from pathlib import Path
+
+# Add project root to path (scripts are not part of the package)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from aiohttp import web
+from eth_abi import decode as abi_decode, encode as abi_encode
+
+from chains.multicall import SELECTOR_AGGREGATE3
+from dex.adapters.algebra import SELECTOR_QUOTE_EXACT_INPUT_SINGLE as ALGEBRA_EXACT_INPUT
+from dex.adapters.uniswap_v3 import (
+    SELECTOR_QUOTE_EXACT_INPUT_SINGLE as V3_EXACT_INPUT,
+    SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE as V3_EXACT_OUTPUT,
+)
+
+FEE_DENOMINATOR = 1_000_000
+BPS = 10_000
+ALGEBRA_FEE = 500  # Dynamic fee reported by the fake Algebra quoter
+GAS_PER_SWAP = 110_000
+GAS_PER_TICK = 15_000
+
+
+class Revert(Exception):
+    """A call that reverts on chain."""
+
+
+@dataclass
+class FakeToken:
+    """Token as the fake chain prices it."""
+    address: str
+    symbol: str
+    decimals: int
+    price_usd: Decimal
+
+
+@dataclass
+class FakeChain:
+    """
+    Deterministic market state behind the fake RPC.
+
+    Args:
+        tokens: Tradable tokens (any pair of them has a pool on every quoter)
+        depth_usd: Liquidity per side of every pool
+        skew_bps: Max deterministic price skew per pool
+        block_number: Current block (advance() moves it)
+        gas_price_wei: eth_gasPrice answer
+    """
+    tokens: list[FakeToken]
+    chain_id: int = 42161
+    depth_usd: Decimal = Decimal(5_000_000)
+    skew_bps: int = 30
+    block_number: int = 1_000_000
+    gas_price_wei: int = 10_000_000  # 0.01 gwei
+    _by_address: dict[str, FakeToken] = field(init=False, repr=False)
+    _reserves: dict[tuple, tuple[int, int]] = field(init=False, repr=False, default_factory=dict)
+
+    def __post_init__(self) -> None:
+        self._by_address = {t.address.lower(): t for t in self.tokens}
+
+    def advance(self, blocks: int = 1) -> int:
+        self.block_number += blocks
+        return self.block_number
+
+    def reserves(self, quoter: str, token_in: str, token_out: str, fee: int) -> tuple[int, int]:
+        """(reserve_in, reserve_out) in wei for a directed pool."""
+        key = (quoter.lower(), token_in.lower(), token_out.lower(), fee)
+        if key not in self._reserves:
+            t_in = self._by_address.get(token_in.lower())
+            t_out = self._by_address.get(token_out.lower())
+            if t_in is None or t_out is None:
+                raise Revert("unknown token")
+            # Skew is a property of the (undirected) pool: both directions agree
+            a, b = sorted((token_in.lower(), token_out.lower()))
+            digest = hashlib.sha256(f"{quoter.lower()}:{a}:{b}:{fee}".encode()).digest()
+            skew = int.from_bytes(digest[:4], "big") % (2 * self.skew_bps + 1) - self.skew_bps
+            if token_in.lower() != a:
+                skew = -skew
+            r_in = int(self.depth_usd / t_in.price_usd * 10**t_in.decimals)
+            r_out = int(self.depth_usd / t_out.price_usd * 10**t_out.decimals) * (BPS + skew) // BPS
+            self._reserves[key] = (r_in, r_out)
+        return self._reserves[key]
+
+    def quote_exact_input(self, quoter: str, token_in: str, token_out: str, amount_in: int, fee: int) -> tuple[int, int, int, int]:
+        """(amount_out, sqrt_price_x96_after, ticks_crossed, gas)."""
+        r_in, r_out = self.reserves(quoter, token_in, token_out, fee)
+        if amount_in <= 0:
+            raise Revert("zero amount")
+        net_in = amount_in * (FEE_DENOMINATOR - fee) // FEE_DENOMINATOR
+        amount_out = r_out * net_in // (r_in + net_in)
+        return (amount_out, *self._after(token_in, token_out, r_in + net_in, r_out - amount_out, amount_in, r_in))
+
+    def quote_exact_output(self, quoter: str, token_in: str, token_out: str, amount_out: int, fee: int) -> tuple[int, int, int, int]:
+        """(amount_in, sqrt_price_x96_after, ticks_crossed, gas)."""
+        r_in, r_out = self.reserves(quoter, token_in, token_out, fee)
+        if amount_out <= 0 or amount_out >= r_out:
+            raise Revert("insufficient liquidity")
+        net_in = -(-r_in * amount_out // (r_out - amount_out))
+        amount_in = -(-net_in * FEE_DENOMINATOR // (FEE_DENOMINATOR - fee))
+        return (amount_in, *self._after(token_in, token_out, r_in + net_in, r_out - amount_out, amount_in, r_in))
+
+    @staticmethod
+    def _after(token_in: str, token_out: str, new_in: int, new_out: int, amount_in: int, r_in: int) -> tuple[int, int, int]:
+        # Price as token1/token0 in raw units, like a V3 pool's sqrtPriceX96
+        if token_in.lower() < token_out.lower():
+            reserve0, reserve1 = new_in, new_out
+        else:
+            reserve0, reserve1 = new_out, new_in
+        sqrt_price_x96 = isqrt((reserve1 << 192) // max(reserve0, 1))
+        ticks = 1 + amount_in * BPS // r_in // 30  # One tick per ~30 bps of impact
+        return sqrt_price_x96, ticks, GAS_PER_SWAP + GAS_PER_TICK * ticks
+
+    # =========================================================================
+    # eth_call dispatch
+    # =========================================================================
+
+    def eth_call(self, to: str, data: str) -> str:
+        """Execute calldata against the fake contracts; returns 0x-hex."""
+        selector, args = data[:10].lower(), bytes.fromhex(data[10:])
+        if selector == V3_EXACT_INPUT:
+            ((token_in, token_out, amount, fee, _),) = abi_decode(["(address,address,uint256,uint24,uint160)"], args)
+            result = self.quote_exact_input(to, token_in, token_out, amount, fee)
+            return "0x" + abi_encode(["uint256", "uint160", "uint32", "uint256"], result).hex()
+        if selector == V3_EXACT_OUTPUT:
+            ((token_in, token_out, amount, fee, _),) = abi_decode(["(address,address,uint256,uint24,uint160)"], args)
+            result = self.quote_exact_output(to, token_in, token_out, amount, fee)
+            return "0x" + abi_encode(["uint256", "uint160", "uint32", "uint256"], result).hex()
+        if selector == "0x" + ALGEBRA_EXACT_INPUT:
+            token_in, token_out, amount, _ = abi_decode(["address", "address", "uint256", "uint160"], args)
+            amount_out = self.quote_exact_input(to, token_in, token_out, amount, ALGEBRA_FEE)[0]
+            return "0x" + abi_encode(["uint256", "uint16"], [amount_out, ALGEBRA_FEE]).hex()
+        raise Revert(f"unknown selector {selector}")
+
+
+class FakeRPCServer:
+    """
+    aiohttp server speaking JSON-RPC (single and batch) for a FakeChain.
+
+    Counts requests and calls per method in self.method_counts and keeps
+    per-request service times (ms, injected latency included) per method.
+    """
+
+    def __init__(
+        self,
+        chain: FakeChain,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        revert_rate: float = 0,
+        http_error_rate: float = 0,
+        rate_limit_rate: float = 0,
+        seed: int = 0,
+    ):
+        self.chain = chain
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.revert_rate = revert_rate
+        self.http_error_rate = http_error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = random.Random(seed)
+        self.http_requests = 0
+        self.method_counts: Counter = Counter()
+        self.service_ms: dict[str, list[float]] = {}
+        self.url = ""
+        self._runner: web.AppRunner | None = None
+
+    async def __aenter__(self) -> "FakeRPCServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://{host}:{bound_port}/"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.http_requests += 1
+        payload = await request.json()
+
+        delay_ms = self.latency_ms + (self.rng.expovariate(1 / self.jitter_ms) if self.jitter_ms else 0)
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self.rate_limit_rate and self.rng.random() < self.rate_limit_rate:
+            return web.Response(status=429, headers={"Retry-After": "0"}, text="Too Many Requests")
+        if self.http_error_rate and self.rng.random() < self.http_error_rate:
+            return web.Response(status=503, text="Service Unavailable")
+
+        if isinstance(payload, list):
+            body = [self._answer(p) for p in payload]
+            method = "batch"
+        else:
+            body = self._answer(payload)
+            method = payload.get("method", "?")
+
+        self.service_ms.setdefault(method, []).append((loop.time() - start) * 1000)
+        return web.json_response(body)
+
+    def _answer(self, call: dict) -> dict:
+        method, params = call.get("method"), call.get("params") or []
+        self.method_counts[method] += 1
+        reply = {"jsonrpc": "2.0", "id": call.get("id")}
+        try:
+            reply["result"] = self._dispatch(method, params)
+        except Revert as e:
+            reply["error"] = {"code": 3, "message": f"execution reverted: {e}"}
+        return reply
+
+    def _dispatch(self, method: str, params: list):
+        chain = self.chain
+        if method == "eth_chainId":
+            return hex(chain.chain_id)
+        if method == "eth_blockNumber":
+            return hex(chain.block_number)
+        if method == "eth_gasPrice":
+            return hex(chain.gas_price_wei)
+        if method == "eth_call":
+            tx = params[0]
+            if self.revert_rate and self.rng.random() < self.revert_rate:
+                raise Revert("injected")
+            if tx["data"][:10].lower() == SELECTOR_AGGREGATE3:
+                return self._aggregate3(tx["data"])
+            return chain.eth_call(tx["to"], tx["data"])
+        raise Revert(f"unsupported method {method}")
+
+    def _aggregate3(self, data: str) -> str:
+        (calls,) = abi_decode(["(address,bool,bytes)[]"], bytes.fromhex(data[10:]))
+        results = []
+        for target, allow_failure, call_data in calls:
+            try:
+                if self.revert_rate and self.rng.random() < self.revert_rate:
+                    raise Revert("injected")
+                out = self.chain.eth_call(target, "0x" + call_data.hex())
+                results.append((True, bytes.fromhex(out[2:])))
+            except Revert:
+                if not allow_failure:
+                    raise
+                results.append((False, b""))
+        self.method_counts["eth_call.aggregated"] += len(calls)
+        return "0x" + abi_encode(["(bool,bytes)[]"], [results]).hex()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake JSON-RPC node")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    args = parser.parse_args()
+
+    async def serve() -> None:
+        tokens = [
+            FakeToken("0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", "WETH", 18, Decimal(2500)),
+            FakeToken("0xaf88d065e77c8cC2239327C5EDb3A432268e5831", "USDC", 6, Decimal(1)),
+        ]
+        server = FakeRPCServer(FakeChain(tokens), latency_ms=args.latency_ms)
+        await server.start(port=args.port)
+        print(f"Fake RPC on {server.url}")
+        while True:
+            await asyncio.sleep(3600)
+
+    asyncio.run(serve())
@@ -0,0 +1,399 @@
+"""
+strategy/backtest_replay.py - Deterministic replay of recorded scan cycles.
+
+Live cycles keep their inputs in the summary's "replay" section
+(CycleInputs, strategy/jobs/run_scan.py): every fetched quote and failure,
+the exact gas price, execution flags and round-trip results. Replay feeds
+them through the scanner's own process_quotes - gates, spreads, confidence,
+paper trades - with no RPC, under a clock frozen at the recorded gating
+time, so:
+- without --config it reproduces the live spreads and paper trades
+- with --config it shows what those gate thresholds would have done
+
+Snapshot files (or --chunk-cycles ranges of them) are shards replayed in a
+process pool. Each shard has its own PaperSession, so cooldowns and
+revalidation restart at shard boundaries; the parent folds the shards'
+cycles into one truth report in shard order.
+
+Round trips are not re-quoted. A profitable spread the live run never
+re-quoted (e.g. one a looser threshold let through) gets
+{"error": "NOT_RECORDED"} and is not executable.
+
+Usage:
+    python -m strategy.backtest_replay data/snapshots/scan_*.arbysnap
+    python -m strategy.backtest_replay data/snapshots/*.arbysnap --config tuned.yaml --workers 8
+    python -m strategy.backtest_replay data/snapshots/*.arbysnap --chunk-cycles 500
+"""
+
+import asyncio
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Iterator
+
+import click
+
+from core.exceptions import ErrorCode
+from core.logging import get_logger, setup_logging
+from core.snapshot import SNAPSHOT_SUFFIX, SnapshotReader, SnapshotWriter, load_snapshot
+from core.time import frozen_clock
+from engine.sizing import GasPricer
+from monitoring.truth_report import (
+    TruthReport, TruthReportAggregator, print_truth_report, save_truth_report,
+)
+from strategy.config import GateThresholds, StrategyConfig, load_strategy_config
+from strategy.jobs.run_scan import (
+    CycleInputs,
+    CycleState,
+    ScanSession,
+    build_cycle_summary,
+    process_quotes,
+)
+from strategy.paper_trading import PaperSession, merge_paper_stats
+
+logger = get_logger("arby.backtest")
+
+# Round-trip report of a spread the live run did not re-quote
+NOT_RECORDED = "NOT_RECORDED"
+
+# Dropped from the cycles workers send back (the shard snapshot keeps them)
+HEAVY_SUMMARY_KEYS = ("quotes",)
+
+
+@dataclass
+class ReplayShard:
+    """Cycles [start, stop) of one snapshot file."""
+    path: Path
+    start: int = 0
+    stop: int | None = None  # None = to the end
+
+    @property
+    def name(self) -> str:
+        return f"{self.path.stem}_{self.start}-{'end' if self.stop is None else self.stop}"
+
+
+@dataclass
+class ShardResult:
+    """What a worker returns for one shard."""
+    shard: str
+    cycles: list[dict] = field(default_factory=list)  # Replayed summaries, without HEAVY_SUMMARY_KEYS
+    skipped: int = 0  # Cycles without a "replay" section
+    paper_stats: dict = field(default_factory=dict)
+    snapshot: str | None = None  # Replayed cycles in full
+
+
+@dataclass
+class BacktestResult:
+    """Merged result of a backtest run."""
+    report: TruthReport
+    paper_stats: dict
+    shards: int
+    cycles: int
+    skipped: int
+    snapshots: list[str]
+
+    def to_dict(self) -> dict:
+        return {
+            "shards": self.shards,
+            "cycles": self.cycles,
+            "skipped": self.skipped,
+            "paper_stats": self.paper_stats,
+            "snapshots": self.snapshots,
+            "truth_report": self.report.to_dict(),
+        }
+
+
+class RecordedBackend:
+    """CycleBackend answering from a live cycle's recording."""
+
+    def __init__(self, inputs: CycleInputs):
+        self.inputs = inputs
+
+    async def round_trips(
+        self, spread_rows: list, gas_pricer: GasPricer | None = None,
+    ) -> dict[tuple[str, str, str], tuple[dict, dict | None]]:
+        # Same candidates the live backend re-quotes: profitable, exact-output buy leg
+        # (recorded reports already carry their gas valuation)
+        results = {}
+        for row in spread_rows:
+            if not row.profitable or row.buy_dex not in self.inputs.round_trip_dexes:
+                continue
+            key = (row.key, row.buy_dex, row.sell_dex)
+            results[key] = self.inputs.round_trips.get(key, ({"error": NOT_RECORDED}, None))
+        return results
+
+    def rpc_success_rate(self) -> float | None:
+        return self.inputs.rpc_success
+
+
+# =============================================================================
+# CYCLES
+# =============================================================================
+
+async def replay_cycle(
+    summary: dict,
+    session: ScanSession,
+    paper_session: PaperSession | None = None,
+    thresholds: GateThresholds | None = None,
+) -> dict | None:
+    """
+    Re-run one recorded cycle.
+
+    Args:
+        summary: Live cycle summary with a "replay" section
+        session: Collects reject samples
+        paper_session: Paper trades and revalidation (None = off)
+        thresholds: Fixed gate limits (None = the scanner's adaptive gates)
+
+    Returns:
+        Cycle summary in the live schema, or None if nothing was recorded
+    """
+    recording = summary.get("replay")
+    if not recording:
+        return None
+    inputs = CycleInputs.from_snapshot(recording)
+
+    state = CycleState(
+        chain_key=summary["chain"],
+        chain_id=summary.get("chain_id"),
+        mode=summary.get("mode", "SMOKE"),
+        cycle_start=datetime.fromisoformat(summary["cycle_start"]),
+    )
+    # Planning happened before quoting: take it as recorded
+    state.block_number = summary["block_number"]
+    state.gas_price_wei = inputs.gas_price_wei
+    state.native_symbol = inputs.native_symbol
+    # USD references as they stood before the live cycle (gas valuation)
+    for key in [key for key in session.reference_prices_usd if key[0] == state.chain_id]:
+        del session.reference_prices_usd[key]
+    session.reference_prices_usd.update(
+        ((state.chain_id, symbol), price) for symbol, price in inputs.reference_prices_usd.items()
+    )
+    state.planned_pools = summary.get("planned_pools", 0)
+    state.pools_scanned = summary.get("pools_scanned", 0)
+    state.pairs_scanned = set(summary.get("pairs_scanned", []))
+    state.pools_skipped = Counter(summary.get("pools_skipped", {}))
+    state.dexes_passed_gate = summary.get("dexes_passed_gate", [])
+    state.quote_reject_reasons.update(inputs.plan_rejects)
+    state.rpc_stats = summary.get("rpc_stats", {})
+    state.pool_state = summary.get("pool_state")
+
+    # Freshness gates and trade timestamps see the time gating started live
+    with frozen_clock(inputs.gated_at_ms):
+        try:
+            await process_quotes(
+                state, inputs.plan, inputs.outcomes, inputs.execution_allowed, session,
+                RecordedBackend(inputs), paper_session, thresholds,
+            )
+        except Exception as e:
+            # Counted the way the live cycle counts it
+            state.quote_reject_reasons[ErrorCode.INFRA_RPC_ERROR.value] += 1
+            logger.error(f"Replay error: {e}", exc_info=True)
+        return build_cycle_summary(state, summary.get("block_pin") or {})
+
+
+def count_cycles(path: Path) -> int:
+    """Number of cycles in a snapshot file."""
+    if path.suffix == SNAPSHOT_SUFFIX:
+        with SnapshotReader(path) as reader:
+            return len(reader)
+    return len(load_snapshot(path).get("cycle_summaries", []))
+
+
+def iter_cycles(shard: ReplayShard) -> Iterator[dict]:
+    """Cycle summaries of a shard (binary snapshots decode one at a time)."""
+    if shard.path.suffix == SNAPSHOT_SUFFIX:
+        with SnapshotReader(shard.path) as reader:
+            stop = len(reader) if shard.stop is None else min(shard.stop, len(reader))
+            for index in range(shard.start, stop):
+                yield reader.cycle(index)
+    else:
+        yield from load_snapshot(shard.path).get("cycle_summaries", [])[shard.start:shard.stop]
+
+
+def plan_shards(paths: list[Path], chunk_cycles: int = 0) -> list[ReplayShard]:
+    """One shard per file, or per chunk_cycles cycles of a file (0 = whole files)."""
+    shards = []
+    for path in paths:
+        if not chunk_cycles:
+            shards.append(ReplayShard(path))
+            continue
+        total = count_cycles(path)
+        shards.extend(
+            ReplayShard(path, start, min(start + chunk_cycles, total))
+            for start in range(0, total, chunk_cycles)
+        )
+    return shards
+
+
+# =============================================================================
+# SHARDS
+# =============================================================================
+
+def replay_shard(
+    shard: ReplayShard,
+    out_dir: Path,
+    config_path: Path | None = None,
+    cooldown_blocks: int = PaperSession.DEFAULT_COOLDOWN_BLOCKS,
+    simulate_blocked: bool = True,
+) -> ShardResult:
+    """
+    Replay one shard with its own paper session (process pool worker).
+
+    Replayed summaries are written in full to out_dir/snapshots/<shard>.arbysnap;
+    the returned ones omit HEAVY_SUMMARY_KEYS.
+    """
+    config: StrategyConfig | None = load_strategy_config(config_path) if config_path else None
+    thresholds_by_chain: dict[int | None, GateThresholds] = {}
+
+    snapshots_dir = out_dir / "snapshots"
+    snapshots_dir.mkdir(parents=True, exist_ok=True)
+    session = ScanSession(snapshots_dir, Path("backtest"), record_quotes=False)
+    # A rerun into the same out_dir starts over instead of resuming cooldowns
+    (out_dir / "trades" / f"paper_trades_{shard.name}.jsonl").unlink(missing_ok=True)
+    paper_session = PaperSession(
+        out_dir / "trades",
+        session_id=shard.name,
+        cooldown_blocks=cooldown_blocks,
+        simulate_blocked=simulate_blocked,
+    )
+
+    result = ShardResult(shard=shard.name)
+    snapshot_path = snapshots_dir / f"{shard.name}{SNAPSHOT_SUFFIX}"
+
+    async def run(writer: SnapshotWriter) -> None:
+        for summary in iter_cycles(shard):
+            chain_id = summary.get("chain_id")
+            thresholds = None
+            if config is not None:
+                if chain_id not in thresholds_by_chain:
+                    thresholds_by_chain[chain_id] = config.get_thresholds(chain_id)
+                thresholds = thresholds_by_chain[chain_id]
+
+            replayed = await replay_cycle(summary, session, paper_session, thresholds)
+            if replayed is None:
+                result.skipped += 1
+                continue
+            writer.write_cycle(replayed)
+            result.cycles.append({k: v for k, v in replayed.items() if k not in HEAVY_SUMMARY_KEYS})
+
+    with SnapshotWriter(snapshot_path) as writer:
+        writer.write_meta({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": "BACKTEST",
+            "source": str(shard.path),
+            "cycles": [shard.start, shard.stop],
+            "config": str(config_path) if config_path else None,
+        })
+        asyncio.run(run(writer))
+
+    result.paper_stats = dict(paper_session.stats)
+    result.snapshot = str(snapshot_path)
+    return result
+
+
+def run_backtest(
+    paths: list[Path],
+    out_dir: Path,
+    config_path: Path | None = None,
+    workers: int = 1,
+    chunk_cycles: int = 0,
+    cooldown_blocks: int = PaperSession.DEFAULT_COOLDOWN_BLOCKS,
+    simulate_blocked: bool = True,
+    log_level: str = "WARNING",
+) -> BacktestResult:
+    """
+    Replay snapshot files, workers shards at a time.
+
+    workers=1 replays in this process. Results are merged in shard order,
+    so the report does not depend on which worker finished first.
+    """
+    shards = plan_shards(paths, chunk_cycles)
+    replay = partial(
+        replay_shard,
+        out_dir=out_dir,
+        config_path=config_path,
+        cooldown_blocks=cooldown_blocks,
+        simulate_blocked=simulate_blocked,
+    )
+
+    if workers > 1 and len(shards) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(shards)),
+            initializer=setup_logging,
+            initargs=(log_level, False, None, False),
+        ) as pool:
+            results = list(pool.map(replay, shards))
+    else:
+        results = [replay(shard) for shard in shards]
+
+    aggregator = TruthReportAggregator()
+    for result in results:
+        for summary in result.cycles:
+            aggregator.add_cycle(summary)
+    paper_stats = merge_paper_stats([r.paper_stats for r in results])
+
+    return BacktestResult(
+        report=aggregator.report(paper_stats),
+        paper_stats=paper_stats,
+        shards=len(results),
+        cycles=sum(len(r.cycles) for r in results),
+        skipped=sum(r.skipped for r in results),
+        snapshots=[r.snapshot for r in results],
+    )
+
+
+@click.command()
+@click.argument("snapshots", nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option("--config", "config_path", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="strategy.yaml whose gate thresholds to apply (default: the scanner's adaptive gates)")
+@click.option("--out-dir", "-o", default="data/backtest", help="Replayed snapshots, paper trades and report")
+@click.option("--workers", "-w", default=os.cpu_count() or 1, help="Worker processes (1 = in process)")
+@click.option("--chunk-cycles", default=0, help="Split files into shards of N cycles (0 = one shard per file)")
+@click.option("--cooldown-blocks", default=PaperSession.DEFAULT_COOLDOWN_BLOCKS,
+              help="Blocks to wait before re-trading same spread")
+@click.option("--simulate-blocked/--no-simulate-blocked", default=True, help="Also simulate blocked trades")
+@click.option("--log-level", "-l", default="WARNING", type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
+def main(
+    snapshots: tuple[str, ...],
+    config_path: str | None,
+    out_dir: str,
+    workers: int,
+    chunk_cycles: int,
+    cooldown_blocks: int,
+    simulate_blocked: bool,
+    log_level: str,
+) -> None:
+    """ARBY Backtest - Replay recorded scan snapshots through gates, spreads and paper trading."""
+    setup_logging(level=log_level, json_output=False, use_queue=False)
+
+    run_dir = Path(out_dir) / datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    result = run_backtest(
+        [Path(s) for s in snapshots],
+        run_dir,
+        config_path=Path(config_path) if config_path else None,
+        workers=workers,
+        chunk_cycles=chunk_cycles,
+        cooldown_blocks=cooldown_blocks,
+        simulate_blocked=simulate_blocked,
+        log_level=log_level,
+    )
+
+    save_truth_report(result.report, run_dir / "reports")
+    with open(run_dir / "backtest_summary.json", "w") as f:
+        json.dump(result.to_dict(), f, indent=2, default=str)
+
+    print_truth_report(result.report)
+    print(
+        f"\nReplayed {result.cycles} cycles in {result.shards} shards "
+        f"({result.skipped} without recorded inputs) -> {run_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
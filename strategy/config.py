@@ -5,11 +5,20 @@ Gate thresholds and limits with per-chain overrides.
 """
 
 from dataclasses import dataclass, field
+from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from core.constants import (
+    DEFAULT_LADDER_REPRICE_BPS,
+    DEFAULT_MAX_CONCURRENT_QUOTES,
+    DEFAULT_QUOTE_SIZES_USD,
+    DEFAULT_SIZE_SEARCH_MAX_PROBES,
+    DEFAULT_SIZE_SEARCH_TOLERANCE_BPS,
+)
+
 
 @dataclass
 class GateThresholds:
@@ -38,6 +47,43 @@ class ChainOverride:
     overrides: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class ScannerConfig:
+    """Scanner loop configuration (scanner: section)."""
+    
+    scan_interval_ms: int = 1000
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES  # In-flight quotes per chain
+    rpc_timeout_ms: int = 3000
+    use_multicall: bool = False  # Quote via one Multicall3 aggregate per cycle
+    block_stride: int = 1  # Block trigger: scan every Nth block
+
+
+@dataclass
+class QuoteConfig:
+    """Quote sizing configuration (quote: section)."""
+    
+    # Quote ladder in USD (ascending); converted per token at scan time
+    sizes_usd: list[Decimal] = field(
+        default_factory=lambda: [Decimal(s) for s in DEFAULT_QUOTE_SIZES_USD]
+    )
+    optimize_size: bool = True  # Search the best size for profitable round trips
+    size_search_max_probes: int = DEFAULT_SIZE_SEARCH_MAX_PROBES
+    size_search_tolerance_bps: int = DEFAULT_SIZE_SEARCH_TOLERANCE_BPS
+    # Keep a token's wei ladder until its USD price moves this far, so quote
+    # sizes (and spread ids) repeat from block to block
+    ladder_reprice_bps: int = DEFAULT_LADDER_REPRICE_BPS
+    # Quote registry pools from a per-chain PoolStateStore (dex/pool_state.py)
+    # kept in sync from pool logs; the quoter is the fallback
+    local_pool_state: bool = True
+
+
+@dataclass
+class MonitoringConfig:
+    """Monitoring configuration (monitoring: section)."""
+    
+    report_interval_seconds: int = 60  # Periodic truth report while scanning (0 = off)
+
+
 @dataclass
 class StrategyConfig:
     """Full strategy configuration."""
@@ -51,6 +97,15 @@ class StrategyConfig:
     # Anchor DEX for price sanity
     anchor_dex: str = "uniswap_v3"
     
+    # Scanner loop settings
+    scanner: ScannerConfig = field(default_factory=ScannerConfig)
+    
+    # Quote sizing
+    quote: QuoteConfig = field(default_factory=QuoteConfig)
+    
+    # Reports
+    monitoring: MonitoringConfig = field(default_factory=MonitoringConfig)
+    
     def get_thresholds(self, chain_id: int) -> GateThresholds:
         """Get thresholds for a specific chain (with overrides applied)."""
         base = GateThresholds(
@@ -92,8 +147,8 @@ def load_strategy_config(config_path: Path | None = None) -> StrategyConfig:
     with open(config_path) as f:
         data = yaml.safe_load(f) or {}
     
-    # Parse defaults
-    defaults_data = data.get("defaults", {})
+    # Parse defaults (strategy.yaml: gate_defaults; "defaults" is the older key)
+    defaults_data = data.get("gate_defaults") or data.get("defaults") or {}
     defaults = GateThresholds(
         max_gas_estimate=defaults_data.get("max_gas_estimate", 500_000),
         max_ticks_crossed=defaults_data.get("max_ticks_crossed", 10),
@@ -106,7 +161,7 @@ def load_strategy_config(config_path: Path | None = None) -> StrategyConfig:
     
     # Parse chain overrides
     chain_overrides = {}
-    for chain_key, overrides in data.get("chains", {}).items():
+    for chain_key, overrides in (data.get("gate_overrides") or data.get("chains") or {}).items():
         # chain_key can be chain_id (int) or chain_name (str)
         # We'll store by chain_id for lookup
         if isinstance(chain_key, int):
@@ -124,8 +179,48 @@ def load_strategy_config(config_path: Path | None = None) -> StrategyConfig:
         if chain_id > 0 and overrides:
             chain_overrides[chain_id] = overrides
     
+    # Parse scanner section
+    scanner_data = data.get("scanner") or {}
+    scanner = ScannerConfig(
+        scan_interval_ms=scanner_data.get("scan_interval_ms", 1000),
+        max_concurrent_quotes=max(
+            1, scanner_data.get("max_concurrent_quotes", DEFAULT_MAX_CONCURRENT_QUOTES)
+        ),
+        rpc_timeout_ms=scanner_data.get("rpc_timeout_ms", 3000),
+        use_multicall=bool(scanner_data.get("use_multicall", False)),
+        block_stride=max(1, scanner_data.get("block_stride", 1)),
+    )
+    
+    # Parse quote section
+    quote_data = data.get("quote") or {}
+    quote = QuoteConfig(
+        sizes_usd=sorted(
+            Decimal(str(s)) for s in quote_data.get("sizes_usd", DEFAULT_QUOTE_SIZES_USD)
+        ),
+        optimize_size=bool(quote_data.get("optimize_size", True)),
+        size_search_max_probes=max(
+            2, quote_data.get("size_search_max_probes", DEFAULT_SIZE_SEARCH_MAX_PROBES)
+        ),
+        size_search_tolerance_bps=max(
+            1, quote_data.get("size_search_tolerance_bps", DEFAULT_SIZE_SEARCH_TOLERANCE_BPS)
+        ),
+        ladder_reprice_bps=max(
+            0, quote_data.get("ladder_reprice_bps", DEFAULT_LADDER_REPRICE_BPS)
+        ),
+        local_pool_state=bool(quote_data.get("local_pool_state", True)),
+    )
+    
+    # Parse monitoring section
+    monitoring_data = data.get("monitoring") or {}
+    monitoring = MonitoringConfig(
+        report_interval_seconds=max(0, monitoring_data.get("report_interval_seconds", 60)),
+    )
+    
     return StrategyConfig(
         defaults=defaults,
         chain_overrides=chain_overrides,
         anchor_dex=data.get("anchor_dex", "uniswap_v3"),
+        scanner=scanner,
+        quote=quote,
+        monitoring=monitoring,
     )
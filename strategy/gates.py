@@ -12,11 +12,15 @@ Team Lead M3_P1 v2 directives:
 """
 
 from decimal import Decimal
+from functools import lru_cache
 from typing import NamedTuple
 
 from core.models import Quote
+from core.math import Price
 from core.exceptions import ErrorCode
 from core.logging import get_logger
+from core.time import is_quote_fresh
+from strategy.config import GateThresholds
 
 logger = get_logger(__name__)
 
@@ -165,6 +169,7 @@ def get_adaptive_gas_limit(amount_in: int) -> int:
     return min(GAS_LIMITS_BY_SIZE.values())
 
 
+@lru_cache(maxsize=4096)
 def get_pair_type(pair: str | None) -> str:
     """
     Classify pair as 'volatile', 'stable', or 'normal'.
@@ -544,9 +549,10 @@ def gate_ticks_crossed(
     return GateResult(passed=True)
 
 
-def gate_freshness(quote: Quote) -> GateResult:
-    """Reject if quote is stale."""
-    if not quote.is_fresh:
+def gate_freshness(quote: Quote, max_age_ms: int | None = None) -> GateResult:
+    """Reject if quote is stale (older than max_age_ms, default DEFAULT_MAX_QUOTE_AGE_MS)."""
+    fresh = quote.is_fresh if max_age_ms is None else is_quote_fresh(quote.timestamp_ms, max_age_ms)
+    if not fresh:
         return GateResult(
             passed=False,
             reject_code=ErrorCode.QUOTE_STALE_BLOCK,
@@ -557,11 +563,11 @@ def gate_freshness(quote: Quote) -> GateResult:
 
 def gate_price_sanity(
     quote: Quote,
-    anchor_price: Decimal | None,
+    anchor_price: Decimal | Price | None,
     is_anchor_dex: bool = False,
     max_deviation_bps: int | None = None,
     pair: str | None = None,
-    second_anchor_price: Decimal | None = None,
+    second_anchor_price: Decimal | Price | None = None,
     anchor_source: dict | None = None,  # Team Lead Крок 4: anchor source info
 ) -> GateResult:
     """
@@ -613,7 +619,7 @@ def gate_price_sanity(
         limit_l2 = max_deviation_bps
     
     # P0 FIX: Non-anchor quote without anchor = REJECT
-    if anchor_price is None or anchor_price == 0:
+    if not anchor_price:  # None or zero
         return GateResult(
             passed=False,
             reject_code=ErrorCode.PRICE_ANCHOR_MISSING,
@@ -628,9 +634,10 @@ def gate_price_sanity(
             },
         )
     
-    quote_price = calculate_implied_price(quote)
+    # Exact, cached per quote - no Decimal division on the hot path
+    quote_price = quote.price
     
-    if quote_price == 0:
+    if not quote_price:
         return GateResult(
             passed=False,
             reject_code=ErrorCode.PRICE_SANITY_FAILED,
@@ -644,8 +651,11 @@ def gate_price_sanity(
         )
     
     # Calculate deviation: |quote - anchor| / anchor * 10000
-    deviation = abs(quote_price - anchor_price) / anchor_price * 10000
-    deviation_bps = int(deviation)
+    deviation_bps = quote_price.deviation_bps(Price.from_decimal(anchor_price))
+    
+    # Common case: within both levels - pass without building details
+    if deviation_bps <= limit_l2 and deviation_bps <= limit_l1:
+        return GateResult(passed=True)
     
     # Build common details with anchor source
     base_details = {
@@ -681,8 +691,7 @@ def gate_price_sanity(
     # Between L1 and L2: requires second anchor confirmation
     if second_anchor_price is not None and second_anchor_price > 0:
         # Check if quote is closer to second anchor
-        deviation_to_second = abs(quote_price - second_anchor_price) / second_anchor_price * 10000
-        deviation_to_second_bps = int(deviation_to_second)
+        deviation_to_second_bps = quote_price.deviation_bps(Price.from_decimal(second_anchor_price))
         
         # If second anchor confirms (within L2), pass
         if deviation_to_second_bps <= limit_l2:
@@ -717,21 +726,13 @@ def calculate_implied_price(quote: Quote) -> Decimal:
     """
     Calculate implied price from quote.
     Returns amount_out per unit of amount_in (normalized by decimals).
-    """
-    if quote.amount_in == 0:
-        return Decimal("0")
-    
-    # Normalize by decimals
-    in_normalized = Decimal(quote.amount_in) / Decimal(10 ** quote.token_in.decimals)
-    out_normalized = Decimal(quote.amount_out) / Decimal(10 ** quote.token_out.decimals)
-    
-    if in_normalized == 0:
-        return Decimal("0")
     
-    return out_normalized / in_normalized
+    Decimal view of quote.price, for reports; gates compare quote.price.
+    """
+    return quote.price.to_decimal()
 
 
-def calculate_slippage_bps(price_small: Decimal, price_large: Decimal) -> int:
+def calculate_slippage_bps(price_small: Decimal | Price, price_large: Decimal | Price) -> int:
     """
     Calculate slippage in basis points.
     
@@ -740,6 +741,9 @@ def calculate_slippage_bps(price_small: Decimal, price_large: Decimal) -> int:
     Positive slippage means price degrades for larger sizes (expected).
     Negative would mean price improves for larger sizes (suspicious).
     """
+    if isinstance(price_small, Price) and isinstance(price_large, Price):
+        return -price_large.bps_diff(price_small)
+    
     if price_small == 0:
         return 0
     
@@ -769,8 +773,8 @@ def gate_slippage_curve(
         small = sorted_quotes[i - 1]
         large = sorted_quotes[i]
         
-        price_small = calculate_implied_price(small)
-        price_large = calculate_implied_price(large)
+        price_small = small.price
+        price_large = large.price
         
         slippage_bps = calculate_slippage_bps(price_small, price_large)
         
@@ -847,8 +851,9 @@ def gate_monotonicity(quotes: list[Quote]) -> GateResult:
 
 def apply_single_quote_gates(
     quote: Quote,
-    anchor_price: Decimal | None = None,
+    anchor_price: Decimal | Price | None = None,
     is_anchor_dex: bool = False,
+    thresholds: GateThresholds | None = None,
 ) -> list[GateResult]:
     """
     Apply all single-quote gates.
@@ -866,28 +871,35 @@ def apply_single_quote_gates(
         quote: Quote to validate
         anchor_price: Reference price from anchor DEX (for sanity check)
         is_anchor_dex: True if this quote is from the anchor DEX
+        thresholds: Fixed limits (strategy.yaml gate_defaults/overrides)
+            instead of the adaptive per-size/per-pair ones; used by
+            backtest replay to evaluate threshold changes
     
     Returns:
         List of failed GateResults (empty if all passed)
     """
+    t = thresholds
     gates = [
         gate_zero_output(quote),
-        gate_gas_estimate(quote),
-        gate_ticks_crossed(quote),
-        gate_freshness(quote),
-        gate_price_sanity(quote, anchor_price, is_anchor_dex),
+        gate_gas_estimate(quote, t.max_gas_estimate if t else None),
+        gate_ticks_crossed(quote, t.max_ticks_crossed if t else None),
+        gate_freshness(quote, t.max_quote_age_ms if t else None),
+        gate_price_sanity(quote, anchor_price, is_anchor_dex, t.max_price_deviation_bps if t else None),
     ]
     
     return [g for g in gates if not g.passed]
 
 
-def apply_curve_gates(quotes: list[Quote]) -> list[GateResult]:
+def apply_curve_gates(
+    quotes: list[Quote],
+    thresholds: GateThresholds | None = None,
+) -> list[GateResult]:
     """
     Apply all curve-level gates.
     Returns list of failed gate results (empty if all passed).
     """
     gates = [
-        gate_slippage_curve(quotes),
+        gate_slippage_curve(quotes, thresholds.max_slippage_bps if thresholds else MAX_SLIPPAGE_BPS),
         gate_monotonicity(quotes),
     ]
     
@@ -29,11 +29,13 @@ from typing import Any
 import click
 import yaml
 
-from core.logging import get_logger, setup_logging, set_global_context
+from core.logging import (
+    DEFAULT_LOG_SAMPLE_EVERY, get_logger, hot_path_sampling, setup_logging, set_global_context,
+)
 from core.exceptions import ErrorCode, ArbyError, QuoteError, InfraError
 from core.models import Token, Pool, Quote
 from core.constants import DexType, PoolStatus
-from chains.providers import RPCProvider, register_provider, close_all_providers
+from chains.providers import RPCProvider, register_chain_provider, close_all_providers
 from chains.block import BlockPinner
 from dex.adapters.uniswap_v3 import UniswapV3Adapter
 from dex.adapters.algebra import AlgebraAdapter
@@ -568,8 +570,7 @@ async def run_scan_cycle(
     
     try:
         # Setup provider
-        rpc_urls = chain_config.get("rpc_urls", [])
-        provider = register_provider(chain_id, rpc_urls)
+        provider = register_chain_provider(chain_config)
         
         # Pin block
         pinner = BlockPinner(provider)
@@ -1180,6 +1181,8 @@ async def scan_loop(
 @click.option("--trades-dir", "-t", default="data/trades")
 @click.option("--log-level", "-l", default="INFO", type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
 @click.option("--json-logs/--no-json-logs", default=True)
+@click.option("--log-sample", default=DEFAULT_LOG_SAMPLE_EVERY,
+              help="Keep 1 in N DEBUG/INFO logs from per-quote/RPC/trade loggers (1 = all)")
 @click.option("--paper-trading/--no-paper-trading", default=True, help="Enable paper trading")
 @click.option("--simulate-blocked/--no-simulate-blocked", default=True, help="Also simulate blocked trades")
 @click.option("--cooldown-blocks", default=10, help="Blocks to wait before re-trading same spread")
@@ -1193,13 +1196,14 @@ def main(
     trades_dir: str,
     log_level: str,
     json_logs: bool,
+    log_sample: int,
     paper_trading: bool,
     simulate_blocked: bool,
     cooldown_blocks: int,
     use_registry: bool,
 ) -> None:
     """ARBY Opportunity Scanner - Real quotes from DEXes with gates and spread detection."""
-    setup_logging(level=log_level, json_output=json_logs)
+    setup_logging(level=log_level, json_output=json_logs, sampling=hot_path_sampling(every=log_sample))
     set_global_context(service="arby-scan", version="0.5.0")  # Bump version
     
     signal.signal(signal.SIGINT, handle_shutdown)
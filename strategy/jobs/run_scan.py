@@ -19,32 +19,46 @@ import asyncio
 import json
 import signal
 import sys
+import time
+import traceback
 from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Protocol
 
 import click
 import yaml
 
-from core.logging import get_logger, setup_logging, set_global_context
+from core.logging import (
+    DEFAULT_LOG_SAMPLE_EVERY, get_logger, hot_path_sampling, setup_logging, set_global_context,
+)
 from core.exceptions import ErrorCode, ArbyError, QuoteError, InfraError
 from core.models import Token, Pool, Quote
-from core.constants import DexType, PoolStatus
-from chains.providers import RPCProvider, register_provider, close_all_providers
-from chains.block import BlockPinner
+from core.math import Price
+from core.quote_batch import QuoteBatch, QuoteRow
+from core.snapshot import SNAPSHOT_SUFFIX, write_snapshot
+from core.time import now_ms, now_utc
+from core.timing import StageHistogram, StageTimer
+from core.constants import DexType, PoolStatus, DEFAULT_MAX_CONCURRENT_QUOTES
+from chains.providers import RPCProvider, register_chain_provider, close_all_providers
+from chains.block import BlockPinner, BlockState, BlockStream
+from chains.multicall import Multicall3
 from dex.adapters.uniswap_v3 import UniswapV3Adapter
 from dex.adapters.algebra import AlgebraAdapter
 from dex.gating import DEXGate
+from dex.pool_state import PoolStateStore
 from strategy.gates import (
     apply_single_quote_gates,
     apply_curve_gates,
     calculate_implied_price,
     GateResult,
     ANCHOR_DEX,
+    STANDARD_AMOUNTS,
 )
+from strategy.config import GateThresholds, QuoteConfig, load_strategy_config
+from strategy.scanner import BlockScheduler
 from strategy.paper_trading import (
     PaperSession,
     PaperTrade,
@@ -52,11 +66,31 @@ from strategy.paper_trading import (
     calculate_usdc_value,
     calculate_pnl_usdc,
 )
+from engine.spread_engine import SpreadMatrix
+from engine.round_trip import RoundTrip, RoundTripRequest, evaluate_round_trips
+from engine.sizing import (
+    USD_STABLE_SYMBOLS,
+    GasPricer,
+    ladder_needs_reprice,
+    local_first_probe,
+    local_round_trip_profit,
+    optimize_sizes,
+    round_trip_probe,
+    size_ladder,
+    usd_price,
+)
 from discovery.registry import PoolRegistry, load_registry, PoolCandidate
-from monitoring.truth_report import generate_truth_report, save_truth_report, print_truth_report, calculate_confidence
+from discovery.pool_index import PoolIndex, prune_registry_chain
+from discovery.registry_store import RegistryStore
+from monitoring.truth_report import (
+    TruthReport, TruthReportAggregator, save_truth_report, print_truth_report, calculate_confidence,
+)
 
 logger = get_logger("arby.scan")
 
+# Layout of a cycle summary's "replay" section (CycleInputs)
+CYCLE_INPUTS_FORMAT = "cycle-inputs-v1"
+
 # Graceful shutdown flag
 _shutdown_requested = False
 
@@ -265,17 +299,46 @@ def build_test_pools(
     return pools, passed_dexes
 
 
+async def select_registry_candidates(
+    chain_key: str,
+    chain_id: int,
+    registry: PoolRegistry,
+    store: RegistryStore | None = None,
+) -> list[PoolCandidate]:
+    """
+    This cycle's candidates: one indexed (chain_id, pair) query per intent
+    pair in registry.sqlite, so pools marked DEAD by pool health drop out
+    on the next cycle. Without a store, the registry's in-memory list.
+    """
+    if store is None:
+        return registry.get_candidates_for_chain(chain_key)
+    quotable = registry.quotable_dexes(chain_key)
+    candidates = [
+        candidate
+        for pair in registry.get_pairs_for_chain(chain_key)
+        for candidate in await store.get_pool_candidates(chain_id, pair=pair)
+        if candidate.dex_key in quotable
+    ]
+    candidates.sort(key=lambda c: c.priority)
+    return candidates
+
+
 def build_pools_from_registry(
     chain_key: str,
     chain_id: int,
     dex_configs: dict,
     registry: PoolRegistry,
+    candidates: list[PoolCandidate] | None = None,
 ) -> tuple[list[tuple[Pool, Token, Token, str]], list[DEXQuotingConfig]]:
     """
     Build pools from registry (PRODUCTION MODE).
     
     Uses intent.txt → registry pipeline instead of hardcoded smoke harness.
     
+    Args:
+        candidates: Pre-selected candidates (select_registry_candidates);
+            default: the registry's in-memory list for the chain
+    
     Returns:
         (pools_list, dexes_passed_gate)
     """
@@ -284,7 +347,8 @@ def build_pools_from_registry(
     seen_dexes: set[str] = set()
     
     # Get candidates for this chain
-    candidates = registry.get_candidates_for_chain(chain_key)
+    if candidates is None:
+        candidates = registry.get_candidates_for_chain(chain_key)
     
     if not candidates:
         logger.warning(f"No registry candidates for {chain_key}")
@@ -347,11 +411,27 @@ class ScanSession:
     
     MAX_REJECT_SAMPLES = 3  # Per error code
     
-    def __init__(self, output_dir: Path, intent_file: Path):
+    def __init__(
+        self,
+        output_dir: Path,
+        intent_file: Path,
+        report_interval_seconds: float = 0,
+        notion_capital_numeraire: float = 0.0,
+        snapshot_format: str = "binary",
+        record_quotes: bool = True,
+    ):
         self.output_dir = output_dir
         self.intent_file = intent_file
+        self.snapshot_format = snapshot_format  # "binary" (core/snapshot.py) or "json"
+        self.record_quotes = record_quotes  # Keep cycle inputs for strategy/backtest_replay.py
         self.started_at = datetime.now(timezone.utc)
-        self.cycles: list[dict] = []
+        self.cycle_count = 0  # Summaries are aggregated, not kept (endless runs)
+        
+        # Truth report, updated once per cycle (report cost does not grow with the session)
+        self.truth = TruthReportAggregator()
+        self.report_interval_seconds = report_interval_seconds
+        self.notion_capital_numeraire = notion_capital_numeraire
+        self._last_report_at = time.monotonic()
         
         # Quote pipeline metrics
         self.quote_reject_histogram: Counter = Counter()
@@ -360,6 +440,25 @@ class ScanSession:
         self.total_quotes_attempted = 0
         self.total_quotes_fetched = 0
         self.total_quotes_passed_gates = 0
+        
+        # Per-stage cycle timings (plus snapshot writes)
+        self.stage_timings = StageHistogram()
+        
+        # Open registry.sqlite (run_scan main / scan workers): per-cycle
+        # candidates and pool health. None = the in-memory registry only
+        self.registry_store: RegistryStore | None = None
+        
+        # USD per token from anchor quotes against stables: (chain_id, symbol) -> price
+        # Sizes the next cycle's quote ladder
+        self.reference_prices_usd: dict[tuple[int, str], Decimal] = {}
+        
+        # Frozen quote ladders: (chain_id, symbol) -> (USD price built at, wei sizes)
+        # Rebuilt only outside quote.ladder_reprice_bps (see ladder_needs_reprice)
+        self.size_ladders: dict[tuple[int, str], tuple[Decimal, list[int]]] = {}
+        
+        # Cached pool state per chain_id, advanced on each pinned head
+        # (see sync_pool_state)
+        self.pool_states: dict[int, PoolStateStore] = {}
     
     def add_reject_sample(self, sample: RejectSample) -> None:
         """Add a reject sample (keep top N per code)."""
@@ -369,7 +468,7 @@ class ScanSession:
     
     def record_cycle(self, summary: dict) -> None:
         """Record a scan cycle summary."""
-        self.cycles.append(summary)
+        self.cycle_count += 1
         self.total_quotes_attempted += summary.get("quotes_attempted", 0)
         self.total_quotes_fetched += summary.get("quotes_fetched", 0)
         self.total_quotes_passed_gates += summary.get("quotes_passed_gates", 0)
@@ -378,6 +477,23 @@ class ScanSession:
         reject_reasons = summary.get("reject_reasons_histogram") or summary.get("quote_reject_reasons", {})
         for code, count in reject_reasons.items():
             self.quote_reject_histogram[code] += count
+        
+        self.stage_timings.record(summary.get("stage_timings_ms", {}))
+        self.truth.add_cycle(summary)
+    
+    def truth_report(self, paper_stats: dict | None = None) -> TruthReport:
+        """Truth report over every cycle recorded so far."""
+        return self.truth.report(paper_stats, notion_capital_numeraire=self.notion_capital_numeraire)
+    
+    def maybe_save_truth_report(self, paper_stats: dict | None = None) -> Path | None:
+        """Save a truth report if report_interval_seconds has passed (0 = never)."""
+        if not self.report_interval_seconds:
+            return None
+        now = time.monotonic()
+        if now - self._last_report_at < self.report_interval_seconds:
+            return None
+        self._last_report_at = now
+        return save_truth_report(self.truth_report(paper_stats), self.output_dir.parent / "reports")
     
     def get_summary(self) -> dict:
         """Get session summary."""
@@ -393,19 +509,27 @@ class ScanSession:
             "session_end": datetime.now(timezone.utc).isoformat(),
             "duration_seconds": int((datetime.now(timezone.utc) - self.started_at).total_seconds()),
             "intent_file": str(self.intent_file),
-            "total_cycles": len(self.cycles),
+            "total_cycles": self.cycle_count,
             "total_quotes_attempted": self.total_quotes_attempted,
             "total_quotes_fetched": self.total_quotes_fetched,
             "total_quotes_passed_gates": self.total_quotes_passed_gates,
             "fetch_rate": round(fetch_rate, 4),
             "gate_pass_rate": round(pass_rate, 4),
             "quote_reject_histogram": dict(self.quote_reject_histogram),
+            "stage_timings_ms": self.stage_timings.to_dict(),
         }
     
     def save_snapshot(self, cycle_summaries: list[dict]) -> Path:
-        """Save scan snapshot to file."""
+        """
+        Save scan snapshot to file (write time shows up as the "snapshot" stage).
+        
+        Binary snapshots load back to the same dict as the JSON form;
+        scripts/export_snapshot.py converts them to JSON.
+        """
+        start = time.perf_counter()
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        filename = f"scan_{timestamp}.json"
+        suffix = ".json" if self.snapshot_format == "json" else SNAPSHOT_SUFFIX
+        filename = f"scan_{timestamp}{suffix}"
         filepath = self.output_dir / filename
         
         # Determine mode from cycle summaries
@@ -419,9 +543,13 @@ class ScanSession:
             "cycle_summaries": cycle_summaries,
         }
         
-        with open(filepath, "w") as f:
-            json.dump(snapshot, f, indent=2, default=str)
+        if self.snapshot_format == "json":
+            with open(filepath, "w") as f:
+                json.dump(snapshot, f, indent=2, default=str)
+        else:
+            write_snapshot(filepath, snapshot)
         
+        self.stage_timings.record({"snapshot": round((time.perf_counter() - start) * 1000, 3)})
         logger.info(f"Snapshot saved: {filepath}")
         return filepath
     
@@ -538,759 +666,1119 @@ def calculate_gas_cost_bps(
     return int(gas_cost_bps)
 
 
-async def run_scan_cycle(
-    chain_key: str,
-    chain_config: dict,
-    dex_configs: dict,
-    token_configs: dict,
-    session: ScanSession,
-    paper_session: PaperSession | None = None,
-    registry: PoolRegistry | None = None,
-) -> dict:
+@dataclass
+class QuoteRequest:
+    """One (pool, size) quote planned for the pinned block."""
+    pool_key: str
+    adapter: UniswapV3Adapter | AlgebraAdapter
+    pool: Pool
+    token_in: Token
+    token_out: Token
+    amount_in: int
+
+
+async def fetch_quotes_concurrently(
+    requests: list[QuoteRequest],
+    block_number: int,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT_QUOTES,
+) -> dict[tuple[str, int], Quote | BaseException]:
     """
-    Run a single scan cycle for a chain.
-    
-    Pipeline:
-    1. Pin block
-    2. Fetch quotes from verified DEXes
-    3. Apply single-quote gates
-    4. Apply curve gates
-    5. Calculate spreads between DEXes
-    6. Record paper trades with cooldown
-    7. Record metrics
+    Fetch quotes for a pinned block with at most max_concurrent calls in flight.
     
-    Modes:
-    - registry=None: SMOKE mode (WETH/USDC only)
-    - registry=PoolRegistry: PRODUCTION mode (intent-driven)
+    Failures are captured, not raised: each (pool_key, amount_in) maps to either
+    the Quote or the exception get_quote raised, so the caller can process
+    outcomes in its own deterministic order.
     """
-    cycle_start = datetime.now(timezone.utc)
-    chain_id = chain_config.get("chain_id")
-    mode = "REGISTRY" if registry else "SMOKE"
+    semaphore = asyncio.Semaphore(max(1, max_concurrent))
+    
+    async def fetch_one(request: QuoteRequest) -> Quote:
+        async with semaphore:
+            return await request.adapter.get_quote(
+                pool=request.pool,
+                token_in=request.token_in,
+                token_out=request.token_out,
+                amount_in=request.amount_in,
+                block_number=block_number,
+            )
     
-    logger.info(
-        f"Starting scan cycle ({mode})",
-        extra={"context": {"chain": chain_key, "chain_id": chain_id, "mode": mode}}
+    outcomes = await asyncio.gather(
+        *(fetch_one(r) for r in requests), return_exceptions=True
     )
+    return {
+        (r.pool_key, r.amount_in): outcome
+        for r, outcome in zip(requests, outcomes)
+    }
+
+
+async def fetch_quotes_multicall(
+    requests: list[QuoteRequest],
+    block_number: int,
+    multicall: Multicall3,
+) -> dict[tuple[str, int], Quote | BaseException]:
+    """
+    Fetch quotes for a pinned block through Multicall3.aggregate3.
     
-    # Initialize counters
-    quote_reject_reasons: Counter = Counter()
-    pools_scanned = 0
-    planned_pools = 0
-    pairs_scanned: set[str] = set()
-    pools_skipped: Counter = Counter()  # Track why pools are skipped
-    quotes_attempted = 0
-    quotes_fetched = 0
-    quotes_rejected_by_gates = 0  # Fetched but failed gates
-    quotes_code_errors = 0  # Fetched but caused TypeError/AttributeError during processing
-    quotes_passed_gates = 0
-    quotes_list: list[dict] = []
-    block_number = None
-    gas_price_wei = 0
-    gas_price_gwei = 0.0
-    dexes_passed_gate: list[dict] = []
-    spreads: list[dict] = []
-    paper_trades_summary: list[dict] = []  # Summary for snapshot
-    paper_errors: int = 0  # R4: Track paper trading errors
-    rpc_stats: dict = {}
-    
-    # Quotes grouped by (fee, amount_in) for spread calculation
-    quotes_by_key: dict[str, dict[str, Quote]] = defaultdict(dict)
-    
-    # Anchor prices for sanity check (per spread_key)
-    anchor_prices: dict[str, Decimal] = {}  # spread_key -> anchor price
+    All legs execute in the same eth_call block by construction. A reverted
+    leg becomes QuoteError(QUOTE_REVERT) for that leg only; a failed
+    aggregate3 chunk returns its InfraError for that chunk's legs only, and
+    a failed batch for every leg. Keyed like fetch_quotes_concurrently.
     
-    try:
-        # Setup provider
-        rpc_urls = chain_config.get("rpc_urls", [])
-        provider = register_provider(chain_id, rpc_urls)
-        
-        # Pin block
-        pinner = BlockPinner(provider)
-        block_state = await pinner.refresh()
-        block_number = block_state.block_number
-        pinned_block = block_number  # For freshness check
-        
-        logger.info(
-            f"Block pinned: {block_number}",
-            extra={"context": {"block": block_number, "latency_ms": block_state.latency_ms}}
-        )
-        
-        # Revalidation: check pending trades from previous cycles
-        revalidation_results = []
-        pending: list = []  # Will be filled if paper_session exists
-        if paper_session is not None:
-            pending = paper_session.get_pending_revalidation(block_number, min_blocks=1)
-            logger.debug(f"Pending revalidation: {len(pending)} trades")
-            # Note: Full revalidation would re-quote, but for now we just mark as checked
-            # Real revalidation happens when we see the same spread in current cycle
-        
-        # Fetch gas price
-        gas_price_wei, gas_latency = await provider.get_gas_price()
-        gas_price_gwei = gas_price_wei / 10**9
-        
-        logger.info(
-            f"Gas price: {gas_price_gwei:.4f} gwei ({gas_price_wei} wei)",
-            extra={"context": {"gas_price_wei": gas_price_wei, "gas_price_gwei": gas_price_gwei}}
-        )
-        
-        # Build pools - REGISTRY or SMOKE mode
-        if registry:
-            test_pools, passed_dexes = build_pools_from_registry(
-                chain_key, chain_id, dex_configs, registry
+    Legs the adapter's state store covers at block_number are quoted
+    locally first (get_local_quote); only the rest become calls.
+    """
+    outcomes: dict[tuple[str, int], Quote | BaseException] = {}
+    remote: list[QuoteRequest] = []
+    for r in requests:
+        try:
+            local_quote = r.adapter.get_local_quote(
+                r.pool, r.token_in, r.token_out, r.amount_in, block_number
             )
+        except Exception as e:
+            outcomes[(r.pool_key, r.amount_in)] = e
+            continue
+        if local_quote is None:
+            remote.append(r)
         else:
-            test_pools, passed_dexes = build_test_pools(
-                chain_key, chain_id, dex_configs, token_configs
+            outcomes[(r.pool_key, r.amount_in)] = local_quote
+    
+    if remote:
+        calls = [
+            r.adapter.build_quote_call(r.pool, r.token_in, r.token_out, r.amount_in)
+            for r in remote
+        ]
+        try:
+            aggregated = await multicall.aggregate3(calls, block_number=block_number)
+        except Exception as e:
+            outcomes.update({(r.pool_key, r.amount_in): e for r in remote})
+        else:
+            for r, call_result in zip(remote, aggregated.results):
+                if call_result.error is not None:
+                    outcomes[(r.pool_key, r.amount_in)] = call_result.error
+                    continue
+                try:
+                    outcomes[(r.pool_key, r.amount_in)] = r.adapter.decode_quote_call(
+                        r.pool, r.token_in, r.token_out, r.amount_in,
+                        call_result, block_number, aggregated.latency_ms,
+                    )
+                except Exception as e:
+                    outcomes[(r.pool_key, r.amount_in)] = e
+    return {(r.pool_key, r.amount_in): outcomes[(r.pool_key, r.amount_in)] for r in requests}
+
+
+@dataclass
+class PlannedPool:
+    """One DEX/fee/pair of a cycle's quote plan, with its sizes in quote order."""
+    pool_key: str
+    pool: Pool
+    token_in: Token
+    token_out: Token
+    dex_key: str
+    quoter: str
+    amounts: list[int]
+
+
+@dataclass
+class CycleState:
+    """
+    Counters and outputs of one scan cycle.
+
+    Stages fill it in place, so when a stage raises, the summary still
+    reports what the earlier stages counted.
+    """
+    chain_key: str
+    chain_id: int | None
+    mode: str  # REGISTRY or SMOKE
+    cycle_start: datetime = field(default_factory=now_utc)
+    timer: StageTimer = field(default_factory=StageTimer)
+    block_number: int | None = None
+    gas_price_wei: int = 0
+    native_symbol: str = "ETH"  # Gas token (chains.yaml native_symbol)
+    quote_reject_reasons: Counter = field(default_factory=Counter)
+    planned_pools: int = 0
+    pools_scanned: int = 0
+    pairs_scanned: set[str] = field(default_factory=set)
+    pools_skipped: Counter = field(default_factory=Counter)  # Why pools were skipped
+    dexes_passed_gate: list[dict] = field(default_factory=list)
+    quotes_attempted: int = 0
+    quotes_fetched: int = 0
+    quotes_rejected_by_gates: int = 0  # Fetched but failed gates
+    quotes_code_errors: int = 0  # Fetched but caused TypeError/AttributeError during processing
+    quote_batch: QuoteBatch = field(default_factory=QuoteBatch)  # Quotes that passed single gates (columnar)
+    spreads: list[dict] = field(default_factory=list)
+    spreads_unprofitable: int = 0  # Non-zero spreads eaten by gas (counted, not materialized)
+    spread_groups_gas_unpriced: int = 0  # Spread groups skipped: no USD price to value gas in token_in
+    paper_trades_summary: list[dict] = field(default_factory=list)  # Summary for snapshot
+    paper_errors: int = 0  # R4: Track paper trading errors
+    revalidation_results: list[dict] = field(default_factory=list)
+    rpc_stats: dict = field(default_factory=dict)
+    pool_state: dict | None = None  # PoolStateStore.get_stats() when quoting from cached state
+    # Filled by process_quotes for the replay recording
+    rpc_success: float | None = None
+    round_trip_results: dict[tuple[str, str, str], tuple[dict, dict | None]] = field(default_factory=dict)
+
+    @property
+    def gas_price_gwei(self) -> float:
+        return self.gas_price_wei / 10**9
+
+
+class CycleBackend(Protocol):
+    """
+    RPC-dependent steps of process_quotes.
+
+    The live scanner answers them from the provider; backtest replay from
+    what the live run recorded.
+    """
+
+    async def round_trips(
+        self, spread_rows: list, gas_pricer: GasPricer,
+    ) -> dict[tuple[str, str, str], tuple[dict, dict | None]]:
+        """(round_trip report, optimal_size) per evaluated (spread_key, buy_dex, sell_dex)."""
+        ...
+
+    def rpc_success_rate(self) -> float | None:
+        """Share of successful RPC requests this session (None = unknown)."""
+        ...
+
+
+# Exceptions a recorded quote failure is rebuilt as (anything else: RuntimeError)
+_RECORDED_ERRORS: dict[str, type[BaseException]] = {
+    cls.__name__: cls
+    for cls in (QuoteError, InfraError, AttributeError, KeyError, ValueError, TypeError)
+}
+
+
+def _error_record(pool_key: str, amount_in: int, error: BaseException) -> list:
+    """[pool_key, amount_in, type, code, message, traceback] of a failed quote."""
+    type_name = next(
+        (name for name, cls in _RECORDED_ERRORS.items() if isinstance(error, cls)), type(error).__name__
+    )
+    if isinstance(error, ArbyError):
+        return [pool_key, amount_in, type_name, error.code.value, error.message, None]
+    # Code errors are classified from their traceback (ABI vs our bug), so keep it
+    return [pool_key, amount_in, type_name, None, str(error), "".join(traceback.format_exception(error))]
+
+
+def _rebuild_error(type_name: str, code: str | None, message: str, trace: str | None) -> BaseException:
+    cls = _RECORDED_ERRORS.get(type_name, RuntimeError)
+    if issubclass(cls, ArbyError):
+        return cls(ErrorCode(code), message)
+    error = cls(message)
+    if trace:
+        error.add_note(trace)  # Shows up in traceback.format_exc()
+    return error
+
+
+@dataclass
+class CycleInputs:
+    """
+    Everything process_quotes consumed in one live cycle.
+
+    Recorded in the cycle summary ("replay") so strategy/backtest_replay.py
+    can re-run gates, spreads, confidence and paper trading without RPC.
+    Quotes are stored as a QuoteBatch in plan order; failed quotes as
+    [pool_key, amount_in, error type, code, message, traceback].
+    """
+    plan: list[PlannedPool]
+    outcomes: dict[tuple[str, int], Quote | QuoteRow | BaseException]
+    gas_price_wei: int
+    gated_at_ms: int  # now_ms() when gating started (freshness reference)
+    execution_allowed: dict[str, bool]
+    plan_rejects: dict[str, int] = field(default_factory=dict)  # Reject reasons counted while planning
+    rpc_success: float | None = None
+    round_trip_dexes: list[str] = field(default_factory=list)  # DEXes with exact-output quoting (buy legs)
+    round_trips: dict[tuple[str, str, str], tuple[dict, dict | None]] = field(default_factory=dict)
+    # Gas valuation inputs: symbol -> USD reference as it stood before the cycle
+    native_symbol: str = "ETH"
+    reference_prices_usd: dict[str, Decimal] = field(default_factory=dict)
+
+    def to_snapshot(self) -> dict[str, Any]:
+        """JSON-ready form (see class docstring)."""
+        batch = QuoteBatch()
+        failures = []
+        plan: dict[str, list] = {
+            name: [] for name in ("pool_key", "pool", "token_in", "token_out", "dex", "quoter", "amounts")
+        }
+        for p in self.plan:
+            plan["pool_key"].append(p.pool_key)
+            plan["pool"].append(batch.intern_pool(p.pool))
+            plan["token_in"].append(batch.intern_token(p.token_in))
+            plan["token_out"].append(batch.intern_token(p.token_out))
+            plan["dex"].append(p.dex_key)
+            plan["quoter"].append(p.quoter)
+            plan["amounts"].append(p.amounts)
+            for amount_in in p.amounts:
+                outcome = self.outcomes.get((p.pool_key, amount_in))
+                if isinstance(outcome, BaseException):
+                    failures.append(_error_record(p.pool_key, amount_in, outcome))
+                elif outcome is not None:
+                    batch.append(outcome, dex=p.dex_key, quoter=p.quoter)
+        return {
+            "format": CYCLE_INPUTS_FORMAT,
+            "gas_price_wei": self.gas_price_wei,
+            "gated_at_ms": self.gated_at_ms,
+            "execution_allowed": self.execution_allowed,
+            "plan_rejects": self.plan_rejects,
+            "rpc_success": self.rpc_success,
+            "round_trip_dexes": self.round_trip_dexes,
+            "native_symbol": self.native_symbol,
+            "reference_prices_usd": {
+                symbol: str(price) for symbol, price in self.reference_prices_usd.items()
+            },
+            "plan": plan,
+            "quotes": batch.to_snapshot(),
+            "failures": failures,
+            "round_trips": [
+                [key, buy_dex, sell_dex, report, optimal_size]
+                for (key, buy_dex, sell_dex), (report, optimal_size) in self.round_trips.items()
+            ],
+        }
+
+    @classmethod
+    def from_snapshot(cls, data: dict[str, Any]) -> "CycleInputs":
+        """Rebuild inputs written by to_snapshot(); quotes come back as QuoteRows."""
+        batch = QuoteBatch.from_snapshot(data["quotes"])
+        failures = {(f[0], f[1]): _rebuild_error(*f[2:]) for f in data["failures"]}
+        p = data["plan"]
+        plan = [
+            PlannedPool(
+                pool_key=p["pool_key"][i],
+                pool=batch.pools[p["pool"][i]],
+                token_in=batch.tokens[p["token_in"][i]],
+                token_out=batch.tokens[p["token_out"][i]],
+                dex_key=p["dex"][i],
+                quoter=p["quoter"][i],
+                amounts=p["amounts"][i],
             )
-        planned_pools = len(test_pools)
-        
-        # Record DEXes for artifact
-        dexes_passed_gate = [
-            {
-                "dex_key": d.dex_key,
-                "quoter": d.quoter,
-                "fee_tiers": d.fee_tiers,
-                "verified_for_execution": d.verified_for_execution,
-            }
-            for d in passed_dexes
+            for i in range(len(p["pool_key"]))
         ]
-        
-        # Build lookup for execution check
-        execution_allowed = {d.dex_key: d.verified_for_execution for d in passed_dexes}
-        
-        logger.info(
-            f"Planned pools: {planned_pools}",
-            extra={"context": {"chain": chain_key, "planned_pools": planned_pools}}
+        # Rows were appended in plan order, skipping failures
+        rows = iter(batch)
+        outcomes: dict[tuple[str, int], Quote | QuoteRow | BaseException] = {}
+        for planned in plan:
+            for amount_in in planned.amounts:
+                key = (planned.pool_key, amount_in)
+                outcomes[key] = failures[key] if key in failures else next(rows)
+        return cls(
+            plan=plan,
+            outcomes=outcomes,
+            gas_price_wei=data["gas_price_wei"],
+            gated_at_ms=data["gated_at_ms"],
+            execution_allowed=data["execution_allowed"],
+            plan_rejects=data["plan_rejects"],
+            rpc_success=data["rpc_success"],
+            round_trip_dexes=data["round_trip_dexes"],
+            round_trips={
+                (key, buy_dex, sell_dex): (report, optimal_size)
+                for key, buy_dex, sell_dex, report, optimal_size in data["round_trips"]
+            },
+            native_symbol=data.get("native_symbol", "ETH"),
+            reference_prices_usd={
+                symbol: Decimal(price)
+                for symbol, price in data.get("reference_prices_usd", {}).items()
+            },
         )
-        
-        if not test_pools:
-            quote_reject_reasons[ErrorCode.POOL_NOT_FOUND.value] += 1
-            logger.warning(f"No test pools for {chain_key}")
-        
-        # Group pools by DEX + fee + pair for proper scanning
-        # Each unique (dex, fee, pair) should be scanned separately
-        pools_by_key: dict[str, tuple[Pool, Token, Token, str]] = {}
-        for pool, token_in, token_out, dex_key in test_pools:
-            # Unique key includes pair to prevent grouping different pairs together
-            pair_key = f"{token_in.symbol}/{token_out.symbol}"
-            key = f"{dex_key}_{pool.fee}_{pair_key}"
-            # Store first occurrence (all should be same anyway)
-            if key not in pools_by_key:
-                pools_by_key[key] = (pool, token_in, token_out, dex_key)
-        
-        # Sort keys so ANCHOR_DEX is processed first (sets anchor price before others)
-        sorted_keys = sorted(
-            pools_by_key.keys(),
-            key=lambda k: (0 if k.startswith(ANCHOR_DEX) else 1, k)
+
+
+class _ProviderBackend:
+    """
+    CycleBackend over the live provider: round trips and size search by RPC.
+
+    With a pool_state store covering both pools of a round trip at the
+    block, its size search probes local V3 math instead of the quoter.
+    """
+
+    def __init__(
+        self,
+        state: CycleState,
+        provider: RPCProvider,
+        adapters_by_dex: dict[str, UniswapV3Adapter | AlgebraAdapter],
+        quote_config: QuoteConfig,
+        quote_amounts: Callable[[Token], list[int]],
+        pool_state: PoolStateStore | None = None,
+    ):
+        self.state = state
+        self.provider = provider
+        self.adapters_by_dex = adapters_by_dex
+        self.quote_config = quote_config
+        self.quote_amounts = quote_amounts
+        self.pool_state = pool_state
+
+    def local_profit(self, round_trip: RoundTrip) -> Callable[[int], int | None] | None:
+        """Net PnL by size from cached state (None if either pool is not covered)."""
+        request = round_trip.request
+        store = self.pool_state
+        if store is None or not request.buy_pool.pool_address or not request.sell_pool.pool_address:
+            return None
+        try:
+            buy_state = store.state_at(request.buy_pool.pool_address, round_trip.block_number)
+            sell_state = store.state_at(request.sell_pool.pool_address, round_trip.block_number)
+        except QuoteError:
+            return None
+        return local_round_trip_profit(
+            request.buy_pool, buy_state, request.sell_pool, sell_state, request.base,
+            gas_cost_quote=round_trip.gas_cost(self.state.gas_price_wei),
         )
-        
-        # Process each DEX/fee/pair combination (anchor DEX first!)
-        for pool_key in sorted_keys:
-            pool, token_in, token_out, dex_key = pools_by_key[pool_key]
-            pools_scanned += 1
-            pairs_scanned.add(f"{token_in.symbol}/{token_out.symbol}")
-            
-            # Get DEX config
-            dex_config = dex_configs.get(dex_key, {})
-            adapter_type = dex_config.get("adapter_type", "uniswap_v3")
-            quoter_address = dex_config.get("quoter_v2") or dex_config.get("quoter")
-            
-            if not quoter_address:
-                logger.warning(f"No quoter for {dex_key}")
-                pools_skipped["no_quoter"] += 1
-                quote_reject_reasons[ErrorCode.QUOTE_REVERT.value] += 1
+
+    async def round_trips(
+        self, spread_rows: list, gas_pricer: GasPricer,
+    ) -> dict[tuple[str, str, str], tuple[dict, dict | None]]:
+        state = self.state
+        timer = state.timer
+        block_number = state.block_number
+        gas_price_wei = state.gas_price_wei
+        quote_config = self.quote_config
+
+        # Directional re-quote of profitable candidates (Roadmap 3.3): buy leg
+        # exact-output, sell leg exact-input, all legs in one batch at the block
+        round_trip_keys: list[tuple[str, str, str]] = []
+        round_trip_requests: list[RoundTripRequest] = []
+        for row in spread_rows:
+            buy_adapter = self.adapters_by_dex.get(row.buy_dex)
+            if not row.profitable or not hasattr(buy_adapter, "build_quote_exact_output_call"):
                 continue
-            
-            # Check feature flag for Algebra
-            feature_flag = dex_config.get("feature_flag")
-            if feature_flag == "algebra_adapter" and adapter_type == "algebra":
-                # Feature flagged - check if enabled
-                if not dex_config.get("enabled", False):
-                    logger.debug(f"Algebra adapter disabled for {dex_key}")
-                    pools_skipped["algebra_disabled"] += 1
-                    continue
-            
-            # Create adapter based on type
-            if adapter_type == "algebra":
-                adapter = AlgebraAdapter(provider, quoter_address, dex_key)
-            else:
-                # Default to UniswapV3Adapter (works for uniswap_v3, sushiswap_v3, etc)
-                adapter = UniswapV3Adapter(provider, quoter_address, dex_key)
-            
-            # Test sizes: 0.01 ETH, 0.1 ETH, 1 ETH
-            test_amounts = [
-                10**16,   # 0.01 ETH
-                10**17,   # 0.1 ETH
-                10**18,   # 1 ETH
+            round_trip_keys.append((row.key, row.buy_dex, row.sell_dex))
+            round_trip_requests.append(RoundTripRequest(
+                buy_dex=row.buy_dex,
+                buy_adapter=buy_adapter,
+                buy_pool=row.buy_quote.pool,
+                sell_dex=row.sell_dex,
+                sell_adapter=self.adapters_by_dex[row.sell_dex],
+                sell_pool=row.sell_quote.pool,
+                base=row.buy_quote.token_in,
+                quote=row.buy_quote.token_out,
+                base_amount=row.buy_quote.amount_in,
+                gas_rate=gas_pricer.quote_rates(row.buy_quote)[1],
+            ))
+        with timer.stage("round_trips"):
+            round_trips: dict[tuple[str, str, str], RoundTrip | BaseException] = dict(zip(
+                round_trip_keys,
+                await evaluate_round_trips(self.provider, round_trip_requests, block_number),
+            ))
+
+        # Best size per profitable round trip, searched within the quote ladder
+        # (only where gas could be valued in the quote token; local math where
+        # both pools are cached, gas held at the round trip's estimate)
+        optimal_sizes: dict[tuple[str, str, str], dict] = {}
+        if quote_config.optimize_size:
+            search = [
+                (key, request) for key, request in zip(round_trip_keys, round_trip_requests)
+                if isinstance(round_trips[key], RoundTrip)
+                and (round_trips[key].net_pnl(gas_price_wei) or 0) > 0
             ]
-            
-            # Collect quotes that passed single gates for curve analysis
-            single_passed_quotes: list[Quote] = []
-            
-            for amount_in in test_amounts:
-                quotes_attempted += 1
-                
-                try:
-                    quote = await adapter.get_quote(
-                        pool=pool,
-                        token_in=token_in,
-                        token_out=token_out,
-                        amount_in=amount_in,
-                        block_number=block_number,
-                    )
-                    
-                    # Successfully fetched and decoded
-                    quotes_fetched += 1
-                    
-                    # Check freshness: quote must be at pinned block
-                    if quote.block_number != pinned_block:
-                        quote_reject_reasons[ErrorCode.QUOTE_STALE_BLOCK.value] += 1
-                        session.add_reject_sample(RejectSample(
-                            dex=dex_key, fee=pool.fee, amount_in=amount_in,
-                            gas_estimate=quote.gas_estimate, ticks_crossed=quote.ticks_crossed,
-                            latency_ms=quote.latency_ms, error_code=ErrorCode.QUOTE_STALE_BLOCK.value,
-                            details={"expected_block": pinned_block, "actual_block": quote.block_number},
-                        ))
-                        continue
-                    
-                    # Determine keys for tracking
-                    pair_id = f"{token_in.symbol}/{token_out.symbol}"
-                    
-                    # P0 FIX: anchor_key WITHOUT fee - allows anchor to work across fee tiers
-                    # This ensures Sushi fee=3000 can use Uni fee=500 as anchor
-                    anchor_key = f"{pair_id}_{amount_in}"
-                    
-                    # spread_key WITH fee - for grouping quotes by fee tier
-                    spread_key = f"{pair_id}_{pool.fee}_{amount_in}"
-                    
-                    # Get anchor price for this pair/amount (any fee tier)
-                    anchor_price = anchor_prices.get(anchor_key)
-                    
-                    # Check if this is anchor DEX
-                    is_anchor_dex = (dex_key == ANCHOR_DEX)
-                    
-                    # If this is anchor DEX and no anchor yet - calculate it first
-                    if is_anchor_dex and anchor_price is None:
-                        anchor_price = calculate_implied_price(quote)
-                        if anchor_price > 0:
-                            anchor_prices[anchor_key] = anchor_price
-                    
-                    # Apply single-quote gates with anchor price and is_anchor_dex flag
-                    gate_failures = apply_single_quote_gates(quote, anchor_price, is_anchor_dex)
-                    
-                    if gate_failures:
-                        # Count this as one rejected quote (unique) - it WAS fetched but failed gates
-                        quotes_rejected_by_gates += 1
-                        
-                        # Add each failure reason to histogram (may be > 1 per quote)
-                        for failure in gate_failures:
-                            quote_reject_reasons[failure.reject_code.value] += 1
-                            session.add_reject_sample(RejectSample(
-                                dex=dex_key, fee=pool.fee, amount_in=amount_in,
-                                gas_estimate=quote.gas_estimate, ticks_crossed=quote.ticks_crossed,
-                                latency_ms=quote.latency_ms, error_code=failure.reject_code.value,
-                                details=failure.details,
-                            ))
-                        continue
-                    
-                    # Quote passed single gates - add to curve analysis list
-                    single_passed_quotes.append(quote)
-                    
-                    # Calculate implied price
-                    implied_price = calculate_implied_price(quote)
-                    
-                    # Update anchor if this is anchor DEX (using anchor_key without fee)
-                    if is_anchor_dex and anchor_key not in anchor_prices:
-                        anchor_prices[anchor_key] = implied_price
-                    
-                    # Store quote data with all fields + pool identity
-                    quote_data = {
-                        "dex": dex_key,
-                        "pair": f"{token_in.symbol}/{token_out.symbol}",
-                        "pool_address": pool.pool_address or "computed",
-                        "token_in": token_in.address,
-                        "token_out": token_out.address,
-                        "fee": pool.fee,
-                        "quoter": quoter_address,
-                        "amount_in": str(amount_in),
-                        "amount_out": str(quote.amount_out),
-                        "implied_price": str(implied_price),
-                        "anchor_price": str(anchor_price) if anchor_price else None,
-                        "block_number": block_number,
-                        "gas_estimate": quote.gas_estimate,
-                        "ticks_crossed": quote.ticks_crossed,
-                        "sqrt_price_x96_after": str(quote.sqrt_price_x96_after) if quote.sqrt_price_x96_after else None,
-                        "latency_ms": quote.latency_ms,
-                    }
-                    quotes_list.append(quote_data)
-                    
-                    # Store for spread calculation (spread_key includes fee)
-                    quotes_by_key[spread_key][dex_key] = quote
-                    
-                    logger.debug(
-                        f"Quote OK: {dex_key} {token_in.symbol}->{token_out.symbol} "
-                        f"fee={pool.fee} in={amount_in} out={quote.amount_out} "
-                        f"gas={quote.gas_estimate} ticks={quote.ticks_crossed}"
-                    )
-                    
-                except QuoteError as e:
-                    quote_reject_reasons[e.code.value] += 1
-                    # Note: NOT incrementing quotes_rejected_by_gates - this is a fetch error
-                    session.add_reject_sample(RejectSample(
-                        dex=dex_key, fee=pool.fee, amount_in=amount_in,
-                        gas_estimate=0, ticks_crossed=0, latency_ms=0,
-                        error_code=e.code.value, details=e.details,
-                    ))
-                    logger.warning(
-                        f"Quote error: {e.code.value} - {e.message}",
-                        extra={"context": {
-                            "dex": dex_key,
-                            "quoter": quoter_address,
-                            "fee": pool.fee,
-                            "amount_in": amount_in,
-                            "block": block_number,
-                        }}
+            if search:
+                with timer.stage("size_search"):
+                    results = await optimize_sizes(
+                        [(request, self.local_profit(round_trips[key])) for key, request in search],
+                        [
+                            (min(self.quote_amounts(request.base)), max(self.quote_amounts(request.base)))
+                            for _, request in search
+                        ],
+                        local_first_probe(round_trip_probe(self.provider, block_number, gas_price_wei)),
+                        max_probes=quote_config.size_search_max_probes,
+                        tolerance_bps=quote_config.size_search_tolerance_bps,
                     )
-                
-                except InfraError as e:
-                    quote_reject_reasons[e.code.value] += 1
-                    # Note: NOT incrementing quotes_rejected_by_gates - this is a fetch error
-                    logger.warning(
-                        f"Infra error: {e.code.value} - {e.message}",
-                        extra={"context": {"dex": dex_key}},
-                    )
-                    
-                except (AttributeError, KeyError, ValueError, TypeError) as e:
-                    # Classify error based on type and context
-                    import traceback
-                    tb = traceback.format_exc()
-                    
-                    # AttributeError/KeyError in our code = INTERNAL_CODE_ERROR (bug!)
-                    # ValueError = bad data from RPC
-                    # TypeError = validation issue
-                    if isinstance(e, (AttributeError, KeyError)):
-                        # Check if it's a real ABI issue or our code bug
-                        tb_lower = tb.lower()
-                        if "abi" in tb_lower or "decode" in tb_lower or "encode" in tb_lower:
-                            error_code = ErrorCode.INFRA_BAD_ABI
-                        else:
-                            error_code = ErrorCode.INTERNAL_CODE_ERROR  # Our code bug!
-                    elif isinstance(e, ValueError):
-                        error_code = ErrorCode.QUOTE_REVERT  # Bad data from RPC
-                    else:
-                        error_code = ErrorCode.VALIDATION_ERROR
-                    
-                    quote_reject_reasons[error_code.value] += 1
-                    # This error happened AFTER fetch (quote was received)
-                    # So count it as code_error, not as gate rejection
-                    quotes_code_errors += 1
-                    
-                    # Add detailed sample for debugging with traceback
-                    session.add_reject_sample(RejectSample(
+                for (key, request), result in zip(search, results):
+                    if result.net_pnl is not None:
+                        optimal_sizes[key] = {
+                            "amount_in": str(result.size),
+                            "net_pnl": str(result.net_pnl),
+                            "net_pnl_token": request.quote.symbol,
+                            "probes": result.probes,
+                        }
+
+        reports = {}
+        for key, round_trip in round_trips.items():
+            if isinstance(round_trip, RoundTrip):
+                report = round_trip.to_dict(gas_price_wei)
+            else:
+                error_code = getattr(round_trip, "code", None)
+                report = {"error": error_code.value if error_code else type(round_trip).__name__}
+            reports[key] = (report, optimal_sizes.get(key))
+        return reports
+
+    def rpc_success_rate(self) -> float | None:
+        # RPC stats for confidence - one lookup per cycle, not per spread
+        try:
+            current_rpc_stats = self.provider.get_stats_summary()
+            total_requests = sum(s.get("total_requests", 0) for s in current_rpc_stats.values())
+            successful_requests = sum(
+                int(s.get("total_requests", 0) * s.get("success_rate", 0))
+                for s in current_rpc_stats.values()
+            )
+            return successful_requests / total_requests if total_requests > 0 else None
+        except Exception:
+            # КРОК 6: Don't default to 1.0 - this hides RPC problems
+            return None  # Will be treated as unknown/risky
+
+
+# Quote failures that are the pool's own (a reverting quoter, no liquidity);
+# anything else (InfraError, timeouts, rate limits) says nothing about it
+POOL_HEALTH_FAILURE_CODES = frozenset({
+    ErrorCode.QUOTE_REVERT,
+    ErrorCode.QUOTE_ZERO_OUTPUT,
+    ErrorCode.POOL_NOT_FOUND,
+    ErrorCode.POOL_NO_LIQUIDITY,
+    ErrorCode.POOL_DEAD,
+    ErrorCode.POOL_UNSUPPORTED_FEE,
+})
+
+
+def pool_health_outcomes(
+    plan: list[PlannedPool],
+    quote_outcomes: dict[tuple[str, int], Quote | QuoteRow | BaseException],
+) -> list[tuple[Pool, bool, str | None]]:
+    """
+    One (pool, ok, error_code) per planned pool for RegistryStore.record_pool_outcomes.
+
+    A pool is ok if any size quoted and failed only if every size raised
+    a QuoteError with a POOL_HEALTH_FAILURE_CODES code. Pools with any
+    other error are skipped, so an RPC outage never builds a DEAD streak.
+    """
+    outcomes = []
+    for planned in plan:
+        results = [quote_outcomes.get((planned.pool_key, amount_in)) for amount_in in planned.amounts]
+        if any(r is not None and not isinstance(r, BaseException) for r in results):
+            outcomes.append((planned.pool, True, None))
+        elif results and all(
+            isinstance(r, QuoteError) and r.code in POOL_HEALTH_FAILURE_CODES for r in results
+        ):
+            outcomes.append((planned.pool, False, results[-1].code.value))
+    return outcomes
+
+
+async def process_quotes(
+    state: CycleState,
+    plan: list[PlannedPool],
+    quote_outcomes: dict[tuple[str, int], Quote | QuoteRow | BaseException],
+    execution_allowed: dict[str, bool],
+    session: ScanSession,
+    backend: CycleBackend,
+    paper_session: PaperSession | None = None,
+    thresholds: GateThresholds | None = None,
+) -> None:
+    """
+    Gates, spreads, confidence and paper trades for one cycle's quotes.
+
+    Shared by the live scanner and backtest replay: everything after the
+    quotes are fetched, with the RPC-dependent steps behind backend.
+
+    Args:
+        state: Cycle counters (block_number and gas_price_wei already set)
+        plan: Pools to process, anchor DEX first
+        quote_outcomes: Quote (or exception) per (pool_key, amount_in)
+        execution_allowed: dex_key -> verified_for_execution
+        session: Reject samples and next cycle's USD reference prices
+        backend: Round trips, size search and RPC health
+        paper_session: Paper trades and revalidation (None = off)
+        thresholds: Fixed gate limits instead of the adaptive ones (replay)
+    """
+    timer = state.timer
+    chain_id = state.chain_id
+    block_number = pinned_block = state.block_number  # pinned_block: for freshness check
+    gas_price_wei = state.gas_price_wei
+    gas_price_gwei = state.gas_price_gwei
+    quote_reject_reasons = state.quote_reject_reasons
+    quote_batch = state.quote_batch
+    spreads = state.spreads
+    paper_trades_summary = state.paper_trades_summary
+    revalidation_results = state.revalidation_results
+    min_net_pnl_bps = max(1, thresholds.min_net_pnl_bps) if thresholds else 1
+
+    # Quotes grouped by (fee, amount_in) for spread calculation
+    quotes_by_key: dict[str, dict[str, QuoteRow]] = defaultdict(dict)
+
+    # Anchor prices for sanity check (per spread_key)
+    anchor_prices: dict[str, Price] = {}  # spread_key -> anchor price
+
+    # Revalidation: pending trades from previous cycles are settled when their
+    # spread reappears this cycle (looked up per spread); ones whose spread
+    # stayed away past the paper session's window expire here
+    if paper_session is not None:
+        paper_session.expire_pending(block_number)
+
+    # Process in planned order (anchor DEX first!) so anchor prices, gates
+    # and reject accounting do not depend on RPC completion order
+    for planned in plan:
+        pool_key = planned.pool_key
+        pool, token_in, token_out, dex_key = planned.pool, planned.token_in, planned.token_out, planned.dex_key
+        quoter_address = planned.quoter
+
+        # Collect quotes that passed single gates for curve analysis
+        single_passed_quotes: list[Quote] = []
+
+        for amount_in in planned.amounts:
+            state.quotes_attempted += 1
+
+            try:
+                # Fetch failures are re-raised here so the handlers below
+                # classify them exactly as an inline await would
+                outcome = quote_outcomes[(pool_key, amount_in)]
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                quote = outcome
+
+                # Successfully fetched and decoded
+                state.quotes_fetched += 1
+
+                # Check freshness: quote must be at pinned block
+                if quote.block_number != pinned_block:
+                    quote_reject_reasons[ErrorCode.QUOTE_STALE_BLOCK.value] += 1
+                    session.add_reject_sample(RejectSample(
                         dex=dex_key, fee=pool.fee, amount_in=amount_in,
-                        gas_estimate=0, ticks_crossed=0, latency_ms=0,
-                        error_code=error_code.value,
-                        details={
-                            "error_type": type(e).__name__,
-                            "error_message": str(e),
-                            "traceback": tb.split('\n')[-4:-1],  # Last 3 lines of traceback
-                            "quoter": quoter_address,
-                            "token_in": token_in.address,
-                            "token_out": token_out.address,
-                            "token_in_symbol": token_in.symbol,
-                            "token_out_symbol": token_out.symbol,
-                            "token_in_decimals": token_in.decimals,
-                            "token_out_decimals": token_out.decimals,
-                            "pool_address": pool.pool_address or "computed",
-                        },
+                        gas_estimate=quote.gas_estimate, ticks_crossed=quote.ticks_crossed,
+                        latency_ms=quote.latency_ms, error_code=ErrorCode.QUOTE_STALE_BLOCK.value,
+                        details={"expected_block": pinned_block, "actual_block": quote.block_number},
                     ))
-                    
-                    logger.error(
-                        f"Code error: {type(e).__name__}: {e}",
-                        extra={"context": {
-                            "dex": dex_key,
-                            "fee": pool.fee,
-                            "amount_in": amount_in,
-                            "token_in": token_in.symbol,
-                            "token_out": token_out.symbol,
-                        }},
-                        exc_info=True,
-                    )
-                    
-                except Exception as e:
-                    quote_reject_reasons[ErrorCode.INFRA_RPC_ERROR.value] += 1
-                    # Note: NOT incrementing quotes_rejected_by_gates - this is a fetch error
+                    continue
+
+                # Determine keys for tracking
+                pair_id = f"{token_in.symbol}/{token_out.symbol}"
+
+                # P0 FIX: anchor_key WITHOUT fee - allows anchor to work across fee tiers
+                # This ensures Sushi fee=3000 can use Uni fee=500 as anchor
+                anchor_key = f"{pair_id}_{amount_in}"
+
+                # spread_key WITH fee - for grouping quotes by fee tier
+                spread_key = f"{pair_id}_{pool.fee}_{amount_in}"
+
+                # Get anchor price for this pair/amount (any fee tier)
+                anchor_price = anchor_prices.get(anchor_key)
+
+                # Check if this is anchor DEX
+                is_anchor_dex = (dex_key == ANCHOR_DEX)
+
+                # If this is anchor DEX and no anchor yet - calculate it first
+                if is_anchor_dex and anchor_price is None:
+                    anchor_price = quote.price
+                    if anchor_price > 0:
+                        anchor_prices[anchor_key] = anchor_price
+
+                # Apply single-quote gates with anchor price and is_anchor_dex flag
+                with timer.stage("gates"):
+                    gate_failures = apply_single_quote_gates(quote, anchor_price, is_anchor_dex, thresholds)
+
+                if gate_failures:
+                    # Count this as one rejected quote (unique) - it WAS fetched but failed gates
+                    state.quotes_rejected_by_gates += 1
+
+                    # Add each failure reason to histogram (may be > 1 per quote)
+                    for failure in gate_failures:
+                        quote_reject_reasons[failure.reject_code.value] += 1
+                        session.add_reject_sample(RejectSample(
+                            dex=dex_key, fee=pool.fee, amount_in=amount_in,
+                            gas_estimate=quote.gas_estimate, ticks_crossed=quote.ticks_crossed,
+                            latency_ms=quote.latency_ms, error_code=failure.reject_code.value,
+                            details=failure.details,
+                        ))
+                    continue
+
+                # Quote passed single gates - add to curve analysis list
+                single_passed_quotes.append(quote)
+
+                # Implied price (exact, cached on the quote)
+                implied_price = quote.price
+
+                # Update anchor if this is anchor DEX (using anchor_key without fee)
+                if is_anchor_dex and anchor_key not in anchor_prices:
+                    anchor_prices[anchor_key] = implied_price
+
+                # USD reference for next cycle's sizing
+                if is_anchor_dex and token_out.symbol.upper() in USD_STABLE_SYMBOLS:
+                    session.reference_prices_usd[(chain_id, token_in.symbol)] = implied_price.to_decimal()
+
+                # Store the quote as a batch row; spreads read the row
+                row = quote_batch.append(
+                    quote, dex=dex_key, quoter=quoter_address, anchor_price=anchor_price,
+                )
+
+                # Store for spread calculation (spread_key includes fee)
+                quotes_by_key[spread_key][dex_key] = row
+
+                logger.debug(
+                    f"Quote OK: {dex_key} {token_in.symbol}->{token_out.symbol} "
+                    f"fee={pool.fee} in={amount_in} out={quote.amount_out} "
+                    f"gas={quote.gas_estimate} ticks={quote.ticks_crossed}"
+                )
+
+            except QuoteError as e:
+                quote_reject_reasons[e.code.value] += 1
+                # Note: NOT incrementing quotes_rejected_by_gates - this is a fetch error
+                session.add_reject_sample(RejectSample(
+                    dex=dex_key, fee=pool.fee, amount_in=amount_in,
+                    gas_estimate=0, ticks_crossed=0, latency_ms=0,
+                    error_code=e.code.value, details=e.details,
+                ))
+                logger.warning(
+                    f"Quote error: {e.code.value} - {e.message}",
+                    extra={"context": {
+                        "dex": dex_key,
+                        "quoter": quoter_address,
+                        "fee": pool.fee,
+                        "amount_in": amount_in,
+                        "block": block_number,
+                    }}
+                )
+
+            except InfraError as e:
+                quote_reject_reasons[e.code.value] += 1
+                # Note: NOT incrementing quotes_rejected_by_gates - this is a fetch error
+                logger.warning(
+                    f"Infra error: {e.code.value} - {e.message}",
+                    extra={"context": {"dex": dex_key}},
+                )
+
+            except (AttributeError, KeyError, ValueError, TypeError) as e:
+                # Classify error based on type and context
+                tb = traceback.format_exc()
+
+                # AttributeError/KeyError in our code = INTERNAL_CODE_ERROR (bug!)
+                # ValueError = bad data from RPC
+                # TypeError = validation issue
+                if isinstance(e, (AttributeError, KeyError)):
+                    # Check if it's a real ABI issue or our code bug
+                    tb_lower = tb.lower()
+                    if "abi" in tb_lower or "decode" in tb_lower or "encode" in tb_lower:
+                        error_code = ErrorCode.INFRA_BAD_ABI
+                    else:
+                        error_code = ErrorCode.INTERNAL_CODE_ERROR  # Our code bug!
+                elif isinstance(e, ValueError):
+                    error_code = ErrorCode.QUOTE_REVERT  # Bad data from RPC
+                else:
+                    error_code = ErrorCode.VALIDATION_ERROR
+
+                quote_reject_reasons[error_code.value] += 1
+                # This error happened AFTER fetch (quote was received)
+                # So count it as code_error, not as gate rejection
+                state.quotes_code_errors += 1
+
+                # Add detailed sample for debugging with traceback
+                session.add_reject_sample(RejectSample(
+                    dex=dex_key, fee=pool.fee, amount_in=amount_in,
+                    gas_estimate=0, ticks_crossed=0, latency_ms=0,
+                    error_code=error_code.value,
+                    details={
+                        "error_type": type(e).__name__,
+                        "error_message": str(e),
+                        "traceback": tb.split('\n')[-4:-1],  # Last 3 lines of traceback
+                        "quoter": quoter_address,
+                        "token_in": token_in.address,
+                        "token_out": token_out.address,
+                        "token_in_symbol": token_in.symbol,
+                        "token_out_symbol": token_out.symbol,
+                        "token_in_decimals": token_in.decimals,
+                        "token_out_decimals": token_out.decimals,
+                        "pool_address": pool.pool_address or "computed",
+                    },
+                ))
+
+                logger.error(
+                    f"Code error: {type(e).__name__}: {e}",
+                    extra={"context": {
+                        "dex": dex_key,
+                        "fee": pool.fee,
+                        "amount_in": amount_in,
+                        "token_in": token_in.symbol,
+                        "token_out": token_out.symbol,
+                    }},
+                    exc_info=True,
+                )
+
+            except Exception as e:
+                quote_reject_reasons[ErrorCode.INFRA_RPC_ERROR.value] += 1
+                # Note: NOT incrementing quotes_rejected_by_gates - this is a fetch error
+                logger.error(
+                    f"Unexpected error: {type(e).__name__}: {e}",
+                    extra={"context": {"dex": dex_key}},
+                    exc_info=True,
+                )
+
+        # Apply curve-level gates (slippage, monotonicity)
+        # Only to quotes that passed single gates
+        if len(single_passed_quotes) >= 2:
+            with timer.stage("curve_gates"):
+                curve_failures = apply_curve_gates(single_passed_quotes, thresholds)
+
+            for failure in curve_failures:
+                quote_reject_reasons[failure.reject_code.value] += 1
+                logger.warning(
+                    f"Curve gate failed: {failure.reject_code.value}",
+                    extra={"context": {
+                        "dex": dex_key,
+                        "fee": pool.fee,
+                        "details": failure.details,
+                    }}
+                )
+
+            # Note: quotes_passed_gates will be calculated at end from quote_batch
+
+    # Pool health in registry.sqlite: pools that fail every cycle go DEAD
+    if session.registry_store is not None:
+        with timer.stage("pool_health"):
+            try:
+                await session.registry_store.record_pool_outcomes(
+                    pool_health_outcomes(plan, quote_outcomes)
+                )
+            except Exception as e:
+                logger.warning(f"Pool health update failed: {e}")
+
+    # Gas in token units at the USD references (this cycle's anchors included)
+    gas_pricer = GasPricer(state.native_symbol, {
+        symbol: price for (ref_chain_id, symbol), price in session.reference_prices_usd.items()
+        if ref_chain_id == chain_id
+    })
+
+    # Calculate spreads between DEXes (raw opportunity detection)
+    # One integer pass over every DEX pair; only profitable rows become dicts
+    with timer.stage("spreads"):
+        spread_matrix = SpreadMatrix.from_groups(
+            quotes_by_key, lambda quote: gas_pricer.quote_rates(quote)[0]
+        )
+        spread_rows = spread_matrix.spreads(gas_price_wei)
+    state.spread_groups_gas_unpriced = len(spread_matrix.unpriced)
+
+    # Round trips and best sizes of profitable candidates (RPC, or recorded)
+    round_trip_results = state.round_trip_results = await backend.round_trips(spread_rows, gas_pricer)
+
+    rpc_success = state.rpc_success = backend.rpc_success_rate()
+
+    # КРОК 6: If RPC stats unavailable, use pessimistic default
+    rpc_success_for_conf = rpc_success if rpc_success is not None else 0.5
+
+    def revalidate_pending(
+        spread_id: str,
+        net_pnl_bps: int,
+        would_still_paper: bool,
+        would_still_real: bool,
+    ) -> None:
+        """Mark pending trades of spread_id as revalidated with current results."""
+        for pending_trade in paper_session.get_pending_for_spread(spread_id, block_number):
+            # AC-6: Gates changed = PnL changed
+            gates_changed = pending_trade.net_pnl_bps != net_pnl_bps
+            paper_session.mark_revalidated(
+                spread_id=pending_trade.spread_id,
+                original_block=pending_trade.block_number,
+                revalidation_block=block_number,
+                would_still_execute=would_still_paper,  # Legacy
+                would_still_paper_execute=would_still_paper,
+                would_still_real_execute=would_still_real,
+                gates_actually_changed=gates_changed,
+                new_net_pnl_bps=net_pnl_bps,
+            )
+            revalidation_results.append({
+                "spread_id": spread_id,
+                "original_block": pending_trade.block_number,
+                "would_still_paper_execute": would_still_paper,
+                "would_still_real_execute": would_still_real,
+                "gates_actually_changed": gates_changed,
+                "original_pnl_bps": pending_trade.net_pnl_bps,
+                "new_pnl_bps": net_pnl_bps,
+                # Legacy
+                "would_still_execute": would_still_paper,
+            })
+
+    for row in spread_rows:
+        buy_dex, sell_dex = row.buy_dex, row.sell_dex
+        buy_quote, sell_quote = row.buy_quote, row.sell_quote
+        spread_bps = row.spread_bps
+        total_gas = row.gas_total
+        gas_cost_wei = row.gas_cost_wei
+        gas_cost_bps = row.gas_cost_bps
+        # Net PnL = spread - gas
+        net_pnl_bps = row.net_pnl_bps
+
+        # Parse spread_key: "PAIR_FEE_AMOUNT"
+        parts = row.key.split("_")
+        fee = parts[1]
+        amount_in_str = parts[2]
+        amount_in = int(amount_in_str)
+
+        # Check executability (both DEXes must be verified)
+        buy_exec = execution_allowed.get(buy_dex, False)
+        sell_exec = execution_allowed.get(sell_dex, False)
+        executable = buy_exec and sell_exec
+
+        # Get token info from quote (same for both since same pair)
+        token_in_symbol = buy_quote.token_in.symbol
+        token_out_symbol = buy_quote.token_out.symbol
+        pair = f"{token_in_symbol}/{token_out_symbol}"
+
+        # P0 FIX: spread_id MUST be unique across pairs
+        # Include pair to prevent cooldown/tracking collisions
+        spread_id = f"{pair}_{buy_dex}_{sell_dex}_{fee}_{amount_in_str}"
+
+        # P0 FIX: executable must be false if unprofitable
+        # executable = verified_for_execution AND profitable AND plausible AND confident
+        is_profitable = net_pnl_bps >= min_net_pnl_bps
+
+        if not is_profitable:
+            # Counted, not materialized; still settles pending revalidations
+            state.spreads_unprofitable += 1
+            if paper_session is not None and paper_session.has_pending(spread_id):
+                try:
+                    revalidate_pending(spread_id, net_pnl_bps, False, False)
+                except Exception as paper_err:
                     logger.error(
-                        f"Unexpected error: {type(e).__name__}: {e}",
-                        extra={"context": {"dex": dex_key}},
-                        exc_info=True,
+                        "Paper revalidation failed",
+                        spread_id=spread_id,
+                        error=str(paper_err),
+                        error_type=type(paper_err).__name__,
                     )
-            
-            # Apply curve-level gates (slippage, monotonicity)
-            # Only to quotes that passed single gates
-            if len(single_passed_quotes) >= 2:
-                curve_failures = apply_curve_gates(single_passed_quotes)
-                
-                for failure in curve_failures:
-                    quote_reject_reasons[failure.reject_code.value] += 1
-                    logger.warning(
-                        f"Curve gate failed: {failure.reject_code.value}",
-                        extra={"context": {
-                            "dex": dex_key,
-                            "fee": pool.fee,
-                            "details": failure.details,
-                        }}
-                    )
-                
-                # Note: quotes_passed_gates will be calculated at end from quotes_list
-        
-        # Calculate spreads between DEXes (raw opportunity detection)
-        for spread_key, dex_quotes in quotes_by_key.items():
-            if len(dex_quotes) < 2:
-                continue
-            
-            dex_list = list(dex_quotes.keys())
-            for i in range(len(dex_list)):
-                for j in range(i + 1, len(dex_list)):
-                    dex_a, dex_b = dex_list[i], dex_list[j]
-                    quote_a, quote_b = dex_quotes[dex_a], dex_quotes[dex_b]
-                    
-                    price_a = calculate_implied_price(quote_a)
-                    price_b = calculate_implied_price(quote_b)
-                    
-                    spread_bps = calculate_spread_bps(price_a, price_b)
-                    
-                    if spread_bps > 0:
-                        # Parse spread_key: "PAIR_FEE_AMOUNT"
-                        parts = spread_key.split("_")
-                        pair = parts[0]
-                        fee = parts[1]
-                        amount_in_str = parts[2]
-                        amount_in = int(amount_in_str)
-                        
-                        # Calculate gas cost in bps with real gas price
-                        total_gas = quote_a.gas_estimate + quote_b.gas_estimate
-                        gas_cost_wei = total_gas * gas_price_wei
-                        gas_cost_bps = calculate_gas_cost_bps(
-                            gas_estimate_a=quote_a.gas_estimate,
-                            gas_estimate_b=quote_b.gas_estimate,
-                            amount_in_wei=amount_in,
-                            gas_price_wei=gas_price_wei,
-                        )
-                        
-                        # Net PnL = spread - gas
-                        net_pnl_bps = spread_bps - gas_cost_bps
-                        
-                        # Determine which DEX is buy vs sell (lower price = buy)
-                        if price_a < price_b:
-                            buy_dex, sell_dex = dex_a, dex_b
-                            buy_quote, sell_quote = quote_a, quote_b
-                            buy_price, sell_price = price_a, price_b
-                        else:
-                            buy_dex, sell_dex = dex_b, dex_a
-                            buy_quote, sell_quote = quote_b, quote_a
-                            buy_price, sell_price = price_b, price_a
-                        
-                        # Check executability (both DEXes must be verified)
-                        buy_exec = execution_allowed.get(buy_dex, False)
-                        sell_exec = execution_allowed.get(sell_dex, False)
-                        executable = buy_exec and sell_exec
-                        
-                        # Get token info from quote (same for both since same pair)
-                        token_in_symbol = buy_quote.token_in.symbol
-                        token_out_symbol = buy_quote.token_out.symbol
-                        pair = f"{token_in_symbol}/{token_out_symbol}"
-                        
-                        # P0 FIX: spread_id MUST be unique across pairs
-                        # Include pair to prevent cooldown/tracking collisions
-                        spread_id = f"{pair}_{buy_dex}_{sell_dex}_{fee}_{amount_in_str}"
-                        
-                        # P0 FIX: executable must be false if unprofitable
-                        # executable = verified_for_execution AND profitable AND plausible AND confident
-                        is_profitable = net_pnl_bps > 0
-                        
-                        # Plausibility gate: very high spreads are suspicious
-                        # 500 bps (5%) is max believable for legitimate arb
-                        MAX_PLAUSIBLE_SPREAD_BPS = 500
-                        is_plausible = spread_bps <= MAX_PLAUSIBLE_SPREAD_BPS
-                        
-                        # Calculate confidence for this spread
-                        # Build minimal spread dict for confidence calculation
-                        spread_for_conf = {
-                            "spread_bps": spread_bps,
-                            "net_pnl_bps": net_pnl_bps,
-                            "gas_cost_bps": gas_cost_bps,
-                            "buy_leg": {
-                                "ticks_crossed": buy_quote.ticks_crossed,
-                                "latency_ms": buy_quote.latency_ms,
-                                "verified_for_execution": buy_exec,
-                            },
-                            "sell_leg": {
-                                "ticks_crossed": sell_quote.ticks_crossed,
-                                "latency_ms": sell_quote.latency_ms,
-                                "verified_for_execution": sell_exec,
-                            },
-                            "executable": True,  # Temp, will be recalculated
-                        }
-                        
-                        # Get RPC stats for confidence (use provider directly)
-                        try:
-                            current_rpc_stats = provider.get_stats_summary()
-                            total_requests = sum(s.get("total_requests", 0) for s in current_rpc_stats.values())
-                            successful_requests = sum(
-                                int(s.get("total_requests", 0) * s.get("success_rate", 0)) 
-                                for s in current_rpc_stats.values()
-                            )
-                            rpc_success = successful_requests / total_requests if total_requests > 0 else None
-                        except Exception:
-                            # КРОК 6: Don't default to 1.0 - this hides RPC problems
-                            rpc_success = None  # Will be treated as unknown/risky
-                        
-                        # КРОК 6: If RPC stats unavailable, use pessimistic default
-                        rpc_success_for_conf = rpc_success if rpc_success is not None else 0.5
-                        confidence, conf_breakdown = calculate_confidence(spread_for_conf, rpc_success_rate=rpc_success_for_conf)
-                        
-                        # Add RPC stats warning to breakdown
-                        if rpc_success is None:
-                            conf_breakdown["rpc_stats_available"] = False
-                        
-                        # Confidence threshold for execution
-                        MIN_CONFIDENCE_FOR_EXEC = 0.5
-                        is_confident = confidence >= MIN_CONFIDENCE_FOR_EXEC
-                        
-                        executable_final = buy_exec and sell_exec and is_profitable and is_plausible and is_confident
-                        
-                        # Extended spread schema with both legs
-                        spread_data = {
-                            "id": spread_id,
-                            "pair": pair,
-                            "token_in_symbol": token_in_symbol,
-                            "token_out_symbol": token_out_symbol,
-                            "buy_leg": {
-                                "dex": buy_dex,
-                                "price": str(buy_price),
-                                "amount_out": str(buy_quote.amount_out),
-                                "gas_estimate": buy_quote.gas_estimate,
-                                "ticks_crossed": buy_quote.ticks_crossed,
-                                "verified_for_execution": buy_exec,
-                            },
-                            "sell_leg": {
-                                "dex": sell_dex,
-                                "price": str(sell_price),
-                                "amount_out": str(sell_quote.amount_out),
-                                "gas_estimate": sell_quote.gas_estimate,
-                                "ticks_crossed": sell_quote.ticks_crossed,
-                                "verified_for_execution": sell_exec,
-                            },
-                            "fee": int(fee),
-                            "amount_in": amount_in_str,
-                            "spread_bps": spread_bps,
-                            "gas_price_gwei": round(gas_price_gwei, 4),
-                            "gas_total": total_gas,
-                            "gas_cost_wei": gas_cost_wei,
-                            "gas_cost_bps": gas_cost_bps,
-                            "net_pnl_bps": net_pnl_bps,
-                            "profitable": is_profitable,
-                            "plausible": is_plausible,
-                            "confidence": round(confidence, 3),
-                            "confidence_breakdown": conf_breakdown,
-                            "executable": executable_final,
-                        }
-                        spreads.append(spread_data)
-                        
-                        # Paper trading with PaperSession (if enabled)
-                        if paper_session is not None and block_number is not None:
-                            # Calculate USDC values
-                            amount_in_usdc = calculate_usdc_value(
-                                amount_in_wei=amount_in,
-                                implied_price=buy_price,  # Use buy price for valuation
-                                token_in_decimals=18,  # WETH
-                            )
-                            expected_pnl_usdc = calculate_pnl_usdc(
-                                amount_in_wei=amount_in,
-                                net_pnl_bps=net_pnl_bps,
-                                implied_price=buy_price,
-                                token_in_decimals=18,
-                            )
-                            
-                            # R2: Use actual token symbols from spread, not hardcoded
-                            actual_token_in = spread_data.get("token_in_symbol", token_in_symbol)
-                            actual_token_out = spread_data.get("token_out_symbol", token_out_symbol)
-                            
-                            # R4: Wrap paper trade creation in try/except for robustness
-                            try:
-                                # R3: Determine economic vs execution status
-                                economic_executable = executable and net_pnl_bps > 0
-                                # AC-4: Paper policy ignores verification
-                                paper_execution_ready = economic_executable  
-                                # AC-4: Real policy requires verification
-                                real_execution_ready = economic_executable and buy_exec and sell_exec
-                                blocked_reason_real = None
-                                if economic_executable and not real_execution_ready:
-                                    if not buy_exec or not sell_exec:
-                                        blocked_reason_real = "EXEC_DISABLED_NOT_VERIFIED"
-                                
-                                # Roadmap 3.2: No float money - use Decimal strings
-                                from decimal import Decimal as D
-                                amount_in_numeraire_str = str(D(str(amount_in_usdc)).quantize(D("0.000001")))
-                                expected_pnl_numeraire_str = str(D(str(expected_pnl_usdc)).quantize(D("0.000001")))
-                                gas_price_gwei_str = str(D(str(gas_price_gwei)).quantize(D("0.0001")))
-                                
-                                # Create PaperTrade with v4 contract fields (Roadmap 3.2: no float)
-                                paper_trade = PaperTrade(
-                                    spread_id=spread_data["id"],
-                                    block_number=block_number,
-                                    timestamp=datetime.now(timezone.utc).isoformat(),
-                                    chain_id=chain_id,
-                                    buy_dex=buy_dex,
-                                    sell_dex=sell_dex,
-                                    token_in=actual_token_in,
-                                    token_out=actual_token_out,
-                                    fee=int(fee),
-                                    amount_in_wei=amount_in_str,
-                                    buy_price=str(buy_price),
-                                    sell_price=str(sell_price),
-                                    spread_bps=spread_bps,
-                                    gas_cost_bps=gas_cost_bps,
-                                    net_pnl_bps=net_pnl_bps,
-                                    gas_price_gwei=gas_price_gwei_str,  # Roadmap 3.2: str
-                                    # v4 CONTRACT FIELDS (Roadmap 3.2: Decimal-strings)
-                                    numeraire="USDC",
-                                    amount_in_numeraire=amount_in_numeraire_str,
-                                    expected_pnl_numeraire=expected_pnl_numeraire_str,
-                                    # Execution status - paper vs real
-                                    economic_executable=economic_executable,
-                                    paper_execution_ready=paper_execution_ready,
-                                    real_execution_ready=real_execution_ready,
-                                    blocked_reason_real=blocked_reason_real,
-                                    # Legacy fields (synced in __post_init__)
-                                    executable=executable,
-                                    buy_verified=buy_exec,
-                                    sell_verified=sell_exec,
-                                )
-                                
-                                # Record with cooldown check (dedup)
-                                recorded = paper_session.record_trade(paper_trade)
-                                
-                                # Revalidation: check if this spread existed in pending trades
-                                # If so, mark them as revalidated with current results
-                                if pending:
-                                    for pending_trade in pending:
-                                        if pending_trade.spread_id == spread_id:
-                                            # AC-6: Separate paper vs real revalidation
-                                            would_still_paper = is_profitable and economic_executable
-                                            would_still_real = would_still_paper and buy_exec and sell_exec
-                                            # AC-6: Gates changed = PnL changed
-                                            gates_changed = (
-                                                pending_trade.net_pnl_bps != net_pnl_bps
-                                            )
-                                            paper_session.mark_revalidated(
-                                                spread_id=pending_trade.spread_id,
-                                                original_block=pending_trade.block_number,
-                                                revalidation_block=block_number,
-                                                would_still_execute=would_still_paper,  # Legacy
-                                                would_still_paper_execute=would_still_paper,
-                                                would_still_real_execute=would_still_real,
-                                                gates_actually_changed=gates_changed,
-                                                new_net_pnl_bps=net_pnl_bps,
-                                            )
-                                            revalidation_results.append({
-                                                "spread_id": spread_id,
-                                                "original_block": pending_trade.block_number,
-                                                "would_still_paper_execute": would_still_paper,
-                                                "would_still_real_execute": would_still_real,
-                                                "gates_actually_changed": gates_changed,
-                                                "original_pnl_bps": pending_trade.net_pnl_bps,
-                                                "new_pnl_bps": net_pnl_bps,
-                                                # Legacy
-                                                "would_still_execute": would_still_paper,
-                                            })
-                                
-                                # Add to snapshot summary - AC-4: Include both readiness states
-                                paper_trades_summary.append({
-                                    "spread_id": paper_trade.spread_id,
-                                    "outcome": paper_trade.outcome,
-                                    "net_pnl_bps": net_pnl_bps,
-                                    "expected_pnl_numeraire": paper_trade.expected_pnl_numeraire,
-                                    # AC-4: Both readiness states
-                                    "economic_executable": economic_executable,
-                                    "paper_execution_ready": paper_execution_ready,
-                                    "real_execution_ready": real_execution_ready,
-                                    "blocked_reason_real": blocked_reason_real,
-                                    # Legacy
-                                    "expected_pnl_usdc": paper_trade.expected_pnl_usdc,
-                                    "execution_ready": real_execution_ready,
-                                    "blocked_reason": blocked_reason_real,
-                                    "recorded": recorded,
-                                })
-                                
-                            except Exception as paper_err:
-                                # R4: Paper trading error should not crash scan cycle
-                                logger.error(
-                                    "Paper trade creation failed",
-                                    spread_id=spread_id,
-                                    error=str(paper_err),
-                                    error_type=type(paper_err).__name__,
-                                )
-                                paper_errors += 1
-                                # Continue with next spread
-                        
-                        # Log spread
-                        status = "EXECUTABLE" if executable and net_pnl_bps > 0 else (
-                            "profitable" if net_pnl_bps > 0 else "unprofitable"
-                        )
-                        logger.info(
-                            f"Spread ({status}): buy@{buy_dex} sell@{sell_dex} = "
-                            f"{spread_bps} bps - {gas_cost_bps} gas = {net_pnl_bps} net "
-                            f"(fee={fee}, size={amount_in_str}, gas={gas_price_gwei:.2f}gwei)"
-                        )
-        
-        # Collect RPC stats
-        rpc_stats = provider.get_stats_summary()
-        
-        # Check block staleness at end of cycle
-        if pinner.is_stale():
-            quote_reject_reasons[ErrorCode.QUOTE_STALE_BLOCK.value] += 1
-            logger.warning("Block became stale during cycle")
-    
-    except InfraError as e:
-        quote_reject_reasons[e.code.value] += 1
-        logger.error(f"Infra error: {e.message}")
-        
-    except Exception as e:
-        quote_reject_reasons[ErrorCode.INFRA_RPC_ERROR.value] += 1
-        logger.error(f"Cycle error: {e}", exc_info=True)
-    
-    cycle_end = datetime.now(timezone.utc)
-    duration_ms = int((cycle_end - cycle_start).total_seconds() * 1000)
-    
+                    state.paper_errors += 1
+            continue
+
+        # Human-readable prices for the report (survivors only)
+        buy_price = calculate_implied_price(buy_quote)
+        sell_price = calculate_implied_price(sell_quote)
+
+        # Plausibility gate: very high spreads are suspicious
+        # 500 bps (5%) is max believable for legitimate arb
+        MAX_PLAUSIBLE_SPREAD_BPS = 500
+        is_plausible = spread_bps <= MAX_PLAUSIBLE_SPREAD_BPS
+
+        # Calculate confidence for this spread
+        # Build minimal spread dict for confidence calculation
+        spread_for_conf = {
+            "spread_bps": spread_bps,
+            "net_pnl_bps": net_pnl_bps,
+            "gas_cost_bps": gas_cost_bps,
+            "buy_leg": {
+                "ticks_crossed": buy_quote.ticks_crossed,
+                "latency_ms": buy_quote.latency_ms,
+                "verified_for_execution": buy_exec,
+            },
+            "sell_leg": {
+                "ticks_crossed": sell_quote.ticks_crossed,
+                "latency_ms": sell_quote.latency_ms,
+                "verified_for_execution": sell_exec,
+            },
+            "executable": True,  # Temp, will be recalculated
+        }
+
+        with timer.stage("confidence"):
+            confidence, conf_breakdown = calculate_confidence(spread_for_conf, rpc_success_rate=rpc_success_for_conf)
+
+        # Add RPC stats warning to breakdown
+        if rpc_success is None:
+            conf_breakdown["rpc_stats_available"] = False
+
+        # Confidence threshold for execution
+        MIN_CONFIDENCE_FOR_EXEC = 0.5
+        is_confident = confidence >= MIN_CONFIDENCE_FOR_EXEC
+
+        # Round trip (when evaluated) must survive directional pricing
+        round_trip_data, optimal_size = round_trip_results.get((row.key, buy_dex, sell_dex), (None, None))
+        # No gate when gas could not be valued in the quote token (net is None)
+        round_trip_net_bps = round_trip_data.get("net_pnl_bps", 0) if round_trip_data else None
+        round_trip_ok = round_trip_net_bps is None or round_trip_net_bps > 0
+
+        executable_final = (
+            buy_exec and sell_exec and is_profitable and is_plausible and is_confident and round_trip_ok
+        )
+
+        # Extended spread schema with both legs
+        spread_data = {
+            "id": spread_id,
+            "pair": pair,
+            "token_in_symbol": token_in_symbol,
+            "token_out_symbol": token_out_symbol,
+            "buy_leg": {
+                "dex": buy_dex,
+                "price": str(buy_price),
+                "amount_out": str(buy_quote.amount_out),
+                "gas_estimate": buy_quote.gas_estimate,
+                "ticks_crossed": buy_quote.ticks_crossed,
+                "verified_for_execution": buy_exec,
+            },
+            "sell_leg": {
+                "dex": sell_dex,
+                "price": str(sell_price),
+                "amount_out": str(sell_quote.amount_out),
+                "gas_estimate": sell_quote.gas_estimate,
+                "ticks_crossed": sell_quote.ticks_crossed,
+                "verified_for_execution": sell_exec,
+            },
+            "fee": int(fee),
+            "amount_in": amount_in_str,
+            "spread_bps": spread_bps,
+            "gas_price_gwei": round(gas_price_gwei, 4),
+            "gas_total": total_gas,
+            "gas_cost_wei": gas_cost_wei,
+            "gas_cost_bps": gas_cost_bps,
+            "net_pnl_bps": net_pnl_bps,
+            "profitable": is_profitable,
+            "plausible": is_plausible,
+            "confidence": round(confidence, 3),
+            "confidence_breakdown": conf_breakdown,
+            "round_trip": round_trip_data,
+            "optimal_size": optimal_size,
+            "executable": executable_final,
+        }
+        spreads.append(spread_data)
+
+        # Paper trading with PaperSession (if enabled)
+        if paper_session is not None and block_number is not None:
+            paper_start = time.perf_counter()
+
+            # Calculate USDC values
+            amount_in_usdc = calculate_usdc_value(
+                amount_in_wei=amount_in,
+                implied_price=buy_price,  # Use buy price for valuation
+                token_in_decimals=buy_quote.token_in.decimals,
+            )
+            expected_pnl_usdc = calculate_pnl_usdc(
+                amount_in_wei=amount_in,
+                net_pnl_bps=net_pnl_bps,
+                implied_price=buy_price,
+                token_in_decimals=buy_quote.token_in.decimals,
+            )
+
+            # R2: Use actual token symbols from spread, not hardcoded
+            actual_token_in = spread_data.get("token_in_symbol", token_in_symbol)
+            actual_token_out = spread_data.get("token_out_symbol", token_out_symbol)
+
+            # R4: Wrap paper trade creation in try/except for robustness
+            try:
+                # R3: Determine economic vs execution status
+                economic_executable = executable and net_pnl_bps > 0
+                # AC-4: Paper policy ignores verification
+                paper_execution_ready = economic_executable
+                # AC-4: Real policy requires verification
+                real_execution_ready = economic_executable and buy_exec and sell_exec
+                blocked_reason_real = None
+                if economic_executable and not real_execution_ready:
+                    if not buy_exec or not sell_exec:
+                        blocked_reason_real = "EXEC_DISABLED_NOT_VERIFIED"
+
+                # Roadmap 3.2: No float money - use Decimal strings
+                from decimal import Decimal as D
+                amount_in_numeraire_str = str(D(str(amount_in_usdc)).quantize(D("0.000001")))
+                expected_pnl_numeraire_str = str(D(str(expected_pnl_usdc)).quantize(D("0.000001")))
+                gas_price_gwei_str = str(D(str(gas_price_gwei)).quantize(D("0.0001")))
+
+                # Create PaperTrade with v4 contract fields (Roadmap 3.2: no float)
+                paper_trade = PaperTrade(
+                    spread_id=spread_data["id"],
+                    block_number=block_number,
+                    timestamp=now_utc().isoformat(),
+                    chain_id=chain_id,
+                    buy_dex=buy_dex,
+                    sell_dex=sell_dex,
+                    token_in=actual_token_in,
+                    token_out=actual_token_out,
+                    fee=int(fee),
+                    amount_in_wei=amount_in_str,
+                    buy_price=str(buy_price),
+                    sell_price=str(sell_price),
+                    spread_bps=spread_bps,
+                    gas_cost_bps=gas_cost_bps,
+                    net_pnl_bps=net_pnl_bps,
+                    gas_price_gwei=gas_price_gwei_str,  # Roadmap 3.2: str
+                    # v4 CONTRACT FIELDS (Roadmap 3.2: Decimal-strings)
+                    numeraire="USDC",
+                    amount_in_numeraire=amount_in_numeraire_str,
+                    expected_pnl_numeraire=expected_pnl_numeraire_str,
+                    # Execution status - paper vs real
+                    economic_executable=economic_executable,
+                    paper_execution_ready=paper_execution_ready,
+                    real_execution_ready=real_execution_ready,
+                    blocked_reason_real=blocked_reason_real,
+                    # Legacy fields (synced in __post_init__)
+                    executable=executable,
+                    buy_verified=buy_exec,
+                    sell_verified=sell_exec,
+                )
+
+                # Record with cooldown check (dedup)
+                recorded = paper_session.record_trade(paper_trade)
+
+                # Revalidation: pending trades of this spread get current results
+                # AC-6: Separate paper vs real revalidation
+                would_still_paper = is_profitable and economic_executable
+                would_still_real = would_still_paper and buy_exec and sell_exec
+                revalidate_pending(spread_id, net_pnl_bps, would_still_paper, would_still_real)
+
+                # Add to snapshot summary - AC-4: Include both readiness states
+                paper_trades_summary.append({
+                    "spread_id": paper_trade.spread_id,
+                    "outcome": paper_trade.outcome,
+                    "net_pnl_bps": net_pnl_bps,
+                    "expected_pnl_numeraire": paper_trade.expected_pnl_numeraire,
+                    # AC-4: Both readiness states
+                    "economic_executable": economic_executable,
+                    "paper_execution_ready": paper_execution_ready,
+                    "real_execution_ready": real_execution_ready,
+                    "blocked_reason_real": blocked_reason_real,
+                    # Legacy
+                    "expected_pnl_usdc": paper_trade.expected_pnl_usdc,
+                    "execution_ready": real_execution_ready,
+                    "blocked_reason": blocked_reason_real,
+                    "recorded": recorded,
+                })
+
+            except Exception as paper_err:
+                # R4: Paper trading error should not crash scan cycle
+                logger.error(
+                    "Paper trade creation failed",
+                    spread_id=spread_id,
+                    error=str(paper_err),
+                    error_type=type(paper_err).__name__,
+                )
+                state.paper_errors += 1
+                # Continue with next spread
+
+            timer.add("paper_trades", time.perf_counter() - paper_start)
+
+        # Log spread
+        status = "EXECUTABLE" if executable else "profitable"
+        logger.info(
+            f"Spread ({status}): buy@{buy_dex} sell@{sell_dex} = "
+            f"{spread_bps} bps - {gas_cost_bps} gas = {net_pnl_bps} net "
+            f"(fee={fee}, size={amount_in_str}, gas={gas_price_gwei:.2f}gwei)"
+        )
+
+
+def build_cycle_summary(state: CycleState, block_pin: dict, replay: dict | None = None) -> dict:
+    """
+    Cycle summary (snapshot schema) from a cycle's state.
+
+    Metrics are recalculated from facts (not increments) and the counter
+    invariants are checked and reported.
+    """
+    cycle_end = now_utc()
+    duration_ms = int((cycle_end - state.cycle_start).total_seconds() * 1000)
+    quote_reject_reasons = state.quote_reject_reasons
+    quotes_attempted = state.quotes_attempted
+    quotes_fetched = state.quotes_fetched
+    quotes_rejected_by_gates = state.quotes_rejected_by_gates
+    quotes_code_errors = state.quotes_code_errors
+
     # ==========================================================================
     # METRICS CALCULATION FROM FACTS (not increments)
     # ==========================================================================
-    # quotes_list contains ONLY quotes that passed single gates
+    # quote_batch contains ONLY quotes that passed single gates
     # quotes_by_key contains quotes grouped for spread calculation
     # quote_reject_reasons is histogram of rejection reasons
-    
+
     # Recalculate from facts to ensure consistency
-    quotes_passed_gates = len(quotes_list)  # Only passed quotes in list
+    quotes_passed_gates = len(state.quote_batch)  # Only passed quotes in batch
     total_reject_reasons = sum(quote_reject_reasons.values())
     quotes_fetch_failed = quotes_attempted - quotes_fetched
-    
+
     # Validate invariants
     invariant_errors = []
-    
+
     # Invariant 1: attempted = fetched + fetch_failed
     if quotes_attempted != quotes_fetched + quotes_fetch_failed:
         invariant_errors.append(
             f"attempted({quotes_attempted}) != fetched({quotes_fetched}) + failed({quotes_fetch_failed})"
         )
-    
+
     # Invariant 2: passed <= fetched
     if quotes_passed_gates > quotes_fetched:
         invariant_errors.append(
             f"passed({quotes_passed_gates}) > fetched({quotes_fetched})"
         )
-    
+
     # Invariant 3: passed + rejected_by_gates + code_errors = fetched
     # All fetched quotes must end up in one of these buckets
     total_processed = quotes_passed_gates + quotes_rejected_by_gates + quotes_code_errors
@@ -1299,16 +1787,16 @@ async def run_scan_cycle(
             f"passed({quotes_passed_gates}) + rejected({quotes_rejected_by_gates}) + code_errors({quotes_code_errors}) "
             f"= {total_processed} != fetched({quotes_fetched})"
         )
-    
+
     # Calculate rates
     fetch_rate = quotes_fetched / quotes_attempted if quotes_attempted > 0 else 0.0
     gate_pass_rate = quotes_passed_gates / quotes_fetched if quotes_fetched > 0 else 0.0
-    
+
     # Sanity check gate_pass_rate
     if gate_pass_rate > 1.0:
         invariant_errors.append(f"gate_pass_rate({gate_pass_rate:.4f}) > 1.0")
         gate_pass_rate = min(gate_pass_rate, 1.0)  # Cap at 1.0
-    
+
     # Log invariant errors
     if invariant_errors:
         logger.error(
@@ -1323,30 +1811,24 @@ async def run_scan_cycle(
                 "histogram_sum": total_reject_reasons,
             }}
         )
-    
+
     summary = {
         "schema_version": "2026-01-13b",  # b = adaptive gates, RPC quarantine, confidence-gated exec
-        "chain": chain_key,
-        "chain_id": chain_id,
-        "mode": mode,  # REGISTRY or SMOKE
-        "cycle_start": cycle_start.isoformat(),
+        "chain": state.chain_key,
+        "chain_id": state.chain_id,
+        "mode": state.mode,  # REGISTRY or SMOKE
+        "cycle_start": state.cycle_start.isoformat(),
         "cycle_end": cycle_end.isoformat(),
         "duration_ms": duration_ms,
-        "block_number": block_number,
-        "block_pin": {
-            "block_number": block_number,
-            "pinned_at_ms": block_state.timestamp_ms if block_state else None,
-            "age_ms": block_state.age_ms() if block_state else None,
-            "latency_ms": block_state.latency_ms if block_state else None,
-            "is_stale": pinner.is_stale() if pinner else None,
-        },
-        "gas_price_gwei": round(gas_price_gwei, 4),
-        "planned_pools": planned_pools,
-        "pools_scanned": pools_scanned,
-        "pools_skipped": dict(pools_skipped),
-        "pairs_scanned": list(pairs_scanned),
-        "pairs_covered": len(pairs_scanned),
-        "dexes_passed_gate": dexes_passed_gate,
+        "block_number": state.block_number,
+        "block_pin": block_pin,
+        "gas_price_gwei": round(state.gas_price_gwei, 4),
+        "planned_pools": state.planned_pools,
+        "pools_scanned": state.pools_scanned,
+        "pools_skipped": dict(state.pools_skipped),
+        "pairs_scanned": list(state.pairs_scanned),
+        "pairs_covered": len(state.pairs_scanned),
+        "dexes_passed_gate": state.dexes_passed_gate,
         # Quote counts (unambiguous)
         "quotes_attempted": quotes_attempted,
         "quotes_fetched": quotes_fetched,
@@ -1361,40 +1843,343 @@ async def run_scan_cycle(
         "invariants_ok": len(invariant_errors) == 0,
         "invariant_errors": invariant_errors if invariant_errors else None,
         # Data
-        "quotes": quotes_list,
-        "spreads": spreads,
-        "paper_trades": paper_trades_summary,
-        "revalidations": revalidation_results,
-        "rpc_stats": rpc_stats,
+        "quotes": state.quote_batch.to_snapshot(),
+        "spreads": state.spreads,
+        "spreads_unprofitable": state.spreads_unprofitable,
+        "spread_groups_gas_unpriced": state.spread_groups_gas_unpriced,
+        "paper_trades": state.paper_trades_summary,
+        "revalidations": state.revalidation_results,
+        "rpc_stats": state.rpc_stats,
+        "pool_state": state.pool_state,
+        # Milliseconds per pipeline stage, plus "other" and "total" (core/timing.py)
+        "stage_timings_ms": state.timer.to_dict(),
         # Reject histogram (reasons, not unique quotes)
         "reject_reasons_histogram": dict(quote_reject_reasons),
         "reject_reasons_total": total_reject_reasons,  # Sum of histogram
         # Status: OK if quotes passed, CODE_ERROR if code bugs, NO_QUOTES otherwise
         "status": "OK" if quotes_passed_gates > 0 else ("CODE_ERROR" if quotes_code_errors > 0 else "NO_QUOTES"),
     }
-    
+    if replay is not None:
+        # Inputs for strategy/backtest_replay.py (CycleInputs)
+        summary["replay"] = replay
+    return summary
+
+
+async def run_scan_cycle(
+    chain_key: str,
+    chain_config: dict,
+    dex_configs: dict,
+    token_configs: dict,
+    session: ScanSession,
+    paper_session: PaperSession | None = None,
+    registry: PoolRegistry | None = None,
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES,
+    use_multicall: bool = False,
+    block_state: BlockState | None = None,
+    quote_config: QuoteConfig | None = None,
+) -> dict:
+    """
+    Run a single scan cycle for a chain.
+
+    Pipeline:
+    1. Pin block (block_state from a BlockStream if given, else eth_blockNumber)
+    2. Fetch quotes from verified DEXes (one Multicall3 aggregate when
+       use_multicall, else concurrent eth_calls bounded by max_concurrent_quotes)
+    3. Apply single-quote gates
+    4. Apply curve gates
+    5. Calculate spreads between DEXes; re-quote profitable ones as
+       directional round trips and search their best size
+    6. Record paper trades with cooldown
+    7. Record metrics
+
+    Steps 3-6 are process_quotes, shared with backtest replay. With
+    session.record_quotes, the summary's "replay" section keeps every fetched quote
+    and failure (CycleInputs) so the cycle can be replayed without RPC.
+
+    Each stage's duration lands in the summary's stage_timings_ms
+    (see core/timing.py), so RPC waits and local math can be told apart.
+
+    In registry mode (quote.local_pool_state), the chain's PoolStateStore is
+    advanced to the pinned head first and handed to the adapters, so cached
+    pools are quoted locally and only the rest cost quoter eth_calls.
+
+    Quote sizes are quote_config.sizes_usd converted per token_in once a USD
+    price for it is known (stables, or a previous cycle's anchor quote);
+    until then the legacy STANDARD_AMOUNTS grid is used.
+
+    Modes:
+    - registry=None: SMOKE mode (WETH/USDC only)
+    - registry=PoolRegistry: PRODUCTION mode (intent-driven)
+    """
+    chain_id = chain_config.get("chain_id")
+    mode = "REGISTRY" if registry else "SMOKE"
+    quote_config = quote_config or QuoteConfig()
+    state = CycleState(chain_key=chain_key, chain_id=chain_id, mode=mode)
+    state.native_symbol = chain_config.get("native_symbol", state.native_symbol)
+    timer = state.timer
+    quote_reject_reasons = state.quote_reject_reasons
+    pools_skipped = state.pools_skipped
+
+    logger.info(
+        f"Starting scan cycle ({mode})",
+        extra={"context": {"chain": chain_key, "chain_id": chain_id, "mode": mode}}
+    )
+
+    pinner: BlockPinner | None = None
+    replay: dict | None = None
+
+    try:
+        # Setup provider
+        provider = register_chain_provider(chain_config)
+
+        # Pin block (pushed state saves the eth_blockNumber round trip)
+        if block_state is None:
+            pinner = BlockPinner(provider)
+            with timer.stage("block_pin"):
+                block_state = await pinner.refresh()
+        block_number = state.block_number = block_state.block_number
+
+        logger.info(
+            f"Block pinned: {block_number}",
+            extra={"context": {"block": block_number, "latency_ms": block_state.latency_ms}}
+        )
+
+        # Fetch gas price
+        with timer.stage("gas_price"):
+            state.gas_price_wei, gas_latency = await provider.get_gas_price()
+        gas_price_wei = state.gas_price_wei
+        gas_price_gwei = state.gas_price_gwei
+
+        logger.info(
+            f"Gas price: {gas_price_gwei:.4f} gwei ({gas_price_wei} wei)",
+            extra={"context": {"gas_price_wei": gas_price_wei, "gas_price_gwei": gas_price_gwei}}
+        )
+
+        # Build pools - REGISTRY or SMOKE mode (timed through quote planning)
+        pool_build_start = time.perf_counter()
+        if registry:
+            candidates = await select_registry_candidates(
+                chain_key, chain_id, registry, session.registry_store
+            )
+            test_pools, passed_dexes = build_pools_from_registry(
+                chain_key, chain_id, dex_configs, registry, candidates
+            )
+        else:
+            test_pools, passed_dexes = build_test_pools(
+                chain_key, chain_id, dex_configs, token_configs
+            )
+        state.planned_pools = planned_pools = len(test_pools)
+
+        # Registry pools have real addresses: quote them from cached state
+        pool_state: PoolStateStore | None = None
+        if registry and quote_config.local_pool_state:
+            with timer.stage("pool_state"):
+                pool_state = await sync_pool_state(
+                    session, provider, block_state,
+                    [pool for pool, _, _, _ in test_pools if pool.pool_address],
+                )
+            state.pool_state = pool_state.get_stats()
+
+        # Record DEXes for artifact
+        state.dexes_passed_gate = [
+            {
+                "dex_key": d.dex_key,
+                "quoter": d.quoter,
+                "fee_tiers": d.fee_tiers,
+                "verified_for_execution": d.verified_for_execution,
+            }
+            for d in passed_dexes
+        ]
+
+        # Build lookup for execution check
+        execution_allowed = {d.dex_key: d.verified_for_execution for d in passed_dexes}
+
+        logger.info(
+            f"Planned pools: {planned_pools}",
+            extra={"context": {"chain": chain_key, "planned_pools": planned_pools}}
+        )
+
+        if not test_pools:
+            quote_reject_reasons[ErrorCode.POOL_NOT_FOUND.value] += 1
+            logger.warning(f"No test pools for {chain_key}")
+
+        # Group pools by DEX + fee + pair for proper scanning
+        # Each unique (dex, fee, pair) should be scanned separately
+        pools_by_key: dict[str, tuple[Pool, Token, Token, str]] = {}
+        for pool, token_in, token_out, dex_key in test_pools:
+            # Unique key includes pair to prevent grouping different pairs together
+            pair_key = f"{token_in.symbol}/{token_out.symbol}"
+            key = f"{dex_key}_{pool.fee}_{pair_key}"
+            # Store first occurrence (all should be same anyway)
+            if key not in pools_by_key:
+                pools_by_key[key] = (pool, token_in, token_out, dex_key)
+
+        # Sort keys so ANCHOR_DEX is processed first (sets anchor price before others)
+        sorted_keys = sorted(
+            pools_by_key.keys(),
+            key=lambda k: (0 if k.startswith(ANCHOR_DEX) else 1, k)
+        )
+
+        # Quote sizes per token_in: USD ladder when priced, else the wei grid
+        amounts_by_token: dict[str, list[int]] = {}
+
+        def quote_amounts(token: Token) -> list[int]:
+            amounts = amounts_by_token.get(token.symbol)
+            if amounts is None:
+                ladder_key = (chain_id, token.symbol)
+                price = usd_price(token, session.reference_prices_usd.get(ladder_key))
+                ladder = session.size_ladders.get(ladder_key)
+                if price and (
+                    ladder is None
+                    or ladder_needs_reprice(ladder[0], price, quote_config.ladder_reprice_bps)
+                ):
+                    ladder = (price, size_ladder(quote_config.sizes_usd, token, price))
+                    session.size_ladders[ladder_key] = ladder
+                amounts = (ladder[1] if ladder else []) or list(STANDARD_AMOUNTS)
+                amounts_by_token[token.symbol] = amounts
+            return amounts
+
+        # Plan quotes for each DEX/fee/pair combination (anchor DEX first!)
+        plan: list[PlannedPool] = []
+        adapters_by_dex: dict[str, UniswapV3Adapter | AlgebraAdapter] = {}
+        quote_requests: list[QuoteRequest] = []
+        for pool_key in sorted_keys:
+            pool, token_in, token_out, dex_key = pools_by_key[pool_key]
+            state.pools_scanned += 1
+            state.pairs_scanned.add(f"{token_in.symbol}/{token_out.symbol}")
+
+            # Get DEX config
+            dex_config = dex_configs.get(dex_key, {})
+            adapter_type = dex_config.get("adapter_type", "uniswap_v3")
+            quoter_address = dex_config.get("quoter_v2") or dex_config.get("quoter")
+
+            if not quoter_address:
+                logger.warning(f"No quoter for {dex_key}")
+                pools_skipped["no_quoter"] += 1
+                quote_reject_reasons[ErrorCode.QUOTE_REVERT.value] += 1
+                continue
+
+            # Check feature flag for Algebra
+            feature_flag = dex_config.get("feature_flag")
+            if feature_flag == "algebra_adapter" and adapter_type == "algebra":
+                # Feature flagged - check if enabled
+                if not dex_config.get("enabled", False):
+                    logger.debug(f"Algebra adapter disabled for {dex_key}")
+                    pools_skipped["algebra_disabled"] += 1
+                    continue
+
+            # Create adapter based on type
+            if adapter_type == "algebra":
+                adapter = AlgebraAdapter(provider, quoter_address, dex_key, state_store=pool_state)
+            else:
+                # Default to UniswapV3Adapter (works for uniswap_v3, sushiswap_v3, etc)
+                adapter = UniswapV3Adapter(provider, quoter_address, dex_key, state_store=pool_state)
+
+            amounts = quote_amounts(token_in)
+            plan.append(PlannedPool(
+                pool_key=pool_key, pool=pool, token_in=token_in, token_out=token_out,
+                dex_key=dex_key, quoter=quoter_address, amounts=amounts,
+            ))
+            adapters_by_dex[dex_key] = adapter
+            for amount_in in amounts:
+                quote_requests.append(QuoteRequest(
+                    pool_key=pool_key, adapter=adapter, pool=pool,
+                    token_in=token_in, token_out=token_out, amount_in=amount_in,
+                ))
+
+        timer.add("pool_build", time.perf_counter() - pool_build_start)
+        plan_rejects = dict(quote_reject_reasons)
+
+        # Fetch all planned quotes for the pinned block
+        with timer.stage("quoting"):
+            if use_multicall:
+                quote_outcomes = await fetch_quotes_multicall(
+                    quote_requests, block_number, Multicall3(provider)
+                )
+            else:
+                quote_outcomes = await fetch_quotes_concurrently(
+                    quote_requests, block_number, max_concurrent_quotes
+                )
+
+        gated_at_ms = now_ms()
+        reference_prices_usd = {
+            symbol: price for (ref_chain_id, symbol), price in session.reference_prices_usd.items()
+            if ref_chain_id == chain_id
+        }
+        await process_quotes(
+            state, plan, quote_outcomes, execution_allowed, session,
+            _ProviderBackend(state, provider, adapters_by_dex, quote_config, quote_amounts, pool_state),
+            paper_session,
+        )
+
+        if session.record_quotes:
+            replay = CycleInputs(
+                plan=plan,
+                outcomes=quote_outcomes,
+                gas_price_wei=gas_price_wei,
+                gated_at_ms=gated_at_ms,
+                execution_allowed=execution_allowed,
+                plan_rejects=plan_rejects,
+                rpc_success=state.rpc_success,
+                round_trip_dexes=[
+                    dex_key for dex_key, adapter in adapters_by_dex.items()
+                    if hasattr(adapter, "build_quote_exact_output_call")
+                ],
+                round_trips=state.round_trip_results,
+                native_symbol=state.native_symbol,
+                reference_prices_usd=reference_prices_usd,
+            ).to_snapshot()
+
+        # Collect RPC stats
+        state.rpc_stats = provider.get_stats_summary()
+
+        # Check block staleness at end of cycle
+        if pinner is not None and pinner.is_stale():
+            quote_reject_reasons[ErrorCode.QUOTE_STALE_BLOCK.value] += 1
+            logger.warning("Block became stale during cycle")
+
+    except InfraError as e:
+        quote_reject_reasons[e.code.value] += 1
+        logger.error(f"Infra error: {e.message}")
+
+    except Exception as e:
+        quote_reject_reasons[ErrorCode.INFRA_RPC_ERROR.value] += 1
+        logger.error(f"Cycle error: {e}", exc_info=True)
+
+    block_pin = {
+        "block_number": state.block_number,
+        "pinned_at_ms": block_state.timestamp_ms if block_state else None,
+        "age_ms": block_state.age_ms() if block_state else None,
+        "latency_ms": block_state.latency_ms if block_state else None,
+        "is_stale": pinner.is_stale() if pinner else None,
+    }
+    summary = build_cycle_summary(state, block_pin, replay)
+
     session.record_cycle(summary)
-    
+    session.maybe_save_truth_report(paper_session.stats if paper_session else None)
+
     # Count paper trade outcomes
+    paper_trades_summary = state.paper_trades_summary
     would_execute = sum(1 for t in paper_trades_summary if t.get("outcome") == TradeOutcome.WOULD_EXECUTE.value)
     blocked = sum(1 for t in paper_trades_summary if t.get("outcome") == TradeOutcome.BLOCKED_EXEC.value)
     cooldown = sum(1 for t in paper_trades_summary if t.get("outcome") == TradeOutcome.COOLDOWN.value)
-    
+
     # Get paper session cumulative stats if available
     paper_stats = paper_session.stats if paper_session else {}
-    
+
     logger.info(
-        f"Scan cycle complete: {quotes_fetched}/{quotes_attempted} fetched, "
-        f"{quotes_passed_gates} passed gates, {len(spreads)} spreads, "
+        f"Scan cycle complete: {summary['quotes_fetched']}/{summary['quotes_attempted']} fetched, "
+        f"{summary['quotes_passed_gates']} passed gates, {len(state.spreads)} spreads "
+        f"(+{state.spreads_unprofitable} unprofitable), "
         f"{would_execute} executable, {blocked} blocked, {cooldown} cooldown",
         extra={"context": {
             "chain": chain_key,
-            "block": block_number,
-            "gas_price_gwei": round(gas_price_gwei, 4),
-            "quotes_attempted": quotes_attempted,
-            "quotes_fetched": quotes_fetched,
-            "quotes_passed_gates": quotes_passed_gates,
-            "spreads": len(spreads),
+            "block": state.block_number,
+            "gas_price_gwei": summary["gas_price_gwei"],
+            "quotes_attempted": summary["quotes_attempted"],
+            "quotes_fetched": summary["quotes_fetched"],
+            "quotes_passed_gates": summary["quotes_passed_gates"],
+            "spreads": len(state.spreads),
             "paper_would_execute": would_execute,
             "paper_blocked": blocked,
             "paper_cooldown": cooldown,
@@ -1402,7 +2187,7 @@ async def run_scan_cycle(
             "rejects": dict(quote_reject_reasons),
         }}
     )
-    
+
     return summary
 
 
@@ -1414,6 +2199,9 @@ async def scan_loop(
     session: ScanSession,
     paper_session: PaperSession | None = None,
     registry: PoolRegistry | None = None,
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES,
+    use_multicall: bool = False,
+    quote_config: QuoteConfig | None = None,
 ) -> None:
     """Continuous scanning loop."""
     cycle_count = 0
@@ -1433,7 +2221,10 @@ async def scan_loop(
             
             summary = await run_scan_cycle(
                 chain_key, chain_config, dex_configs, token_configs,
-                session, paper_session, registry
+                session, paper_session, registry,
+                max_concurrent_quotes=max_concurrent_quotes,
+                use_multicall=use_multicall,
+                quote_config=quote_config,
             )
             cycle_summaries.append(summary)
         
@@ -1455,6 +2246,187 @@ async def scan_loop(
     logger.info("Scan loop terminated")
 
 
+async def scan_blocks(
+    chains: list[tuple[str, dict]],
+    dexes: dict,
+    tokens: dict,
+    session: ScanSession,
+    paper_session: PaperSession | None = None,
+    registry: PoolRegistry | None = None,
+    block_stride: int = 1,
+    max_cycles: int = 0,
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES,
+    use_multicall: bool = False,
+    quote_config: QuoteConfig | None = None,
+) -> list[dict]:
+    """
+    Block-triggered scanning: one task per chain, one cycle per new block.
+    
+    Each chain follows its own newHeads stream (HTTP polling fallback), so a
+    slow chain never delays the others. Late blocks are coalesced, not queued.
+    
+    Returns:
+        Cycle summaries (each with a block_lag section); empty unless
+        max_cycles > 0, since an endless run records cycles on the session only
+    """
+    streams: dict[str, tuple[dict, BlockStream]] = {}
+    for chain_key, chain_config in chains:
+        provider = register_chain_provider(chain_config)
+        streams[chain_key] = (chain_config, BlockStream(
+            provider,
+            chain_config.get("ws_urls", []),
+            poll_interval_ms=max(250, chain_config.get("block_time_ms", 1000)),
+        ))
+    
+    async def run_cycle(chain_key: str, chain_config: dict, block_state: BlockState) -> dict:
+        return await run_scan_cycle(
+            chain_key, chain_config,
+            dexes.get(chain_key, {}), tokens.get(chain_key, {}),
+            session, paper_session, registry,
+            max_concurrent_quotes=max_concurrent_quotes,
+            use_multicall=use_multicall,
+            block_state=block_state,
+            quote_config=quote_config,
+        )
+    
+    scheduler = BlockScheduler(
+        streams, run_cycle,
+        block_stride=block_stride,
+        should_stop=lambda: _shutdown_requested,
+    )
+    summaries = await scheduler.run(max_cycles=max_cycles)
+    
+    logger.info(
+        "Block scheduler stopped",
+        extra={"context": {"lag": scheduler.get_lag_summary()}},
+    )
+    return summaries
+
+
+async def run_scanner(
+    chains: list[tuple[str, dict]],
+    dexes: dict,
+    tokens: dict,
+    session: ScanSession,
+    paper_session: PaperSession | None = None,
+    registry: PoolRegistry | None = None,
+    trigger: str = "block",
+    interval_ms: int = 5000,
+    max_cycles: int = 0,
+    block_stride: int = 1,
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES,
+    use_multicall: bool = False,
+    quote_config: QuoteConfig | None = None,
+) -> list[dict]:
+    """
+    Scan chains on the chosen trigger until max_cycles per chain (0 = until shutdown).
+    
+    Runs in the scanner process, or once per worker with --workers
+    (strategy/jobs/scan_workers.py).
+    
+    Returns:
+        Cycle summaries (none for an endless run)
+    """
+    if trigger == "block":
+        return await scan_blocks(
+            chains, dexes, tokens,
+            session, paper_session, registry,
+            block_stride=block_stride,
+            max_cycles=max_cycles,
+            max_concurrent_quotes=max_concurrent_quotes,
+            use_multicall=use_multicall,
+            quote_config=quote_config,
+        )
+    
+    if max_cycles <= 0:
+        await scan_loop(
+            chains, dexes, tokens, interval_ms,
+            session, paper_session, registry,
+            max_concurrent_quotes=max_concurrent_quotes,
+            use_multicall=use_multicall,
+            quote_config=quote_config,
+        )
+        return []
+    
+    # Run finite number of cycles
+    all_cycle_summaries = []
+    
+    for cycle_num in range(max_cycles):
+        cycle_summaries = []
+        for chain_key, chain_config in chains:
+            dex_configs = dexes.get(chain_key, {})
+            token_configs = tokens.get(chain_key, {})
+            
+            summary = await run_scan_cycle(
+                chain_key, chain_config, dex_configs, token_configs,
+                session, paper_session, registry,
+                max_concurrent_quotes=max_concurrent_quotes,
+                use_multicall=use_multicall,
+                quote_config=quote_config,
+            )
+            cycle_summaries.append(summary)
+        
+        all_cycle_summaries.extend(cycle_summaries)
+        
+        # Wait between cycles (except after last)
+        if cycle_num < max_cycles - 1:
+            await asyncio.sleep(interval_ms / 1000)
+    
+    return all_cycle_summaries
+
+
+async def sync_pool_state(
+    session: ScanSession,
+    provider: RPCProvider,
+    block_state: BlockState,
+    pools: list[Pool],
+) -> PoolStateStore:
+    """
+    The chain's PoolStateStore, advanced to the pinned head.
+
+    Created on the chain's first cycle; each cycle then applies the pool
+    logs up to block_state (rolling back on a reorg) and bootstraps pools
+    new to the registry. Failures are logged: the adapters fall back to
+    the quoter for any pool the store does not cover at the block.
+    """
+    chain_id = provider.chain_id
+    store = session.pool_states.get(chain_id)
+    if store is None:
+        store = session.pool_states[chain_id] = PoolStateStore(provider)
+    try:
+        await store.advance(block_state)
+        await store.bootstrap(pools, block_state.block_number)
+    except Exception as e:
+        logger.warning(
+            f"Pool state sync failed: {e}",
+            extra={"context": {"chain_id": chain_id, "block": block_state.block_number}},
+        )
+    return store
+
+
+async def prune_registry_pools(
+    registry: PoolRegistry,
+    chains: list[tuple[str, dict]],
+    dexes: dict,
+    store: RegistryStore,
+    data_dir: Path,
+) -> None:
+    """
+    Load candidates from registry.sqlite (generating only new intent pairs),
+    then drop candidates with no deployed pool / no liquidity before quoting.
+    """
+    await store.load_registry_candidates(registry)
+    for chain_key, chain_config in chains:
+        provider = register_chain_provider(chain_config)
+        index = PoolIndex(provider, cache_path=data_dir / "pool_index" / f"{chain_key}.json")
+        try:
+            await prune_registry_chain(
+                registry, chain_key, dexes.get(chain_key, {}), index, store
+            )
+        except Exception as e:
+            logger.warning(f"Pool index pruning failed for {chain_key}: {e}")
+
+
 @click.command()
 @click.option("--chain", "-c", default="arbitrum_one", help="Chain to scan (or 'all')")
 @click.option("--interval", "-i", default=5000, help="Scan interval in milliseconds")
@@ -1462,13 +2434,24 @@ async def scan_loop(
 @click.option("--cycles", "-n", default=0, help="Run N cycles and exit (0 = infinite)")
 @click.option("--intent", type=click.Path(exists=True), default="config/intent.txt")
 @click.option("--output-dir", "-o", default="data/snapshots")
+@click.option("--snapshot-format", type=click.Choice(["binary", "json"]), default="binary",
+              help="Snapshot file format (binary is smaller and faster; export to JSON with scripts/export_snapshot.py)")
+@click.option("--record-quotes/--no-record-quotes", default=True,
+              help="Keep every fetched quote in snapshots for strategy/backtest_replay.py")
 @click.option("--trades-dir", "-t", default="data/trades")
 @click.option("--log-level", "-l", default="INFO", type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
 @click.option("--json-logs/--no-json-logs", default=True)
+@click.option("--log-sample", default=DEFAULT_LOG_SAMPLE_EVERY,
+              help="Keep 1 in N DEBUG/INFO logs from per-quote/RPC/trade loggers (1 = all)")
 @click.option("--paper-trading/--no-paper-trading", default=True, help="Enable paper trading")
 @click.option("--simulate-blocked/--no-simulate-blocked", default=True, help="Also simulate blocked trades")
 @click.option("--cooldown-blocks", default=10, help="Blocks to wait before re-trading same spread")
 @click.option("--use-registry/--smoke", default=True, help="Use registry (intent-driven) vs smoke (WETH/USDC only)")
+@click.option("--trigger", type=click.Choice(["block", "interval"]), default="block",
+              help="Scan on each new block (per chain) or on a fixed --interval timer")
+@click.option("--block-stride", default=0, help="Scan every Nth block (0 = scanner.block_stride from strategy.yaml)")
+@click.option("--workers", "-w", default=1,
+              help="Scan chains in N worker processes (1 = one process; see strategy/jobs/scan_workers.py)")
 def main(
     chain: str,
     interval: int,
@@ -1476,17 +2459,23 @@ def main(
     cycles: int,
     intent: str,
     output_dir: str,
+    snapshot_format: str,
+    record_quotes: bool,
     trades_dir: str,
     log_level: str,
     json_logs: bool,
+    log_sample: int,
     paper_trading: bool,
     simulate_blocked: bool,
     cooldown_blocks: int,
     use_registry: bool,
+    trigger: str = "block",
+    block_stride: int = 0,
+    workers: int = 1,
     notion_capital_numeraire: float = 10000.0,  # AC-3: Notional capital for PnL normalization
 ) -> None:
     """ARBY Opportunity Scanner - Real quotes from DEXes with gates and spread detection."""
-    setup_logging(level=log_level, json_output=json_logs)
+    setup_logging(level=log_level, json_output=json_logs, sampling=hot_path_sampling(every=log_sample))
     set_global_context(service="arby-scan", version="0.5.0")  # Bump version
     
     signal.signal(signal.SIGINT, handle_shutdown)
@@ -1501,6 +2490,12 @@ def main(
     
     # Load config
     chains_config, dexes_config, tokens_config = load_config()
+    strategy_config = load_strategy_config()
+    scanner_config = strategy_config.scanner
+    quote_config = strategy_config.quote
+    max_concurrent_quotes = scanner_config.max_concurrent_quotes
+    use_multicall = scanner_config.use_multicall
+    block_stride = block_stride or scanner_config.block_stride
     
     # Determine chains
     if chain == "all":
@@ -1511,29 +2506,34 @@ def main(
             sys.exit(1)
         chains = [(chain, chains_config[chain])]
     
-    session = ScanSession(output_path, intent_path)
+    session = ScanSession(
+        output_path, intent_path,
+        report_interval_seconds=strategy_config.monitoring.report_interval_seconds,
+        notion_capital_numeraire=notion_capital_numeraire,
+        snapshot_format=snapshot_format,
+        record_quotes=record_quotes,
+    )
+    
+    # Shard chains across worker processes (each owns its paper session)
+    sharded = workers > 1 and len(chains) > 1
+    if workers > 1 and not sharded:
+        logger.info("Single chain: scanning in one process")
     
     # Create paper session if enabled
     paper_session = None
-    if paper_trading:
+    if paper_trading and not sharded:
         paper_session = PaperSession(
             trades_dir=trades_path,
             cooldown_blocks=cooldown_blocks,
             simulate_blocked=simulate_blocked,
         )
     
-    # Create registry if enabled (PRODUCTION mode)
+    # Create registry if enabled (PRODUCTION mode); candidates come from
+    # registry.sqlite once the store is open (see prune_registry_pools)
     registry = None
+    registry_path = output_path.parent / "registry.sqlite"
     if use_registry:
-        registry = load_registry(intent_path)
-        registry_summary = registry.get_summary()
-        logger.info(
-            "Registry loaded",
-            extra={"context": registry_summary}
-        )
-        
-        # Save registry snapshot
-        registry.save_snapshot(output_path.parent / "registry")
+        registry = load_registry(intent_path, generate=False)
     
     mode = "REGISTRY" if use_registry else "SMOKE"
     
@@ -1549,76 +2549,111 @@ def main(
             "paper_trading": paper_trading,
             "simulate_blocked": simulate_blocked,
             "cooldown_blocks": cooldown_blocks,
+            "max_concurrent_quotes": max_concurrent_quotes,
+            "use_multicall": use_multicall,
+            "trigger": trigger,
+            "block_stride": block_stride,
+            "workers": min(workers, len(chains)) if sharded else 1,
         }}
     )
     
+    def finalize(all_cycle_summaries: list[dict], paper_stats: dict | None) -> None:
+        """Save snapshot, reject histogram and truth report for a finite run."""
+        session.save_snapshot(all_cycle_summaries)
+        session.save_reject_histogram()
+        
+        # Generate truth report with resilience (Team Lead: fallback if truth_report fails)
+        try:
+            # Aggregated as cycles completed; AC-3 notion capital set on the session
+            truth_report = session.truth_report(paper_stats)
+            
+            # Save and print
+            reports_dir = output_path.parent / "reports"
+            save_truth_report(truth_report, reports_dir)
+            print_truth_report(truth_report)
+        except Exception as truth_err:
+            # Team Lead: "якщо truth_report впав — log + continue"
+            logger.error(
+                f"Truth report generation failed: {truth_err}",
+                exc_info=True,
+                extra={"context": {
+                    "error": str(truth_err),
+                    "snapshot_cycles": len(all_cycle_summaries),
+                }}
+            )
+            # snapshot/reject_histogram/paper_trades вже записані - продовжуємо
+    
+    scan_options = dict(
+        trigger=trigger,
+        interval_ms=interval,
+        max_cycles=max_cycles,
+        block_stride=block_stride,
+        max_concurrent_quotes=max_concurrent_quotes,
+        use_multicall=use_multicall,
+        quote_config=quote_config,
+    )
+    
     async def run():
         try:
-            if max_cycles > 0:
-                # Run finite number of cycles
-                all_cycle_summaries = []
-                
-                for cycle_num in range(max_cycles):
-                    cycle_summaries = []
-                    for chain_key, chain_config in chains:
-                        dex_configs = dexes_config.get(chain_key, {})
-                        token_configs = tokens_config.get(chain_key, {})
-                        
-                        summary = await run_scan_cycle(
-                            chain_key, chain_config, dex_configs, token_configs,
-                            session, paper_session, registry
-                        )
-                        cycle_summaries.append(summary)
-                    
-                    all_cycle_summaries.extend(cycle_summaries)
-                    
-                    # Wait between cycles (except after last)
-                    if cycle_num < max_cycles - 1:
-                        await asyncio.sleep(interval / 1000)
-                
-                session.save_snapshot(all_cycle_summaries)
-                session.save_reject_histogram()
-                
-                # Generate truth report with resilience (Team Lead: fallback if truth_report fails)
-                snapshot = {
-                    "mode": mode,
-                    "cycle_summaries": all_cycle_summaries,
-                }
-                paper_stats = paper_session.stats if paper_session else None
-                
-                try:
-                    # AC-3: Pass notion_capital_numeraire for PnL normalization
-                    truth_report = generate_truth_report(
-                        snapshot, 
-                        paper_stats,
-                        notion_capital_numeraire=notion_capital_numeraire,
-                    )
-                    
-                    # Save and print
-                    reports_dir = output_path.parent / "reports"
-                    save_truth_report(truth_report, reports_dir)
-                    print_truth_report(truth_report)
-                except Exception as truth_err:
-                    # Team Lead: "якщо truth_report впав — log + continue"
-                    logger.error(
-                        f"Truth report generation failed: {truth_err}",
-                        exc_info=True,
-                        extra={"context": {
-                            "error": str(truth_err),
-                            "snapshot_cycles": len(all_cycle_summaries),
-                        }}
-                    )
-                    # snapshot/reject_histogram/paper_trades вже записані - продовжуємо
-            else:
-                await scan_loop(
-                    chains, dexes_config, tokens_config, interval,
-                    session, paper_session, registry
+            if registry:
+                session.registry_store = RegistryStore(registry_path)
+                await session.registry_store.open()
+                await prune_registry_pools(
+                    registry, chains, dexes_config, session.registry_store, output_path.parent
                 )
+                logger.info("Registry loaded", extra={"context": registry.get_summary()})
+                registry.save_snapshot(output_path.parent / "registry")
+            if sharded:
+                return
+            summaries = await run_scanner(
+                chains, dexes_config, tokens_config,
+                session, paper_session, registry,
+                **scan_options,
+            )
+            if max_cycles > 0:
+                finalize(summaries, paper_session.stats if paper_session else None)
         finally:
+            if session.registry_store is not None:
+                await session.registry_store.close()
+                session.registry_store = None
             await close_all_providers()
     
+    def run_workers() -> dict | None:
+        """Scan chain shards in worker processes; returns merged paper stats."""
+        from strategy.jobs.scan_workers import ScanSupervisor, WorkerOptions, plan_chain_shards
+        
+        supervisor = ScanSupervisor(
+            session,
+            WorkerOptions(
+                output_dir=output_path,
+                intent_file=intent_path,
+                trades_dir=trades_path,
+                session_id=datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S"),
+                snapshot_format=snapshot_format,
+                record_quotes=record_quotes,
+                paper_trading=paper_trading,
+                cooldown_blocks=cooldown_blocks,
+                simulate_blocked=simulate_blocked,
+                log_level=log_level,
+                json_logs=json_logs,
+                log_sample=log_sample,
+                registry_path=registry_path if registry else None,
+                **scan_options,
+            ),
+            should_stop=lambda: _shutdown_requested,
+        )
+        summaries = supervisor.run(
+            plan_chain_shards(chains, workers), dexes_config, tokens_config, registry
+        )
+        if max_cycles > 0:
+            finalize(summaries, supervisor.paper_stats)
+        return supervisor.paper_stats
+    
+    worker_paper_stats = None
     try:
         asyncio.run(run())
+        if sharded:
+            worker_paper_stats = run_workers()
     except KeyboardInterrupt:
         logger.info("Scanner interrupted")
     except Exception as e:
@@ -1633,6 +2668,8 @@ def main(
     if paper_session:
         paper_summary = paper_session.get_summary()
         logger.info("Paper session summary", extra={"context": paper_summary})
+    elif worker_paper_stats is not None:
+        logger.info("Paper session summary", extra={"context": {"workers": workers, "stats": worker_paper_stats}})
     
     logger.info("Scanner stopped")
 
@@ -0,0 +1,331 @@
+"""
+strategy/jobs/scan_workers.py - Multi-process scanning: chains sharded across workers.
+
+A single scanner process has one event loop and one GIL, so gate, spread
+and confidence work for one chain competes with response decoding for the
+others. With `arby-scan --workers N` the enabled chains are dealt into N
+shards, each scanned by its own process with its own event loop and
+RPCProvider registry (chains/providers.py keeps one per process).
+
+Workers stream every cycle summary, with their paper stats, to the
+supervisor over a multiprocessing queue. The supervisor owns the
+ScanSession: cycles are recorded as they arrive (truth-report aggregator,
+periodic reports, snapshot), and when the workers finish their paper
+stats, reject samples and paper trade files are merged.
+
+Chains are the unit of sharding: spreads compare DEXes within a chain, so
+all of a chain's DEXes stay in one worker's cycle. Each worker opens
+registry.sqlite itself for its per-cycle candidates and pool health.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import signal
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from core.constants import DEFAULT_MAX_CONCURRENT_QUOTES
+from core.logging import (
+    DEFAULT_LOG_SAMPLE_EVERY, get_logger, hot_path_sampling, set_global_context, setup_logging,
+)
+from chains.providers import close_all_providers
+from discovery.registry import PoolRegistry
+from discovery.registry_store import RegistryStore
+from strategy.config import QuoteConfig
+from strategy.jobs.run_scan import RejectSample, ScanSession, handle_shutdown, run_scanner
+from strategy.paper_trading import PaperSession, merge_paper_stats, merge_trade_files
+
+logger = get_logger("arby.scan.workers")
+
+# Queue messages: (MSG_CYCLE, worker, summary, paper_stats) / (MSG_DONE, worker, WorkerResult)
+MSG_CYCLE = "cycle"
+MSG_DONE = "done"
+
+POLL_INTERVAL_SECONDS = 0.5  # Supervisor: stop flag / dead worker checks
+JOIN_TIMEOUT_SECONDS = 30.0  # Grace period for workers to flush after stop
+
+
+@dataclass
+class WorkerOptions:
+    """Scanner settings every worker runs with (picklable)."""
+    output_dir: Path
+    intent_file: Path
+    trades_dir: Path
+    session_id: str  # Worker i writes paper_trades_<session_id>_w<i>.jsonl
+    trigger: str = "block"
+    interval_ms: int = 5000
+    max_cycles: int = 0  # Per chain (0 = until stopped)
+    block_stride: int = 1
+    max_concurrent_quotes: int = DEFAULT_MAX_CONCURRENT_QUOTES
+    use_multicall: bool = False
+    quote_config: QuoteConfig | None = None
+    snapshot_format: str = "binary"
+    record_quotes: bool = True
+    paper_trading: bool = True
+    cooldown_blocks: int = PaperSession.DEFAULT_COOLDOWN_BLOCKS
+    simulate_blocked: bool = True
+    log_level: str = "INFO"
+    json_logs: bool = True
+    log_sample: int = DEFAULT_LOG_SAMPLE_EVERY
+    registry_path: Path | None = None  # registry.sqlite: candidates and pool health
+
+    def worker_session_id(self, index: int) -> str:
+        return f"{self.session_id}_w{index}"
+
+
+@dataclass
+class WorkerResult:
+    """Sent once by each worker when it stops."""
+    cycles: int = 0
+    paper_stats: dict | None = None
+    reject_samples: list[RejectSample] = field(default_factory=list)
+    trades_file: str | None = None
+    error: str | None = None
+
+
+def plan_chain_shards(chains: list[tuple[str, dict]], workers: int) -> list[list[tuple[str, dict]]]:
+    """Deal chains (in priority order) round-robin into at most workers shards."""
+    count = max(1, min(workers, len(chains)))
+    return [chains[i::count] for i in range(count)]
+
+
+# =============================================================================
+# WORKER
+# =============================================================================
+
+class _ForwardingSession(ScanSession):
+    """Worker-side ScanSession: cycles go to the supervisor, not into memory."""
+
+    def __init__(self, events: "multiprocessing.Queue", index: int, options: WorkerOptions):
+        super().__init__(
+            options.output_dir, options.intent_file,
+            snapshot_format=options.snapshot_format,
+            record_quotes=options.record_quotes,
+        )
+        self.events = events
+        self.index = index
+        self.paper_session: PaperSession | None = None
+
+    def record_cycle(self, summary: dict) -> None:
+        self.cycle_count += 1
+        paper_stats = dict(self.paper_session.stats) if self.paper_session else None
+        self.events.put((MSG_CYCLE, self.index, summary, paper_stats))
+
+
+def scan_worker(
+    index: int,
+    chains: list[tuple[str, dict]],
+    dexes: dict,
+    tokens: dict,
+    registry: PoolRegistry | None,
+    options: WorkerOptions,
+    events: "multiprocessing.Queue",
+    stop: "multiprocessing.synchronize.Event",
+) -> None:
+    """Process entry point: scan one shard of chains until done or stopped."""
+    setup_logging(
+        level=options.log_level,
+        json_output=options.json_logs,
+        sampling=hot_path_sampling(every=options.log_sample),
+    )
+    set_global_context(service="arby-scan", worker=index)
+    signal.signal(signal.SIGINT, handle_shutdown)
+    signal.signal(signal.SIGTERM, handle_shutdown)
+
+    session = _ForwardingSession(events, index, options)
+    paper_session = None
+    if options.paper_trading:
+        paper_session = PaperSession(
+            trades_dir=options.trades_dir,
+            session_id=options.worker_session_id(index),
+            cooldown_blocks=options.cooldown_blocks,
+            simulate_blocked=options.simulate_blocked,
+        )
+    session.paper_session = paper_session
+
+    async def watch_stop() -> None:
+        while not stop.is_set():
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+        handle_shutdown(signal.SIGTERM, None)
+
+    async def run() -> None:
+        watcher = asyncio.create_task(watch_stop())
+        try:
+            if options.registry_path is not None:
+                session.registry_store = RegistryStore(options.registry_path)
+                await session.registry_store.open()
+            await run_scanner(
+                chains, dexes, tokens, session, paper_session, registry,
+                trigger=options.trigger,
+                interval_ms=options.interval_ms,
+                max_cycles=options.max_cycles,
+                block_stride=options.block_stride,
+                max_concurrent_quotes=options.max_concurrent_quotes,
+                use_multicall=options.use_multicall,
+                quote_config=options.quote_config,
+            )
+        finally:
+            watcher.cancel()
+            if session.registry_store is not None:
+                await session.registry_store.close()
+            await close_all_providers()
+
+    result = WorkerResult()
+    try:
+        asyncio.run(run())
+    except BaseException as e:  # KeyboardInterrupt included: still report back
+        result.error = f"{type(e).__name__}: {e}"
+        logger.error(f"Scan worker {index} failed: {e}", exc_info=True)
+    finally:
+        result.cycles = session.cycle_count
+        result.reject_samples = [s for samples in session.reject_samples.values() for s in samples]
+        if paper_session is not None:
+            result.paper_stats = dict(paper_session.stats)
+            result.trades_file = str(paper_session.trades_file)
+        events.put((MSG_DONE, index, result))
+
+
+# =============================================================================
+# SUPERVISOR
+# =============================================================================
+
+class ScanSupervisor:
+    """
+    Runs one scan worker per chain shard and merges what they send.
+
+    Usage:
+        supervisor = ScanSupervisor(session, options, should_stop=lambda: stopping)
+        summaries = supervisor.run(plan_chain_shards(chains, 4), dexes, tokens, registry)
+        supervisor.paper_stats  # Merged over all workers
+    """
+
+    def __init__(
+        self,
+        session: ScanSession,
+        options: WorkerOptions,
+        should_stop: Callable[[], bool] = lambda: False,
+    ):
+        self.session = session
+        self.options = options
+        self.should_stop = should_stop
+        self.worker_stats: dict[int, dict] = {}  # Latest PaperSession.stats per worker
+        self.results: dict[int, WorkerResult] = {}
+        self.trades_file: Path | None = None  # Merged paper trades
+
+    @property
+    def paper_stats(self) -> dict | None:
+        """Paper stats summed over workers (None with paper trading off)."""
+        if not self.options.paper_trading:
+            return None
+        return merge_paper_stats([self.worker_stats[i] for i in sorted(self.worker_stats)])
+
+    def run(
+        self,
+        shards: list[list[tuple[str, dict]]],
+        dexes: dict,
+        tokens: dict,
+        registry: PoolRegistry | None = None,
+    ) -> list[dict]:
+        """
+        Scan until every worker stops (max_cycles reached, or should_stop).
+
+        Returns:
+            Cycle summaries in arrival order; only kept when max_cycles > 0
+            (otherwise each is recorded on the session and dropped)
+        """
+        # Spawned, not forked: workers start without the parent's loop and log thread
+        context = multiprocessing.get_context("spawn")
+        events = context.Queue()
+        stop = context.Event()
+        processes = {
+            index: context.Process(
+                target=scan_worker,
+                args=(
+                    index, shard,
+                    {chain_key: dexes.get(chain_key, {}) for chain_key, _ in shard},
+                    {chain_key: tokens.get(chain_key, {}) for chain_key, _ in shard},
+                    registry, self.options, events, stop,
+                ),
+                name=f"arby-scan-w{index}",
+            )
+            for index, shard in enumerate(shards)
+        }
+        for index, process in processes.items():
+            process.start()
+            logger.info(
+                f"Scan worker {index} started",
+                extra={"context": {"pid": process.pid, "chains": [c for c, _ in shards[index]]}},
+            )
+
+        summaries: list[dict] = []
+        running = set(processes)
+        try:
+            while running:
+                if self.should_stop() and not stop.is_set():
+                    stop.set()
+                try:
+                    message = events.get(timeout=POLL_INTERVAL_SECONDS)
+                except queue.Empty:
+                    for index in sorted(running):
+                        if not processes[index].is_alive():
+                            # Died without reporting (killed, or crashed in startup)
+                            self.results[index] = WorkerResult(
+                                error=f"exited with code {processes[index].exitcode}"
+                            )
+                            running.discard(index)
+                            logger.error(f"Scan worker {index} exited without reporting")
+                    continue
+
+                kind, index = message[0], message[1]
+                if kind == MSG_CYCLE:
+                    summary, paper_stats = message[2], message[3]
+                    if self.options.max_cycles > 0:
+                        summaries.append(summary)
+                    self.session.record_cycle(summary)
+                    if paper_stats is not None:
+                        self.worker_stats[index] = paper_stats
+                    self.session.maybe_save_truth_report(self.paper_stats)
+                elif kind == MSG_DONE:
+                    self.results[index] = message[2]
+                    running.discard(index)
+        finally:
+            stop.set()
+            for process in processes.values():
+                process.join(JOIN_TIMEOUT_SECONDS)
+                if process.is_alive():
+                    logger.warning(f"Terminating scan worker {process.name}")
+                    process.terminate()
+
+        self._merge_results()
+        return summaries
+
+    def _merge_results(self) -> None:
+        """Fold worker results into the session, in worker order."""
+        trade_files = []
+        for index in sorted(self.results):
+            result = self.results[index]
+            if result.error:
+                logger.error(f"Scan worker {index}: {result.error}")
+            if result.paper_stats is not None:
+                self.worker_stats[index] = result.paper_stats
+            for sample in result.reject_samples:
+                self.session.add_reject_sample(sample)
+            if result.trades_file:
+                trade_files.append(Path(result.trades_file))
+
+        if trade_files:
+            self.trades_file = merge_trade_files(
+                trade_files, self.options.trades_dir / f"paper_trades_{self.options.session_id}.jsonl"
+            )
+
+        logger.info(
+            "Scan workers stopped",
+            extra={"context": {
+                "workers": len(self.results),
+                "cycles": {i: r.cycles for i, r in sorted(self.results.items())},
+                "errors": {i: r.error for i, r in sorted(self.results.items()) if r.error},
+                "trades_file": str(self.trades_file) if self.trades_file else None,
+            }},
+        )
@@ -2,7 +2,8 @@
 strategy/paper_trading.py - Paper trading simulation with persistence.
 
 Features:
-- JSONL persistence for paper trades
+- JSONL persistence for paper trades (append-only, incl. revalidation/expiry updates)
+- In-memory index of trades pending revalidation, by spread_id and by block
 - Cooldown/dedupe logic
 - PnL tracking in bps and USDC
 - Outcome categories: WOULD_EXECUTE, BLOCKED_EXEC, STALE, etc.
@@ -23,6 +24,7 @@ EXAMPLE:
 """
 
 import json
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from decimal import Decimal
@@ -38,6 +40,25 @@ logger = get_logger(__name__)
 # Default numeraire for PnL calculations
 DEFAULT_NUMERAIRE = "USDC"
 
+# JSONL record types for updates (trade lines have no record_type)
+RECORD_REVALIDATION = "revalidation"
+RECORD_EXPIRED = "expired"  # Pending trade whose spread did not reappear in time
+
+# outcome_reason["reason"] of a trade folded with an expired record
+REASON_REVALIDATION_EXPIRED = "revalidation_expired"
+
+# Fields carried by a revalidation update record
+REVALIDATION_FIELDS = (
+    "revalidated",
+    "revalidation_block",
+    "would_still_execute",
+    "would_still_paper_execute",
+    "would_still_real_execute",
+    "gates_actually_changed",
+    "outcome",
+    "outcome_reason",
+)
+
 
 class TradeOutcome(str, Enum):
     """Paper trade outcome categories."""
@@ -310,9 +331,18 @@ class PaperSession:
     
     Stores trades in JSONL format for easy appending and analysis.
     Implements cooldown logic to avoid trading same spread repeatedly.
+
+    The file is append-only: revalidation writes a small update record
+    instead of rewriting every trade. Only WOULD_EXECUTE trades awaiting
+    revalidation are kept in memory, indexed by spread_id and in a
+    block-ordered queue; settled trades live in the file only. A pending
+    trade whose spread has not reappeared within pending_window_blocks is
+    expired (an "expired" update record), so memory and per-cycle work
+    don't grow with the session's trade count.
     """
     
     DEFAULT_COOLDOWN_BLOCKS = 10
+    DEFAULT_PENDING_WINDOW_BLOCKS = 1000
     
     def __init__(
         self,
@@ -320,6 +350,7 @@ class PaperSession:
         session_id: str | None = None,
         cooldown_blocks: int = DEFAULT_COOLDOWN_BLOCKS,
         simulate_blocked: bool = True,  # Policy: also simulate blocked trades
+        pending_window_blocks: int = DEFAULT_PENDING_WINDOW_BLOCKS,
     ):
         self.trades_dir = trades_dir
         self.trades_dir.mkdir(parents=True, exist_ok=True)
@@ -327,12 +358,20 @@ class PaperSession:
         self.session_id = session_id or datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
         self.cooldown_blocks = cooldown_blocks
         self.simulate_blocked = simulate_blocked
+        self.pending_window_blocks = max(1, pending_window_blocks)
         
         # JSONL file for this session
         self.trades_file = trades_dir / f"paper_trades_{self.session_id}.jsonl"
         
         # In-memory tracking for cooldown
         self._last_trade_block: dict[str, int] = {}  # spread_id -> last_block
+
+        # Trades pending revalidation (first trade wins on duplicate keys)
+        self._trades: dict[tuple[str, int], PaperTrade] = {}
+        # Pending revalidation: sorted (block_number, spread_id), and
+        # spread_id -> sorted block numbers
+        self._pending: list[tuple[int, str]] = []
+        self._pending_by_spread: dict[str, list[int]] = {}
         
         # Session stats (Roadmap 3.2: No float money - use Decimal)
         self._total_pnl_numeraire = Decimal("0")  # Decimal for accumulation
@@ -348,6 +387,14 @@ class PaperSession:
             "numeraire": "USDC",
         }
         
+        # Resuming an existing session: rebuild index and cooldowns
+        if self.trades_file.exists():
+            for trade in self.load_trades():
+                self._index_trade(trade)
+                self._last_trade_block[trade.spread_id] = max(
+                    trade.block_number, self._last_trade_block.get(trade.spread_id, trade.block_number)
+                )
+
         logger.info(
             f"Paper session started: {self.session_id}",
             extra={"context": {
@@ -427,33 +474,135 @@ class PaperSession:
                     f"trade={trade.numeraire}"
                 )
         
-        # Persist to JSONL
-        self._append_trade(trade)
+        # Persist to JSONL (one to_dict serves the file and the log context)
+        record = trade.to_dict()
+        self._append_record(record)
+        self._index_trade(trade)
         
         logger.info(
             f"Paper trade: {trade.outcome} {trade.spread_id} "
-            f"net={trade.net_pnl_bps}bps ${trade.expected_pnl_numeraire:.2f} {trade.numeraire}",
-            extra={"context": trade.to_dict()}
+            f"net={trade.net_pnl_bps}bps ${trade.expected_pnl_numeraire} {trade.numeraire}",
+            extra={"context": record}
         )
         
         return True
     
-    def _append_trade(self, trade: PaperTrade) -> None:
-        """Append trade to JSONL file."""
+    def _append_record(self, record: dict) -> None:
+        """Append one JSON line."""
         with open(self.trades_file, "a") as f:
-            f.write(json.dumps(trade.to_dict()) + "\n")
-    
+            f.write(json.dumps(record) + "\n")
+
+    def _index_trade(self, trade: PaperTrade) -> None:
+        """Add a trade awaiting revalidation to the in-memory index."""
+        if (
+            trade.outcome != TradeOutcome.WOULD_EXECUTE.value
+            or trade.revalidated
+            or trade.outcome_reason.get("reason") == REASON_REVALIDATION_EXPIRED
+        ):
+            return
+        key = (trade.spread_id, trade.block_number)
+        if key in self._trades:
+            return
+        self._trades[key] = trade
+        insort(self._pending, (trade.block_number, trade.spread_id))
+        insort(self._pending_by_spread.setdefault(trade.spread_id, []), trade.block_number)
+
+    def _remove_pending(self, spread_id: str, block_number: int) -> None:
+        """Drop a trade from the pending index (no-op if absent)."""
+        if self._trades.pop((spread_id, block_number), None) is None:
+            return
+        entry = (block_number, spread_id)
+        i = bisect_left(self._pending, entry)
+        if i < len(self._pending) and self._pending[i] == entry:
+            del self._pending[i]
+        blocks = self._pending_by_spread[spread_id]
+        blocks.remove(block_number)
+        if not blocks:
+            del self._pending_by_spread[spread_id]
+
+    def get_trade(self, spread_id: str, block_number: int) -> PaperTrade | None:
+        """Look up a trade pending revalidation by (spread_id, block_number)."""
+        return self._trades.get((spread_id, block_number))
+
+    def has_pending(self, spread_id: str) -> bool:
+        """True if any trade of spread_id awaits revalidation."""
+        return spread_id in self._pending_by_spread
+
+    def get_pending_for_spread(
+        self, spread_id: str, current_block: int, min_blocks: int = 1,
+    ) -> list[PaperTrade]:
+        """Trades of spread_id pending revalidation, at least min_blocks old (oldest first)."""
+        blocks = self._pending_by_spread.get(spread_id, [])
+        end = bisect_right(blocks, current_block - min_blocks)
+        return [self._trades[(spread_id, block_number)] for block_number in blocks[:end]]
+
+    def expire_pending(self, current_block: int) -> int:
+        """
+        Expire pending trades older than pending_window_blocks.
+
+        Their spread did not reappear in time, so they are never
+        revalidated; each gets an append-only "expired" record and leaves
+        memory. The trade's outcome is unchanged.
+
+        Returns:
+            Number of trades expired
+        """
+        cutoff = current_block - self.pending_window_blocks
+        expired = 0
+        while self._pending and self._pending[0][0] < cutoff:
+            block_number, spread_id = self._pending[0]
+            trade = self._trades[(spread_id, block_number)]
+            trade.outcome_reason = {
+                "reason": REASON_REVALIDATION_EXPIRED,
+                "expired_block": current_block,
+            }
+            self._remove_pending(spread_id, block_number)
+            self._append_record({
+                "record_type": RECORD_EXPIRED,
+                "spread_id": spread_id,
+                "block_number": block_number,
+                "outcome_reason": trade.outcome_reason,
+            })
+            expired += 1
+        if expired:
+            logger.debug(
+                f"Expired {expired} pending revalidations",
+                extra={"context": {"block": current_block, "window": self.pending_window_blocks}},
+            )
+        return expired
+
     def load_trades(self) -> list[PaperTrade]:
-        """Load all trades from JSONL file."""
-        trades = []
+        """
+        Load all trades from JSONL file.
+
+        Revalidation and expiry update records are folded into the trade
+        they refer to.
+        """
+        trades: list[PaperTrade] = []
+        by_key: dict[tuple[str, int], PaperTrade] = {}
         if not self.trades_file.exists():
             return trades
-        
+
         with open(self.trades_file, "r") as f:
             for line in f:
-                if line.strip():
-                    trades.append(PaperTrade.from_dict(json.loads(line)))
-        
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("record_type") == RECORD_REVALIDATION:
+                    trade = by_key.get((record["spread_id"], record["block_number"]))
+                    if trade is not None:
+                        for name in REVALIDATION_FIELDS:
+                            setattr(trade, name, record[name])
+                    continue
+                if record.get("record_type") == RECORD_EXPIRED:
+                    trade = by_key.get((record["spread_id"], record["block_number"]))
+                    if trade is not None:
+                        trade.outcome_reason = record["outcome_reason"]
+                    continue
+                trade = PaperTrade.from_dict(record)
+                by_key.setdefault((trade.spread_id, trade.block_number), trade)
+                trades.append(trade)
+
         return trades
     
     def get_summary(self) -> dict:
@@ -474,6 +623,10 @@ class PaperSession:
         - Have outcome WOULD_EXECUTE
         - Were not yet revalidated
         - Are at least min_blocks old
+
+        Served from the in-memory queue (oldest block first, bounded by
+        pending_window_blocks once expire_pending runs); the trades file
+        is not re-read.
         
         Args:
             current_block: Current block number
@@ -482,20 +635,12 @@ class PaperSession:
         Returns:
             List of trades needing revalidation
         """
-        pending = []
-        trades = self.load_trades()
-        
-        for trade in trades:
-            if trade.outcome != TradeOutcome.WOULD_EXECUTE.value:
-                continue
-            if trade.revalidated:
-                continue
-            if current_block - trade.block_number < min_blocks:
-                continue
-            
-            pending.append(trade)
-        
-        return pending
+        # Block cutoff: block_number <= current_block - min_blocks
+        end = bisect_right(self._pending, current_block - min_blocks, key=lambda entry: entry[0])
+        return [
+            self._trades[(spread_id, block_number)]
+            for block_number, spread_id in self._pending[:end]
+        ]
     
     def mark_revalidated(
         self,
@@ -534,59 +679,98 @@ class PaperSession:
         if would_still_real_execute is None:
             would_still_real_execute = would_still_execute
         
-        trades = self.load_trades()
-        found = False
-        
-        for trade in trades:
-            if trade.spread_id == spread_id and trade.block_number == original_block:
-                trade.revalidated = True
-                trade.revalidation_block = revalidation_block
-                # AC-6: Set both paper and real revalidation results
-                trade.would_still_execute = would_still_execute  # Legacy
-                trade.would_still_paper_execute = would_still_paper_execute
-                trade.would_still_real_execute = would_still_real_execute
-                trade.gates_actually_changed = gates_actually_changed
-                
-                # AC-6: Update stats ONLY if gates actually changed
-                # Not just because policy/confidence changed
-                if gates_actually_changed and not would_still_paper_execute:
-                    if trade.outcome == TradeOutcome.WOULD_EXECUTE.value:
-                        self.stats["would_execute"] -= 1
-                        trade.outcome = TradeOutcome.GATES_CHANGED.value
-                        trade.outcome_reason = {
-                            "reason": "gates_actually_changed",
-                            "revalidation_block": revalidation_block,
-                            "new_net_pnl_bps": new_net_pnl_bps,
-                        }
-                elif not would_still_paper_execute and trade.outcome == TradeOutcome.WOULD_EXECUTE.value:
-                    # Policy changed but gates didn't - different outcome
-                    # Don't count as GATES_CHANGED for KPI
-                    trade.outcome_reason = {
-                        "reason": "policy_changed",  # Not gates
-                        "revalidation_block": revalidation_block,
-                        "new_net_pnl_bps": new_net_pnl_bps,
-                        "gates_actually_changed": False,
-                    }
-                
-                found = True
-                break
-        
-        if found:
-            # Rewrite entire file (simple but ok for paper trading volumes)
-            with open(self.trades_file, "w") as f:
-                for trade in trades:
-                    f.write(json.dumps(trade.to_dict()) + "\n")
-            
-            logger.info(
-                f"Revalidation: {spread_id} paper={would_still_paper_execute} "
-                f"real={would_still_real_execute} gates_changed={gates_actually_changed}",
-                extra={"context": {
-                    "original_block": original_block,
+        trade = self._trades.get((spread_id, original_block))
+        if trade is None:
+            return False
+        
+        trade.revalidated = True
+        trade.revalidation_block = revalidation_block
+        # AC-6: Set both paper and real revalidation results
+        trade.would_still_execute = would_still_execute  # Legacy
+        trade.would_still_paper_execute = would_still_paper_execute
+        trade.would_still_real_execute = would_still_real_execute
+        trade.gates_actually_changed = gates_actually_changed
+        
+        # AC-6: Update stats ONLY if gates actually changed
+        # Not just because policy/confidence changed
+        if gates_actually_changed and not would_still_paper_execute:
+            if trade.outcome == TradeOutcome.WOULD_EXECUTE.value:
+                self.stats["would_execute"] -= 1
+                trade.outcome = TradeOutcome.GATES_CHANGED.value
+                trade.outcome_reason = {
+                    "reason": "gates_actually_changed",
                     "revalidation_block": revalidation_block,
-                }}
-            )
+                    "new_net_pnl_bps": new_net_pnl_bps,
+                }
+        elif not would_still_paper_execute and trade.outcome == TradeOutcome.WOULD_EXECUTE.value:
+            # Policy changed but gates didn't - different outcome
+            # Don't count as GATES_CHANGED for KPI
+            trade.outcome_reason = {
+                "reason": "policy_changed",  # Not gates
+                "revalidation_block": revalidation_block,
+                "new_net_pnl_bps": new_net_pnl_bps,
+                "gates_actually_changed": False,
+            }
+        
+        self._remove_pending(spread_id, original_block)
         
-        return found
+        # Append-only: one update record, folded back in by load_trades()
+        self._append_record({
+            "record_type": RECORD_REVALIDATION,
+            "spread_id": spread_id,
+            "block_number": original_block,
+            **{name: getattr(trade, name) for name in REVALIDATION_FIELDS},
+        })
+        
+        logger.info(
+            f"Revalidation: {spread_id} paper={would_still_paper_execute} "
+            f"real={would_still_real_execute} gates_changed={gates_actually_changed}",
+            extra={"context": {
+                "original_block": original_block,
+                "revalidation_block": revalidation_block,
+            }}
+        )
+        
+        return True
+
+
+def merge_paper_stats(stats: list[dict]) -> dict:
+    """
+    Combine PaperSession.stats of sessions run side by side (scan workers,
+    backtest shards): counts add up, PnL stays a Decimal-string.
+    """
+    merged: dict = {}
+    total_pnl = Decimal("0")
+    for session_stats in stats:
+        for key, value in session_stats.items():
+            if key == "total_pnl_numeraire":
+                total_pnl += Decimal(value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+            else:
+                merged.setdefault(key, value)
+    if stats:
+        merged["total_pnl_numeraire"] = str(total_pnl.quantize(Decimal("0.000001")))
+    return merged
+
+
+def merge_trade_files(parts: list[Path], target: Path) -> Path:
+    """
+    Append JSONL trade files to target, in order, and remove them.
+
+    Each part keeps its own order, so revalidation records still follow
+    the trade they update.
+    """
+    with open(target, "a") as out:
+        for part in parts:
+            if not part.exists():
+                continue
+            with open(part) as f:
+                for line in f:
+                    if line.strip():
+                        out.write(line if line.endswith("\n") else line + "\n")
+            part.unlink()
+    return target
 
 
 def calculate_usdc_value(
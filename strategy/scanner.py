@@ -0,0 +1,190 @@
+"""
+strategy/scanner.py - Block-triggered multi-chain scan scheduler.
+
+One independent task per chain, each driven by that chain's BlockStream:
+- A cycle fires on every new block (or every block_stride blocks)
+- Blocks that arrive while a cycle runs are coalesced into the newest one,
+  never queued, so a slow cycle skips ahead instead of falling further behind
+- A slow chain only delays itself
+- Lag (head block - scanned block) is tracked per chain
+- Shutdown is polled while waiting for blocks, so a stalled stream cannot
+  hold it up
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from core.logging import get_logger
+from chains.block import BlockState, BlockStream
+
+logger = get_logger(__name__)
+
+
+# Runs one scan cycle for (chain_key, chain_config) at a pinned block
+CycleRunner = Callable[[str, dict, BlockState], Awaitable[dict]]
+
+STOP_POLL_SECONDS = 0.25  # should_stop check while no block arrives
+
+
+@dataclass
+class ChainLag:
+    """Per-chain scheduling and lag statistics."""
+    chain_key: str
+    cycles: int = 0
+    head_block: int | None = None  # Latest block seen by the stream
+    scanned_block: int | None = None  # Block of the last completed cycle
+    last_lag_blocks: int = 0  # Head - scanned when the last cycle finished
+    max_lag_blocks: int = 0
+    blocks_dropped: int = 0  # Blocks coalesced away beyond the stride
+    last_cycle_ms: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "chain": self.chain_key,
+            "cycles": self.cycles,
+            "head_block": self.head_block,
+            "scanned_block": self.scanned_block,
+            "last_lag_blocks": self.last_lag_blocks,
+            "max_lag_blocks": self.max_lag_blocks,
+            "blocks_dropped": self.blocks_dropped,
+            "last_cycle_ms": self.last_cycle_ms,
+            "errors": self.errors,
+        }
+
+
+class BlockScheduler:
+    """
+    Runs scan cycles per chain on new blocks.
+
+    Usage:
+        scheduler = BlockScheduler(streams, run_cycle, block_stride=2)
+        summaries = await scheduler.run(max_cycles=10)
+    """
+
+    def __init__(
+        self,
+        streams: dict[str, tuple[dict, BlockStream]],
+        run_cycle: CycleRunner,
+        block_stride: int = 1,
+        should_stop: Callable[[], bool] | None = None,
+    ):
+        """
+        Args:
+            streams: chain_key -> (chain_config, BlockStream)
+            run_cycle: Coroutine running one cycle at a pinned block
+            block_stride: Scan every Nth block (1 = every block)
+            should_stop: Polled between cycles and while waiting for a
+                block (e.g. shutdown flag)
+        """
+        self.streams = streams
+        self.run_cycle = run_cycle
+        self.block_stride = max(1, block_stride)
+        self.should_stop = should_stop or (lambda: False)
+        self.lag: dict[str, ChainLag] = {key: ChainLag(chain_key=key) for key in streams}
+        self.summaries: list[dict] = []
+        self._keep_summaries = False
+
+    async def run(self, max_cycles: int = 0) -> list[dict]:
+        """
+        Run all chains until stopped (or max_cycles per chain, if > 0).
+
+        Returns:
+            Cycle summaries in completion order. Only kept for a finite run
+            (max_cycles > 0): an endless run would hold every block's
+            summary, so its consumer has to record each cycle as it completes.
+        """
+        self._keep_summaries = max_cycles > 0
+        for _, stream in self.streams.values():
+            await stream.start()
+
+        watcher = asyncio.create_task(self._watch_stop())
+        try:
+            await asyncio.gather(*(
+                self._run_chain(chain_key, chain_config, stream, max_cycles)
+                for chain_key, (chain_config, stream) in self.streams.items()
+            ))
+        finally:
+            watcher.cancel()
+
+        return self.summaries
+
+    async def _watch_stop(self) -> None:
+        """Stop every stream once should_stop() is set, even mid-wait for a block."""
+        while not self.should_stop():
+            await asyncio.sleep(STOP_POLL_SECONDS)
+        for _, stream in self.streams.values():
+            await stream.stop()
+
+    async def _run_chain(
+        self,
+        chain_key: str,
+        chain_config: dict,
+        stream: BlockStream,
+        max_cycles: int,
+    ) -> None:
+        """Scan one chain on each new block (per stride) until done."""
+        try:
+            await self._scan_blocks(chain_key, chain_config, stream, max_cycles)
+        finally:
+            await stream.stop()
+
+    async def _scan_blocks(
+        self,
+        chain_key: str,
+        chain_config: dict,
+        stream: BlockStream,
+        max_cycles: int,
+    ) -> None:
+        lag = self.lag[chain_key]
+
+        async for state in stream.blocks():
+            if self.should_stop():
+                return
+
+            if lag.scanned_block is not None:
+                gap = state.block_number - lag.scanned_block
+                if 0 < gap < self.block_stride:
+                    continue
+                lag.blocks_dropped += max(0, gap - self.block_stride)
+
+            start = time.monotonic()
+            try:
+                summary = await self.run_cycle(chain_key, chain_config, state)
+            except Exception as e:
+                # run_scan_cycle reports its own failures; keep the chain alive
+                lag.errors += 1
+                logger.error(
+                    f"Scan cycle crashed on {chain_key}: {e}",
+                    exc_info=True,
+                    extra={"context": {"chain": chain_key, "block": state.block_number}},
+                )
+                summary = None
+
+            lag.cycles += 1
+            lag.last_cycle_ms = int((time.monotonic() - start) * 1000)
+            lag.scanned_block = state.block_number
+            head = stream.latest.block_number if stream.latest else state.block_number
+            lag.head_block = head
+            lag.last_lag_blocks = max(0, head - state.block_number)
+            lag.max_lag_blocks = max(lag.max_lag_blocks, lag.last_lag_blocks)
+
+            if summary is not None:
+                summary["block_lag"] = lag.to_dict()
+                if self._keep_summaries:
+                    self.summaries.append(summary)
+
+            logger.info(
+                f"{chain_key} block {state.block_number} scanned, "
+                f"lag={lag.last_lag_blocks} blocks, cycle={lag.last_cycle_ms}ms",
+                extra={"context": lag.to_dict()},
+            )
+
+            if self.should_stop() or (max_cycles > 0 and lag.cycles >= max_cycles):
+                return
+
+    def get_lag_summary(self) -> dict[str, dict]:
+        """Get lag statistics for all chains."""
+        return {key: lag.to_dict() for key, lag in self.lag.items()}
@@ -0,0 +1,77 @@
+"""
+tests/integration/test_backtest_replay.py - Tests for strategy/backtest_replay.py
+
+Records scan cycles against the fake JSON-RPC node (scripts/fake_rpc.py),
+then replays the snapshot without RPC.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from core.snapshot import load_snapshot
+from scripts.bench_scan import bench_universe
+from strategy.backtest_replay import run_backtest
+
+# Differ between a live cycle and its replay by construction
+VOLATILE_KEYS = {"cycle_end", "duration_ms", "stage_timings_ms", "replay"}
+
+
+def comparable(summary: dict) -> dict:
+    summary = {k: v for k, v in summary.items() if k not in VOLATILE_KEYS}
+    summary["pairs_scanned"] = sorted(summary["pairs_scanned"])
+    return summary
+
+
+@pytest.fixture
+async def recorded(tmp_path) -> Path:
+    """Snapshot of 3 live cycles with failed quotes mixed in."""
+    await bench_universe(24, cycles=3, workdir=tmp_path / "live", revert_rate=0.05)
+    return next((tmp_path / "live").glob("**/scan_*.arbysnap"))
+
+
+class TestBacktestReplay:
+    """Test replaying recorded cycles."""
+
+    def test_reproduces_live_cycles(self, recorded, tmp_path):
+        """Without a config, replay matches the live summaries and paper trades."""
+        live = load_snapshot(recorded)["cycle_summaries"]
+
+        result = run_backtest([recorded], tmp_path / "bt")
+
+        replayed = load_snapshot(Path(result.snapshots[0]))["cycle_summaries"]
+        assert result.cycles == 3
+        assert result.skipped == 0
+        assert any(s["paper_trades"] for s in live)
+        assert any("QUOTE_REVERT" in s["reject_reasons_histogram"] for s in live)
+        assert [comparable(s) for s in replayed] == [comparable(s) for s in live]
+
+    def test_thresholds_change_results(self, recorded, tmp_path):
+        """Gate thresholds from --config apply to the replayed quotes."""
+        config = tmp_path / "strategy.yaml"
+        config.write_text("gate_defaults:\n  max_gas_estimate: 1000\n")
+
+        baseline = run_backtest([recorded], tmp_path / "base")
+        strict = run_backtest([recorded], tmp_path / "strict", config_path=config)
+
+        assert baseline.paper_stats["would_execute"] > 0
+        assert strict.paper_stats.get("would_execute", 0) == 0
+        assert strict.report.health.quote_gate_pass_rate == 0
+
+    def test_parallel_shards_merge_in_order(self, recorded, tmp_path):
+        """Per-cycle shards in a process pool give the same report as one pass."""
+        serial = run_backtest([recorded], tmp_path / "serial", chunk_cycles=1)
+        parallel = run_backtest([recorded], tmp_path / "parallel", workers=2, chunk_cycles=1)
+
+        assert parallel.shards == 3
+        assert parallel.paper_stats == serial.paper_stats
+        assert parallel.report.top_opportunities == serial.report.top_opportunities
+
+    def test_unrecorded_cycles_skipped(self, tmp_path):
+        """Cycles recorded with --no-record-quotes are counted, not replayed."""
+        path = tmp_path / "scan.json"
+        path.write_text('{"cycle_summaries": [{"chain": "arbitrum_one", "block_number": 1}]}')
+
+        result = run_backtest([path], tmp_path / "bt")
+
+        assert (result.cycles, result.skipped) == (0, 1)
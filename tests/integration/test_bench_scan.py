@@ -0,0 +1,98 @@
+"""
+tests/integration/test_bench_scan.py - Tests for scripts/fake_rpc.py and scripts/bench_scan.py
+
+Tests the fake JSON-RPC node over real HTTP and a small benchmark run.
+"""
+
+import pytest
+
+from core.exceptions import InfraError
+from chains.multicall import Multicall3
+from chains.providers import RPCProvider
+from dex.adapters.uniswap_v3 import UniswapV3Adapter
+from scripts.bench_scan import BENCH_DEXES, CHAIN_ID, build_universe, bench_universe
+from scripts.fake_rpc import FakeChain, FakeRPCServer
+
+QUOTER = BENCH_DEXES["uniswap_v3"]
+
+
+@pytest.fixture
+def universe():
+    tokens, dex_configs, candidates = build_universe(12)
+    return FakeChain(tokens, chain_id=CHAIN_ID), candidates
+
+
+class TestFakeChain:
+    """Test the deterministic market."""
+
+    def test_exact_output_covers_exact_input(self, universe):
+        chain, candidates = universe
+        pool = candidates[0]
+        base, quote = pool.base.address, pool.quote.address
+
+        amount_out = chain.quote_exact_input(QUOTER, base, quote, 10**18, 500)[0]
+        amount_in = chain.quote_exact_output(QUOTER, base, quote, amount_out, 500)[0]
+
+        # Output is floored, so the input that buys it is at most 10**18
+        assert amount_in <= 10**18
+        assert chain.quote_exact_input(QUOTER, base, quote, amount_in, 500)[0] >= amount_out
+
+    def test_dexes_disagree_deterministically(self, universe):
+        chain, candidates = universe
+        base, quote = candidates[0].base.address, candidates[0].quote.address
+
+        outs = {q: chain.quote_exact_input(q, base, quote, 10**18, 500)[0] for q in BENCH_DEXES.values()}
+        assert len(set(outs.values())) > 1
+        assert outs == {q: FakeChain(chain.tokens).quote_exact_input(q, base, quote, 10**18, 500)[0]
+                        for q in BENCH_DEXES.values()}
+
+
+class TestFakeRPCServer:
+    """Test the node over HTTP with the real provider and adapters."""
+
+    async def test_quotes_direct_and_multicall(self, universe):
+        chain, candidates = universe
+        candidate = candidates[0]
+
+        async with FakeRPCServer(chain) as server:
+            provider = RPCProvider(CHAIN_ID, [server.url])
+            adapter = UniswapV3Adapter(provider, QUOTER, "uniswap_v3")
+            try:
+                quote = await adapter.get_quote(candidate.pool, candidate.base, candidate.quote, 10**18, chain.block_number)
+                call = adapter.build_quote_call(candidate.pool, candidate.base, candidate.quote, 10**18)
+                aggregated = await Multicall3(provider).aggregate3([call, call], block_number=chain.block_number)
+            finally:
+                await provider.close()
+
+        expected = chain.quote_exact_input(QUOTER, candidate.base.address, candidate.quote.address, 10**18, candidate.pool.fee)
+        assert quote.amount_out == expected[0]
+        assert [r.success for r in aggregated.results] == [True, True]
+        assert server.method_counts["eth_call.aggregated"] == 2
+
+    async def test_error_injection(self, universe):
+        chain, _ = universe
+
+        async with FakeRPCServer(chain, http_error_rate=1.0) as server:
+            provider = RPCProvider(CHAIN_ID, [server.url])
+            try:
+                with pytest.raises(InfraError):
+                    await provider.get_block_number()
+            finally:
+                await provider.close()
+
+
+class TestBenchScan:
+    """Test a small benchmark end to end."""
+
+    async def test_small_universe(self, tmp_path):
+        row = await bench_universe(12, cycles=2, workdir=tmp_path)
+
+        assert row["pools"] == 12
+        assert row["quotes_attempted"] > 0
+        assert row["quotes_fetched"] == row["quotes_attempted"]
+        assert row["quotes_per_sec"] > 0
+        assert row["stages_ms"]["cycle"]["count"] == 2
+        assert {"rpc.eth_blockNumber", "rpc.eth_gasPrice", "snapshot"} <= set(row["stages_ms"])
+        assert {"scan.block_pin", "scan.quoting", "scan.gates", "scan.spreads"} <= set(row["stages_ms"])
+        assert row["stages_ms"]["scan.quoting"]["count"] == 2
+        assert row["peak_rss_mb"] > 0
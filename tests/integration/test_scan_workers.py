@@ -0,0 +1,70 @@
+"""
+tests/integration/test_scan_workers.py - Tests for strategy/jobs/scan_workers.py
+
+Scans two chains, each on its own fake JSON-RPC node (scripts/fake_rpc.py),
+in two spawned worker processes.
+"""
+
+import asyncio
+from pathlib import Path
+
+from discovery.registry import PoolRegistry
+from scripts.bench_scan import CHAIN_ID, build_universe
+from scripts.fake_rpc import FakeChain, FakeRPCServer
+from strategy.jobs.run_scan import ScanSession
+from strategy.jobs.scan_workers import ScanSupervisor, WorkerOptions, plan_chain_shards
+
+CHAIN_KEYS = ["bench_a", "bench_b"]
+
+
+class TestScanSupervisor:
+    """Test sharded scanning end to end."""
+
+    async def test_two_chains_two_workers(self, tmp_path):
+        """Both workers' cycles, paper stats and trades reach the supervisor."""
+        tokens, dex_configs, candidates = build_universe(12)
+        servers = [FakeRPCServer(FakeChain(tokens, chain_id=CHAIN_ID)) for _ in CHAIN_KEYS]
+        for server in servers:
+            await server.start()
+        try:
+            chains = [
+                (key, {"chain_id": CHAIN_ID, "rpc_urls": [server.url], "rate_limit": {"enabled": False}})
+                for key, server in zip(CHAIN_KEYS, servers)
+            ]
+            registry = PoolRegistry(dict(chains), {key: dex_configs for key in CHAIN_KEYS}, {})
+            for key in CHAIN_KEYS:
+                registry.set_candidates_for_chain(key, candidates)
+
+            snapshots_dir = tmp_path / "snapshots"
+            snapshots_dir.mkdir()
+            options = WorkerOptions(
+                output_dir=snapshots_dir,
+                intent_file=tmp_path / "intents.jsonl",
+                trades_dir=tmp_path / "trades",
+                session_id="test",
+                trigger="interval",
+                interval_ms=10,
+                max_cycles=2,
+                log_level="WARNING",
+                json_logs=False,
+            )
+            supervisor = ScanSupervisor(ScanSession(snapshots_dir, options.intent_file), options)
+
+            summaries = await asyncio.to_thread(
+                supervisor.run, plan_chain_shards(chains, 2), {k: dex_configs for k in CHAIN_KEYS}, {}, registry,
+            )
+        finally:
+            for server in servers:
+                await server.stop()
+
+        assert sorted(s["chain"] for s in summaries) == ["bench_a", "bench_a", "bench_b", "bench_b"]
+        assert all(s["quotes_fetched"] > 0 for s in summaries)
+        assert [r.cycles for _, r in sorted(supervisor.results.items())] == [2, 2]
+        assert not any(r.error for r in supervisor.results.values())
+
+        stats = supervisor.paper_stats
+        assert stats["total_signals"] == sum(
+            supervisor.results[i].paper_stats["total_signals"] for i in supervisor.results
+        )
+        assert supervisor.trades_file == tmp_path / "trades" / "paper_trades_test.jsonl"
+        assert sorted(p.name for p in Path(tmp_path / "trades").glob("*_w*.jsonl")) == []
@@ -2,6 +2,9 @@
 tests/unit/test_algebra_adapter.py - Algebra adapter unit tests.
 """
 
+import json
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
@@ -14,7 +17,8 @@ from dex.adapters.algebra import (
 from dex.adapters.uniswap_v3 import UniswapV3Adapter
 from core.models import Token, Pool
 from core.constants import DexType
-from core.exceptions import QuoteError, ErrorCode
+from core.exceptions import InfraError, QuoteError, ErrorCode
+from tests.unit.test_providers import make_provider
 
 
 class TestAlgebraEncoding:
@@ -248,3 +252,41 @@ class TestAdapterSelector:
         
         assert fee_tiers == [0]
         assert len(fee_tiers) == 1
+
+
+class TestProviderErrors:
+    """Test that provider errors are not reported as pool reverts."""
+
+    @staticmethod
+    def quote_args() -> tuple[Pool, Token, Token]:
+        weth = Token(chain_id=1, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="WETH", decimals=18)
+        usdc = Token(chain_id=1, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USDC", decimals=6)
+        pool = Pool(chain_id=1, dex_id="dex", dex_type=DexType.UNISWAP_V3, pool_address="",
+                    token0=weth, token1=usdc, fee=500)
+        return pool, weth, usdc
+
+    @pytest.mark.parametrize("adapter_class", [AlgebraAdapter, UniswapV3Adapter])
+    @pytest.mark.asyncio
+    async def test_rate_limit_surfaces(self, adapter_class):
+        """get_quote on a 429 from every endpoint raises INFRA_RATE_LIMIT."""
+        provider = make_provider(lambda request: httpx.Response(429, text="slow down"))
+        adapter = adapter_class(provider, "0x0Fc73040b26E9bC8514fA028D998E73A254Fa76E")
+        with pytest.raises(InfraError) as exc_info:
+            await adapter.get_quote(*self.quote_args(), 10**18, block_number=100)
+
+        assert exc_info.value.code == ErrorCode.INFRA_RATE_LIMIT
+
+    @pytest.mark.parametrize("adapter_class", [AlgebraAdapter, UniswapV3Adapter])
+    @pytest.mark.asyncio
+    async def test_revert_is_quote_revert(self, adapter_class):
+        """An eth_call revert is still the pool's QUOTE_REVERT."""
+        def handler(request):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"],
+                                             "error": {"code": 3, "message": "execution reverted"}})
+
+        adapter = adapter_class(make_provider(handler), "0x0Fc73040b26E9bC8514fA028D998E73A254Fa76E")
+        with pytest.raises(QuoteError) as exc_info:
+            await adapter.get_quote(*self.quote_args(), 10**18, block_number=100)
+
+        assert exc_info.value.code == ErrorCode.QUOTE_REVERT
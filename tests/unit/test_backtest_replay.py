@@ -0,0 +1,100 @@
+"""
+tests/unit/test_backtest_replay.py - Tests for strategy/backtest_replay.py
+
+Tests for shard planning and the recorded backend.
+"""
+
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+from core.snapshot import SnapshotWriter
+from strategy.backtest_replay import (
+    NOT_RECORDED,
+    RecordedBackend,
+    ReplayShard,
+    iter_cycles,
+    plan_shards,
+)
+from strategy.jobs.run_scan import CycleInputs
+
+
+def write_cycles(path: Path, count: int) -> Path:
+    with SnapshotWriter(path) as writer:
+        writer.write_meta({"mode": "REGISTRY"})
+        for block in range(count):
+            writer.write_cycle({"block_number": block})
+    return path
+
+
+class TestShards:
+    """Test plan_shards/iter_cycles."""
+
+    def test_one_shard_per_file(self, tmp_path):
+        paths = [write_cycles(tmp_path / f"scan_{i}.arbysnap", 3) for i in range(2)]
+
+        shards = plan_shards(paths)
+
+        assert shards == [ReplayShard(paths[0]), ReplayShard(paths[1])]
+        assert shards[0].name == "scan_0_0-end"
+
+    def test_chunked(self, tmp_path):
+        """--chunk-cycles splits a file into consecutive ranges."""
+        path = write_cycles(tmp_path / "scan.arbysnap", 5)
+
+        shards = plan_shards([path], chunk_cycles=2)
+
+        assert [(s.start, s.stop) for s in shards] == [(0, 2), (2, 4), (4, 5)]
+        assert [c["block_number"] for c in iter_cycles(shards[1])] == [2, 3]
+
+    def test_json_snapshots(self, tmp_path):
+        """Legacy JSON snapshots are read too."""
+        path = tmp_path / "scan.json"
+        path.write_text('{"cycle_summaries": [{"block_number": 7}, {"block_number": 8}]}')
+
+        shards = plan_shards([path], chunk_cycles=1)
+
+        assert [c["block_number"] for c in iter_cycles(shards[1])] == [8]
+
+
+class TestRecordedBackend:
+    """Test round trips answered from the recording."""
+
+    def make_backend(self) -> RecordedBackend:
+        return RecordedBackend(CycleInputs(
+            plan=[], outcomes={}, gas_price_wei=1, gated_at_ms=0, execution_allowed={},
+            rpc_success=0.9,
+            round_trip_dexes=["uniswap_v3"],
+            round_trips={("k1", "uniswap_v3", "sushiswap_v3"): ({"net_pnl_bps": 4}, {"amount_in": "5"})},
+        ))
+
+    async def test_recorded_and_missing(self):
+        """Recorded round trips are reused; unrecorded candidates are errors."""
+        rows = [
+            SimpleNamespace(key="k1", buy_dex="uniswap_v3", sell_dex="sushiswap_v3", profitable=True),
+            SimpleNamespace(key="k2", buy_dex="uniswap_v3", sell_dex="sushiswap_v3", profitable=True),
+            SimpleNamespace(key="k3", buy_dex="uniswap_v3", sell_dex="sushiswap_v3", profitable=False),
+            SimpleNamespace(key="k4", buy_dex="camelot_v3", sell_dex="uniswap_v3", profitable=True),
+        ]
+
+        results = await self.make_backend().round_trips(rows)
+
+        assert results == {
+            ("k1", "uniswap_v3", "sushiswap_v3"): ({"net_pnl_bps": 4}, {"amount_in": "5"}),
+            ("k2", "uniswap_v3", "sushiswap_v3"): ({"error": NOT_RECORDED}, None),
+        }
+
+    def test_rpc_success(self):
+        assert self.make_backend().rpc_success_rate() == 0.9
+
+    def test_gas_inputs_recorded(self):
+        """Native symbol and USD references survive the snapshot (gas valuation)."""
+        inputs = CycleInputs(
+            plan=[], outcomes={}, gas_price_wei=1, gated_at_ms=0, execution_allowed={},
+            native_symbol="MNT", reference_prices_usd={"WMNT": Decimal("0.71")},
+        )
+
+        restored = CycleInputs.from_snapshot(inputs.to_snapshot())
+
+        assert restored.native_symbol == "MNT"
+        assert restored.reference_prices_usd == {"WMNT": Decimal("0.71")}
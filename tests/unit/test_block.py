@@ -0,0 +1,165 @@
+"""
+tests/unit/test_block.py - Tests for chains/block.py
+
+Tests for BlockPinner push updates and the newHeads BlockStream.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import websockets
+
+from core.time import now_ms
+from chains.block import BlockPinner, BlockState, BlockStream, parse_new_head
+
+
+def make_state(block_number: int, block_hash: str | None = None, parent_hash: str | None = None) -> BlockState:
+    return BlockState(
+        chain_id=42161, block_number=block_number, timestamp_ms=now_ms(),
+        latency_ms=0, block_hash=block_hash, parent_hash=parent_hash,
+    )
+
+
+@pytest.fixture
+def provider():
+    provider = MagicMock()
+    provider.chain_id = 42161
+    provider.get_block_number = AsyncMock(return_value=(100, 5))
+    return provider
+
+
+class TestBlockPinnerUpdate:
+    """Test BlockPinner.update for pushed blocks."""
+
+    def test_newer_block_pins(self, provider):
+        pinner = BlockPinner(provider)
+        assert pinner.update(make_state(10))
+        assert pinner.update(make_state(11))
+        assert pinner.current_block == 11
+
+    def test_older_block_ignored(self, provider):
+        pinner = BlockPinner(provider)
+        pinner.update(make_state(11))
+        assert not pinner.update(make_state(10))
+        assert pinner.current_block == 11
+
+    def test_same_height_new_hash_replaces(self, provider):
+        """A reorg at the same height replaces the pin."""
+        pinner = BlockPinner(provider)
+        pinner.update(make_state(11, "0xaa"))
+        assert not pinner.update(make_state(11, "0xaa"))
+        assert pinner.update(make_state(11, "0xbb"))
+        assert pinner.get_state().block_hash == "0xbb"
+
+    def test_reorg_clears_rpc_cache(self, provider):
+        """Cached results are keyed by block number, so a reorg drops them."""
+        pinner = BlockPinner(provider)
+        pinner.update(make_state(11, "0xaa"))
+        pinner.update(make_state(12, "0xb1", parent_hash="0xaa"))
+        pinner.update(make_state(13))  # Polled: no hash to compare
+        provider.clear_cache.assert_not_called()
+
+        pinner.update(make_state(13, "0xc1"))
+        pinner.update(make_state(13, "0xc2"))
+        assert provider.clear_cache.call_count == 1
+
+        pinner.update(make_state(14, "0xd1", parent_hash="0xc1"))  # Parent orphaned
+        assert provider.clear_cache.call_count == 2
+
+
+class TestParseNewHead:
+    def test_parses_hex_header(self):
+        state = parse_new_head(8453, {"number": "0x1b4", "hash": "0xabc", "timestamp": "0x1"})
+        assert state.chain_id == 8453
+        assert state.block_number == 436
+        assert state.block_hash == "0xabc"
+
+
+class TestBlockStream:
+    """Test BlockStream sources and iteration."""
+
+    async def test_http_fallback_without_ws(self, provider):
+        """With no WS endpoints the stream polls eth_blockNumber."""
+        blocks = iter(range(100, 200))
+        provider.get_block_number.side_effect = lambda: (next(blocks), 3)
+        stream = BlockStream(provider, ws_urls=[], poll_interval_ms=1)
+
+        await stream.start()
+        seen = []
+        async for state in stream.blocks():
+            seen.append(state.block_number)
+            if len(seen) == 3:
+                break
+        await stream.stop()
+
+        assert seen == sorted(seen)
+        assert len(set(seen)) == 3
+        assert stream.source == "http"
+        assert stream.pinner.current_block >= seen[-1]
+
+    async def test_ws_new_heads_update_pinner(self, provider):
+        """newHeads notifications from a WS server drive the pinner."""
+        async def handler(ws):
+            request = json.loads(await ws.recv())
+            assert request["method"] == "eth_subscribe"
+            await ws.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0xsub"}))
+            for n in (500, 501, 502):
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0", "method": "eth_subscription",
+                    "params": {"subscription": "0xsub", "result": {"number": hex(n), "hash": f"0x{n}"}},
+                }))
+            await ws.wait_closed()
+
+        async with websockets.serve(handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            stream = BlockStream(provider, ws_urls=[f"ws://127.0.0.1:{port}"])
+            await stream.start()
+
+            async for state in stream.blocks():
+                if state.block_number == 502:
+                    break
+            await stream.stop()
+
+        assert stream.source == "ws"
+        assert stream.ws_connects == 1
+        assert stream.pinner.current_block == 502
+        provider.get_block_number.assert_not_called()
+
+    async def test_ws_failure_falls_back_to_http(self, provider):
+        """An unreachable WS endpoint falls back to HTTP polling."""
+        stream = BlockStream(
+            provider, ws_urls=["ws://127.0.0.1:9"], poll_interval_ms=1,
+            stall_timeout_ms=500, reconnect_base_ms=50,
+        )
+        await stream.start()
+        state = await asyncio.wait_for(stream.blocks().__anext__(), 5)
+        await stream.stop()
+
+        assert state.block_number == 100
+        assert stream.ws_failures >= 1
+        assert stream.last_error is not None
+
+    async def test_slow_consumer_sees_latest_only(self, provider):
+        """Blocks published while the consumer is busy are coalesced."""
+        stream = BlockStream(provider)
+        for n in (1, 2, 3):
+            await stream._publish(make_state(n))
+
+        state = await stream.blocks().__anext__()
+
+        assert state.block_number == 3
+        assert stream.blocks_received == 3
+
+    async def test_stop_ends_iteration(self, provider):
+        stream = BlockStream(provider)
+
+        async def consume():
+            return [s async for s in stream.blocks()]
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0)
+        await stream.stop()
+
+        assert await asyncio.wait_for(task, 1) == []
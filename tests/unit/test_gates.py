@@ -9,6 +9,7 @@ from unittest.mock import MagicMock
 from core.exceptions import ErrorCode
 from core.models import Token, Pool, Quote
 from core.constants import DexType, PoolStatus
+from strategy.config import GateThresholds
 from strategy.gates import (
     gate_zero_output,
     gate_gas_estimate,
@@ -283,6 +284,18 @@ class TestApplySingleQuoteGates:
         quote = make_quote(pool, weth, usdc, 10**18, 0, gas=999999, ticks=99)
         failures = apply_single_quote_gates(quote, is_anchor_dex=True)
         assert len(failures) >= 2  # Zero output, high gas, high ticks
+    
+    def test_thresholds_replace_adaptive_limits(self, pool, weth, usdc):
+        """Explicit thresholds override the adaptive gas/ticks limits."""
+        quote = make_quote(pool, weth, usdc, 10**18, 2500_000000, gas=450000, ticks=12)
+        assert len(apply_single_quote_gates(quote, is_anchor_dex=True)) == 1  # Ticks only
+        
+        loose = GateThresholds(max_gas_estimate=600000, max_ticks_crossed=20)
+        assert apply_single_quote_gates(quote, is_anchor_dex=True, thresholds=loose) == []
+        
+        tight = GateThresholds(max_gas_estimate=400000, max_ticks_crossed=20)
+        failures = apply_single_quote_gates(quote, is_anchor_dex=True, thresholds=tight)
+        assert [f.reject_code for f in failures] == [ErrorCode.QUOTE_GAS_TOO_HIGH]
 
 
 class TestApplyCurveGates:
@@ -294,6 +307,17 @@ class TestApplyCurveGates:
         ]
         failures = apply_curve_gates(quotes)
         assert len(failures) == 0
+    
+    def test_slippage_threshold(self, pool, weth, usdc):
+        """thresholds.max_slippage_bps replaces MAX_SLIPPAGE_BPS."""
+        quotes = [
+            make_quote(pool, weth, usdc, 10**17, 250_000000),
+            make_quote(pool, weth, usdc, 10**18, 2400_000000),  # 400 bps worse
+        ]
+        assert apply_curve_gates(quotes) == []
+        
+        failures = apply_curve_gates(quotes, GateThresholds(max_slippage_bps=300))
+        assert [f.reject_code for f in failures] == [ErrorCode.SLIPPAGE_TOO_HIGH]
 
 
 class TestGatePriceSanity:
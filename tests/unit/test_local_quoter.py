@@ -0,0 +1,140 @@
+"""
+tests/unit/test_local_quoter.py - Tests for dex/local_quoter.py
+
+Tests for in-process V3 quoting against a synthetic two-position pool.
+"""
+
+import pytest
+
+from core.constants import DexType
+from core.exceptions import ErrorCode, QuoteError
+from core.models import Token, Pool, Quote
+from dex import v3_math
+from dex.local_quoter import LocalV3Quoter, PoolState, TickInfo, simulate_swap
+
+
+TICK_SPACING = 60
+
+
+def build_state(load_words: range | None = range(-2, 2)) -> PoolState:
+    """
+    Price 1.0 (tick 0), fee 0.3%, two positions:
+    [-600, 600] with L=1e18 and [-1200, 1200] with L=5e17.
+    """
+    ticks = {
+        -1200: TickInfo(5 * 10**17, 5 * 10**17),
+        -600: TickInfo(10**18, 10**18),
+        600: TickInfo(10**18, -(10**18)),
+        1200: TickInfo(5 * 10**17, -5 * 10**17),
+    }
+    bitmap = {word: 0 for word in (load_words or [])}
+    for tick in ticks:
+        word, bit = v3_math.tick_position(v3_math.compress_tick(tick, TICK_SPACING))
+        if word in bitmap:
+            bitmap[word] |= 1 << bit
+    return PoolState(
+        pool_address="0xpool",
+        sqrt_price_x96=v3_math.Q96,
+        tick=0,
+        liquidity=15 * 10**17,
+        fee=3000,
+        tick_spacing=TICK_SPACING,
+        tick_bitmap=bitmap,
+        ticks=ticks,
+        block_number=100,
+    )
+
+
+@pytest.fixture
+def pool_tokens():
+    token0 = Token(chain_id=1, address="0x0000000000000000000000000000000000000001", symbol="T0", name="Token0", decimals=18)
+    token1 = Token(chain_id=1, address="0x0000000000000000000000000000000000000002", symbol="T1", name="Token1", decimals=18)
+    pool = Pool(chain_id=1, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+                pool_address="0xpool", token0=token0, token1=token1, fee=3000)
+    return pool, token0, token1
+
+
+class TestSimulateSwap:
+    """Test the swap loop."""
+
+    def test_small_swap_stays_in_range(self):
+        """A swap inside one range equals a single computeSwapStep."""
+        state = build_state()
+        result = simulate_swap(state, zero_for_one=True, amount_specified=10**15)
+
+        target = v3_math.get_sqrt_ratio_at_tick(-600)
+        expected = v3_math.compute_swap_step(state.sqrt_price_x96, target, state.liquidity, 10**15, 3000)
+        assert result.amount_out == expected[2]
+        assert result.sqrt_price_x96_after == expected[0]
+        assert result.ticks_crossed == 0
+        assert result.fully_filled
+
+    def test_crossing_tick_updates_liquidity(self):
+        """Crossing tick 600 upward removes the inner position's liquidity."""
+        state = build_state()
+        result = simulate_swap(state, zero_for_one=False, amount_specified=5 * 10**16)
+
+        assert result.tick_after >= 600
+        assert result.liquidity_after == 5 * 10**17
+        assert result.ticks_crossed == 1
+
+    def test_state_not_mutated(self):
+        state = build_state()
+        simulate_swap(state, zero_for_one=False, amount_specified=5 * 10**16)
+        assert state.sqrt_price_x96 == v3_math.Q96
+        assert state.liquidity == 15 * 10**17
+
+    def test_exact_output_inverts_exact_input(self):
+        """Buying back the quoted output never costs more than the input."""
+        state = build_state()
+        forward = simulate_swap(state, zero_for_one=True, amount_specified=10**16)
+        backward = simulate_swap(state, zero_for_one=True, amount_specified=-forward.amount_out)
+
+        assert backward.amount_out == forward.amount_out
+        assert backward.amount_in <= 10**16
+
+    def test_uncached_word_raises(self):
+        state = build_state(load_words=range(0, 1))
+        with pytest.raises(QuoteError) as exc_info:
+            simulate_swap(state, zero_for_one=True, amount_specified=10**15)
+        assert exc_info.value.code == ErrorCode.POOL_STATE_INCOMPLETE
+
+
+class TestLocalV3Quoter:
+    """Test Quote output."""
+
+    def test_quote_matches_adapter_model(self, pool_tokens):
+        pool, token0, token1 = pool_tokens
+        quote = LocalV3Quoter().get_quote(pool, build_state(), token0, token1, 10**15)
+
+        assert isinstance(quote, Quote)
+        assert quote.direction == "0to1"
+        assert quote.block_number == 100
+        assert quote.amount_in == 10**15
+        assert 0 < quote.amount_out < 10**15
+        assert quote.ticks_crossed == 0
+        assert quote.gas_estimate > 0
+        assert quote.sqrt_price_x96_after < v3_math.Q96
+
+    def test_reverse_direction(self, pool_tokens):
+        pool, token0, token1 = pool_tokens
+        quote = LocalV3Quoter().get_quote(pool, build_state(), token1, token0, 10**15, block_number=101)
+        assert quote.direction == "1to0"
+        assert quote.block_number == 101
+        assert quote.sqrt_price_x96_after > v3_math.Q96
+
+    def test_exhausted_liquidity_raises(self, pool_tokens):
+        pool, token0, token1 = pool_tokens
+        state = build_state(load_words=range(-60, 60))
+        with pytest.raises(QuoteError) as exc_info:
+            LocalV3Quoter().get_quote(pool, state, token0, token1, 10**24)
+        assert exc_info.value.code == ErrorCode.POOL_NO_LIQUIDITY
+
+    def test_multi_size_curve_is_monotonic(self, pool_tokens):
+        pool, token0, token1 = pool_tokens
+        sizes = [10**14 * (i + 1) for i in range(30)]
+        quotes = LocalV3Quoter().get_quotes_multi_size(pool, build_state(), token0, token1, sizes)
+
+        assert len(quotes) == 30
+        prices = [q.amount_out * 10**18 // q.amount_in for q in quotes]
+        assert prices == sorted(prices, reverse=True)
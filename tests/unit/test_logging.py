@@ -0,0 +1,162 @@
+"""
+tests/unit/test_logging.py - Tests for core/logging.py
+
+Tests for the JSON formatter, the queued writer and per-logger sampling.
+"""
+
+import sys
+import json
+import logging
+import queue
+
+import pytest
+
+import core.logging as core_logging
+from core.logging import (
+    JSONFormatter,
+    LogQueueHandler,
+    LogSampling,
+    SamplingFilter,
+    get_logger,
+    hot_path_sampling,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+def make_record(name: str = "dex.adapters.uniswap_v3", level: int = logging.DEBUG, msg: str = "Quote") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+@pytest.fixture
+def restore_root_logger():
+    """Put the root logger back the way pytest left it."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield
+    shutdown_logging()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+class TestJSONFormatter:
+    """Test JSONFormatter."""
+
+    def test_big_ints_and_context(self):
+        """Wei amounts beyond 64 bits serialize (orjson falls back to json)."""
+        record = make_record()
+        record.context = {"amount_in": 10**30, "fee": 500}
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry["context"] == {"amount_in": 10**30, "fee": 500}
+        assert entry["logger"] == "dex.adapters.uniswap_v3"
+
+    def test_stdlib_fallback(self, monkeypatch):
+        """Without orjson the stdlib encoder is used."""
+        monkeypatch.setattr(core_logging, "orjson", None)
+        record = make_record()
+        record.context = {"price": object()}
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry["context"]["price"].startswith("<object")
+
+    def test_preformatted_exception(self):
+        """exc_text from the queue handler lands in context.exception."""
+        record = make_record(level=logging.ERROR)
+        record.exc_text = "Traceback: boom"
+
+        entry = json.loads(JSONFormatter().format(record))
+
+        assert entry["context"]["exception"] == "Traceback: boom"
+
+
+class TestSamplingFilter:
+    """Test SamplingFilter."""
+
+    def test_one_in_n(self):
+        """DEBUG/INFO records are sampled 1 in N."""
+        sampler = SamplingFilter({"dex.adapters": LogSampling(every=10)})
+
+        kept = sum(sampler.filter(make_record()) for _ in range(100))
+
+        assert kept == 10
+        assert sampler.dropped["dex.adapters.uniswap_v3"] == 90
+
+    def test_errors_always_pass(self):
+        """ERROR records are never sampled or rate limited."""
+        sampler = SamplingFilter({"dex.adapters": LogSampling(every=1000, max_per_second=0)})
+
+        assert all(sampler.filter(make_record(level=logging.ERROR)) for _ in range(50))
+
+    def test_rate_limit_applies_to_warnings(self):
+        """max_per_second caps records below ERROR, warnings included."""
+        sampler = SamplingFilter({"chains.providers": LogSampling(max_per_second=5)})
+
+        kept = sum(
+            sampler.filter(make_record(name="chains.providers", level=logging.WARNING))
+            for _ in range(20)
+        )
+
+        assert kept == 5
+
+    def test_longest_prefix_wins(self):
+        """Rules match logger-name prefixes; other loggers pass untouched."""
+        sampler = SamplingFilter({
+            "dex": LogSampling(every=2),
+            "dex.adapters": LogSampling(every=1000),
+        })
+
+        assert sum(sampler.filter(make_record()) for _ in range(10)) == 1
+        assert sum(sampler.filter(make_record(name="dex.gating")) for _ in range(10)) == 5
+        assert sum(sampler.filter(make_record(name="dexter")) for _ in range(10)) == 10
+
+    def test_hot_path_rules(self):
+        """hot_path_sampling covers the per-quote loggers."""
+        rules = hot_path_sampling(every=7)
+
+        assert set(rules) == set(core_logging.HOT_PATH_LOGGERS)
+        assert all(rule.every == 7 for rule in rules.values())
+
+
+class TestQueuedLogging:
+    """Test LogQueueHandler and the writer thread."""
+
+    def test_full_queue_drops(self):
+        """A full queue drops records instead of blocking."""
+        handler = LogQueueHandler(queue.Queue(maxsize=1))
+
+        handler.handle(make_record())
+        handler.handle(make_record())
+
+        assert handler.dropped == 1
+
+    def test_prepare_resolves_message_and_traceback(self):
+        """Args and exc_info are resolved on the caller thread."""
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = logging.LogRecord("x", logging.ERROR, __file__, 1, "n=%d", (3,), sys.exc_info())
+
+        prepared = LogQueueHandler(queue.Queue()).prepare(record)
+
+        assert prepared.msg == "n=3"
+        assert prepared.args is None
+        assert prepared.exc_info is None
+        assert "ValueError: boom" in prepared.exc_text
+
+    def test_writer_thread_writes_json(self, tmp_path, restore_root_logger):
+        """Records reach the log file once the writer drains the queue."""
+        log_file = tmp_path / "arby.log"
+        setup_logging(level="DEBUG", log_file=str(log_file), sampling=hot_path_sampling(every=3))
+
+        logger = get_logger("dex.adapters.test")
+        for i in range(6):
+            logger.debug(f"Quote {i}", extra={"context": {"amount_in": 10**24}})
+        logger.error("Quote failed")
+        shutdown_logging()
+
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert [e["message"] for e in entries] == ["Quote 0", "Quote 3", "Quote failed"]
+        assert entries[0]["context"]["amount_in"] == 10**24
@@ -31,6 +31,8 @@ from core.math import (
     calculate_net_pnl,
     calculate_price_impact_bps,
     normalize_price,
+    # Exact prices
+    Price,
     # Rounding
     round_down,
     round_up,
@@ -245,6 +247,52 @@ class TestNormalizePrice:
         assert result == Decimal("0.5")  # 0.5 DAI per USDC
 
 
+class TestPrice:
+    """Test the exact rational price type."""
+    
+    def test_matches_normalize_price(self):
+        """Same value as the Decimal normalization."""
+        price = Price.from_amounts(10**18, 2_500_123_456, 18, 6)
+        assert price.to_decimal() == normalize_price(10**18, 2_500_123_456, 18, 6)
+        assert str(price) == "2500.123456"
+    
+    def test_exact_comparison_and_equality(self):
+        """Comparisons cross-multiply; equal values hash equal."""
+        a = Price.from_amounts(10**18, 2_500_000_000, 18, 6)
+        b = Price.from_amounts(2 * 10**18, 5_000_000_000, 18, 6)
+        assert a == b == 2500 == Decimal("2500")
+        assert hash(a) == hash(b) == hash(2500)
+        assert Price(1, 3) < Price(333_334, 1_000_000)
+        assert Price(0) == 0 and not Price(0)
+    
+    def test_bps_diff_truncates_toward_zero(self):
+        """bps_diff matches int((a - b) / b * 10000)."""
+        a, b = Price(10_001), Price(10_000)
+        assert a.bps_diff(b) == 1
+        assert b.bps_diff(a) == int((Decimal(10_000) - 10_001) / 10_001 * 10000) == 0
+        assert Price(9_000).bps_diff(Price(10_000)) == -1000
+        assert Price(5).bps_diff(Price(0)) == 0
+    
+    def test_spread_bps(self):
+        """|a - b| / min * 10000, symmetric."""
+        a, b = Price(2500), Price(2510)
+        assert a.spread_bps(b) == b.spread_bps(a) == 40
+        assert a.spread_bps(Price(0)) == 0
+    
+    def test_from_decimal_is_exact(self):
+        """Decimal anchors convert without rounding."""
+        assert Price.from_decimal(Decimal("2500.123456")) == Price(2_500_123_456, 10**6)
+    
+    def test_float_rejected(self):
+        """No float money."""
+        with pytest.raises(ValidationError):
+            Price(1.5)
+        with pytest.raises(ValidationError):
+            Price.from_decimal(1.5)
+        with pytest.raises(ValidationError):
+            Price(1, 0)
+
+
 class TestRounding:
     """Test rounding functions."""
     
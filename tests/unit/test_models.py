@@ -28,6 +28,7 @@ from core.constants import (
     OpportunityStatus,
 )
 from core.exceptions import ErrorCode
+from core.math import Price
 from core.time import now_ms
 
 
@@ -241,6 +242,23 @@ class TestQuote:
             gas_estimate=100000,
         )
         assert quote.effective_price == Decimal("0")
+    
+    def test_quote_price_is_exact_and_cached(self, v3_pool, weth_token, usdc_token):
+        """quote.price is computed once and compares exactly."""
+        quote = Quote(
+            pool=v3_pool,
+            direction=TradeDirection.SELL,
+            token_in=weth_token,
+            token_out=usdc_token,
+            amount_in=3 * 10**18,
+            amount_out=7500_000_001,
+            block_number=100,
+            timestamp_ms=now_ms(),
+            gas_estimate=100000,
+        )
+        assert quote.price is quote.price
+        assert quote.price > 2500
+        assert quote.price == Price(7500_000_001, 3 * 10**6)
 
 
 # =============================================================================
@@ -0,0 +1,175 @@
+"""
+tests/unit/test_multicall.py - Tests for chains/multicall.py
+
+Tests for aggregate3 ABI encoding/decoding and per-leg failure mapping.
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from eth_abi import encode as abi_encode
+
+from core.constants import DexType
+from core.exceptions import ErrorCode, InfraError, QuoteError
+from core.models import Token, Pool
+from chains.multicall import (
+    Call3,
+    Call3Result,
+    Multicall3,
+    MULTICALL3_ADDRESS,
+    SELECTOR_AGGREGATE3,
+    decode_aggregate3_response,
+    encode_aggregate3,
+    get_multicall3_address,
+)
+from chains.providers import RPCBatchItem
+from dex.adapters.uniswap_v3 import UniswapV3Adapter
+
+QUOTER = "0x61fFE014bA17989E743c5F6cB21bF9697530B21e"
+TARGET = "0x1111111111111111111111111111111111111111"
+
+
+def encode_return(results: list[tuple[bool, bytes]]) -> str:
+    """ABI-encode an aggregate3 return value with eth_abi."""
+    return "0x" + abi_encode(["(bool,bytes)[]"], [results]).hex()
+
+
+def encode_quoter_output(amount_out: int, sqrt_price: int, ticks: int, gas: int) -> bytes:
+    return abi_encode(["uint256", "uint160", "uint32", "uint256"], [amount_out, sqrt_price, ticks, gas])
+
+
+@pytest.fixture
+def weth_usdc_pool():
+    weth = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="Wrapped Ether", decimals=18)
+    usdc = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USD Coin", decimals=6)
+    pool = Pool(
+        chain_id=42161, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+        pool_address="", token0=weth, token1=usdc, fee=500,
+    )
+    return pool, weth, usdc
+
+
+class TestAggregate3Encoding:
+    """Test aggregate3 calldata and return decoding."""
+
+    def test_encode_matches_eth_abi(self):
+        """Hand-rolled encoding matches eth_abi for mixed-length calldata."""
+        calls = [
+            Call3(target=TARGET, call_data="0x12345678"),
+            Call3(target=QUOTER, call_data="0x" + "ab" * 100, allow_failure=False),
+            Call3(target=TARGET, call_data="0x"),
+        ]
+
+        encoded = encode_aggregate3(calls)
+        expected = abi_encode(
+            ["(address,bool,bytes)[]"],
+            [[(c.target, c.allow_failure, bytes.fromhex(c.call_data[2:])) for c in calls]],
+        ).hex()
+
+        assert encoded.startswith(SELECTOR_AGGREGATE3)
+        assert encoded[len(SELECTOR_AGGREGATE3):] == expected
+
+    def test_decode_round_trip(self):
+        """Return data decodes to per-call success flags and payloads."""
+        raw = encode_return([(True, b"\x01\x02"), (False, b""), (True, b"\xff" * 40)])
+
+        results = decode_aggregate3_response(raw)
+
+        assert results == [
+            Call3Result(success=True, return_data="0x0102"),
+            Call3Result(success=False, return_data="0x"),
+            Call3Result(success=True, return_data="0x" + "ff" * 40),
+        ]
+
+    def test_decode_empty_raises(self):
+        with pytest.raises(ValueError):
+            decode_aggregate3_response("0x")
+
+    def test_decode_truncated_raises(self):
+        raw = encode_return([(True, b"\x01" * 64)])
+        with pytest.raises(ValueError):
+            decode_aggregate3_response(raw[:-64])
+
+    def test_address_override(self):
+        assert get_multicall3_address(42161) == MULTICALL3_ADDRESS
+        assert get_multicall3_address(324) != MULTICALL3_ADDRESS
+
+
+class TestMulticall3:
+    """Test Multicall3 aggregator against a mocked provider."""
+
+    @pytest.fixture
+    def provider(self):
+        provider = MagicMock()
+        provider.chain_id = 42161
+        provider.eth_call_batch = AsyncMock()
+        return provider
+
+    async def test_chunks_in_one_batch_at_pinned_block(self, provider):
+        """Chunks are sent together at the same block tag and re-joined in order."""
+        provider.eth_call_batch.return_value = [
+            RPCBatchItem(result=encode_return([(True, b"\x01"), (True, b"\x02")]), error=None, latency_ms=5, endpoint_used="a"),
+            RPCBatchItem(result=encode_return([(False, b"\x03")]), error=None, latency_ms=9, endpoint_used="a"),
+        ]
+        multicall = Multicall3(provider, chunk_size=2)
+
+        out = await multicall.aggregate3([Call3(TARGET, "0x01")] * 3, block_number=100)
+
+        sent, = provider.eth_call_batch.call_args.args
+        assert len(sent) == 2
+        assert all(to == MULTICALL3_ADDRESS for to, _ in sent)
+        assert provider.eth_call_batch.call_args.kwargs["block"] == hex(100)
+        assert [r.success for r in out.results] == [True, True, False]
+        assert out.latency_ms == 9
+        assert out.eth_calls == 2
+
+    @pytest.mark.parametrize("bad_item, code", [
+        (RPCBatchItem(result=None, error={"code": -32000, "message": "out of gas"}, latency_ms=5, endpoint_used="a"),
+         ErrorCode.INFRA_RPC_ERROR),
+        (RPCBatchItem(result="0xdead", error=None, latency_ms=5, endpoint_used="a"), ErrorCode.INFRA_BAD_ABI),
+        (RPCBatchItem(result=encode_return([(True, b"\x03")] * 2), error=None, latency_ms=5, endpoint_used="a"),
+         ErrorCode.INFRA_BAD_ABI),
+    ])
+    async def test_failed_chunk_fails_only_its_legs(self, provider, bad_item, code):
+        """A failed or undecodable chunk fails its own legs; other chunks keep their results."""
+        provider.eth_call_batch.return_value = [
+            RPCBatchItem(result=encode_return([(True, b"\x01"), (False, b"\x02")]), error=None, latency_ms=5, endpoint_used="a"),
+            bad_item,
+        ]
+
+        out = await Multicall3(provider, chunk_size=2).aggregate3([Call3(TARGET, "0x01")] * 3, block_number=1)
+
+        assert [r.success for r in out.results] == [True, False, False]
+        assert out.results[0].return_data == "0x01"
+        assert out.results[1].error is None  # A reverted leg, not a failed chunk
+        assert out.results[2].error.code == code
+
+
+class TestAdapterSubCalls:
+    """Test adapter build/decode hooks used with Multicall3."""
+
+    def test_successful_leg_decodes_to_quote(self, weth_usdc_pool):
+        pool, weth, usdc = weth_usdc_pool
+        adapter = UniswapV3Adapter(MagicMock(), QUOTER)
+
+        call = adapter.build_quote_call(pool, weth, usdc, 10**18)
+        result = Call3Result(True, "0x" + encode_quoter_output(3_500_000_000, 2**96, 2, 90_000).hex())
+        quote = adapter.decode_quote_call(pool, weth, usdc, 10**18, result, 123, 7)
+
+        assert call.target == QUOTER
+        assert call.call_data.startswith("0xc6a5026a")
+        assert quote.amount_out == 3_500_000_000
+        assert quote.ticks_crossed == 2
+        assert quote.block_number == 123
+        assert quote.latency_ms == 7
+        assert quote.direction == "0to1"
+
+    def test_reverted_leg_is_quote_revert(self, weth_usdc_pool):
+        pool, weth, usdc = weth_usdc_pool
+        adapter = UniswapV3Adapter(MagicMock(), QUOTER)
+
+        with pytest.raises(QuoteError) as exc_info:
+            adapter.decode_quote_call(pool, weth, usdc, 10**18, Call3Result(False, "0x08c379a0"), 123, 7)
+
+        assert exc_info.value.code == ErrorCode.QUOTE_REVERT
+        assert exc_info.value.details["revert_data"] == "0x08c379a0"
@@ -14,6 +14,8 @@ from strategy.paper_trading import (
     TradeOutcome,
     calculate_usdc_value,
     calculate_pnl_usdc,
+    merge_paper_stats,
+    merge_trade_files,
 )
 
 
@@ -428,3 +430,148 @@ class TestRevalidation:
         # Trade outcome should change
         trades = session.load_trades()
         assert trades[0].outcome == TradeOutcome.GATES_CHANGED.value
+
+
+class TestIndexedStore:
+    """Test the in-memory index, pending queue and append-only updates."""
+
+    @staticmethod
+    def make_trade(spread_id: str, block_number: int) -> PaperTrade:
+        return PaperTrade(
+            spread_id=spread_id, block_number=block_number, timestamp="2026-01-12T10:00:00Z",
+            chain_id=42161, buy_dex="uni", sell_dex="sushi", token_in="WETH",
+            token_out="USDC", fee=3000, amount_in_wei="1000000000000000000",
+            buy_price="2500", sell_price="2550", spread_bps=200, gas_cost_bps=10,
+            net_pnl_bps=190, expected_pnl_numeraire="1.500000",
+        )
+
+    def test_pending_is_block_ordered_and_respects_min_blocks(self, paper_session):
+        for spread_id, block in [("b", 104), ("a", 100), ("c", 102)]:
+            paper_session.record_trade(self.make_trade(spread_id, block))
+
+        pending = paper_session.get_pending_revalidation(current_block=104, min_blocks=2)
+        assert [(t.block_number, t.spread_id) for t in pending] == [(100, "a"), (102, "c")]
+
+    def test_pending_does_not_reread_file(self, paper_session):
+        paper_session.record_trade(self.make_trade("a", 100))
+        paper_session.trades_file.unlink()
+
+        assert len(paper_session.get_pending_revalidation(current_block=101)) == 1
+
+    def test_revalidation_appends_update_record(self, paper_session):
+        paper_session.record_trade(self.make_trade("a", 100))
+        paper_session.record_trade(self.make_trade("b", 100))
+
+        assert paper_session.mark_revalidated("a", 100, 105, would_still_execute=True)
+        assert not paper_session.mark_revalidated("missing", 100, 105, would_still_execute=True)
+
+        lines = [json.loads(line) for line in paper_session.trades_file.read_text().splitlines()]
+        assert len(lines) == 3
+        assert lines[2]["record_type"] == "revalidation"
+        assert "buy_price" not in lines[2]
+
+        trades = {t.spread_id: t for t in paper_session.load_trades()}
+        assert len(trades) == 2
+        assert trades["a"].revalidated and trades["a"].revalidation_block == 105
+        assert not trades["b"].revalidated
+        assert [t.spread_id for t in paper_session.get_pending_revalidation(106)] == ["b"]
+
+    def test_gates_changed_outcome_survives_reload(self, paper_session):
+        paper_session.record_trade(self.make_trade("a", 100))
+        paper_session.mark_revalidated(
+            "a", 100, 105, would_still_execute=False, gates_actually_changed=True
+        )
+
+        (trade,) = paper_session.load_trades()
+        assert trade.outcome == TradeOutcome.GATES_CHANGED.value
+        assert trade.outcome_reason["reason"] == "gates_actually_changed"
+
+    def test_resumed_session_rebuilds_index(self, temp_trades_dir, paper_session):
+        paper_session.record_trade(self.make_trade("a", 100))
+        paper_session.record_trade(self.make_trade("b", 101))
+        paper_session.mark_revalidated("a", 100, 105, would_still_execute=True)
+
+        resumed = PaperSession(temp_trades_dir, session_id="test_session", cooldown_blocks=5)
+
+        assert resumed.get_trade("a", 100) is None  # Settled: in the file only
+        assert [t.spread_id for t in resumed.get_pending_revalidation(110)] == ["b"]
+        assert resumed.is_on_cooldown("b", 103)
+
+    def test_settled_trades_leave_memory(self, paper_session):
+        paper_session.record_trade(self.make_trade("a", 100))
+        unprofitable = self.make_trade("u", 100)
+        unprofitable.net_pnl_bps = -5
+        paper_session.record_trade(unprofitable)
+
+        assert paper_session.get_trade("u", 100) is None
+        paper_session.mark_revalidated("a", 100, 105, would_still_execute=True)
+        assert paper_session.get_trade("a", 100) is None
+        assert not paper_session.has_pending("a")
+
+    def test_pending_by_spread(self, paper_session):
+        for spread_id, block in [("a", 100), ("b", 101), ("a", 106)]:
+            paper_session.record_trade(self.make_trade(spread_id, block))
+
+        assert [t.block_number for t in paper_session.get_pending_for_spread("a", 107)] == [100, 106]
+        assert [t.block_number for t in paper_session.get_pending_for_spread("a", 106)] == [100]
+        assert paper_session.get_pending_for_spread("c", 107) == []
+
+    def test_expired_pending_are_dropped_and_recorded(self, temp_trades_dir):
+        session = PaperSession(temp_trades_dir, session_id="expiry", cooldown_blocks=1, pending_window_blocks=10)
+        session.record_trade(self.make_trade("gone", 100))
+        session.record_trade(self.make_trade("recent", 105))
+
+        assert session.expire_pending(110) == 0
+        assert session.expire_pending(111) == 1
+        assert [t.spread_id for t in session.get_pending_revalidation(111)] == ["recent"]
+        assert not session.has_pending("gone")
+
+        record = json.loads(session.trades_file.read_text().splitlines()[-1])
+        assert record["record_type"] == "expired"
+        assert "buy_price" not in record
+
+        trades = {t.spread_id: t for t in session.load_trades()}
+        assert trades["gone"].outcome == TradeOutcome.WOULD_EXECUTE.value
+        assert trades["gone"].outcome_reason["reason"] == "revalidation_expired"
+
+        resumed = PaperSession(temp_trades_dir, session_id="expiry", pending_window_blocks=10)
+        assert [t.spread_id for t in resumed.get_pending_revalidation(111)] == ["recent"]
+
+
+class TestMergeSessions:
+    """Test merging side-by-side paper sessions."""
+
+    def test_stats_sum_counts_and_pnl(self):
+        stats = [
+            {"total_signals": 3, "would_execute": 2, "total_pnl_numeraire": "1.500000", "numeraire": "USDC"},
+            {"total_signals": 1, "would_execute": 1, "total_pnl_numeraire": "0.250001", "numeraire": "USDC"},
+        ]
+
+        merged = merge_paper_stats(stats)
+
+        assert merged == {
+            "total_signals": 4,
+            "would_execute": 3,
+            "total_pnl_numeraire": "1.750001",
+            "numeraire": "USDC",
+        }
+
+    def test_stats_empty(self):
+        assert merge_paper_stats([]) == {}
+
+    def test_trade_files_concatenate_in_order(self, temp_trades_dir):
+        """Worker trade files fold into one session file that loads back whole."""
+        parts = []
+        for worker, spread_id in enumerate(["a", "b"]):
+            session = PaperSession(temp_trades_dir, session_id=f"run_w{worker}", cooldown_blocks=5)
+            session.record_trade(TestIndexedStore.make_trade(spread_id, 100))
+            session.mark_revalidated(spread_id, 100, 105, would_still_execute=True)
+            parts.append(session.trades_file)
+
+        target = merge_trade_files(parts, temp_trades_dir / "paper_trades_run.jsonl")
+
+        trades = PaperSession(temp_trades_dir, session_id="run").load_trades()
+        assert [t.spread_id for t in trades] == ["a", "b"]
+        assert all(t.revalidated for t in trades)
+        assert not any(p.exists() for p in parts)
+        assert target.exists()
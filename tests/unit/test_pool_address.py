@@ -0,0 +1,56 @@
+"""
+tests/unit/test_pool_address.py - Tests for dex/pool_address.py
+
+Vectors are live mainnet pools.
+"""
+
+from dex.pool_address import (
+    compute_v3_pool_address,
+    compute_algebra_pool_address,
+    compute_pool_address,
+)
+
+
+UNI_INIT_HASH = "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54"
+UNI_FACTORY = "0x1F98431c8aD98523631AE4a59f267346ea31F984"
+ARB_WETH = "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"
+ARB_USDC = "0xaf88d065e77c8cC2239327C5EDb3A432268e5831"
+
+
+class TestPoolAddress:
+    """Test CREATE2 derivation."""
+
+    def test_uniswap_v3_arbitrum_weth_usdc(self):
+        assert compute_v3_pool_address(UNI_FACTORY, ARB_WETH, ARB_USDC, 500, UNI_INIT_HASH) == (
+            "0xC6962004f452bE9203591991D15f6b388e09E8D0"
+        )
+
+    def test_token_order_irrelevant(self):
+        assert compute_v3_pool_address(UNI_FACTORY, ARB_USDC, ARB_WETH, 500, UNI_INIT_HASH) == (
+            compute_v3_pool_address(UNI_FACTORY, ARB_WETH, ARB_USDC, 500, UNI_INIT_HASH)
+        )
+
+    def test_pancakeswap_v3_uses_pool_deployer(self):
+        # BSC WBNB/USDT 0.05%
+        assert compute_v3_pool_address(
+            "0x41ff9AA7e16B8B1a8a8dc4f0eFacd93D02d071c9",
+            "0xbb4CdB9CBd36B01bD1cBaEBF2De08d9173bc095c",
+            "0x55d398326f99059fF775485246999027B3197955",
+            500,
+            "0x6ce8eb472fa82df5469c6ab6d485f17c3ad13c8cd7af59b3d4a8026c5ce0f7e2",
+        ) == "0x36696169C63e42cd08ce11f5deeBbCeBae652050"
+
+    def test_camelot_algebra(self):
+        assert compute_algebra_pool_address(
+            "0x6Dd3FB9653B10e806650F107C3B5A0a6fF974F65",
+            ARB_WETH,
+            ARB_USDC,
+            "0x6c1bebd370ba84753516bc1393c0d0a6c645856da55f5393ac8ab3d6dbc861d3",
+        ) == "0xB1026b8e7276e7AC75410F1fcbbe21796e8f7526"
+
+    def test_from_dex_config(self):
+        config = {"adapter_type": "uniswap_v3", "factory": UNI_FACTORY, "pool_init_code_hash": UNI_INIT_HASH}
+        assert compute_pool_address(config, ARB_WETH, ARB_USDC, 500) == "0xC6962004f452bE9203591991D15f6b388e09E8D0"
+
+    def test_no_init_hash_returns_none(self):
+        assert compute_pool_address({"factory": UNI_FACTORY}, ARB_WETH, ARB_USDC, 500) is None
@@ -0,0 +1,123 @@
+"""
+tests/unit/test_pool_index.py - Tests for discovery/pool_index.py
+
+Tests for existence/liquidity pruning and the disk cache.
+"""
+
+from core.constants import DexType
+from core.models import Token, Pool
+from chains.providers import RPCBatchItem
+from dex.pool_address import compute_pool_address
+from discovery.registry import PoolCandidate
+from discovery.pool_index import PoolIndex, SELECTOR_LIQUIDITY, SELECTOR_GET_POOL
+
+
+UNI_INIT_HASH = "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54"
+DEX_CONFIGS = {
+    "uniswap_v3": {
+        "adapter_type": "uniswap_v3",
+        "factory": "0x1F98431c8aD98523631AE4a59f267346ea31F984",
+        "pool_init_code_hash": UNI_INIT_HASH,
+    },
+    "fork_v3": {
+        "adapter_type": "uniswap_v3",
+        "factory": "0x00000000000000000000000000000000000000f0",
+    },
+}
+WETH = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="WETH", decimals=18)
+USDC = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USDC", decimals=6)
+
+
+def make_candidate(dex_key: str, fee: int) -> PoolCandidate:
+    pool = Pool(chain_id=42161, dex_id=dex_key, dex_type=DexType.UNISWAP_V3,
+                pool_address="", token0=WETH, token1=USDC, fee=fee)
+    return PoolCandidate(pool=pool, base=WETH, quote=USDC, dex_key=dex_key)
+
+
+class FakeChain:
+    """Answers eth_getCode / liquidity() / getPool from dicts."""
+
+    chain_id = 42161
+
+    def __init__(self, code: dict[str, str], liquidity: dict[str, int], factory_pools: dict[int, str] | None = None):
+        self.code = {k.lower(): v for k, v in code.items()}
+        self.liquidity = {k.lower(): v for k, v in liquidity.items()}
+        self.factory_pools = factory_pools or {}
+        self.batches = 0
+
+    async def call_batch(self, calls):
+        self.batches += 1
+        return [RPCBatchItem(self.code.get(params[0].lower(), "0x"), None, 1, "fake") for _, params in calls]
+
+    async def eth_call_batch(self, calls, block="latest"):
+        self.batches += 1
+        items = []
+        for to, data in calls:
+            if data == SELECTOR_LIQUIDITY:
+                items.append(RPCBatchItem(f"0x{self.liquidity.get(to.lower(), 0):064x}", None, 1, "fake"))
+            elif data.startswith(SELECTOR_GET_POOL):
+                fee = int(data[-64:], 16)
+                address = self.factory_pools.get(fee, "0x" + "0" * 40)
+                items.append(RPCBatchItem("0x" + address[2:].lower().zfill(64), None, 1, "fake"))
+            else:
+                items.append(RPCBatchItem(None, {"message": "revert"}, 1, "fake"))
+        return items
+
+
+LIVE_500 = "0xC6962004f452bE9203591991D15f6b388e09E8D0"
+
+
+class TestPoolIndex:
+    """Test pruning decisions."""
+
+    async def test_prunes_missing_and_empty_pools(self):
+        empty_3000 = compute_pool_address(DEX_CONFIGS["uniswap_v3"], WETH.address, USDC.address, 3000)
+        chain = FakeChain(code={LIVE_500: "0x60806040", empty_3000: "0x60806040"},
+                          liquidity={LIVE_500: 10**20, empty_3000: 0})
+        candidates = [make_candidate("uniswap_v3", fee) for fee in (500, 3000, 10000)]
+
+        kept = await PoolIndex(chain).prune(candidates, DEX_CONFIGS)
+
+        assert [c.pool.fee for c in kept] == [500]
+        assert kept[0].pool.pool_address == LIVE_500
+
+    async def test_factory_lookup_without_init_hash(self):
+        chain = FakeChain(code={"0x" + "ab" * 20: "0x6080"}, liquidity={"0x" + "ab" * 20: 5},
+                          factory_pools={500: "0x" + "ab" * 20})
+        candidates = [make_candidate("fork_v3", 500), make_candidate("fork_v3", 3000)]
+
+        kept = await PoolIndex(chain).prune(candidates, DEX_CONFIGS)
+
+        assert len(kept) == 1
+        assert kept[0].pool.pool_address == "0x" + "ab" * 20
+
+    async def test_infra_failure_keeps_candidate(self):
+        class Failing(FakeChain):
+            async def call_batch(self, calls):
+                return [RPCBatchItem(None, {"message": "timeout"}, 1, "fake") for _ in calls]
+
+        candidates = [make_candidate("uniswap_v3", 500)]
+        kept = await PoolIndex(Failing({}, {})).prune(candidates, DEX_CONFIGS)
+        assert kept == candidates
+
+    async def test_disk_cache_skips_probes(self, tmp_path):
+        cache = tmp_path / "pool_index" / "arbitrum_one.json"
+        chain = FakeChain(code={LIVE_500: "0x6080"}, liquidity={LIVE_500: 10**20})
+        await PoolIndex(chain, cache_path=cache).prune([make_candidate("uniswap_v3", 500)], DEX_CONFIGS)
+        batches = chain.batches
+
+        index = PoolIndex(chain, cache_path=cache)
+        kept = await index.prune([make_candidate("uniswap_v3", 500)], DEX_CONFIGS)
+
+        assert chain.batches == batches
+        assert index.cache_hits == 1
+        assert kept[0].pool.pool_address == LIVE_500
+
+    async def test_expired_entries_are_reprobed(self, tmp_path):
+        cache = tmp_path / "index.json"
+        chain = FakeChain(code={LIVE_500: "0x6080"}, liquidity={LIVE_500: 10**20})
+        await PoolIndex(chain, cache_path=cache).prune([make_candidate("uniswap_v3", 500)], DEX_CONFIGS)
+
+        index = PoolIndex(chain, cache_path=cache, ttl_seconds=-1)
+        await index.prune([make_candidate("uniswap_v3", 500)], DEX_CONFIGS)
+        assert index.probed == 1
@@ -0,0 +1,281 @@
+"""
+tests/unit/test_pool_state.py - Tests for dex/pool_state.py
+
+Tests for bootstrap, log replay, reorg rollback and pinned-block views
+against an in-memory fake pool.
+"""
+
+import pytest
+
+from core.constants import DexType
+from core.exceptions import ErrorCode, QuoteError
+from core.models import Token, Pool
+from chains.block import BlockState
+from chains.providers import RPCBatchItem, RPCResponse
+from dex import v3_math
+from dex.adapters.uniswap_v3 import UniswapV3Adapter
+from dex.pool_state import (
+    PoolStateStore,
+    parse_pool_log,
+    SELECTOR_SLOT0,
+    SELECTOR_LIQUIDITY,
+    SELECTOR_FEE,
+    SELECTOR_TICK_SPACING,
+    SELECTOR_TICK_BITMAP,
+    SELECTOR_TICKS,
+    TOPIC_SWAP,
+    TOPIC_MINT,
+    TOPIC_BURN,
+)
+
+
+POOL = "0x00000000000000000000000000000000000000aa"
+SPACING = 60
+
+
+def word(value: int) -> str:
+    return f"{value % (1 << 256):064x}"
+
+
+def make_log(topic: str, topics: list[int], data: list[int], block: int, index: int = 0,
+             block_hash: str | None = None, removed: bool = False) -> dict:
+    return {
+        "address": POOL,
+        "topics": [topic] + ["0x" + word(t) for t in topics],
+        "data": "0x" + "".join(word(d) for d in data),
+        "blockNumber": hex(block),
+        "logIndex": hex(index),
+        "blockHash": block_hash or f"0xhash{block}",
+        "removed": removed,
+    }
+
+
+def mint_log(lower: int, upper: int, amount: int, block: int, **kwargs) -> dict:
+    return make_log(TOPIC_MINT, [0, lower, upper], [0, amount, 0, 0], block, **kwargs)
+
+
+def burn_log(lower: int, upper: int, amount: int, block: int, **kwargs) -> dict:
+    return make_log(TOPIC_BURN, [0, lower, upper], [amount, 0, 0], block, **kwargs)
+
+
+def swap_log(sqrt_price: int, liquidity: int, tick: int, block: int, **kwargs) -> dict:
+    return make_log(TOPIC_SWAP, [0, 0], [0, 0, sqrt_price, liquidity, tick], block, **kwargs)
+
+
+class FakePoolProvider:
+    """Serves one V3 pool's getters and a scripted log list."""
+
+    chain_id = 42161
+
+    def __init__(self):
+        self.ticks = {
+            -1200: (5 * 10**17, 5 * 10**17),
+            -600: (10**18, 10**18),
+            600: (10**18, -(10**18)),
+            1200: (5 * 10**17, -5 * 10**17),
+        }
+        self.logs: list[dict] = []
+        self.get_logs_calls: list[tuple[int, int]] = []
+        self.canonical_hashes: dict[int, str] = {}
+
+    def _bitmap(self, word_pos: int) -> int:
+        bits = 0
+        for tick in self.ticks:
+            w, b = v3_math.tick_position(v3_math.compress_tick(tick, SPACING))
+            if w == word_pos:
+                bits |= 1 << b
+        return bits
+
+    def _eth_call(self, data: str) -> str:
+        selector, arg = data[:10], int(data[10:] or "0", 16)
+        arg = arg - (1 << 256) if arg >= 1 << 255 else arg
+        if selector == SELECTOR_SLOT0:
+            return "0x" + word(v3_math.Q96) + word(0) + word(0) * 5
+        if selector == SELECTOR_LIQUIDITY:
+            return "0x" + word(15 * 10**17)
+        if selector == SELECTOR_FEE:
+            return "0x" + word(3000)
+        if selector == SELECTOR_TICK_SPACING:
+            return "0x" + word(SPACING)
+        if selector == SELECTOR_TICK_BITMAP:
+            return "0x" + word(self._bitmap(arg))
+        if selector == SELECTOR_TICKS:
+            gross, net = self.ticks.get(arg, (0, 0))
+            return "0x" + word(gross) + word(net) + word(0) * 6
+        raise AssertionError(f"unexpected selector {selector}")
+
+    async def eth_call_batch(self, calls, block="latest"):
+        return [RPCBatchItem(self._eth_call(data), None, 1, "fake") for _, data in calls]
+
+    async def get_logs(self, addresses, topics, from_block, to_block):
+        self.get_logs_calls.append((from_block, to_block))
+        logs = [log for log in self.logs if from_block <= int(log["blockNumber"], 16) <= to_block]
+        return RPCResponse(logs, 1, "fake")
+
+    async def call_batch(self, calls):
+        return [
+            RPCBatchItem({"hash": self.canonical_hashes.get(int(params[0], 16))}, None, 1, "fake")
+            for _, params in calls
+        ]
+
+
+@pytest.fixture
+def pool():
+    token0 = Token(chain_id=42161, address="0x0000000000000000000000000000000000000001", symbol="T0", name="Token0", decimals=18)
+    token1 = Token(chain_id=42161, address="0x0000000000000000000000000000000000000002", symbol="T1", name="Token1", decimals=18)
+    return Pool(chain_id=42161, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+                pool_address=POOL, token0=token0, token1=token1, fee=3000)
+
+
+@pytest.fixture
+async def store(pool):
+    provider = FakePoolProvider()
+    store = PoolStateStore(provider, reorg_depth=8)
+    await store.bootstrap([pool], block_number=100)
+    return store
+
+
+class TestParsePoolLog:
+    """Test log decoding."""
+
+    def test_mint_with_negative_ticks(self):
+        event = parse_pool_log(mint_log(-1200, -600, 10**18, 5))
+        assert (event.kind, event.tick_lower, event.tick_upper, event.amount) == ("mint", -1200, -600, 10**18)
+
+    def test_swap(self):
+        event = parse_pool_log(swap_log(v3_math.Q96, 7, -3, 5))
+        assert (event.kind, event.sqrt_price_x96, event.liquidity, event.tick) == ("swap", v3_math.Q96, 7, -3)
+
+    def test_unrelated_topic(self):
+        assert parse_pool_log(make_log("0x" + "11" * 32, [], [], 5)) is None
+
+
+class TestBootstrap:
+    """Test initial state load."""
+
+    async def test_loads_core_and_ticks(self, store):
+        state = store.state_at(POOL, 100)
+        assert state.sqrt_price_x96 == v3_math.Q96
+        assert state.liquidity == 15 * 10**17
+        assert (state.fee, state.tick_spacing) == (3000, SPACING)
+        assert set(state.tick_bitmap) == {-2, -1, 0, 1, 2}
+        assert state.ticks[-600].liquidity_net == 10**18
+        assert state.ticks[600].liquidity_net == -(10**18)
+
+    async def test_second_bootstrap_is_noop(self, store, pool):
+        assert await store.bootstrap([pool]) == []
+
+
+class TestLogReplay:
+    """Test Swap/Mint/Burn application and pinned-block views."""
+
+    async def test_mint_in_range_adds_liquidity(self, store):
+        store.provider.logs = [mint_log(-120, 120, 10**17, 101)]
+        await store.sync(101)
+
+        state = store.state_at(POOL, 101)
+        assert state.liquidity == 16 * 10**17
+        assert state.ticks[-120].liquidity_net == 10**17
+        assert state.ticks[120].liquidity_net == -(10**17)
+        word_pos, bit = v3_math.tick_position(v3_math.compress_tick(120, SPACING))
+        assert state.tick_bitmap[word_pos] >> bit & 1
+
+    async def test_burn_clears_tick(self, store):
+        store.provider.logs = [burn_log(-600, 600, 10**18, 101)]
+        await store.sync(101)
+
+        state = store.state_at(POOL, 101)
+        assert state.liquidity == 5 * 10**17
+        assert 600 not in state.ticks and -600 not in state.ticks
+        word_pos, bit = v3_math.tick_position(v3_math.compress_tick(600, SPACING))
+        assert not state.tick_bitmap[word_pos] >> bit & 1
+
+    async def test_swap_sets_price(self, store):
+        price = v3_math.get_sqrt_ratio_at_tick(-300)
+        store.provider.logs = [swap_log(price, 15 * 10**17, -300, 102)]
+        await store.sync(102)
+
+        assert store.state_at(POOL, 102).tick == -300
+        assert store.state_at(POOL, 101).tick == 0  # Unwound view
+        assert store.state_at(POOL, 102).block_number == 102
+
+    async def test_log_ranges_are_chunked(self, store):
+        store.log_block_range = 2
+        await store.sync(105)
+        assert store.provider.get_logs_calls == [(101, 102), (103, 104), (105, 105)]
+        assert store.synced_block == 105
+
+    async def test_state_at_outside_window_raises(self, store):
+        with pytest.raises(QuoteError) as exc_info:
+            store.state_at(POOL, 101)
+        assert exc_info.value.code == ErrorCode.POOL_STATE_INCOMPLETE
+
+        with pytest.raises(QuoteError):
+            store.state_at("0xunknown", 100)
+
+
+class TestReorg:
+    """Test rollback to checkpoints."""
+
+    async def test_rollback_restores_state(self, store):
+        store.provider.logs = [mint_log(-120, 120, 10**17, 101), burn_log(-600, 600, 10**18, 102)]
+        await store.sync(102)
+
+        assert store.rollback(100)
+        state = store.state_at(POOL, 100)
+        assert state.liquidity == 15 * 10**17
+        assert -120 not in state.ticks
+        assert state.ticks[600].liquidity_gross == 10**18
+
+    async def test_removed_logs_roll_back(self, store):
+        store.apply_logs([mint_log(-120, 120, 10**17, 101)], 101)
+        store.apply_logs([mint_log(-120, 120, 10**17, 101, removed=True)], 102)
+
+        assert store.synced_block == 102
+        assert store.state_at(POOL, 102).liquidity == 15 * 10**17
+
+    async def test_rollback_past_checkpoint_clears(self, store):
+        await store.sync(120)
+        assert store.checkpoint_block == 112
+        assert not store.rollback(105)
+        assert store.pools == []
+        assert store.synced_block is None
+
+    async def test_advance_detects_same_height_reorg(self, store):
+        provider = store.provider
+        provider.logs = [mint_log(-120, 120, 10**17, 101, block_hash="0xold101")]
+        await store.advance(BlockState(42161, 101, 0, 0, block_hash="0xold101"))
+        assert store.state_at(POOL, 101).liquidity == 16 * 10**17
+
+        # 101 replaced by a block without the mint
+        provider.logs = []
+        provider.canonical_hashes = {100: "0xhash100", 101: "0xnew101"}
+        store._block_hashes[100] = "0xhash100"
+        await store.advance(BlockState(42161, 101, 0, 0, block_hash="0xnew101"))
+
+        assert store.reorgs == 1
+        assert store.synced_block == 101
+        assert store.state_at(POOL, 101).liquidity == 15 * 10**17
+
+
+class TestAdapterIntegration:
+    """Test adapters quoting from the store."""
+
+    async def test_local_quote_used_when_covered(self, store, pool):
+        adapter = UniswapV3Adapter(store.provider, "0xquoter", state_store=store)
+        quote = await adapter.get_quote(pool, pool.token0, pool.token1, 10**15, block_number=100)
+        assert quote.block_number == 100
+        assert quote.amount_out > 0
+
+    async def test_falls_back_to_quoter_when_not_covered(self, store, pool):
+        adapter = UniswapV3Adapter(store.provider, "0xquoter", state_store=store)
+        called = []
+
+        async def get_quote_raw(**kwargs):
+            called.append(kwargs["block_number"])
+            raise QuoteError(code=ErrorCode.QUOTE_REVERT, message="rpc path")
+
+        adapter.get_quote_raw = get_quote_raw
+        with pytest.raises(QuoteError):
+            await adapter.get_quote(pool, pool.token0, pool.token1, 10**15, block_number=150)
+        assert called == [150]
@@ -0,0 +1,499 @@
+"""
+tests/unit/test_providers.py - Tests for chains/providers.py
+
+Tests for JSON-RPC batching, failover and per-endpoint stats.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.exceptions import ErrorCode, InfraError
+from chains.providers import RPCProvider, RPCBatchItem
+from chains.rate_limit import EndpointLimiter, RateLimitConfig
+
+URL_A = "https://rpc-a.example"
+URL_B = "https://rpc-b.example"
+
+
+def make_provider(handler, urls=(URL_A, URL_B), max_batch_size=50) -> RPCProvider:
+    """Provider whose HTTP client is served by handler(request) -> httpx.Response."""
+    provider = RPCProvider(1, list(urls), max_batch_size=max_batch_size)
+    provider._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return provider
+
+
+def echo_results(payload: list[dict]) -> list[dict]:
+    """Answer every call with its method name, in reverse order."""
+    return [
+        {"jsonrpc": "2.0", "id": p["id"], "result": p["method"]}
+        for p in reversed(payload)
+    ]
+
+
+class TestCallBatch:
+    """Test RPCProvider.call_batch."""
+
+    async def test_maps_responses_by_id(self):
+        """Out-of-order responses are returned in call order."""
+        def handler(request):
+            return httpx.Response(200, json=echo_results(json.loads(request.content)))
+
+        provider = make_provider(handler)
+        items = await provider.call_batch([("m0", []), ("m1", []), ("m2", None)])
+
+        assert [i.result for i in items] == ["m0", "m1", "m2"]
+        assert all(isinstance(i, RPCBatchItem) and i.ok for i in items)
+        assert items[0].endpoint_used == URL_A
+
+    async def test_splits_at_max_batch_size(self):
+        """Calls are split into POSTs of at most max_batch_size."""
+        sizes = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            sizes.append(len(payload))
+            return httpx.Response(200, json=echo_results(payload))
+
+        provider = make_provider(handler, max_batch_size=4)
+        items = await provider.call_batch([(f"m{i}", []) for i in range(10)])
+
+        assert sorted(sizes) == [2, 4, 4]
+        assert [i.result for i in items] == [f"m{i}" for i in range(10)]
+        assert provider.stats[URL_A].successful_requests == 3
+
+    async def test_per_item_error_returned_separately(self):
+        """A per-call error is surfaced on its item and is not an endpoint failure."""
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": payload[0]["id"], "result": "0x01"},
+                {"jsonrpc": "2.0", "id": payload[1]["id"],
+                 "error": {"code": 3, "message": "execution reverted"}},
+            ])
+
+        provider = make_provider(handler)
+        items = await provider.call_batch([("eth_call", [{"to": "0x1"}]), ("eth_call", [{"to": "0x2"}])])
+
+        assert items[0].ok and items[0].result == "0x01"
+        assert not items[1].ok
+        assert items[1].error["message"] == "execution reverted"
+        assert provider.stats[URL_A].failed_requests == 0
+
+    async def test_failover_on_rejected_batch(self):
+        """A non-array response fails the endpoint and the batch moves on."""
+        def handler(request):
+            if request.url.host == "rpc-a.example":
+                return httpx.Response(200, json={"jsonrpc": "2.0", "id": None,
+                                                 "error": {"code": -32600, "message": "batch too large"}})
+            return httpx.Response(200, json=echo_results(json.loads(request.content)))
+
+        provider = make_provider(handler)
+        items = await provider.call_batch([("m0", [])])
+
+        assert items[0].result == "m0"
+        assert items[0].endpoint_used == URL_B
+        assert provider.stats[URL_A].failed_requests == 1
+        assert provider.stats[URL_A].last_error == "batch too large"
+        assert provider.stats[URL_B].successful_requests == 1
+
+    async def test_missing_ids_retried_on_next_endpoint(self):
+        """Calls dropped from a response are resent to the next endpoint only."""
+        sent_to_b = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            if request.url.host == "rpc-a.example":
+                return httpx.Response(200, json=echo_results(payload[:1]))
+            sent_to_b.extend(p["method"] for p in payload)
+            return httpx.Response(200, json=echo_results(payload))
+
+        provider = make_provider(handler)
+        items = await provider.call_batch([("m0", []), ("m1", [])])
+
+        assert [i.result for i in items] == ["m0", "m1"]
+        assert [i.endpoint_used for i in items] == [URL_A, URL_B]
+        assert sent_to_b == ["m1"]
+
+    async def test_all_endpoints_fail_raises(self):
+        """InfraError when no endpoint answers the batch."""
+        def handler(request):
+            raise httpx.ConnectError("refused")
+
+        provider = make_provider(handler)
+        with pytest.raises(InfraError) as exc_info:
+            await provider.call_batch([("m0", [])])
+
+        assert exc_info.value.code == ErrorCode.INFRA_RPC_ERROR
+        assert provider.stats[URL_A].failed_requests == 1
+        assert provider.stats[URL_B].failed_requests == 1
+
+    async def test_empty_batch(self):
+        """No calls means no HTTP traffic."""
+        def handler(request):
+            raise AssertionError("should not be called")
+
+        provider = make_provider(handler)
+        assert await provider.call_batch([]) == []
+
+    async def test_eth_call_batch_params(self):
+        """eth_call_batch builds eth_call params at the given block."""
+        seen = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            seen.extend(payload)
+            return httpx.Response(200, json=echo_results(payload))
+
+        provider = make_provider(handler)
+        await provider.eth_call_batch([("0xabc", "0x1234")], block="0x10")
+
+        assert seen[0]["method"] == "eth_call"
+        assert seen[0]["params"] == [{"to": "0xabc", "data": "0x1234"}, "0x10"]
+
+
+def seed_latency(provider: RPCProvider, url: str, latency_ms: int, samples: int = 20) -> None:
+    for _ in range(samples):
+        provider.stats[url].record_latency(latency_ms)
+
+
+class TestLatencyRouting:
+    """Test latency percentiles, endpoint ranking and hedging."""
+
+    def test_percentiles_need_min_samples(self):
+        """No percentile until enough samples; nearest-rank after."""
+        provider = make_provider(lambda request: None)
+        stats = provider.stats[URL_A]
+
+        for ms in range(1, 10):
+            stats.record_latency(ms)
+        assert stats.p50_latency_ms is None
+
+        for ms in range(10, 101):
+            stats.record_latency(ms)
+        assert (stats.p50_latency_ms, stats.p95_latency_ms, stats.p99_latency_ms) == (51, 96, 100)
+
+    def test_faster_endpoint_ranked_first(self):
+        """Measured endpoints order by p50; unmeasured keep config order after them."""
+        url_c = "https://rpc-c.example"
+        provider = make_provider(lambda request: None, urls=(URL_A, URL_B, url_c))
+        seed_latency(provider, URL_A, 300)
+        seed_latency(provider, url_c, 40)
+
+        assert list(provider._iter_endpoints()) == [url_c, URL_A, URL_B]
+
+    def test_unreliable_endpoint_loses_rank(self):
+        """A fast endpoint that mostly fails ranks behind a slower reliable one."""
+        provider = make_provider(lambda request: None)
+        seed_latency(provider, URL_A, 40)
+        seed_latency(provider, URL_B, 100)
+        provider.stats[URL_A].total_requests = 10
+        provider.stats[URL_A].successful_requests = 2
+        provider.stats[URL_B].total_requests = 10
+        provider.stats[URL_B].successful_requests = 10
+
+        assert list(provider._iter_endpoints()) == [URL_B, URL_A]
+
+    async def test_slow_endpoint_is_hedged(self):
+        """Past the p95 of the first endpoint the call goes to the next; first answer wins."""
+        async def handler(request):
+            body = json.loads(request.content)
+            if request.url.host == "rpc-a.example":
+                await asyncio.sleep(5)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": "0x1"})
+
+        provider = make_provider(handler)
+        seed_latency(provider, URL_A, 10)
+
+        response = await provider.call("eth_blockNumber")
+
+        assert response.endpoint_used == URL_B
+        assert (provider.hedged_requests, provider.hedge_wins) == (1, 1)
+        # The cancelled attempt is not a request, but its wait is a latency sample
+        assert provider.stats[URL_A].total_requests == 0
+        assert provider.stats[URL_A].failed_requests == 0
+        assert len(provider.stats[URL_A].latencies_ms) == 21
+
+    async def test_no_hedge_without_measurements(self):
+        """An unmeasured endpoint is waited for (plain failover)."""
+        async def handler(request):
+            body = json.loads(request.content)
+            if request.url.host == "rpc-a.example":
+                await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": "0x1"})
+
+        provider = make_provider(handler)
+        response = await provider.call("eth_blockNumber")
+
+        assert response.endpoint_used == URL_A
+        assert provider.hedged_requests == 0
+        assert provider.stats[URL_B].total_requests == 0
+
+    async def test_batch_is_hedged(self):
+        """call_batch hedges the same way."""
+        async def handler(request):
+            if request.url.host == "rpc-a.example":
+                await asyncio.sleep(5)
+            return httpx.Response(200, json=echo_results(json.loads(request.content)))
+
+        provider = make_provider(handler)
+        seed_latency(provider, URL_A, 10)
+
+        items = await provider.call_batch([("m0", []), ("m1", [])])
+
+        assert [i.result for i in items] == ["m0", "m1"]
+        assert {i.endpoint_used for i in items} == {URL_B}
+        assert provider.hedge_wins == 1
+
+
+class TestRateLimits:
+    """Test 429 handling and request budgets."""
+
+    async def test_429_fails_over_without_quarantine(self):
+        """A 429 moves to the next endpoint and is not a failure."""
+        def handler(request):
+            body = json.loads(request.content)
+            if request.url.host == "rpc-a.example":
+                return httpx.Response(429, headers={"Retry-After": "5"}, text="slow down")
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"], "result": "0x1"})
+
+        provider = make_provider(handler)
+        provider.limiters = {url: EndpointLimiter(RateLimitConfig(requests_per_second=100)) for url in (URL_A, URL_B)}
+
+        for _ in range(6):
+            response = await provider.call("eth_blockNumber")
+            assert response.endpoint_used == URL_B
+
+        stats = provider.stats[URL_A]
+        assert (stats.total_requests, stats.failed_requests, stats.quarantined) == (0, 0, False)
+        # Backing off after the first 429: A is not asked again
+        assert stats.rate_limited == 1
+        assert list(provider._iter_endpoints()) == [URL_B, URL_A]
+
+    async def test_rate_limit_error_code(self):
+        """Every endpoint rate limiting surfaces as INFRA_RATE_LIMIT."""
+        def handler(request):
+            body = json.loads(request.content)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"],
+                                             "error": {"code": 429, "message": "Too Many Requests"}})
+
+        provider = make_provider(handler)
+        with pytest.raises(InfraError) as exc_info:
+            await provider.call("eth_blockNumber")
+
+        assert exc_info.value.code == ErrorCode.INFRA_RATE_LIMIT
+        assert provider.stats[URL_A].rate_limited == 1
+        assert provider.stats[URL_A].failed_requests == 0
+
+    async def test_rate_limited_batch_error_code(self):
+        """A batch every endpoint rate limits raises INFRA_RATE_LIMIT too."""
+        def handler(request):
+            return httpx.Response(429, text="slow down")
+
+        provider = make_provider(handler)
+        with pytest.raises(InfraError) as exc_info:
+            await provider.call_batch([("m0", []), ("m1", [])])
+
+        assert exc_info.value.code == ErrorCode.INFRA_RATE_LIMIT
+
+    async def test_mixed_failures_are_rpc_errors(self):
+        """One endpoint down and one rate limiting is still INFRA_RPC_ERROR."""
+        def handler(request):
+            if request.url.host == "rpc-a.example":
+                return httpx.Response(429, text="slow down")
+            return httpx.Response(500, text="boom")
+
+        provider = make_provider(handler)
+        with pytest.raises(InfraError) as exc_info:
+            await provider.call("eth_blockNumber")
+
+        assert exc_info.value.code == ErrorCode.INFRA_RPC_ERROR
+
+    async def test_rate_limit_and_rpc_error_are_rpc_errors(self):
+        """A JSON-RPC error on one endpoint is not hidden by a 429 on the other."""
+        def handler(request):
+            body = json.loads(request.content)
+            if request.url.host == "rpc-a.example":
+                return httpx.Response(429, text="slow down")
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"],
+                                             "error": {"code": -32000, "message": "header not found"}})
+
+        provider = make_provider(handler)
+        with pytest.raises(InfraError) as exc_info:
+            await provider.call("eth_blockNumber")
+
+        assert exc_info.value.code == ErrorCode.INFRA_RPC_ERROR
+
+    async def test_revert_is_an_answer(self):
+        """An eth_call revert comes back with error set, from the first endpoint, uncached."""
+        hosts = []
+
+        def handler(request):
+            body = json.loads(request.content)
+            hosts.append(request.url.host)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"],
+                                             "error": {"code": 3, "message": "execution reverted"}})
+
+        provider = make_provider(handler)
+        provider.hedge = False
+        for _ in range(2):
+            response = await provider.call("eth_call", [{"to": "0x1", "data": "0x"}, "0x10"])
+            assert response.result is None
+            assert response.error["message"] == "execution reverted"
+
+        assert len(hosts) == 2
+        assert len(set(hosts)) == 1
+        assert provider.stats[URL_A].failed_requests + provider.stats[URL_B].failed_requests == 0
+
+    async def test_rate_limited_batch_calls_resent(self):
+        """Per-call rate-limit errors in a batch are not answers."""
+        def handler(request):
+            payload = json.loads(request.content)
+            if request.url.host == "rpc-a.example":
+                return httpx.Response(200, json=[
+                    {"jsonrpc": "2.0", "id": payload[0]["id"], "result": payload[0]["method"]},
+                    {"jsonrpc": "2.0", "id": payload[1]["id"], "error": {"code": 429, "message": "rate limit"}},
+                ])
+            return httpx.Response(200, json=echo_results(payload))
+
+        provider = make_provider(handler)
+        items = await provider.call_batch([("m0", []), ("m1", [])])
+
+        assert [(i.result, i.endpoint_used) for i in items] == [("m0", URL_A), ("m1", URL_B)]
+        assert provider.stats[URL_A].rate_limited == 1
+        assert provider.stats[URL_A].successful_requests == 1
+
+    async def test_budget_paces_requests(self):
+        """Requests beyond the burst wait for the bucket."""
+        def handler(request):
+            return httpx.Response(200, json=echo_results(json.loads(request.content)))
+
+        provider = make_provider(handler, urls=(URL_A,), max_batch_size=1)
+        provider.limiters = {URL_A: EndpointLimiter(RateLimitConfig(requests_per_second=100, burst_seconds=0.02))}
+
+        await provider.call_batch([(f"m{i}", []) for i in range(4)])
+
+        assert provider.limiters[URL_A].wait_seconds > 0
+
+
+class TestCallCache:
+    """Test the pinned-block cache and request coalescing."""
+
+    async def test_pinned_block_cached(self):
+        """Pinned-block eth_calls hit the network once; latest does not cache."""
+        posts = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            posts.append(payload)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "0x01"})
+
+        provider = make_provider(handler)
+        first = await provider.eth_call("0xabc", "0x1234", block="0x10")
+        second = await provider.eth_call("0xabc", "0x1234", block="0x10")
+        await provider.eth_call("0xabc", "0x1234")
+        await provider.eth_call("0xabc", "0x1234")
+
+        assert (first.endpoint_used, second.endpoint_used) == (URL_A, "cache")
+        assert second.result == "0x01"
+        assert len(posts) == 3
+        assert provider.get_cache_stats() == {"size": 1, "hits": 1, "coalesced": 0}
+
+    async def test_concurrent_calls_coalesced(self):
+        """Identical in-flight calls share one request."""
+        posts = []
+
+        async def handler(request):
+            payload = json.loads(request.content)
+            posts.append(payload)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "0x10"})
+
+        provider = make_provider(handler)
+        responses = await asyncio.gather(*(provider.call("eth_blockNumber") for _ in range(5)))
+
+        assert [r.result for r in responses] == ["0x10"] * 5
+        assert len(posts) == 1
+        assert provider.coalesced_requests == 4
+
+    async def test_batch_dedup_cache_and_coalescing(self):
+        """A batch sends each distinct call once, across concurrent batches too."""
+        sent = []
+
+        async def handler(request):
+            payload = json.loads(request.content)
+            sent.extend(p["params"][0]["data"] for p in payload)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": p["id"], "result": p["params"][0]["data"]} for p in payload
+            ])
+
+        provider = make_provider(handler)
+        calls = [("0xabc", "0x01"), ("0xabc", "0x02"), ("0xabc", "0x01")]
+        first, second = await asyncio.gather(
+            provider.eth_call_batch(calls, block="0x10"),
+            provider.eth_call_batch(calls[:2], block="0x10"),
+        )
+        third = await provider.eth_call_batch(calls, block="0x10")
+
+        assert sorted(sent) == ["0x01", "0x02"]
+        assert [i.result for i in first] == ["0x01", "0x02", "0x01"]
+        assert [i.result for i in second] == ["0x01", "0x02"]
+        assert [i.endpoint_used for i in third] == ["cache"] * 3
+
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        """A batch waiting on another batch's call resends it if that batch is cancelled."""
+        sent = []
+
+        async def handler(request):
+            payload = json.loads(request.content)
+            sent.append(len(payload))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=echo_results(payload))
+
+        provider = make_provider(handler)
+        owner = asyncio.ensure_future(provider.call_batch([("m0", []), ("m1", [])]))
+        await asyncio.sleep(0.01)
+        waiter = asyncio.ensure_future(provider.call_batch([("m1", [])]))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+
+        items = await waiter
+
+        assert owner.cancelled()
+        assert [i.result for i in items] == ["m1"]
+        assert sent == [2, 1]
+
+    async def test_errors_not_cached(self):
+        """Reverted calls are returned but asked again next time."""
+        posts = []
+
+        def handler(request):
+            payload = json.loads(request.content)
+            posts.append(payload)
+            return httpx.Response(200, json=[
+                {"jsonrpc": "2.0", "id": p["id"], "error": {"code": 3, "message": "execution reverted"}}
+                for p in payload
+            ])
+
+        provider = make_provider(handler)
+        for _ in range(2):
+            (item,) = await provider.eth_call_batch([("0xabc", "0x01")], block="0x10")
+            assert not item.ok
+
+        assert len(posts) == 2
+
+    async def test_lru_eviction(self):
+        def handler(request):
+            payload = json.loads(request.content)
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": payload["id"], "result": "0x01"})
+
+        provider = make_provider(handler)
+        provider.cache_size = 2
+        for data in ("0x01", "0x02", "0x01", "0x03"):
+            await provider.eth_call("0xabc", data, block="0x10")
+
+        cached = [json.loads(key)[1][0]["data"] for key in provider._cache]
+        assert cached == ["0x01", "0x03"]
@@ -0,0 +1,113 @@
+"""
+tests/unit/test_quote_batch.py - Tests for core/quote_batch.py
+
+Tests for columnar quote storage, row views and the snapshot form.
+"""
+
+import json
+
+import pytest
+
+from core.constants import DexType, TradeDirection
+from core.math import Price
+from core.models import Token, Pool, Quote
+from core.quote_batch import QuoteBatch, QuoteRow, QUOTE_BATCH_FORMAT
+from core.time import now_ms
+from engine.spread_engine import compute_spreads
+from strategy.gates import apply_single_quote_gates, calculate_implied_price
+
+
+WETH = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="WETH", decimals=18)
+USDC = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USDC", decimals=6)
+ONE_ETH = 10**18
+
+
+def make_pool(dex: str) -> Pool:
+    return Pool(chain_id=42161, dex_id=dex, dex_type=DexType.UNISWAP_V3,
+                pool_address="", token0=WETH, token1=USDC, fee=500)
+
+
+def make_quote(pool: Pool, amount_out: int, amount_in: int = ONE_ETH) -> Quote:
+    return Quote(pool=pool, direction=TradeDirection.SELL, token_in=WETH, token_out=USDC,
+                 amount_in=amount_in, amount_out=amount_out, block_number=100,
+                 timestamp_ms=now_ms(), gas_estimate=150_000, ticks_crossed=2,
+                 sqrt_price_x96_after=2**96 * 50, latency_ms=12)
+
+
+@pytest.fixture
+def batch():
+    batch = QuoteBatch()
+    uni, sushi = make_pool("uniswap_v3"), make_pool("sushiswap_v3")
+    for amount_in in (10**17, ONE_ETH):
+        batch.append(make_quote(uni, amount_in * 2510 // 10**12, amount_in), dex="uniswap_v3",
+                     quoter="0x" + "11" * 20)
+        batch.append(make_quote(sushi, amount_in * 2500 // 10**12, amount_in), dex="sushiswap_v3",
+                     quoter="0x" + "22" * 20, anchor_price=Price.from_decimal("2510"))
+    return batch
+
+
+class TestQuoteBatch:
+    """Test interning and row views."""
+
+    def test_pools_and_tokens_interned(self, batch):
+        assert len(batch) == 4
+        assert len(batch.pools) == 2
+        assert batch.tokens == [WETH, USDC]
+        assert batch[0].token_in is batch[3].token_in
+        assert batch.pool == [0, 1, 0, 1]
+
+    def test_row_reads_like_quote(self, batch):
+        quote = make_quote(make_pool("uniswap_v3"), 2_510_000_000)
+        row = batch.append(quote, dex="uniswap_v3")
+
+        assert isinstance(row, QuoteRow)
+        assert batch[-1].index == row.index
+        assert row.to_quote() == quote
+        assert row.price == quote.price
+        assert row.effective_price == quote.effective_price
+        assert row.is_fresh
+
+    def test_gates_accept_rows(self, batch):
+        row = batch[1]
+        assert apply_single_quote_gates(row, Price.from_decimal("2510"), is_anchor_dex=False) == []
+        assert calculate_implied_price(row) == 2500
+
+    def test_spreads_from_rows(self, batch):
+        rows = compute_spreads({"WETH/USDC_500_1e18": {"uniswap_v3": batch[2], "sushiswap_v3": batch[3]}}, 10**8)
+
+        (spread,) = rows
+        assert (spread.buy_quote.index, spread.sell_quote.index) == (3, 2)
+        assert spread.spread_bps == 40
+
+
+class TestQuoteBatchSnapshot:
+    """Test the columnar snapshot form."""
+
+    def test_columns_not_copied(self, batch):
+        snapshot = batch.to_snapshot()
+        assert snapshot["format"] == QUOTE_BATCH_FORMAT
+        assert snapshot["count"] == 4
+        assert snapshot["columns"]["amount_in"] is batch.amount_in
+
+    def test_json_round_trip_exact(self, batch):
+        adapter_quote = make_quote(make_pool("uniswap_v3"), 2_510_000_000)
+        adapter_quote.direction = "0to1"  # As UniswapV3Adapter builds it
+        batch.append(adapter_quote, dex="uniswap_v3")
+
+        text = json.dumps(batch.to_snapshot())
+        restored = QuoteBatch.from_snapshot(json.loads(text))
+
+        assert len(restored) == len(batch)
+        for i in range(len(batch)):
+            assert restored.to_quote(i) == batch.to_quote(i)
+            assert restored[i].dex == batch[i].dex
+        assert restored.anchor_price == batch.anchor_price
+
+    def test_records_match_legacy_layout(self, batch):
+        record = batch.records()[1]
+        assert record["dex"] == "sushiswap_v3"
+        assert record["pair"] == "WETH/USDC"
+        assert record["pool_address"] == "computed"
+        assert record["amount_in"] == str(10**17)
+        assert record["implied_price"] == "2500"
+        assert record["anchor_price"] == "2510"
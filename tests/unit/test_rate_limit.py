@@ -0,0 +1,102 @@
+"""
+tests/unit/test_rate_limit.py - Tests for chains/rate_limit.py
+
+Tests for token buckets, compute-unit costs and rate-limit detection.
+"""
+
+import time
+
+from chains.rate_limit import (
+    MIN_RATE_FRACTION,
+    EndpointLimiter,
+    RateLimitConfig,
+    TokenBucket,
+    is_rate_limit_error,
+    parse_retry_after,
+)
+
+
+class TestTokenBucket:
+    """Test pacing and AIMD backoff."""
+
+    async def test_burst_then_paced(self):
+        bucket = TokenBucket(rate=200, capacity=2)
+
+        assert await bucket.acquire() == 0
+        assert await bucket.acquire() == 0
+        assert await bucket.acquire() > 0  # Burst spent: waits ~5ms for a token
+
+    async def test_oversized_cost_is_clamped(self):
+        bucket = TokenBucket(rate=1000, capacity=5)
+        assert await bucket.acquire(50) == 0
+
+    async def test_rate_limited_halves_rate_and_pauses(self):
+        bucket = TokenBucket(rate=100)
+        bucket.on_rate_limited(retry_after_s=0.02)
+
+        assert bucket.rate == 50
+        start = time.monotonic()
+        await bucket.acquire()
+        assert time.monotonic() - start >= 0.015
+
+    def test_rate_floor_and_recovery(self):
+        bucket = TokenBucket(rate=100)
+        for _ in range(10):
+            bucket.on_rate_limited(retry_after_s=0)
+        assert bucket.rate == 100 * MIN_RATE_FRACTION
+
+        for _ in range(100):
+            bucket.on_success()
+        assert bucket.rate == 100
+
+
+class TestEndpointLimiter:
+    """Test request and compute-unit budgets."""
+
+    def test_batch_cost(self):
+        limiter = EndpointLimiter(RateLimitConfig(
+            requests_per_second=10, compute_units_per_second=500,
+            method_weights={"eth_getLogs": 100},
+        ))
+
+        assert limiter.cost(["eth_call", "eth_call", "eth_getLogs"]) == {
+            "requests": 3,
+            "compute_units": 26 + 26 + 100,
+        }
+        assert [kind for kind, _ in limiter.buckets] == ["requests", "compute_units"]
+
+    def test_config_section(self):
+        assert RateLimitConfig.from_config(None) == RateLimitConfig()
+        assert RateLimitConfig.from_config({}).requests_per_second == 10
+        assert RateLimitConfig.from_config({"enabled": False}) is None
+
+        config = RateLimitConfig.from_config({"compute_units_per_second": 330})
+        assert config.requests_per_second == 10  # DEFAULT_REQUESTS_PER_SECOND
+        assert config.compute_units_per_second == 330
+
+    def test_blocked_after_rate_limit(self):
+        limiter = EndpointLimiter(RateLimitConfig(requests_per_second=10))
+        assert not limiter.blocked
+
+        limiter.on_rate_limited(retry_after_s=5)
+        assert limiter.blocked
+        assert limiter.rate_limited == 1
+
+
+class TestDetection:
+    """Test rate-limit classification."""
+
+    def test_rate_limit_errors(self):
+        assert is_rate_limit_error({"code": 429, "message": "Too Many Requests"})
+        assert is_rate_limit_error({"code": -32000, "message": "Your app has exceeded its compute units per second capacity"})
+        assert is_rate_limit_error({"code": -32090, "message": "rate limit reached"})
+
+    def test_other_errors(self):
+        assert not is_rate_limit_error({"code": 3, "message": "execution reverted"})
+        assert not is_rate_limit_error({"code": -32000, "message": "out of gas: gas limit exceeded"})
+        assert not is_rate_limit_error(None)
+
+    def test_retry_after(self):
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after("Wed, 21 Oct 2026 07:28:00 GMT") is None
+        assert parse_retry_after(None) is None
@@ -249,3 +249,52 @@ class TestPoolRegistry:
         # Check that candidates are sorted by priority
         priorities = [c.priority for c in candidates]
         assert priorities == sorted(priorities)
+    
+    def test_candidates_get_create2_address(
+        self, tmp_path,
+        sample_chains_config, sample_dexes_config, sample_tokens_config
+    ):
+        intent_file = tmp_path / "intent.txt"
+        intent_file.write_text("arbitrum_one:WETH/USDC")
+        
+        dexes = {"arbitrum_one": {"uniswap_v3": {
+            **sample_dexes_config["arbitrum_one"]["uniswap_v3"],
+            "factory": "0x1F98431c8aD98523631AE4a59f267346ea31F984",
+            "pool_init_code_hash": "0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54",
+        }}}
+        registry = PoolRegistry(sample_chains_config, dexes, sample_tokens_config)
+        registry.load_intent(intent_file)
+        candidates = registry.generate_pool_candidates()
+        
+        by_fee = {c.pool.fee: c.pool.pool_address for c in candidates}
+        assert by_fee[500] == "0xC6962004f452bE9203591991D15f6b388e09E8D0"
+    
+    def test_candidates_without_init_hash_have_no_address(
+        self, tmp_path,
+        sample_chains_config, sample_dexes_config, sample_tokens_config
+    ):
+        intent_file = tmp_path / "intent.txt"
+        intent_file.write_text("arbitrum_one:WETH/USDC")
+        
+        registry = PoolRegistry(sample_chains_config, sample_dexes_config, sample_tokens_config)
+        registry.load_intent(intent_file)
+        candidates = registry.generate_pool_candidates()
+        
+        assert all(c.pool.pool_address == "" for c in candidates)
+    
+    def test_set_candidates_for_chain(
+        self, tmp_path, sample_intent_content,
+        sample_chains_config, sample_dexes_config, sample_tokens_config
+    ):
+        intent_file = tmp_path / "intent.txt"
+        intent_file.write_text(sample_intent_content)
+        
+        registry = PoolRegistry(sample_chains_config, sample_dexes_config, sample_tokens_config)
+        registry.load_intent(intent_file)
+        registry.generate_pool_candidates()
+        base_before = registry.get_candidates_for_chain("base")
+        
+        registry.set_candidates_for_chain("arbitrum_one", registry.get_candidates_for_chain("arbitrum_one")[:1])
+        
+        assert len(registry.get_candidates_for_chain("arbitrum_one")) == 1
+        assert registry.get_candidates_for_chain("base") == base_before
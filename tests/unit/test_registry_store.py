@@ -0,0 +1,250 @@
+"""
+tests/unit/test_registry_store.py - Tests for discovery/registry_store.py
+
+Tests for SQLite persistence of the registry.
+"""
+
+from dataclasses import replace
+
+import aiosqlite
+import pytest
+
+from core.constants import PoolStatus
+from chains.providers import RPCBatchItem
+from discovery.registry import PoolRegistry
+from discovery.registry_store import RegistryStore
+from discovery.pool_index import PoolIndex, prune_registry_chain
+
+
+CHAINS = {
+    "arbitrum_one": {"chain_id": 42161},
+    "base": {"chain_id": 8453},
+}
+TOKENS = {
+    "arbitrum_one": {
+        "WETH": {"address": "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", "decimals": 18},
+        "USDC": {"address": "0xaf88d065e77c8cC2239327C5EDb3A432268e5831", "decimals": 6},
+        "WBTC": {"address": "0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f", "decimals": 8},
+    },
+    "base": {
+        "WETH": {"address": "0x4200000000000000000000000000000000000006", "decimals": 18},
+        "USDC": {"address": "0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913", "decimals": 6},
+    },
+}
+DEX = {"enabled": True, "verified_for_quoting": True, "adapter_type": "uniswap_v3", "fee_tiers": [500, 3000]}
+DEXES = {"arbitrum_one": {"uniswap_v3": DEX}, "base": {"uniswap_v3": DEX}}
+
+
+@pytest.fixture
+def registry(tmp_path):
+    intent = tmp_path / "intent.txt"
+    intent.write_text("arbitrum_one:WETH/USDC\narbitrum_one:WBTC/USDC\nbase:WETH/USDC\n")
+    registry = PoolRegistry(CHAINS, DEXES, TOKENS)
+    registry.load_intent(intent)
+    registry.generate_pool_candidates()
+    return registry
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = RegistryStore(tmp_path / "registry.sqlite")
+    await store.open()
+    yield store
+    await store.close()
+
+
+class TestRegistryStore:
+    """Test writes, indexed reads and pool health."""
+
+    async def test_save_and_load_by_chain(self, store, registry):
+        summary = await store.save_registry(registry)
+        assert summary["pools_changed"] == 6
+        assert summary["intent_pairs_added"] == 3
+
+        arb = await store.get_pool_candidates(42161)
+        assert len(arb) == 4
+        assert {c.pool.fee for c in arb} == {500, 3000}
+
+    async def test_resave_is_incremental(self, store, registry):
+        await store.save_registry(registry)
+        summary = await store.save_registry(registry)
+        assert summary == {"tokens_changed": 0, "intent_pairs_added": 0, "pools_changed": 0}
+
+    async def test_pair_lookup_keeps_orientation_and_checksum(self, store, registry):
+        await store.save_registry(registry)
+
+        candidates = await store.get_pool_candidates(42161, pair="WETH/USDC", fee=500)
+        assert len(candidates) == 1
+        candidate = candidates[0]
+        assert (candidate.base.symbol, candidate.quote.symbol) == ("WETH", "USDC")
+        assert candidate.base.address == "0x82aF49447D8a07e3bd95BD0d56f35241523fBab1"
+        assert candidate.pool.token0.address.lower() < candidate.pool.token1.address.lower()
+
+    async def test_dead_pools_hidden_and_not_revived(self, store, registry):
+        await store.save_registry(registry)
+        dead = registry.get_candidates_for_chain("base")[0].pool
+        await store.set_pool_statuses([(dead, PoolStatus.DEAD)])
+
+        assert len(await store.get_pool_candidates(8453)) == 1
+        assert len(await store.get_pool_candidates(8453, include_inactive=True)) == 2
+
+        await store.save_registry(registry)
+        assert len(await store.get_pool_candidates(8453)) == 1
+
+    async def test_pool_address_not_cleared(self, store, registry):
+        candidate = registry.get_candidates_for_chain("base")[0]
+        candidate.pool = replace(candidate.pool, pool_address="0x" + "ab" * 20)
+        await store.upsert_pools([candidate])
+
+        candidate.pool = replace(candidate.pool, pool_address="")
+        await store.save_registry(registry)
+
+        rows = await store.get_pool_candidates(8453, fee=candidate.pool.fee)
+        assert rows[0].pool.pool_address == "0x" + "ab" * 20
+
+    async def test_pool_health_accumulates(self, store, registry):
+        await store.save_registry(registry)
+        pool = registry.get_candidates_for_chain("arbitrum_one")[0].pool
+
+        await store.record_pool_health(pool, ok=True)
+        await store.record_pool_health(pool, ok=False, error_code="QUOTE_REVERT")
+        await store.record_pool_health(pool, ok=True)
+
+        (health,) = await store.get_pool_health(42161)
+        assert (health["quotes_ok"], health["quotes_failed"]) == (2, 1)
+        assert health["last_error"] == "QUOTE_REVERT"
+
+    async def test_failure_streak_marks_dead(self, store, registry):
+        """A success resets the streak; dead_after failures in a row hide the pool."""
+        await store.save_registry(registry)
+        pool = registry.get_candidates_for_chain("base")[0].pool
+
+        assert await store.record_pool_outcomes([(pool, False, "QUOTE_REVERT")] * 2, dead_after=3) == 0
+        await store.record_pool_outcomes([(pool, True, None)], dead_after=3)
+        assert await store.record_pool_outcomes([(pool, False, "QUOTE_REVERT")] * 2, dead_after=3) == 0
+        assert len(await store.get_pool_candidates(8453)) == 2
+
+        assert await store.record_pool_outcomes([(pool, False, "QUOTE_REVERT")], dead_after=3) == 1
+        (alive,) = await store.get_pool_candidates(8453)
+        assert alive.pool.fee != pool.fee
+        (health,) = [h for h in await store.get_pool_health(8453) if h["fee"] == pool.fee]
+        assert (health["quotes_ok"], health["quotes_failed"], health["consecutive_failed"]) == (1, 5, 3)
+
+    async def test_adds_missing_columns(self, tmp_path):
+        """Databases created before consecutive_failed get the column on open."""
+        path = tmp_path / "old.sqlite"
+        async with aiosqlite.connect(path) as db:
+            await db.execute(
+                "CREATE TABLE pool_health (pool_id INTEGER PRIMARY KEY, quotes_ok INTEGER NOT NULL DEFAULT 0, "
+                "quotes_failed INTEGER NOT NULL DEFAULT 0, last_error TEXT, last_quote_at TEXT, "
+                "updated_at TEXT NOT NULL)"
+            )
+            await db.commit()
+
+        async with RegistryStore(path) as store:
+            async with store.db.execute("PRAGMA table_info(pool_health)") as cursor:
+                columns = {row["name"] for row in await cursor.fetchall()}
+        assert "consecutive_failed" in columns
+
+    async def test_lookups_use_indexes(self, store, registry):
+        await store.save_registry(registry)
+        async with store.db.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM pools WHERE chain_id = ? AND pair = ?", (42161, "WETH/USDC")
+        ) as cursor:
+            plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+        assert "idx_pools_chain_pair" in plan
+
+    async def test_persists_across_reopen(self, tmp_path, registry):
+        path = tmp_path / "reopen.sqlite"
+        async with RegistryStore(path) as store:
+            await store.save_registry(registry)
+        async with RegistryStore(path) as store:
+            assert await store.count_pools() == 6
+
+
+class TestLoadRegistryCandidates:
+    """Test starting the registry from the store."""
+
+    def resolved(self, tmp_path, intent: str) -> PoolRegistry:
+        path = tmp_path / "intent.txt"
+        path.write_text(intent)
+        registry = PoolRegistry(CHAINS, DEXES, TOKENS)
+        registry.load_intent(path)
+        return registry
+
+    async def test_first_run_generates_everything(self, store, tmp_path):
+        registry = self.resolved(tmp_path, "arbitrum_one:WETH/USDC\nbase:WETH/USDC\n")
+
+        summary = await store.load_registry_candidates(registry)
+
+        assert (summary["new_pairs"], summary["generated_candidates"], summary["stored_candidates"]) == (2, 4, 0)
+        assert await store.count_pools() == 4
+
+    async def test_known_pairs_come_from_store(self, store, registry, tmp_path):
+        """Stored pools are reused (dead ones stay out); only the new pair is generated."""
+        await store.save_registry(registry)
+        dead = registry.get_candidates_for_chain("base")[0].pool
+        await store.set_pool_statuses([(dead, PoolStatus.DEAD)])
+        restarted = self.resolved(
+            tmp_path, "arbitrum_one:WETH/USDC\narbitrum_one:WBTC/USDC\nbase:WETH/USDC\narbitrum_one:WBTC/WETH\n"
+        )
+
+        summary = await store.load_registry_candidates(restarted)
+
+        assert (summary["known_pairs"], summary["new_pairs"]) == (3, 1)
+        assert (summary["stored_candidates"], summary["generated_candidates"]) == (5, 2)
+        assert len(restarted.get_candidates_for_chain("base")) == 1
+        assert len(restarted.get_candidates_for_chain("arbitrum_one")) == 6
+        assert summary["intent_pairs_added"] == 1
+
+    async def test_disabled_dex_not_loaded(self, store, registry, tmp_path):
+        await store.save_registry(registry)
+        restarted = self.resolved(tmp_path, "base:WETH/USDC\n")
+        restarted.dexes_config = {"base": {"uniswap_v3": {**DEX, "enabled": False}}}
+
+        await store.load_registry_candidates(restarted)
+
+        assert restarted.get_candidates_for_chain("base") == []
+
+
+class TestPruneWithStore:
+    """Test pool index pruning persisted to the store."""
+
+    async def test_dead_pools_marked(self, store, registry):
+        live = "0x" + "ab" * 20
+
+        class FakeChain:
+            chain_id = 8453
+
+            async def eth_call_batch(self, calls, block="latest"):
+                # getPool: only the 500 tier exists; liquidity() is non-zero
+                results = []
+                for _, data in calls:
+                    if len(data) > 10:
+                        fee = int(data[-64:], 16)
+                        results.append("0x" + (live[2:] if fee == 500 else "").zfill(64))
+                    else:
+                        results.append("0x" + "1".zfill(64))
+                return [RPCBatchItem(r, None, 1, "fake") for r in results]
+
+            async def call_batch(self, calls):
+                return [RPCBatchItem("0x6080", None, 1, "fake") for _ in calls]
+
+        await store.save_registry(registry)
+        dex_configs = {"uniswap_v3": {"adapter_type": "uniswap_v3", "factory": "0x" + "f0" * 20}}
+        summary = await prune_registry_chain(registry, "base", dex_configs, PoolIndex(FakeChain()), store)
+
+        assert summary["kept"] == 1
+        (active,) = await store.get_pool_candidates(8453)
+        assert (active.pool.fee, active.pool.pool_address, active.pool.status) == (500, live, PoolStatus.ACTIVE)
+        statuses = {c.pool.fee: c.pool.status for c in await store.get_pool_candidates(8453, include_inactive=True)}
+        assert statuses[3000] == PoolStatus.DEAD
+
+
+class TestRegistryChainIndex:
+    """Test the in-memory per-chain index."""
+
+    def test_get_candidates_for_chain(self, registry):
+        assert len(registry.get_candidates_for_chain("arbitrum_one")) == 4
+        assert len(registry.get_candidates_for_chain("base")) == 2
+        assert registry.get_candidates_for_chain("unknown") == []
@@ -0,0 +1,158 @@
+"""
+tests/unit/test_round_trip.py - Tests for engine/round_trip.py
+
+Tests for exact-output quoting and same-block two-leg round trips.
+"""
+
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from eth_abi import decode as abi_decode, encode as abi_encode
+
+from core.constants import DexType
+from core.exceptions import ErrorCode, InfraError, QuoteError
+from core.math import Price
+from core.models import Token, Pool
+from chains.providers import RPCBatchItem, RPCResponse
+from dex.adapters.uniswap_v3 import (
+    SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE,
+    UniswapV3Adapter,
+    encode_quote_exact_output_single,
+)
+from engine.round_trip import RoundTripRequest, evaluate_round_trips
+
+
+WETH = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="WETH", decimals=18)
+USDC = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USDC", decimals=6)
+QUOTER_A = "0x61fFE014bA17989E743c5F6cB21bF9697530B21e"
+QUOTER_B = "0x0524E833cCD057e4d7A296e3aaAb9f7675964Ce1"
+ONE_ETH = 10**18
+USDC_PER_WEI = Price(2500 * 10**6, ONE_ETH)  # USDC wei per native wei at 2500 USD/ETH
+
+
+def quoter_output(amount: int, gas: int = 100_000) -> str:
+    return "0x" + abi_encode(["uint256", "uint160", "uint32", "uint256"], [amount, 2**96, 1, gas]).hex()
+
+
+class FakeProvider:
+    """Answers quoter calls from a table keyed by (quoter, selector)."""
+
+    chain_id = 42161
+
+    def __init__(self, answers: dict[tuple[str, str], RPCBatchItem]):
+        self.answers = answers
+        self.batches: list[tuple[list[tuple[str, str]], str]] = []
+
+    async def eth_call_batch(self, calls, block="latest"):
+        self.batches.append((calls, block))
+        return [self.answers[(to, data[:10])] for to, data in calls]
+
+
+def make_request(amount: int = ONE_ETH) -> RoundTripRequest:
+    def pool(dex: str) -> Pool:
+        return Pool(chain_id=42161, dex_id=dex, dex_type=DexType.UNISWAP_V3,
+                    pool_address="", token0=WETH, token1=USDC, fee=500)
+
+    return RoundTripRequest(
+        buy_dex="dex_a", buy_adapter=UniswapV3Adapter(None, QUOTER_A, "dex_a"), buy_pool=pool("dex_a"),
+        sell_dex="dex_b", sell_adapter=UniswapV3Adapter(None, QUOTER_B, "dex_b"), sell_pool=pool("dex_b"),
+        base=WETH, quote=USDC, base_amount=amount, gas_rate=USDC_PER_WEI,
+    )
+
+
+def ok(result: str) -> RPCBatchItem:
+    return RPCBatchItem(result, None, 5, "fake")
+
+
+class TestExactOutputEncoding:
+    """Test quoteExactOutputSingle calldata."""
+
+    def test_matches_eth_abi(self):
+        data = encode_quote_exact_output_single(USDC.address, WETH.address, ONE_ETH, 500)
+        assert data.startswith(SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE)
+
+        (params,) = abi_decode(["(address,address,uint256,uint24,uint160)"], bytes.fromhex(data[10:]))
+        assert params == (USDC.address.lower(), WETH.address.lower(), ONE_ETH, 500, 0)
+
+    async def test_provider_errors_are_not_reverts(self):
+        """A rate-limited buy leg raises INFRA_RATE_LIMIT; a reverted one QUOTE_REVERT."""
+        provider = MagicMock()
+        provider.eth_call = AsyncMock(side_effect=InfraError(ErrorCode.INFRA_RATE_LIMIT, "rate limited"))
+        adapter = UniswapV3Adapter(provider, QUOTER_A)
+        pool = make_request().buy_pool
+
+        with pytest.raises(InfraError) as exc_info:
+            await adapter.get_quote_exact_output(pool, USDC, WETH, ONE_ETH, block_number=100)
+        assert exc_info.value.code == ErrorCode.INFRA_RATE_LIMIT
+
+        provider.eth_call = AsyncMock(return_value=RPCResponse(
+            None, 5, "fake", error={"code": 3, "message": "execution reverted"},
+        ))
+        with pytest.raises(QuoteError) as exc_info:
+            await adapter.get_quote_exact_output(pool, USDC, WETH, ONE_ETH, block_number=100)
+        assert exc_info.value.code == ErrorCode.QUOTE_REVERT
+
+
+class TestRoundTrip:
+    """Test two-leg evaluation."""
+
+    async def test_both_legs_in_one_batch_at_block(self):
+        provider = FakeProvider({
+            (QUOTER_A, SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE): ok(quoter_output(2_500_000_000)),
+            (QUOTER_B, "0xc6a5026a"): ok(quoter_output(2_510_000_000)),
+        })
+
+        (trip,) = await evaluate_round_trips(provider, [make_request()], block_number=1000)
+
+        ((calls, block),) = provider.batches
+        assert block == hex(1000)
+        assert [to for to, _ in calls] == [QUOTER_A, QUOTER_B]
+
+        assert trip.buy_quote.token_in == USDC and trip.buy_quote.amount_out == ONE_ETH
+        assert (trip.cost, trip.proceeds, trip.gross_pnl) == (2_500_000_000, 2_510_000_000, 10_000_000)
+        assert trip.gross_bps == 40
+        # 200k gas * 0.1 gwei = 2e13 wei = 0.05 USDC
+        assert trip.gas_cost(10**8) == 50_000
+        assert trip.net_pnl(10**8) == 9_950_000
+        assert trip.net_pnl_bps(10**8) == 39
+        assert trip.to_dict(10**8)["block_number"] == 1000
+
+    async def test_unpriced_gas_has_no_net(self):
+        """Without a quote-token gas rate the net figures are unknown, not guessed."""
+        provider = FakeProvider({
+            (QUOTER_A, SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE): ok(quoter_output(2_500_000_000)),
+            (QUOTER_B, "0xc6a5026a"): ok(quoter_output(2_510_000_000)),
+        })
+
+        (trip,) = await evaluate_round_trips(provider, [replace(make_request(), gas_rate=None)], 1000)
+
+        assert trip.net_pnl(10**8) is None
+        report = trip.to_dict(10**8)
+        assert (report["gross_bps"], report["gas_cost"], report["net_pnl_bps"]) == (40, None, None)
+
+    async def test_reverted_leg_fails_only_its_request(self):
+        provider = FakeProvider({
+            (QUOTER_A, SELECTOR_QUOTE_EXACT_OUTPUT_SINGLE): RPCBatchItem(None, {"message": "execution reverted"}, 5, "fake"),
+            (QUOTER_B, "0xc6a5026a"): ok(quoter_output(2_510_000_000)),
+        })
+
+        (outcome,) = await evaluate_round_trips(provider, [make_request()], block_number=1000)
+
+        assert isinstance(outcome, QuoteError)
+        assert outcome.code == ErrorCode.QUOTE_REVERT
+
+    async def test_batch_failure_returned_per_request(self):
+        class DownProvider:
+            async def eth_call_batch(self, calls, block="latest"):
+                raise ConnectionError("down")
+
+        outcomes = await evaluate_round_trips(DownProvider(), [make_request(), make_request(10**17)], 1000)
+
+        assert len(outcomes) == 2
+        assert all(isinstance(o, ConnectionError) for o in outcomes)
+
+    async def test_no_requests_no_rpc(self):
+        provider = FakeProvider({})
+        assert await evaluate_round_trips(provider, [], 1000) == []
+        assert provider.batches == []
@@ -0,0 +1,486 @@
+"""
+tests/unit/test_run_scan.py - Tests for strategy/jobs/run_scan.py
+
+Tests for the concurrent quote fetch stage, scanner config, stage timings,
+snapshot files, recorded cycle inputs, registry.sqlite use and the
+pool-state store.
+"""
+
+import asyncio
+import json
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from eth_abi import encode as abi_encode
+
+from core.exceptions import ErrorCode, InfraError, QuoteError
+from core.models import Token, Pool, Quote, TradeDirection
+from core.quote_batch import QuoteRow
+from core.constants import DexType, DEFAULT_MAX_CONCURRENT_QUOTES, DEFAULT_POOL_DEAD_AFTER_FAILURES
+from core.snapshot import SNAPSHOT_SUFFIX, load_snapshot
+from core.constants import PoolStatus
+from discovery.registry_store import RegistryStore
+from strategy.config import ScannerConfig, load_strategy_config
+from chains.block import BlockState
+from chains.multicall import Call3Result, MulticallResult
+from dex.adapters.uniswap_v3 import UniswapV3Adapter
+from dex.pool_state import PoolStateStore
+from monitoring.truth_report import generate_truth_report
+from strategy.jobs.run_scan import (
+    CycleInputs,
+    PlannedPool,
+    QuoteRequest,
+    ScanSession,
+    fetch_quotes_concurrently,
+    fetch_quotes_multicall,
+    pool_health_outcomes,
+    select_registry_candidates,
+    sync_pool_state,
+)
+from discovery.registry import PoolRegistry
+from tests.unit.test_pool_state import POOL, FakePoolProvider, swap_log
+from tests.unit.test_registry_store import CHAINS, DEXES, TOKENS
+
+
+class FakeAdapter:
+    """Adapter stub that tracks in-flight get_quote calls."""
+
+    def __init__(self, fail_amounts: set[int] | None = None):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_amounts = fail_amounts or set()
+
+    async def get_quote(self, pool, token_in, token_out, amount_in, block_number):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            if amount_in in self.fail_amounts:
+                raise QuoteError(ErrorCode.QUOTE_REVERT, "reverted")
+            return (amount_in, block_number)
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def pool_and_tokens():
+    weth = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="Wrapped Ether", decimals=18)
+    usdc = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USD Coin", decimals=6)
+    pool = Pool(
+        chain_id=42161, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+        pool_address="0xC6962004f452bE9203591991D15f6b388e09E8D0",
+        token0=weth, token1=usdc, fee=500,
+    )
+    return pool, weth, usdc
+
+
+def _requests(adapter, pool, token_in, token_out, amounts):
+    return [
+        QuoteRequest(
+            pool_key="uniswap_v3_500_WETH/USDC", adapter=adapter, pool=pool,
+            token_in=token_in, token_out=token_out, amount_in=amount,
+        )
+        for amount in amounts
+    ]
+
+
+class TestFetchQuotesConcurrently:
+    """Test bounded concurrent quote fetching."""
+
+    async def test_respects_concurrency_limit(self, pool_and_tokens):
+        """No more than max_concurrent quotes are in flight."""
+        pool, weth, usdc = pool_and_tokens
+        adapter = FakeAdapter()
+        requests = _requests(adapter, pool, weth, usdc, range(1, 21))
+
+        outcomes = await fetch_quotes_concurrently(requests, 100, max_concurrent=3)
+
+        assert len(outcomes) == 20
+        assert 1 < adapter.max_in_flight <= 3
+
+    async def test_results_keyed_by_pool_and_amount(self, pool_and_tokens):
+        """Each outcome is keyed by (pool_key, amount_in) at the pinned block."""
+        pool, weth, usdc = pool_and_tokens
+        adapter = FakeAdapter()
+        requests = _requests(adapter, pool, weth, usdc, [10**16, 10**17])
+
+        outcomes = await fetch_quotes_concurrently(requests, 123)
+
+        assert outcomes[("uniswap_v3_500_WETH/USDC", 10**17)] == (10**17, 123)
+
+    async def test_failures_captured_not_raised(self, pool_and_tokens):
+        """A failing quote is returned as its exception; others still succeed."""
+        pool, weth, usdc = pool_and_tokens
+        adapter = FakeAdapter(fail_amounts={10**17})
+        requests = _requests(adapter, pool, weth, usdc, [10**16, 10**17, 10**18])
+
+        outcomes = await fetch_quotes_concurrently(requests, 1)
+
+        failed = outcomes[("uniswap_v3_500_WETH/USDC", 10**17)]
+        assert isinstance(failed, QuoteError)
+        assert failed.code == ErrorCode.QUOTE_REVERT
+        assert outcomes[("uniswap_v3_500_WETH/USDC", 10**18)] == (10**18, 1)
+
+
+class TestFetchQuotesMulticall:
+    """Test Multicall3-backed quote fetching."""
+
+    async def test_revert_maps_to_single_leg(self, pool_and_tokens):
+        """Only the reverted leg becomes QUOTE_REVERT; others decode normally."""
+        pool, weth, usdc = pool_and_tokens
+        adapter = UniswapV3Adapter(MagicMock(), "0x61fFE014bA17989E743c5F6cB21bF9697530B21e")
+        requests = _requests(adapter, pool, weth, usdc, [10**16, 10**17])
+        ok = "0x" + abi_encode(["uint256", "uint160", "uint32", "uint256"], [35_000_000, 2**96, 1, 80_000]).hex()
+
+        multicall = MagicMock()
+        multicall.aggregate3 = AsyncMock(return_value=MulticallResult(
+            results=[Call3Result(True, ok), Call3Result(False, "0x")],
+            latency_ms=12, eth_calls=1,
+        ))
+
+        outcomes = await fetch_quotes_multicall(requests, 200, multicall)
+
+        good = outcomes[("uniswap_v3_500_WETH/USDC", 10**16)]
+        bad = outcomes[("uniswap_v3_500_WETH/USDC", 10**17)]
+        assert good.amount_out == 35_000_000
+        assert good.block_number == 200
+        assert isinstance(bad, QuoteError)
+        assert bad.code == ErrorCode.QUOTE_REVERT
+        assert multicall.aggregate3.call_args.kwargs["block_number"] == 200
+
+    async def test_failed_chunk_is_infra_for_its_legs(self, pool_and_tokens):
+        """A failed chunk's legs get its InfraError, not QUOTE_REVERT; other legs still decode."""
+        pool, weth, usdc = pool_and_tokens
+        adapter = UniswapV3Adapter(MagicMock(), "0x61fFE014bA17989E743c5F6cB21bF9697530B21e")
+        requests = _requests(adapter, pool, weth, usdc, [10**16, 10**17])
+        ok = "0x" + abi_encode(["uint256", "uint160", "uint32", "uint256"], [35_000_000, 2**96, 1, 80_000]).hex()
+        chunk_error = InfraError(code=ErrorCode.INFRA_RPC_ERROR, message="aggregate3 failed: out of gas")
+
+        multicall = MagicMock()
+        multicall.aggregate3 = AsyncMock(return_value=MulticallResult(
+            results=[Call3Result(True, ok), Call3Result(False, "0x", error=chunk_error)],
+            latency_ms=12, eth_calls=2,
+        ))
+
+        outcomes = await fetch_quotes_multicall(requests, 200, multicall)
+
+        assert outcomes[("uniswap_v3_500_WETH/USDC", 10**16)].amount_out == 35_000_000
+        assert outcomes[("uniswap_v3_500_WETH/USDC", 10**17)] is chunk_error
+
+    async def test_cached_pools_skip_calls(self, pool_and_tokens):
+        """Pools the state store covers are quoted locally; only the rest become calls."""
+        pool, weth, usdc = pool_and_tokens
+        cached = Pool(
+            chain_id=42161, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+            pool_address=POOL, token0=weth, token1=usdc, fee=3000,
+        )
+        store = PoolStateStore(FakePoolProvider())
+        await store.bootstrap([cached], block_number=200)
+        adapter = UniswapV3Adapter(store.provider, "0x61fFE014bA17989E743c5F6cB21bF9697530B21e", state_store=store)
+        requests = _requests(adapter, pool, weth, usdc, [10**16])
+        requests.append(QuoteRequest(
+            pool_key="uniswap_v3_3000_WETH/USDC", adapter=adapter, pool=cached,
+            token_in=weth, token_out=usdc, amount_in=10**16,
+        ))
+        ok = "0x" + abi_encode(["uint256", "uint160", "uint32", "uint256"], [35_000_000, 2**96, 1, 80_000]).hex()
+
+        multicall = MagicMock()
+        multicall.aggregate3 = AsyncMock(return_value=MulticallResult(
+            results=[Call3Result(True, ok)], latency_ms=12, eth_calls=1,
+        ))
+
+        outcomes = await fetch_quotes_multicall(requests, 200, multicall)
+
+        assert len(multicall.aggregate3.call_args.args[0]) == 1
+        assert list(outcomes) == [("uniswap_v3_500_WETH/USDC", 10**16), ("uniswap_v3_3000_WETH/USDC", 10**16)]
+        assert outcomes[("uniswap_v3_500_WETH/USDC", 10**16)].amount_out == 35_000_000
+        assert outcomes[("uniswap_v3_3000_WETH/USDC", 10**16)].amount_out > 0
+
+
+class TestSyncPoolState:
+    """Test the per-chain pool-state store across cycles."""
+
+    async def test_one_store_per_chain_follows_heads(self, tmp_path, pool_and_tokens):
+        _, weth, usdc = pool_and_tokens
+        pool = Pool(
+            chain_id=42161, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+            pool_address=POOL, token0=weth, token1=usdc, fee=3000,
+        )
+        provider = FakePoolProvider()
+        session = ScanSession(tmp_path, tmp_path / "intents.jsonl")
+
+        def head(n: int) -> BlockState:
+            return BlockState(chain_id=42161, block_number=n, timestamp_ms=0, latency_ms=0, block_hash=f"0xhash{n}")
+
+        store = await sync_pool_state(session, provider, head(100), [pool])
+        assert store.synced_block == 100
+        assert store.pools == [POOL]
+
+        provider.logs.append(swap_log(2**96 * 2, 10**18, 6931, 101))
+        again = await sync_pool_state(session, provider, head(101), [pool])
+
+        assert again is store
+        assert session.pool_states == {42161: store}
+        assert store.state_at(POOL, 101).tick == 6931
+        assert store.state_at(POOL, 100).tick == 0
+        assert provider.get_logs_calls == [(101, 101)]
+
+
+class TestScannerConfig:
+    """Test scanner section of strategy.yaml."""
+
+    def test_defaults(self):
+        """Defaults apply when the file is missing."""
+        config = load_strategy_config(Path("/nonexistent/strategy.yaml"))
+        assert config.scanner == ScannerConfig()
+        assert config.scanner.max_concurrent_quotes == DEFAULT_MAX_CONCURRENT_QUOTES
+
+    def test_loads_max_concurrent_quotes(self, tmp_path):
+        """max_concurrent_quotes is read from the scanner section."""
+        path = tmp_path / "strategy.yaml"
+        path.write_text("scanner:\n  max_concurrent_quotes: 24\n  scan_interval_ms: 250\n")
+
+        config = load_strategy_config(path)
+
+        assert config.scanner.max_concurrent_quotes == 24
+        assert config.scanner.scan_interval_ms == 250
+        assert config.scanner.use_multicall is False
+
+    def test_concurrency_floor_is_one(self, tmp_path):
+        """A zero budget is clamped to one in-flight quote."""
+        path = tmp_path / "strategy.yaml"
+        path.write_text("scanner:\n  max_concurrent_quotes: 0\n")
+
+        assert load_strategy_config(path).scanner.max_concurrent_quotes == 1
+
+    def test_loads_report_interval(self, tmp_path):
+        """report_interval_seconds is read from the monitoring section."""
+        path = tmp_path / "strategy.yaml"
+        path.write_text("monitoring:\n  report_interval_seconds: 15\n")
+
+        assert load_strategy_config(path).monitoring.report_interval_seconds == 15
+
+    def test_loads_gate_thresholds(self, tmp_path):
+        """gate_defaults and per-chain gate_overrides become GateThresholds."""
+        path = tmp_path / "strategy.yaml"
+        path.write_text(
+            "gate_defaults:\n  max_gas_estimate: 300000\n  min_net_pnl_bps: 5\n"
+            "gate_overrides:\n  arbitrum_one:\n    max_quote_age_ms: 750\n"
+        )
+
+        config = load_strategy_config(path)
+
+        assert config.get_thresholds(8453).max_gas_estimate == 300_000
+        assert config.get_thresholds(8453).max_quote_age_ms == 2000
+        assert config.get_thresholds(42161).max_quote_age_ms == 750
+        assert config.get_thresholds(42161).min_net_pnl_bps == 5
+
+
+class TestStageTimings:
+    """Test stage timing rollups in ScanSession and the truth report."""
+
+    def test_session_and_truth_report_rollup(self, tmp_path):
+        """Cycle stage_timings_ms roll up into get_summary and the truth report."""
+        session = ScanSession(tmp_path, Path("intent.txt"))
+        cycles = [
+            {"chain": "arbitrum_one", "stage_timings_ms": {"quoting": 30.0, "gates": 5.0, "other": 5.0, "total": 40.0}},
+            {"chain": "arbitrum_one", "stage_timings_ms": {"quoting": 50.0, "gates": 5.0, "other": 5.0, "total": 60.0}},
+        ]
+        for cycle in cycles:
+            session.record_cycle(cycle)
+
+        summary = session.get_summary()["stage_timings_ms"]
+        assert summary["quoting"]["total_ms"] == 80.0
+        assert summary["quoting"]["share_pct"] == 80.0
+
+        session.save_snapshot(cycles)
+        assert session.get_summary()["stage_timings_ms"]["snapshot"]["count"] == 1
+
+        report = generate_truth_report({"mode": "REGISTRY", "cycle_summaries": cycles})
+        assert report.stage_breakdown["gates"]["total_ms"] == 10.0
+        assert report.to_dict()["stage_breakdown"]["quoting"]["p50_ms"] == 50.0
+
+    def test_periodic_truth_report(self, tmp_path, monkeypatch):
+        """A truth report is saved once report_interval_seconds has passed."""
+        snapshots = tmp_path / "snapshots"
+        snapshots.mkdir()
+        session = ScanSession(snapshots, Path("intent.txt"), report_interval_seconds=60)
+        session.record_cycle({"chain": "arbitrum_one", "mode": "REGISTRY", "quotes_attempted": 4})
+
+        assert session.maybe_save_truth_report() is None
+
+        monkeypatch.setattr(session, "_last_report_at", session._last_report_at - 61)
+        path = session.maybe_save_truth_report()
+
+        assert path.parent == tmp_path / "reports"
+        assert session.truth_report().mode == "REGISTRY"
+        assert session.maybe_save_truth_report() is None
+
+    def test_truth_report_without_timings(self):
+        """Old snapshots without stage timings produce no breakdown."""
+        report = generate_truth_report({"mode": "SMOKE", "cycle_summaries": [{"chain": "arbitrum_one"}]})
+
+        assert report.stage_breakdown is None
+        assert "stage_breakdown" not in report.to_dict()
+
+
+class TestSnapshotFormat:
+    """Test ScanSession snapshot files."""
+
+    CYCLES = [
+        {"chain": "arbitrum_one", "mode": "REGISTRY", "block_number": 100, "spreads": [{"amount_in": "10" * 12}]},
+        {"chain": "arbitrum_one", "mode": "REGISTRY", "block_number": 101, "spreads": []},
+    ]
+
+    def test_binary_by_default(self, tmp_path):
+        """Snapshots are binary and load back to the JSON-shaped dict."""
+        session = ScanSession(tmp_path, Path("intent.txt"))
+        path = session.save_snapshot(self.CYCLES)
+
+        assert path.suffix == SNAPSHOT_SUFFIX
+        snapshot = load_snapshot(path)
+        assert snapshot["mode"] == "REGISTRY"
+        assert snapshot["cycle_summaries"] == self.CYCLES
+
+    def test_json_format(self, tmp_path):
+        """snapshot_format="json" keeps the indented JSON file."""
+        session = ScanSession(tmp_path, Path("intent.txt"), snapshot_format="json")
+        path = session.save_snapshot(self.CYCLES)
+
+        assert path.suffix == ".json"
+        assert json.loads(path.read_text())["cycle_summaries"] == self.CYCLES
+
+
+class TestCycleInputs:
+    """Test the recorded cycle inputs (summary "replay" section)."""
+
+    def make_inputs(self, pool_and_tokens) -> CycleInputs:
+        pool, weth, usdc = pool_and_tokens
+        amounts = [10**16, 10**17, 10**18]
+        quote = Quote(
+            pool=pool, direction=TradeDirection.SELL, token_in=weth, token_out=usdc,
+            amount_in=10**16, amount_out=25_100_000, block_number=100, timestamp_ms=1_700_000_000_000,
+            gas_estimate=90_000, ticks_crossed=1, sqrt_price_x96_after=2**96, latency_ms=15,
+        )
+        try:
+            None.amount_out  # A decode bug, with a real traceback
+        except AttributeError as e:
+            code_error = e
+        return CycleInputs(
+            plan=[PlannedPool(
+                pool_key="uniswap_v3_500_WETH/USDC", pool=pool, token_in=weth, token_out=usdc,
+                dex_key="uniswap_v3", quoter="0x61fFE014bA17989E743c5F6cB21bF9697530B21e", amounts=amounts,
+            )],
+            outcomes={
+                ("uniswap_v3_500_WETH/USDC", 10**16): quote,
+                ("uniswap_v3_500_WETH/USDC", 10**17): QuoteError(ErrorCode.QUOTE_REVERT, "reverted"),
+                ("uniswap_v3_500_WETH/USDC", 10**18): code_error,
+            },
+            gas_price_wei=10_000_000,
+            gated_at_ms=1_700_000_000_050,
+            execution_allowed={"uniswap_v3": True},
+            plan_rejects={"POOL_NOT_FOUND": 1},
+            rpc_success=0.98,
+            round_trip_dexes=["uniswap_v3"],
+            round_trips={("WETH/USDC_500_10000000000000000", "uniswap_v3", "sushiswap_v3"): ({"net_pnl_bps": 3}, None)},
+        )
+
+    def test_round_trip_through_json(self, pool_and_tokens):
+        """Quotes, failures and round trips survive the snapshot's JSON form."""
+        inputs = self.make_inputs(pool_and_tokens)
+
+        restored = CycleInputs.from_snapshot(json.loads(json.dumps(inputs.to_snapshot())))
+
+        quote = restored.outcomes[("uniswap_v3_500_WETH/USDC", 10**16)]
+        assert isinstance(quote, QuoteRow)
+        assert quote.amount_out == 25_100_000
+        assert quote.latency_ms == 15
+        assert quote.dex == "uniswap_v3"
+        revert = restored.outcomes[("uniswap_v3_500_WETH/USDC", 10**17)]
+        assert isinstance(revert, QuoteError)
+        assert revert.code == ErrorCode.QUOTE_REVERT
+        assert restored.plan[0].pool == inputs.plan[0].pool
+        assert restored.plan[0].amounts == [10**16, 10**17, 10**18]
+        assert restored.gas_price_wei == 10_000_000
+        assert restored.round_trips == inputs.round_trips
+
+    def test_code_errors_keep_traceback(self, pool_and_tokens):
+        """Replayed code errors carry the original traceback for classification."""
+        inputs = self.make_inputs(pool_and_tokens)
+
+        restored = CycleInputs.from_snapshot(inputs.to_snapshot())
+
+        error = restored.outcomes[("uniswap_v3_500_WETH/USDC", 10**18)]
+        assert isinstance(error, AttributeError)
+        assert "None.amount_out" in error.__notes__[0]
+
+
+@pytest.fixture
+def registry(tmp_path) -> PoolRegistry:
+    intent = tmp_path / "intent.txt"
+    intent.write_text("arbitrum_one:WETH/USDC\narbitrum_one:WBTC/USDC\nbase:WETH/USDC\n")
+    registry = PoolRegistry(CHAINS, DEXES, TOKENS)
+    registry.load_intent(intent)
+    registry.generate_pool_candidates()
+    return registry
+
+
+class TestRegistryStoreUse:
+    """Test per-cycle candidates and pool health against registry.sqlite."""
+
+    async def test_candidates_follow_store_status(self, tmp_path, registry):
+        async with RegistryStore(tmp_path / "registry.sqlite") as store:
+            await store.save_registry(registry)
+            assert len(await select_registry_candidates("arbitrum_one", 42161, registry, store)) == 4
+
+            dead = registry.get_candidates_for_chain("arbitrum_one")[0].pool
+            await store.set_pool_statuses([(dead, PoolStatus.DEAD)])
+
+            candidates = await select_registry_candidates("arbitrum_one", 42161, registry, store)
+        assert len(candidates) == 3
+        assert dead not in [c.pool for c in candidates]
+
+    async def test_without_store_uses_registry(self, registry):
+        assert await select_registry_candidates("base", 8453, registry) == registry.get_candidates_for_chain("base")
+
+    def test_pool_health_outcomes(self, pool_and_tokens):
+        """One outcome per pool: any quote is ok, all reverts fail, infra errors say nothing."""
+        pool, weth, usdc = pool_and_tokens
+        plan = [
+            PlannedPool(
+                pool_key=key, pool=pool, token_in=weth, token_out=usdc,
+                dex_key="uniswap_v3", quoter="0x0", amounts=[1, 2],
+            )
+            for key in ("ok", "reverts", "infra")
+        ]
+        revert = QuoteError(ErrorCode.QUOTE_REVERT, "reverted")
+        outcomes = {
+            ("ok", 1): revert, ("ok", 2): MagicMock(spec=QuoteRow),
+            ("reverts", 1): revert, ("reverts", 2): revert,
+            ("infra", 1): revert, ("infra", 2): InfraError(ErrorCode.INFRA_RPC_TIMEOUT, "timeout"),
+        }
+
+        assert pool_health_outcomes(plan, outcomes) == [(pool, True, None), (pool, False, "QUOTE_REVERT")]
+
+    async def test_outage_builds_no_dead_streak(self, tmp_path, registry):
+        """Every size failing with an InfraError, cycle after cycle, records nothing."""
+        candidate = registry.get_candidates_for_chain("arbitrum_one")[0]
+        plan = [PlannedPool(
+            pool_key="k", pool=candidate.pool, token_in=candidate.base, token_out=candidate.quote,
+            dex_key=candidate.dex_key, quoter="0x0", amounts=[1, 2],
+        )]
+        outage = {
+            ("k", 1): InfraError(ErrorCode.INFRA_RPC_ERROR, "all endpoints failed"),
+            ("k", 2): InfraError(ErrorCode.INFRA_RATE_LIMIT, "rate limited"),
+        }
+
+        async with RegistryStore(tmp_path / "registry.sqlite") as store:
+            await store.save_registry(registry)
+            for _ in range(DEFAULT_POOL_DEAD_AFTER_FAILURES + 1):
+                assert await store.record_pool_outcomes(pool_health_outcomes(plan, outage)) == 0
+            health = await store.get_pool_health(42161)
+            candidates = await select_registry_candidates("arbitrum_one", 42161, registry, store)
+
+        assert health == []
+        assert candidate.pool in [c.pool for c in candidates]
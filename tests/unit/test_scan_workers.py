@@ -0,0 +1,68 @@
+"""
+tests/unit/test_scan_workers.py - Tests for strategy/jobs/scan_workers.py
+
+Tests for chain shard planning and supervisor-side merging.
+"""
+
+from pathlib import Path
+
+from strategy.jobs.run_scan import ScanSession
+from strategy.jobs.scan_workers import ScanSupervisor, WorkerOptions, WorkerResult, plan_chain_shards
+
+
+def chains(*keys: str) -> list[tuple[str, dict]]:
+    return [(key, {"chain_id": i}) for i, key in enumerate(keys)]
+
+
+class TestPlanChainShards:
+    """Test dealing chains into worker shards."""
+
+    def test_round_robin(self):
+        """Chains are dealt in priority order, so each worker gets a top chain."""
+        shards = plan_chain_shards(chains("arb", "base", "op", "linea", "bsc"), 2)
+
+        assert [[key for key, _ in shard] for shard in shards] == [["arb", "op", "bsc"], ["base", "linea"]]
+
+    def test_no_empty_shards(self):
+        """More workers than chains: one chain per worker."""
+        shards = plan_chain_shards(chains("arb", "base"), 8)
+
+        assert [[key for key, _ in shard] for shard in shards] == [["arb"], ["base"]]
+
+    def test_worker_session_id(self, tmp_path):
+        options = WorkerOptions(tmp_path, tmp_path / "intents.jsonl", tmp_path, session_id="s1")
+
+        assert options.worker_session_id(3) == "s1_w3"
+
+
+class TestSupervisorMerge:
+    """Test folding worker results into the session."""
+
+    def make_supervisor(self, tmp_path: Path) -> ScanSupervisor:
+        options = WorkerOptions(tmp_path, tmp_path / "intents.jsonl", tmp_path / "trades", session_id="s1")
+        return ScanSupervisor(ScanSession(tmp_path, options.intent_file), options)
+
+    def test_merges_stats_and_trade_files(self, tmp_path):
+        supervisor = self.make_supervisor(tmp_path)
+        (tmp_path / "trades").mkdir()
+        for i in range(2):
+            path = tmp_path / "trades" / f"paper_trades_s1_w{i}.jsonl"
+            path.write_text(f'{{"worker": {i}}}\n')
+            supervisor.results[i] = WorkerResult(
+                cycles=1,
+                paper_stats={"total_signals": i + 1, "total_pnl_numeraire": "0.5"},
+                trades_file=str(path),
+            )
+
+        supervisor._merge_results()
+
+        assert supervisor.paper_stats["total_signals"] == 3
+        assert supervisor.paper_stats["total_pnl_numeraire"] == "1.000000"
+        assert supervisor.trades_file.read_text() == '{"worker": 0}\n{"worker": 1}\n'
+        assert not (tmp_path / "trades" / "paper_trades_s1_w0.jsonl").exists()
+
+    def test_paper_trading_off(self, tmp_path):
+        supervisor = self.make_supervisor(tmp_path)
+        supervisor.options.paper_trading = False
+
+        assert supervisor.paper_stats is None
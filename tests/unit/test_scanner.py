@@ -0,0 +1,186 @@
+"""
+tests/unit/test_scanner.py - Tests for strategy/scanner.py
+
+Tests for the block-triggered per-chain scheduler.
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+from core.time import now_ms
+from chains.block import BlockState, BlockStream
+from strategy.scanner import BlockScheduler
+
+
+def make_state(block_number: int) -> BlockState:
+    return BlockState(chain_id=1, block_number=block_number, timestamp_ms=now_ms(), latency_ms=0)
+
+
+def make_stream() -> BlockStream:
+    """BlockStream with no background source; tests publish blocks directly."""
+    provider = MagicMock()
+    provider.chain_id = 1
+    stream = BlockStream(provider)
+    stream.start = _noop
+    return stream
+
+
+async def _noop():
+    return None
+
+
+async def feed(stream: BlockStream, blocks: list[int], delay: float = 0.005):
+    for n in blocks:
+        await stream._publish(make_state(n))
+        await asyncio.sleep(delay)
+
+
+class TestBlockScheduler:
+    """Test BlockScheduler triggering, coalescing and lag."""
+
+    async def test_cycle_per_block(self):
+        """Each new block triggers one cycle at that block."""
+        stream = make_stream()
+        scanned = []
+
+        async def run_cycle(chain_key, chain_config, state):
+            scanned.append(state.block_number)
+            return {"chain": chain_key}
+
+        scheduler = BlockScheduler({"arb": ({}, stream)}, run_cycle)
+        feeder = asyncio.create_task(feed(stream, [1, 2, 3]))
+        summaries = await asyncio.wait_for(scheduler.run(max_cycles=3), 2)
+        await feeder
+
+        assert scanned == [1, 2, 3]
+        assert all("block_lag" in s for s in summaries)
+
+    async def test_block_stride(self):
+        """With stride 2 only every second block is scanned."""
+        stream = make_stream()
+        scanned = []
+
+        async def run_cycle(chain_key, chain_config, state):
+            scanned.append(state.block_number)
+            return {}
+
+        scheduler = BlockScheduler({"arb": ({}, stream)}, run_cycle, block_stride=2)
+        feeder = asyncio.create_task(feed(stream, [10, 11, 12, 13, 14]))
+        await asyncio.wait_for(scheduler.run(max_cycles=3), 2)
+        await feeder
+
+        assert scanned == [10, 12, 14]
+        assert scheduler.lag["arb"].blocks_dropped == 0
+
+    async def test_late_blocks_coalesced_and_lag_reported(self):
+        """Blocks arriving during a slow cycle are dropped, not queued."""
+        stream = make_stream()
+        scanned = []
+
+        async def run_cycle(chain_key, chain_config, state):
+            scanned.append(state.block_number)
+            if state.block_number == 1:
+                # Chain moves on while we quote
+                for n in (2, 3, 4, 5):
+                    await stream._publish(make_state(n))
+            return {}
+
+        scheduler = BlockScheduler({"arb": ({}, stream)}, run_cycle)
+        await stream._publish(make_state(1))
+        await asyncio.wait_for(scheduler.run(max_cycles=2), 2)
+
+        lag = scheduler.lag["arb"]
+        assert scanned == [1, 5]
+        assert lag.max_lag_blocks == 4
+        assert lag.blocks_dropped == 3
+        assert lag.last_lag_blocks == 0
+
+    async def test_slow_chain_does_not_block_others(self):
+        """Each chain runs independently."""
+        fast, slow = make_stream(), make_stream()
+        done_order = []
+
+        async def run_cycle(chain_key, chain_config, state):
+            if chain_key == "slow":
+                await asyncio.sleep(0.2)
+            done_order.append(chain_key)
+            return {}
+
+        scheduler = BlockScheduler({"fast": ({}, fast), "slow": ({}, slow)}, run_cycle)
+        feeders = [
+            asyncio.create_task(feed(fast, [1, 2, 3])),
+            asyncio.create_task(feed(slow, [1])),
+        ]
+        await asyncio.wait_for(scheduler.run(max_cycles=1), 2)
+        await asyncio.gather(*feeders)
+
+        assert done_order == ["fast", "slow"]
+
+    async def test_cycle_crash_keeps_chain_alive(self):
+        """An exception in one cycle is counted and scanning continues."""
+        stream = make_stream()
+
+        async def run_cycle(chain_key, chain_config, state):
+            if state.block_number == 1:
+                raise RuntimeError("boom")
+            return {}
+
+        scheduler = BlockScheduler({"arb": ({}, stream)}, run_cycle)
+        feeder = asyncio.create_task(feed(stream, [1, 2]))
+        summaries = await asyncio.wait_for(scheduler.run(max_cycles=2), 2)
+        await feeder
+
+        assert scheduler.lag["arb"].errors == 1
+        assert len(summaries) == 1
+
+    async def test_should_stop(self):
+        """should_stop ends the chain task before the next cycle."""
+        stream = make_stream()
+        cycles = []
+
+        async def run_cycle(chain_key, chain_config, state):
+            cycles.append(state.block_number)
+            return {}
+
+        scheduler = BlockScheduler(
+            {"arb": ({}, stream)}, run_cycle, should_stop=lambda: len(cycles) >= 1,
+        )
+        feeder = asyncio.create_task(feed(stream, [1, 2, 3]))
+        await asyncio.wait_for(scheduler.run(), 2)
+        await feeder
+
+        assert cycles == [1]
+
+    async def test_stop_while_stream_stalled(self):
+        """Shutdown does not wait for a block that never comes."""
+        stream = make_stream()
+        stopping = False
+
+        async def run_cycle(chain_key, chain_config, state):
+            return {}
+
+        scheduler = BlockScheduler({"arb": ({}, stream)}, run_cycle, should_stop=lambda: stopping)
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.05)
+        stopping = True
+
+        await asyncio.wait_for(task, 2)
+
+    async def test_endless_run_keeps_no_summaries(self):
+        """Without max_cycles summaries are not accumulated."""
+        stream = make_stream()
+        cycles = []
+
+        async def run_cycle(chain_key, chain_config, state):
+            cycles.append(state.block_number)
+            return {"block": state.block_number}
+
+        scheduler = BlockScheduler(
+            {"arb": ({}, stream)}, run_cycle, should_stop=lambda: len(cycles) >= 3,
+        )
+        feeder = asyncio.create_task(feed(stream, [1, 2, 3]))
+        summaries = await asyncio.wait_for(scheduler.run(), 2)
+        await feeder
+
+        assert cycles == [1, 2, 3]
+        assert summaries == []
@@ -0,0 +1,183 @@
+"""
+tests/unit/test_sizing.py - Tests for engine/sizing.py
+
+Tests for USD size ladders and golden-section size search.
+"""
+
+from decimal import Decimal
+
+from core.constants import DexType, TradeDirection
+from core.math import Price
+from core.models import Token, Pool, Quote
+from dex import v3_math
+from engine.sizing import (
+    GasPricer,
+    golden_section_search,
+    ladder_needs_reprice,
+    local_first_probe,
+    local_round_trip_profit,
+    optimize_sizes,
+    size_ladder,
+    usd_price,
+)
+from strategy.config import load_strategy_config
+from tests.unit.test_local_quoter import build_state
+
+
+WETH = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="WETH", decimals=18)
+USDC = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USDC", decimals=6)
+SIZES_USD = [Decimal(50), Decimal(100), Decimal(200), Decimal(400)]
+
+
+def concave(peak: int):
+    """Net PnL with its maximum at peak."""
+    return lambda size: 10**12 - ((size - peak) // 10**9) ** 2
+
+
+class TestSizeLadder:
+    """Test USD -> wei conversion."""
+
+    def test_stable_token_needs_no_reference(self):
+        assert usd_price(USDC) == 1
+        assert size_ladder(SIZES_USD, USDC, usd_price(USDC)) == [50 * 10**6, 100 * 10**6, 200 * 10**6, 400 * 10**6]
+
+    def test_volatile_token_uses_reference(self):
+        assert usd_price(WETH) is None
+        assert usd_price(WETH, Decimal(0)) is None
+
+        ladder = size_ladder(SIZES_USD, WETH, usd_price(WETH, Decimal(2500)))
+        assert ladder == [2 * 10**16, 4 * 10**16, 8 * 10**16, 16 * 10**16]
+
+    def test_reprice_band(self):
+        """Ladders are kept while the price stays within the band."""
+        assert not ladder_needs_reprice(Decimal(2500), Decimal(2600), 500)
+        assert not ladder_needs_reprice(Decimal(2500), Decimal(2375), 500)
+        assert ladder_needs_reprice(Decimal(2500), Decimal(2626), 500)
+        assert ladder_needs_reprice(Decimal(2500), Decimal("2500.01"), 0)
+
+    def test_config_section(self, tmp_path):
+        path = tmp_path / "strategy.yaml"
+        path.write_text("quote:\n  sizes_usd: [400, 50]\n  optimize_size: false\n  ladder_reprice_bps: 100\n")
+
+        quote = load_strategy_config(path).quote
+        assert quote.sizes_usd == [Decimal(50), Decimal(400)]
+        assert quote.optimize_size is False
+        assert quote.ladder_reprice_bps == 100
+
+
+class TestGasPricer:
+    """Test gas (native wei) -> token wei rates."""
+
+    def test_rates(self):
+        pricer = GasPricer("ETH", {"WETH": Decimal(2500)})
+
+        assert pricer.rate(WETH) == Price(1)
+        assert pricer.rate(USDC) == Price(2500 * 10**6, 10**18)
+        # 0.01 ETH of gas is 25 USDC
+        rate = pricer.rate(USDC)
+        assert 10**16 * rate.num // rate.den == 25 * 10**6
+
+    def test_unknown_prices(self):
+        assert GasPricer("ETH", {}).rate(USDC) is None
+        mnt = Token(chain_id=5000, address="0x" + "1" * 40, symbol="WMNT", name="WMNT", decimals=18)
+        assert GasPricer("MNT", {}).rate(mnt) == Price(1)
+        assert GasPricer("MNT", {"WETH": Decimal(2500)}).rate(USDC) is None
+
+    def test_derived_through_quote(self):
+        """An unpriced token_in is valued through the quote's own price."""
+        pricer = GasPricer("ETH", {"WETH": Decimal(2500)})
+        arb = Token(chain_id=42161, address="0x" + "2" * 40, symbol="ARB", name="ARB", decimals=18)
+        quote = Quote(
+            pool=Pool(chain_id=42161, dex_id="uniswap_v3", dex_type=DexType.UNISWAP_V3,
+                      pool_address="", token0=arb, token1=USDC, fee=500),
+            direction=TradeDirection.SELL, token_in=arb, token_out=USDC,
+            amount_in=10**18, amount_out=5 * 10**5, block_number=1, timestamp_ms=0, gas_estimate=0,
+        )
+
+        rate_in, rate_out = pricer.quote_rates(quote)
+
+        assert rate_out == pricer.rate(USDC)
+        assert rate_in == Price(5000)  # ARB at 0.5 USD: 5000 ARB wei per ETH wei
+
+
+class TestGoldenSection:
+    """Test the search itself."""
+
+    async def test_finds_peak_within_tolerance(self):
+        peak = 73 * 10**15
+        result = await golden_section_search(concave(peak), 10**16, 2 * 10**17, max_probes=30, tolerance_bps=10)
+
+        assert abs(result.size - peak) * 10_000 <= peak * 20
+        assert result.profitable
+        assert result.probes <= 30
+
+    async def test_probe_budget_respected(self):
+        result = await golden_section_search(concave(5 * 10**16), 10**16, 2 * 10**17, max_probes=5, tolerance_bps=1)
+        assert result.probes == 5
+
+    async def test_unfillable_sizes_rank_lowest(self):
+        limit = 6 * 10**16  # Liquidity runs out above this
+
+        def probe(size):
+            return None if size > limit else size // 10**6  # Increasing until it can't fill
+
+        result = await golden_section_search(probe, 10**16, 2 * 10**17, max_probes=30, tolerance_bps=10)
+        assert result.size <= limit
+        assert (limit - result.size) * 10_000 <= limit * 50
+
+    async def test_candidates_share_each_batch(self):
+        peaks = [3 * 10**16, 15 * 10**16]
+        batches: list[list] = []
+
+        async def probe_batch(items):
+            batches.append(items)
+            return [concave(peak)(size) for peak, size in items]
+
+        results = await optimize_sizes(peaks, [(10**16, 2 * 10**17)] * 2, probe_batch, max_probes=8, tolerance_bps=1)
+
+        assert len(batches) == 7  # 2 probes in the first step, then 1 per step
+        assert all({peak for peak, _ in batch} == set(peaks) for batch in batches)
+        assert [r.probes for r in results] == [8, 8]
+        assert results[0].size < results[1].size
+
+
+class TestLocalRoundTrip:
+    """Test the local V3 probe."""
+
+    async def test_price_gap_has_interior_optimum(self):
+        token0 = Token(chain_id=1, address="0x0000000000000000000000000000000000000001", symbol="T0", name="Token0", decimals=18)
+        token1 = Token(chain_id=1, address="0x0000000000000000000000000000000000000002", symbol="T1", name="Token1", decimals=18)
+
+        def pool(dex: str) -> Pool:
+            return Pool(chain_id=1, dex_id=dex, dex_type=DexType.UNISWAP_V3,
+                        pool_address="0xpool", token0=token0, token1=token1, fee=3000)
+
+        # Token0 ~2% dearer on the sell pool
+        sell_state = build_state()
+        sell_state.tick = 200
+        sell_state.sqrt_price_x96 = v3_math.get_sqrt_ratio_at_tick(200)
+
+        profit = local_round_trip_profit(pool("a"), build_state(), pool("b"), sell_state, token0)
+        lo, hi = 10**14, 2 * 10**16
+        result = await golden_section_search(profit, lo, hi, max_probes=25, tolerance_bps=10)
+
+        grid_best = max(profit(lo + (hi - lo) * i // 100) for i in range(101))
+        assert result.profitable
+        assert lo < result.size < hi
+        assert result.net_pnl >= grid_best * 999 // 1000
+
+    async def test_local_first_probe_sends_only_uncached(self):
+        """Candidates with a local profit never reach the remote batch."""
+        remote_batches: list[list] = []
+
+        async def remote(items):
+            remote_batches.append(items)
+            return [size for _, size in items]
+
+        probe_batch = local_first_probe(remote)
+        values = await probe_batch([(("a", lambda size: -size), 5), (("b", None), 7), (("c", None), 9)])
+
+        assert values == [-5, 7, 9]
+        assert remote_batches == [[("b", 7), ("c", 9)]]
+        assert await probe_batch([(("a", lambda size: size * 2), 3)]) == [6]
+        assert len(remote_batches) == 1
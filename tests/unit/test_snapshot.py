@@ -0,0 +1,180 @@
+"""
+tests/unit/test_snapshot.py - Tests for core/snapshot.py
+
+Tests for the binary snapshot format: lossless round trips against the
+JSON form, columnar encodings, the lazy reader and JSON export.
+"""
+
+import json
+from decimal import Decimal
+
+import pytest
+
+from core.snapshot import (
+    SNAPSHOT_MAGIC,
+    SnapshotReader,
+    SnapshotWriter,
+    decode_record,
+    encode_record,
+    export_json,
+    load_snapshot,
+    write_snapshot,
+)
+
+
+def as_json(value):
+    """What the JSON snapshot would load back as."""
+    return json.loads(json.dumps(value, default=str))
+
+
+def make_spread(i: int) -> dict:
+    return {
+        "spread_id": f"arbitrum_one:WETH/USDC:{i}",
+        "buy_dex": "uniswap_v3",
+        "sell_dex": "sushiswap_v3",
+        "amount_in": str(10**18 + i),
+        "amount_out": str(-i),
+        "net_pnl_bps": 1.5 * i,
+        "executable": i % 2 == 0,
+        "fee": 500,
+    }
+
+
+def make_snapshot(cycles: int = 3) -> dict:
+    return {
+        "timestamp": "2026-01-01T00:00:00+00:00",
+        "mode": "REGISTRY",
+        "session_summary": {"total_cycles": cycles, "fetch_rate": 0.5, "quote_reject_histogram": {}},
+        "cycle_summaries": [
+            {
+                "chain": "arbitrum_one",
+                "block_number": 1000 + c,
+                "spreads": [make_spread(i) for i in range(8)],
+                "pairs": ["WETH/USDC", "ARB/USDC", "WETH/USDC", "GMX/WETH"],
+                "ticks": [-887272, 0, 887272, 1, 2],
+                "stage_timings_ms": {"quoting": 12.5, "total": 20.0},
+            }
+            for c in range(cycles)
+        ],
+    }
+
+
+class TestRecordCodec:
+    """Test encode_record/decode_record."""
+
+    @pytest.mark.parametrize("value", [
+        None, True, False, 0, -1, 2**64 + 7, -(2**70), 1.25, "", "WETH",
+        [], {}, [1, "a", None, 2.5], {"nested": {"list": [[1, 2], [3]]}},
+    ])
+    def test_scalar_and_nested_round_trip(self, value):
+        """Plain JSON values come back unchanged."""
+        assert decode_record(encode_record(value)) == value
+
+    def test_int_columns(self):
+        """Int lists of every width (and past 64 bits) round-trip."""
+        values = [
+            [1, 2, 3, 4, 5],
+            [-300, 0, 300, 30000, 7],
+            [2**40, -(2**40), 0, 1],
+            [10**30, -(10**30), 0, 1, 2],
+        ]
+        for column in values:
+            assert decode_record(encode_record(column)) == column
+
+    def test_int_strings_stay_strings(self):
+        """Canonical integer strings are stored as ints but read back as str."""
+        value = {"amount": "1000000000000000000", "odd": "007", "neg": "-5", "col": [str(10**25 + i) for i in range(6)]}
+        decoded = decode_record(encode_record(value))
+
+        assert decoded == value
+        assert all(isinstance(v, str) for v in decoded["col"])
+
+    def test_table_of_dicts(self):
+        """A list of same-key dicts round-trips, including mixed column types."""
+        rows = [make_spread(i) for i in range(10)]
+        rows[3]["fee"] = None
+
+        assert decode_record(encode_record(rows)) == rows
+
+    def test_bool_columns_keep_type(self):
+        """Bools are not folded into int columns."""
+        decoded = decode_record(encode_record([True, False, True, True]))
+
+        assert decoded == [True, False, True, True]
+        assert all(type(v) is bool for v in decoded)
+
+    def test_json_only_shapes(self):
+        """Tuples, int keys and Decimals decode as JSON would render them."""
+        value = {1: (1, 2), "price": Decimal("1.5"), "t": ("a", "b")}
+
+        assert decode_record(encode_record(value)) == as_json(value)
+
+    def test_smaller_than_json(self):
+        """Repeated keys and numbers cost far less than in indented JSON."""
+        rows = [make_spread(i) for i in range(200)]
+
+        assert len(encode_record(rows)) * 3 < len(json.dumps(rows, indent=2))
+
+
+class TestSnapshotFile:
+    """Test SnapshotWriter/SnapshotReader and helpers."""
+
+    @pytest.mark.parametrize("compress_level", [0, 1])
+    def test_load_matches_json(self, tmp_path, compress_level):
+        """load_snapshot of a binary file equals json.load of the JSON file."""
+        snapshot = make_snapshot()
+        path = tmp_path / "scan.arbysnap"
+        write_snapshot(path, snapshot, compress_level=compress_level)
+
+        assert path.read_bytes().startswith(SNAPSHOT_MAGIC)
+        assert load_snapshot(path) == as_json(snapshot)
+
+    def test_load_json_snapshot(self, tmp_path):
+        """Legacy .json snapshots still load."""
+        path = tmp_path / "scan.json"
+        path.write_text(json.dumps(make_snapshot(1)))
+
+        assert load_snapshot(path)["mode"] == "REGISTRY"
+
+    def test_reader_is_lazy_and_indexable(self, tmp_path):
+        """Cycles are decoded on access, by index or in order."""
+        snapshot = make_snapshot(5)
+        path = tmp_path / "scan.arbysnap"
+        write_snapshot(path, snapshot)
+
+        with SnapshotReader(path) as reader:
+            assert len(reader) == 5
+            assert reader.meta["mode"] == "REGISTRY"
+            assert reader.cycle(3)["block_number"] == 1003
+            assert [c["block_number"] for c in reader] == [1000, 1001, 1002, 1003, 1004]
+
+    def test_truncated_tail_keeps_complete_cycles(self, tmp_path):
+        """An interrupted write loses only the partial record."""
+        path = tmp_path / "scan.arbysnap"
+        with SnapshotWriter(path) as writer:
+            writer.write_meta({"mode": "SMOKE"})
+            writer.write_cycle({"block_number": 1})
+            writer.write_cycle({"block_number": 2})
+        data = path.read_bytes()
+        path.write_bytes(data[:-3])
+
+        with SnapshotReader(path) as reader:
+            assert [c["block_number"] for c in reader] == [1]
+
+    def test_bad_magic(self, tmp_path):
+        """Files that are not snapshots are rejected."""
+        path = tmp_path / "scan.arbysnap"
+        path.write_bytes(b"{}")
+
+        with pytest.raises(ValueError):
+            SnapshotReader(path)
+
+    def test_export_json(self, tmp_path):
+        """export_json writes the legacy JSON snapshot."""
+        snapshot = make_snapshot(2)
+        path = tmp_path / "scan.arbysnap"
+        write_snapshot(path, snapshot)
+
+        output = export_json(path, tmp_path / "scan.json")
+
+        assert json.loads(output.read_text()) == as_json(snapshot)
@@ -0,0 +1,149 @@
+"""
+tests/unit/test_spread_engine.py - Tests for engine/spread_engine.py
+
+Tests the integer spread pass against the Decimal per-pair formulas.
+"""
+
+import random
+from decimal import Decimal
+
+from core.constants import DexType, TradeDirection
+from core.models import Token, Pool, Quote
+from engine.sizing import GasPricer
+from engine.spread_engine import SpreadMatrix, compute_spreads
+from strategy.gates import calculate_implied_price
+from strategy.jobs.run_scan import calculate_spread_bps, calculate_gas_cost_bps
+
+
+WETH = Token(chain_id=42161, address="0x82aF49447D8a07e3bd95BD0d56f35241523fBab1", symbol="WETH", name="WETH", decimals=18)
+USDC = Token(chain_id=42161, address="0xaf88d065e77c8cC2239327C5EDb3A432268e5831", symbol="USDC", name="USDC", decimals=6)
+ARB = Token(chain_id=42161, address="0x912CE59144191C1204E64559FE8253a0e49E6548", symbol="ARB", name="ARB", decimals=18)
+ONE_ETH = 10**18
+GAS_PRICE = 10**8  # 0.1 gwei
+
+
+def make_quote(
+    dex: str, amount_out: int, amount_in: int = ONE_ETH, gas: int = 150_000,
+    token_in: Token = WETH, token_out: Token = USDC,
+) -> Quote:
+    pool = Pool(chain_id=42161, dex_id=dex, dex_type=DexType.UNISWAP_V3,
+                pool_address="", token0=WETH, token1=USDC, fee=500)
+    return Quote(pool=pool, direction=TradeDirection.SELL, token_in=token_in, token_out=token_out,
+                 amount_in=amount_in, amount_out=amount_out, block_number=1,
+                 timestamp_ms=0, gas_estimate=gas)
+
+
+def key(amount_in: int = ONE_ETH) -> str:
+    return f"WETH/USDC_500_{amount_in}"
+
+
+class TestSpreadMatrix:
+    """Test pairwise spread rows."""
+
+    def test_buy_leg_is_cheaper_dex(self):
+        rows = compute_spreads({key(): {
+            "uniswap_v3": make_quote("uniswap_v3", 2_510_000_000),
+            "sushiswap_v3": make_quote("sushiswap_v3", 2_500_000_000),
+        }}, GAS_PRICE)
+
+        (row,) = rows
+        assert (row.buy_dex, row.sell_dex) == ("sushiswap_v3", "uniswap_v3")
+        assert row.spread_bps == 40  # 10 / 2500
+        assert row.gas_total == 300_000
+        assert row.gas_cost_bps == 300_000 * GAS_PRICE * 10_000 // ONE_ETH
+        assert row.net_pnl_bps == row.spread_bps - row.gas_cost_bps
+
+    def test_equal_prices_and_single_dex_groups_skipped(self):
+        matrix = SpreadMatrix.from_groups({
+            key(): {"a": make_quote("a", 2_500_000_000), "b": make_quote("b", 2_500_000_000)},
+            key(10**17): {"a": make_quote("a", 250_000_000, amount_in=10**17)},
+        })
+        assert matrix.keys == [key()]
+        assert matrix.pair_count == 1
+        assert matrix.spreads(GAS_PRICE) == []
+
+    def test_gas_valued_in_token_in(self):
+        """USDC-in: gas is converted to USDC wei before it is charged against amount_in."""
+        pricer = GasPricer("ETH", {"WETH": Decimal(2500)})
+        usdc_in = 2_500 * 10**6
+        rows = compute_spreads({"USDC/WETH_500_2500000000": {
+            "a": make_quote("a", ONE_ETH, amount_in=usdc_in, token_in=USDC, token_out=WETH),
+            "b": make_quote("b", ONE_ETH + 10**16, amount_in=usdc_in, token_in=USDC, token_out=WETH),
+        }}, 10**10, gas_rate=lambda quote: pricer.quote_rates(quote)[0])
+
+        (row,) = rows
+        # 300k gas * 10 gwei = 0.003 ETH = 7.5 USD of a 2500 USD trade
+        assert row.gas_cost_wei == 3 * 10**15
+        assert row.gas_cost_bps == 30
+        assert row.net_pnl_bps == row.spread_bps - 30
+
+    def test_unpriced_groups_skipped(self):
+        pricer = GasPricer("ETH", {})
+        quotes = {key(): {"a": make_quote("a", 2_500_000_000), "b": make_quote("b", 2_510_000_000)}}
+        usdc_key = "USDC/ARB_500_2500000000"
+        quotes[usdc_key] = {
+            dex: make_quote(dex, out, amount_in=2_500 * 10**6, token_in=USDC, token_out=ARB)
+            for dex, out in (("a", ONE_ETH), ("b", 2 * ONE_ETH))
+        }
+
+        matrix = SpreadMatrix.from_groups(quotes, lambda quote: pricer.quote_rates(quote)[0])
+
+        assert matrix.keys == [key()]  # WETH-in needs no USD price
+        assert matrix.unpriced == [usdc_key]  # No WETH price to value gas in USDC
+
+    def test_zero_output_never_pairs(self):
+        rows = compute_spreads({key(): {
+            "a": make_quote("a", 0), "b": make_quote("b", 2_500_000_000),
+        }}, GAS_PRICE)
+        assert rows == []
+
+    def test_min_net_filter_keeps_only_survivors(self):
+        quotes = {key(): {
+            "a": make_quote("a", 2_500_000_000),
+            "b": make_quote("b", 2_500_500_000),  # 2 bps, eaten by gas
+            "c": make_quote("c", 2_525_000_000),  # 100 bps vs a
+        }}
+        gas_price = 10**9  # 3 bps of gas per pair
+
+        all_rows = compute_spreads(quotes, gas_price)
+        survivors = compute_spreads(quotes, gas_price, min_net_pnl_bps=1)
+
+        assert len(all_rows) == 3
+        assert all(row.profitable for row in survivors)
+        assert {(r.buy_dex, r.sell_dex) for r in survivors} == {("a", "c"), ("b", "c")}
+
+    def test_matches_decimal_formulas(self):
+        rng = random.Random(7)
+        groups = {}
+        for amount_in in (10**16, 10**17, ONE_ETH, 5 * ONE_ETH):
+            groups[key(amount_in)] = {
+                f"dex{i}": make_quote(
+                    f"dex{i}",
+                    amount_in * rng.randint(2_400_000, 2_600_000) // 10**15,
+                    amount_in=amount_in,
+                    gas=rng.randint(80_000, 400_000),
+                )
+                for i in range(10)
+            }
+
+        rows = {(r.key, r.buy_dex, r.sell_dex): r for r in compute_spreads(groups, GAS_PRICE)}
+
+        expected = 0
+        for group_key, dex_quotes in groups.items():
+            dexes = list(dex_quotes)
+            for i, dex_a in enumerate(dexes):
+                for dex_b in dexes[i + 1:]:
+                    price_a = calculate_implied_price(dex_quotes[dex_a])
+                    price_b = calculate_implied_price(dex_quotes[dex_b])
+                    spread_bps = calculate_spread_bps(price_a, price_b)
+                    if spread_bps == 0:
+                        continue
+                    expected += 1
+                    buy, sell = (dex_a, dex_b) if price_a < price_b else (dex_b, dex_a)
+                    row = rows[(group_key, buy, sell)]
+                    assert row.spread_bps == spread_bps
+                    assert row.gas_cost_bps == calculate_gas_cost_bps(
+                        dex_quotes[dex_a].gas_estimate, dex_quotes[dex_b].gas_estimate,
+                        dex_quotes[dex_a].amount_in, GAS_PRICE,
+                    )
+        assert len(rows) == expected
@@ -9,6 +9,7 @@ import time
 
 from core.time import (
     BlockPin,
+    frozen_clock,
     now_ms,
     now_utc,
     is_quote_fresh,
@@ -125,6 +126,15 @@ class TestQuoteFreshness:
         assert is_quote_fresh(quote_time, max_age_ms=1000) is True
         # 500ms is not fresh with 400ms threshold
         assert is_quote_fresh(quote_time, max_age_ms=400) is False
+    
+    def test_frozen_clock(self):
+        """Inside frozen_clock, freshness is judged at the frozen time."""
+        recorded = 1_700_000_000_000
+        with frozen_clock(recorded + 500):
+            assert now_ms() == recorded + 500
+            assert now_utc().timestamp() == (recorded + 500) / 1000
+            assert is_quote_fresh(recorded) is True
+        assert is_quote_fresh(recorded) is False
 
 
 class TestBlockFreshness:
@@ -0,0 +1,101 @@
+"""
+tests/unit/test_timing.py - Tests for core/timing.py
+
+Tests for per-stage cycle timers and their cross-cycle histograms.
+"""
+
+import time
+
+import pytest
+
+from core.timing import OTHER_STAGE, TOTAL_STAGE, StageHistogram, StageTimer
+
+
+class TestStageTimer:
+    """Test StageTimer."""
+
+    def test_stage_records_duration(self):
+        """A timed block lands in its stage."""
+        timer = StageTimer()
+        with timer.stage("quoting"):
+            time.sleep(0.01)
+
+        timings = timer.to_dict()
+        assert timings["quoting"] >= 10
+        assert timer.counts["quoting"] == 1
+
+    def test_repeated_stage_accumulates(self):
+        """Entering a stage again adds to it."""
+        timer = StageTimer()
+        timer.add("gates", 0.001)
+        timer.add("gates", 0.002)
+
+        assert timer.to_dict()["gates"] == pytest.approx(3.0)
+        assert timer.counts["gates"] == 2
+
+    def test_exception_still_recorded(self):
+        """A stage that raises is still timed."""
+        timer = StageTimer()
+        with pytest.raises(ValueError):
+            with timer.stage("spreads"):
+                raise ValueError("boom")
+
+        assert "spreads" in timer.to_dict()
+
+    def test_total_and_other(self):
+        """total covers the timer lifetime; other is the untimed remainder."""
+        timer = StageTimer()
+        timer.add("quoting", 0.005)
+        time.sleep(0.01)
+
+        timings = timer.to_dict()
+        assert timings[TOTAL_STAGE] >= 10
+        assert timings[OTHER_STAGE] == pytest.approx(timings[TOTAL_STAGE] - 5.0, abs=0.01)
+
+    def test_stage_order_preserved(self):
+        """Stages keep first-entered order, total last."""
+        timer = StageTimer()
+        timer.add("block_pin", 0.0)
+        timer.add("quoting", 0.0)
+
+        assert list(timer.to_dict()) == ["block_pin", "quoting", OTHER_STAGE, TOTAL_STAGE]
+
+
+class TestStageHistogram:
+    """Test StageHistogram."""
+
+    def test_rollup(self):
+        """Count, total, share and percentiles per stage."""
+        histogram = StageHistogram()
+        for ms in (10.0, 20.0, 30.0, 40.0):
+            histogram.record({"quoting": ms, TOTAL_STAGE: 100.0})
+
+        stats = histogram.to_dict()
+        assert stats["quoting"]["count"] == 4
+        assert stats["quoting"]["total_ms"] == 100.0
+        assert stats["quoting"]["share_pct"] == 25.0
+        assert stats["quoting"]["p50_ms"] == 30.0
+        assert stats["quoting"]["max_ms"] == 40.0
+
+    def test_sorted_slowest_first(self):
+        """Stages are ordered by total time."""
+        histogram = StageHistogram()
+        histogram.record({"gates": 1.0, "quoting": 50.0, TOTAL_STAGE: 60.0})
+
+        assert list(histogram.to_dict()) == [TOTAL_STAGE, "quoting", "gates"]
+
+    def test_window_bounds_samples(self):
+        """Percentiles use the window; totals use every sample."""
+        histogram = StageHistogram(window=2)
+        for ms in (100.0, 1.0, 2.0):
+            histogram.record({"gates": ms})
+
+        stats = histogram.to_dict()["gates"]
+        assert stats["max_ms"] == 2.0
+        assert stats["total_ms"] == 103.0
+        assert stats["share_pct"] is None
+
+    def test_empty(self):
+        """No cycles, no stages."""
+        assert StageHistogram().to_dict() == {}
+        assert StageHistogram().percentile("gates", 50) is None
@@ -0,0 +1,161 @@
+"""
+tests/unit/test_truth_report.py - Tests for monitoring/truth_report.py
+
+Tests for the incremental TruthReportAggregator.
+"""
+
+import copy
+import random
+
+import pytest
+
+from monitoring.truth_report import (
+    BlockedReason,
+    TruthReportAggregator,
+    generate_truth_report,
+)
+
+
+def make_spread(spread_id: str, net_pnl_bps: int, executable: bool = False, **extra) -> dict:
+    return {
+        "id": spread_id,
+        "pair": spread_id.split("_")[0],
+        "net_pnl_bps": net_pnl_bps,
+        "spread_bps": net_pnl_bps + 10,
+        "gas_cost_bps": 3,
+        "executable": executable,
+        "amount_in": str(10**18),
+        "buy_leg": {"dex": "uniswap_v3", "price": "2000", "latency_ms": 50, "ticks_crossed": 1},
+        "sell_leg": {"dex": "sushiswap_v3", "latency_ms": 50, "ticks_crossed": 1},
+        **extra,
+    }
+
+
+def make_cycle(spreads: list[dict], **extra) -> dict:
+    return {
+        "chain": "arbitrum_one",
+        "mode": "REGISTRY",
+        "quotes_attempted": 10,
+        "quotes_fetched": 9,
+        "quotes_passed_gates": 8,
+        "spreads": spreads,
+        "block_pin": {"age_ms": 100},
+        "rpc_stats": {"https://rpc": {"total_requests": 20, "success_rate": 0.95, "avg_latency_ms": 40}},
+        "reject_reasons_histogram": {"QUOTE_REVERT": 1},
+        **extra,
+    }
+
+
+def random_cycles(seed: int, count: int = 8) -> list[dict]:
+    rng = random.Random(seed)
+    cycles = []
+    for c in range(count):
+        spreads = []
+        for i in range(30):
+            reason = rng.choice([None, "EXEC_DISABLED_RISK", "unset"])
+            extra = {} if reason == "unset" else {"blocked_reason": reason}
+            spreads.append(make_spread(
+                f"P{i % 11}/USDC_uni_sushi_500_{i % 4}",
+                rng.randint(-10, 80),
+                executable=rng.random() < 0.3,
+                **extra,
+            ))
+        cycles.append(make_cycle(
+            spreads,
+            spreads_unprofitable=rng.randint(0, 5),
+            block_pin={"age_ms": rng.randint(0, 12_000)},
+        ))
+    return cycles
+
+
+def without_timestamp(report) -> dict:
+    data = report.to_dict()
+    data.pop("timestamp")
+    return data
+
+
+class TestTruthReportAggregator:
+    """Test TruthReportAggregator."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    @pytest.mark.parametrize("max_candidates", [None, -1])
+    def test_matches_generate_truth_report(self, seed, max_candidates):
+        """Incremental report equals the one-shot report over the same cycles."""
+        cycles = random_cycles(seed)
+        paper = {"total_pnl_bps": 7, "total_pnl_numeraire": "1.25", "would_execute": 1}
+
+        aggregator = TruthReportAggregator(top_n=5, max_candidates=max_candidates)
+        for cycle in copy.deepcopy(cycles):
+            aggregator.add_cycle(cycle)
+
+        expected = generate_truth_report(
+            {"mode": "REGISTRY", "cycle_summaries": copy.deepcopy(cycles)},
+            paper, top_n=5, notion_capital_numeraire=1000.0,
+        )
+        assert without_timestamp(aggregator.report(paper, 1000.0)) == without_timestamp(expected)
+
+    def test_latest_spread_version_wins(self):
+        """A re-seen spread_id replaces its counts and its candidate."""
+        aggregator = TruthReportAggregator()
+        aggregator.add_cycle(make_cycle([make_spread("A/USDC_x_y_500_1", 40, executable=False)]))
+        aggregator.add_cycle(make_cycle([make_spread("A/USDC_x_y_500_1", -3, executable=False)]))
+
+        report = aggregator.report()
+
+        assert report.spread_ids_total == 1
+        assert report.spread_ids_profitable == 0
+        assert report.blocked_spreads == 0
+        assert report.blocked_reasons is None
+        assert report.signals_total == 2
+        assert report.signals_profitable == 1
+        assert report.top_opportunities == []
+
+    def test_blocked_reasons_histogram(self):
+        """Profitable, non-executable spreads count under their blocked reason."""
+        aggregator = TruthReportAggregator()
+        aggregator.add_cycle(make_cycle([
+            make_spread("A/USDC_x_y_500_1", 40),
+            make_spread("B/USDC_x_y_500_1", 40, blocked_reason="EXEC_DISABLED_RISK"),
+            make_spread("C/USDC_x_y_500_1", 40, executable=True),
+        ]))
+
+        report = aggregator.report()
+
+        assert report.blocked_reasons == {
+            BlockedReason.EXEC_DISABLED_NOT_VERIFIED: 1,
+            "EXEC_DISABLED_RISK": 1,
+        }
+        assert report.blocked_spreads == 2
+        assert report.spread_ids_executable == 1
+
+    def test_candidates_stay_bounded(self):
+        """The candidate heap does not grow with the session."""
+        aggregator = TruthReportAggregator(top_n=3)
+        for cycle in range(200):
+            aggregator.add_cycle(make_cycle([
+                make_spread(f"P{cycle}/USDC_x_y_500_{i}", 10 + i) for i in range(20)
+            ]))
+
+        assert len(aggregator._candidates) <= 2 * aggregator.max_candidates
+        assert aggregator.spread_ids_total == 4000
+        assert [o.net_pnl_bps for o in aggregator.report().top_opportunities] == [29, 29, 29]
+
+    def test_mode_from_cycles(self):
+        """Without an explicit mode the cycles' mode is used (MIXED if several)."""
+        aggregator = TruthReportAggregator()
+        assert aggregator.report().mode == "UNKNOWN"
+
+        aggregator.add_cycle(make_cycle([]))
+        assert aggregator.report().mode == "REGISTRY"
+
+        aggregator.add_cycle(make_cycle([], mode="SMOKE"))
+        assert aggregator.report().mode == "MIXED"
+
+    def test_ingest_does_not_mutate_spreads(self):
+        """Scoring at ingest leaves the cycle's spread dicts untouched."""
+        spread = make_spread("A/USDC_x_y_500_1", 40, gas_cost_bps=0, buy_leg={"gas_estimate": 300_000})
+        original = copy.deepcopy(spread)
+
+        TruthReportAggregator().add_cycle(make_cycle([spread]))
+
+        assert spread == original
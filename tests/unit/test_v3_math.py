@@ -0,0 +1,148 @@
+"""
+tests/unit/test_v3_math.py - Tests for dex/v3_math.py
+
+Reference vectors are taken from the Uniswap v3-core test suite.
+"""
+
+import pytest
+
+from dex.v3_math import (
+    Q96,
+    MIN_TICK,
+    MAX_TICK,
+    MIN_SQRT_RATIO,
+    MAX_SQRT_RATIO,
+    MAX_UINT256,
+    get_sqrt_ratio_at_tick,
+    get_tick_at_sqrt_ratio,
+    get_next_sqrt_price_from_input,
+    get_next_sqrt_price_from_output,
+    get_amount0_delta,
+    get_amount1_delta,
+    compute_swap_step,
+    next_initialized_tick_within_one_word,
+    count_initialized_ticks_crossed,
+)
+
+# encodePriceSqrt(121, 100)
+SQRT_PRICE_1_21 = 87150978765690771352898345369
+# encodePriceSqrt(101, 100)
+SQRT_PRICE_1_01 = 79623317895830914510639640423
+
+
+class TestTickMath:
+    """Test tick <-> sqrt price conversion."""
+
+    def test_bounds(self):
+        assert get_sqrt_ratio_at_tick(MIN_TICK) == MIN_SQRT_RATIO
+        assert get_sqrt_ratio_at_tick(MAX_TICK) == MAX_SQRT_RATIO
+        assert get_sqrt_ratio_at_tick(0) == Q96
+
+    def test_out_of_range_raises(self):
+        with pytest.raises(ValueError):
+            get_sqrt_ratio_at_tick(MAX_TICK + 1)
+
+    def test_tick_at_sqrt_ratio(self):
+        assert get_tick_at_sqrt_ratio(MIN_SQRT_RATIO) == MIN_TICK
+        assert get_tick_at_sqrt_ratio(MAX_SQRT_RATIO - 1) == MAX_TICK - 1
+        assert get_tick_at_sqrt_ratio(Q96) == 0
+
+    @pytest.mark.parametrize("tick", [-887271, -50000, -1, 1, 60, 12345, 887271])
+    def test_round_trip(self, tick):
+        """Tick -> ratio -> tick, and ratio - 1 falls to the tick below."""
+        ratio = get_sqrt_ratio_at_tick(tick)
+        assert get_tick_at_sqrt_ratio(ratio) == tick
+        assert get_tick_at_sqrt_ratio(ratio - 1) == tick - 1
+
+
+class TestSqrtPriceMath:
+    """Test SqrtPriceMath vectors."""
+
+    def test_next_price_from_input(self):
+        assert get_next_sqrt_price_from_input(Q96, 10**18, 10**17, False) == SQRT_PRICE_1_21
+        assert get_next_sqrt_price_from_input(Q96, 10**18, 10**17, True) == 72025602285694852357767227579
+
+    def test_next_price_from_output(self):
+        assert get_next_sqrt_price_from_output(Q96, 10**18, 10**17, False) == 88031291682515930659493278152
+        assert get_next_sqrt_price_from_output(Q96, 10**18, 10**17, True) == 71305346262837903834189555302
+
+    def test_output_exceeding_reserves_raises(self):
+        with pytest.raises(ValueError):
+            get_next_sqrt_price_from_output(Q96, 1, 4, False)
+
+    def test_amount0_delta_rounding(self):
+        assert get_amount0_delta(Q96, SQRT_PRICE_1_21, 10**18, True) == 90909090909090910
+        assert get_amount0_delta(Q96, SQRT_PRICE_1_21, 10**18, False) == 90909090909090909
+
+    def test_amount1_delta_rounding(self):
+        assert get_amount1_delta(Q96, SQRT_PRICE_1_21, 10**18, True) == 100000000000000000
+        assert get_amount1_delta(Q96, SQRT_PRICE_1_21, 10**18, False) == 99999999999999999
+
+    def test_input_overflow_branch(self):
+        """Huge token0 input takes the divRoundingUp fallback, never overflows."""
+        price = get_next_sqrt_price_from_input(Q96, 1, MAX_UINT256 // Q96, True)
+        assert price == 1
+
+
+class TestSwapMath:
+    """Test SwapMath.computeSwapStep vectors."""
+
+    def test_exact_in_capped_at_target(self):
+        sqrt_q, amount_in, amount_out, fee = compute_swap_step(Q96, SQRT_PRICE_1_01, 2 * 10**18, 10**18, 600)
+        assert (sqrt_q, amount_in, amount_out, fee) == (
+            SQRT_PRICE_1_01, 9975124224178055, 9925619580021728, 5988667735148,
+        )
+
+    def test_exact_out_capped_at_target(self):
+        sqrt_q, amount_in, amount_out, fee = compute_swap_step(Q96, SQRT_PRICE_1_01, 2 * 10**18, -(10**18), 600)
+        assert (sqrt_q, amount_in, amount_out, fee) == (
+            SQRT_PRICE_1_01, 9975124224178055, 9925619580021728, 5988667735148,
+        )
+
+    def test_exact_in_fully_spent(self):
+        sqrt_q, amount_in, amount_out, fee = compute_swap_step(Q96, SQRT_PRICE_1_21 * 10, 2 * 10**18, 10**18, 600)
+        assert amount_in + fee == 10**18
+        assert sqrt_q < SQRT_PRICE_1_21 * 10
+
+    def test_exact_out_capped_at_requested(self):
+        _, _, amount_out, _ = compute_swap_step(417332158212080721273783715441582, 1452870262520218020823638996, 159344665391607089467575320103, -1, 1)
+        assert amount_out == 1
+
+
+class TestTickBitmap:
+    """Test nextInitializedTickWithinOneWord and QuoterV2 tick counting."""
+
+    @pytest.fixture
+    def bitmap(self):
+        # Initialized (spacing 1): -200, -55, -4, 70, 78, 84, 139, 240, 535
+        bitmap: dict[int, int] = {}
+        for tick in (-200, -55, -4, 70, 78, 84, 139, 240, 535):
+            word, bit = tick >> 8, tick % 256
+            bitmap[word] = bitmap.get(word, 0) | (1 << bit)
+        for word in range(-2, 4):
+            bitmap.setdefault(word, 0)
+        return bitmap
+
+    def test_lte_search(self, bitmap):
+        assert next_initialized_tick_within_one_word(bitmap, 78, 1, True)[:2] == (78, True)
+        assert next_initialized_tick_within_one_word(bitmap, 79, 1, True)[:2] == (78, True)
+        assert next_initialized_tick_within_one_word(bitmap, 258, 1, True)[:2] == (256, False)
+        assert next_initialized_tick_within_one_word(bitmap, -55, 1, True)[:2] == (-55, True)
+
+    def test_gt_search(self, bitmap):
+        assert next_initialized_tick_within_one_word(bitmap, 78, 1, False)[:2] == (84, True)
+        assert next_initialized_tick_within_one_word(bitmap, 77, 1, False)[:2] == (78, True)
+        assert next_initialized_tick_within_one_word(bitmap, 255, 1, False)[:2] == (511, False)
+        assert next_initialized_tick_within_one_word(bitmap, -257, 1, False)[:2] == (-200, True)
+
+    def test_missing_word_raises(self, bitmap):
+        with pytest.raises(KeyError):
+            next_initialized_tick_within_one_word(bitmap, 5000, 1, True)
+
+    def test_count_ticks_crossed(self, bitmap):
+        assert count_initialized_ticks_crossed(bitmap, 1, 60, 100) == 3
+        assert count_initialized_ticks_crossed(bitmap, 1, 100, 60) == 3
+        # Landing exactly on an initialized tick going down is not counted
+        assert count_initialized_ticks_crossed(bitmap, 1, 100, 78) == 1
+        # Starting exactly on an initialized tick going up is not counted
+        assert count_initialized_ticks_crossed(bitmap, 1, 78, 100) == 1